@@ -104,6 +104,7 @@ class StudentDashboard(ctk.CTkToplevel):
         self.create_service_card(services_container, "🏫", "View Cash-In Request", self.show_cash_in_frame)
         self.create_service_card(services_container, "📄", "View Post Bills", self.show_post_bills_frame)
         self.create_service_card(services_container, "📄", "View Transaction", self.show_transaction_history)
+        self.create_service_card(services_container, "📊", "Spending Insights", self.show_spending_insights)
 
     # Service Card Helper 
     def create_service_card(self, parent, emoji, text, command):
@@ -571,6 +572,77 @@ class StudentDashboard(ctk.CTkToplevel):
         except Exception as e:
             ctk.CTkLabel(results_frame, text=f"Error loading transactions: {e}", text_color="red").pack(pady=20)
 
+    def show_spending_insights(self):
+        self.clear_content_frame()
+
+        # Title
+        ctk.CTkLabel(
+            self.content_frame,
+            text="Spending Insights",
+            font=("Times New Roman", 25, "bold")
+        ).pack(pady=15)
+
+        scroll_frame = ctk.CTkScrollableFrame(self.content_frame)
+        scroll_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+
+        insights = self.backend.view_spending_insights()
+        if not insights or not insights["transaction_count"]:
+            ctk.CTkLabel(scroll_frame, text="No transactions yet.", text_color="gray").pack(pady=20)
+        else:
+            # Totals
+            ctk.CTkLabel(
+                scroll_frame,
+                text=f"Total spent: ₱{insights['total_spent']:.2f}    Total received: ₱{insights['total_received']:.2f}",
+                font=("Times New Roman", 18, "bold")
+            ).pack(anchor="w", padx=10, pady=(5, 10))
+
+            # Per transaction type
+            ctk.CTkLabel(scroll_frame, text="By Type", font=("Times New Roman", 16, "bold")).pack(anchor="w", padx=10)
+            for item in insights["by_category"]:
+                ctk.CTkLabel(
+                    scroll_frame,
+                    text=f"{item['transaction_type']}: spent ₱{item['spent']:.2f}, received ₱{item['received']:.2f} ({item['count']})",
+                    anchor="w"
+                ).pack(anchor="w", padx=20)
+
+            # Last weeks
+            ctk.CTkLabel(scroll_frame, text="Recent Weeks", font=("Times New Roman", 16, "bold")).pack(anchor="w", padx=10, pady=(10, 0))
+            for item in insights["by_week"][-8:]:
+                ctk.CTkLabel(
+                    scroll_frame,
+                    text=f"Week of {item['week_start']}: spent ₱{item['spent']:.2f}, received ₱{item['received']:.2f}",
+                    anchor="w"
+                ).pack(anchor="w", padx=20)
+
+            # Top counterparties
+            ctk.CTkLabel(scroll_frame, text="Top Payees", font=("Times New Roman", 16, "bold")).pack(anchor="w", padx=10, pady=(10, 0))
+            for item in insights["top_counterparties"]:
+                ctk.CTkLabel(
+                    scroll_frame,
+                    text=f"{item['counterparty']}: ₱{item['spent']:.2f} ({item['count']} payments)",
+                    anchor="w"
+                ).pack(anchor="w", padx=20)
+
+            # Lowest and highest balance from the running balance curve; min/max
+            # also work on the plain list the API server returns in thin-client mode
+            balances = insights["balance_curve"]["balances"]
+            ctk.CTkLabel(
+                scroll_frame,
+                text=f"Balance range: ₱{min(balances):.2f} – ₱{max(balances):.2f}",
+                anchor="w"
+            ).pack(anchor="w", padx=10, pady=(10, 0))
+
+        # Back Button
+        ctk.CTkButton(
+            self.content_frame,
+            text="⬅ Back",
+            width=150,
+            height=45,
+            fg_color="#A8D9A4",
+            corner_radius=10,
+            command=self.show_main_services
+        ).pack(side="bottom", pady=10)
+
     def show_service_frame(self, title):
         self.clear_content_frame()
 
@@ -679,10 +751,16 @@ class StudentOrganizationDashboard(ctk.CTkToplevel):
             balance = self.student_backend.get_balance()
             self.balance_display_label.configure(fg_color="#8fc98f")
         elif wallet_type == "organization":
-            balance = self.organization_backend.get_balance()
+            info = self.organization_backend.display_balance()
+            balance = info["balance"] if info else None
             self.balance_display_label.configure(fg_color="#FFD580") 
 
-        if balance is not None:
+        if balance is not None and wallet_type == "organization" and info["held"] > 0:
+            # Pending cash-outs hold part of the balance until processed
+            self.balance_display_label.configure(
+                text=f"₱{balance:,.2f}\n(₱{info['available_balance']:,.2f} available)"
+            )
+        elif balance is not None:
             self.balance_display_label.configure(text=f"₱{balance:,.2f}")
         else:
             self.balance_display_label.configure(text="No Wallet Found")
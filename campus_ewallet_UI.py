@@ -45,9 +45,9 @@ class App(ctk.CTk):
 
         self.after(10, lambda: center_top_window(self, top_padding=0))
 
-        from system_backend.login import LoginSystem
+        from system_backend.api_client import get_backend
 
-        self.login_system = LoginSystem()
+        self.login_system = get_backend().LoginSystem()
         
         # Ensure the main window closes the application properly
         self.protocol("WM_DELETE_WINDOW", self.destroy)
@@ -1,6 +1,10 @@
+import threading
 import customtkinter as ctk
-from tkinter import messagebox, simpledialog
-from system_backend.finance_admin_wallet import FinanceAdminWallet
+from tkinter import messagebox, simpledialog, filedialog
+from system_backend.api_client import get_backend
+
+# Local class, or a thin client of the API server when CAMPUS_EWALLET_API_URL is set
+FinanceAdminWallet = get_backend().FinanceAdminWallet
 
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("green")
@@ -22,7 +26,8 @@ class App(ctk.CTkToplevel):
         self.frames = {}
         for F in (FinanceAdminDashboard, CreateStudentPage,
                   CashInPage, CashInDetailPage,
-                  CashOutPage, CashOutDetailPage, TransactionsPage): # Removed App from here
+                  CashOutPage, CashOutDetailPage, TransactionsPage,
+                  FlaggedTransactionsPage): # Removed App from here
             frame = F(container, self.show_frame)
             self.frames[F.__name__] = frame
             frame.grid(row=0, column=0, sticky="nsew")
@@ -38,12 +43,19 @@ class App(ctk.CTkToplevel):
 
         frame.tkraise()
 
+        # Dashboard KPIs are cheap to read, so refresh them whenever shown
+        if hasattr(frame, "refresh_kpis"):
+            frame.refresh_kpis()
+
         # Load data if the frame has load_data method and data is passed
         if data and hasattr(frame, "load_data"):
             frame.load_data(data)
 
     def logout(self):
         """Destroys the dashboard window to return to the main application."""
+        # Hand unprocessed claims back so other admins can pick them up
+        if self.admin_user_id:
+            FinanceAdminWallet.release_claimed_requests(self.admin_user_id)
         self.destroy()
 
 
@@ -67,7 +79,7 @@ class FinanceAdminDashboard(ctk.CTkFrame):
 
         btn_frame = ctk.CTkFrame(self)
         btn_frame.pack(pady=40, padx=20, fill="x")
-        for i in range(4):
+        for i in range(5):
             btn_frame.grid_columnconfigure(i, weight=1, uniform="btn_col")
 
         create_btn = ctk.CTkButton(btn_frame, text="🧑‍🎓\nCreate Student\nAccount",
@@ -90,6 +102,59 @@ class FinanceAdminDashboard(ctk.CTkFrame):
                                          command=lambda: switch_callback("TransactionsPage"))
         transactions_btn.grid(row=0, column=3, padx=10, pady=10, sticky="nsew")
 
+        flagged_btn = ctk.CTkButton(btn_frame, text="🚩\nReview Flagged\nTransfers",
+                                    width=200, height=150,
+                                    command=lambda: switch_callback("FlaggedTransactionsPage"))
+        flagged_btn.grid(row=0, column=4, padx=10, pady=10, sticky="nsew")
+
+        # Live KPIs, read from counters maintained on every write
+        kpi_frame = ctk.CTkFrame(self)
+        kpi_frame.pack(pady=(0, 10), padx=20, fill="x")
+        for i in range(4):
+            kpi_frame.grid_columnconfigure(i, weight=1, uniform="kpi_col")
+
+        self.kpi_labels = {}
+        kpi_titles = [
+            ("money_in_circulation", "Money in Circulation"),
+            ("pending_cashin", "Pending Cash-In"),
+            ("pending_cashout", "Pending Cash-Out"),
+            ("today_volume", "Today's Volume"),
+        ]
+        for column, (key, title) in enumerate(kpi_titles):
+            ctk.CTkLabel(kpi_frame, text=title, font=ctk.CTkFont(size=14, weight="bold")).grid(
+                row=0, column=column, padx=10, pady=(10, 0))
+            self.kpi_labels[key] = ctk.CTkLabel(kpi_frame, text="-", font=ctk.CTkFont(size=18))
+            self.kpi_labels[key].grid(row=1, column=column, padx=10, pady=(0, 10))
+
+        self.volume_label = ctk.CTkLabel(self, text="", justify="left", anchor="w")
+        self.volume_label.pack(padx=20, fill="x")
+
+        ctk.CTkButton(self, text="Refresh", width=100, command=self.refresh_kpis).pack(pady=10)
+
+    def refresh_kpis(self):
+        success, snapshot = FinanceAdminWallet.get_dashboard_snapshot()
+        if not success:
+            self.volume_label.configure(text=snapshot)
+            return
+
+        self.kpi_labels["money_in_circulation"].configure(text=f"₱{snapshot['money_in_circulation']:,.2f}")
+        for key in ("pending_cashin", "pending_cashout"):
+            self.kpi_labels[key].configure(
+                text=f"{snapshot[key]['count']} (₱{snapshot[key]['amount']:,.2f})")
+
+        days = {}
+        for row in snapshot["daily_volume"]:
+            days.setdefault(row["volume_date"], []).append(row)
+
+        self.kpi_labels["today_volume"].configure(text=f"₱{snapshot['today_volume']:,.2f}")
+
+        lines = []
+        for day in sorted(days, reverse=True):
+            parts = ", ".join(
+                f"{row['transaction_type']} {row['txn_count']} (₱{row['total_amount']:,.2f})" for row in days[day])
+            lines.append(f"{day}: {parts}")
+        self.volume_label.configure(text="\n".join(lines) or "No activity in the last 7 days.")
+
 
 # Create Student Page
 class CreateStudentPage(ctk.CTkFrame):
@@ -203,9 +268,10 @@ class CreateStudentPage(ctk.CTkFrame):
 
 # Cash-In Page
 class CashInPage(ctk.CTkFrame):
-    def __init__(self, parent, switch_callback):
+    def __init__(self, parent, switch_callback, admin_user_id=None):
         super().__init__(parent)
         self.switch_callback = switch_callback
+        self.admin_user_id = admin_user_id
 
         back_btn = ctk.CTkButton(self, text="←", width=50, height=40,
                                   command=lambda: switch_callback("FinanceAdminDashboard"))
@@ -231,6 +297,8 @@ class CashInPage(ctk.CTkFrame):
             command=lambda _: self.load_requests()
         )
         self.filter_dropdown.pack(side="left", padx=5)
+        ctk.CTkButton(top_frame, text="Claim Next 10", command=self.claim_requests)\
+            .pack(side="left", padx=5)
 
         self.message_label = ctk.CTkLabel(self, text="Pending Requests", 
                                           font=ctk.CTkFont(size=14, weight="bold"))
@@ -270,6 +338,25 @@ class CashInPage(ctk.CTkFrame):
             )
             return
 
+        self.show_requests(requests)
+
+    def claim_requests(self):
+        """Lease the next pending requests to this admin and list only those."""
+        for widget in self.scroll_frame.winfo_children():
+            widget.destroy()
+
+        success, requests = FinanceAdminWallet.claim_cashin_requests(self.admin_user_id)
+        if not success:
+            self.message_label.configure(text=requests)
+            return
+        if not requests:
+            self.message_label.configure(text="No unclaimed pending requests")
+            return
+
+        self.message_label.configure(text=f"Your Claimed Requests (held until {requests[0]['claim_expires_at']})")
+        self.show_requests(requests)
+
+    def show_requests(self, requests):
         for req in requests:
             card = ctk.CTkFrame(self.scroll_frame, fg_color="#D9FDD3", corner_radius=10)
             card.pack(pady=5, padx=10, fill="x")
@@ -353,7 +440,9 @@ class CashInDetailPage(ctk.CTkFrame):
             if not reason:
                 return
             if messagebox.askyesno("Confirm", "Decline this cash-in request?"):
-                success, msg = FinanceAdminWallet.decline_cashin_request(self.selected_request['request_id'], reason)
+                success, msg = FinanceAdminWallet.decline_cashin_request(
+                    self.selected_request['request_id'], reason, self.admin_user_id
+                )
                 messagebox.showinfo("Result", msg)
                 self.switch_callback("CashInPage")
 
@@ -389,6 +478,7 @@ class CashOutPage(ctk.CTkFrame):
             command=lambda _: self.load_requests()
         )
         self.filter_menu.pack(side="left", padx=5)
+        ctk.CTkButton(top_frame, text="Claim Next 10", command=self.claim_requests).pack(side="left", padx=5)
 
         self.message_label = ctk.CTkLabel(self, text="Pending Cash-Out Requests",
                                           font=ctk.CTkFont(size=14, weight="bold"))
@@ -430,6 +520,25 @@ class CashOutPage(ctk.CTkFrame):
             )
             return
 
+        self.show_requests(requests)
+
+    def claim_requests(self):
+        """Lease the next pending requests to this admin and list only those."""
+        for widget in self.scroll_frame.winfo_children():
+            widget.destroy()
+
+        success, requests = FinanceAdminWallet.claim_cashout_requests(self.admin_user_id)
+        if not success:
+            self.message_label.configure(text=requests)
+            return
+        if not requests:
+            self.message_label.configure(text="No unclaimed pending requests")
+            return
+
+        self.message_label.configure(text=f"Your Claimed Requests (held until {requests[0]['claim_expires_at']})")
+        self.show_requests(requests)
+
+    def show_requests(self, requests):
         for req in requests:
             card = ctk.CTkFrame(self.scroll_frame, fg_color="#FFD9D9", corner_radius=10)
             card.pack(pady=5, padx=10, fill="x")
@@ -522,12 +631,106 @@ class CashOutDetailPage(ctk.CTkFrame):
             if messagebox.askyesno("Confirm", "Decline this cash-out request?"):
                 success, msg = FinanceAdminWallet.decline_cashout_request(
                     self.selected_request['request_id'],
-                    reason
+                    reason,
+                    self.admin_user_id
                 )
                 messagebox.showinfo("Result", msg)
                 self.switch_callback("CashOutPage")
 
 
+# Flagged Transactions Page
+class FlaggedTransactionsPage(ctk.CTkFrame):
+    def __init__(self, parent, switch_callback, admin_user_id=None):
+        super().__init__(parent)
+        self.switch_callback = switch_callback
+        self.admin_user_id = admin_user_id
+
+        back_btn = ctk.CTkButton(self, text="←", width=50, height=40,
+                                  command=lambda: switch_callback("FinanceAdminDashboard"))
+        back_btn.pack(anchor="nw", pady=10, padx=10)
+
+        header = ctk.CTkLabel(self, text="Flagged Transfers", font=ctk.CTkFont(size=22, weight="bold"))
+        header.pack(pady=10)
+
+        top_frame = ctk.CTkFrame(self)
+        top_frame.pack(pady=5, fill="x", padx=10)
+
+        self.status_var = ctk.StringVar(value="pending")
+        self.filter_dropdown = ctk.CTkOptionMenu(
+            top_frame,
+            variable=self.status_var,
+            values=["pending", "cleared", "confirmed", "all"],
+            command=lambda _: self.load_flags()
+        )
+        self.filter_dropdown.pack(side="left", padx=5)
+        ctk.CTkButton(top_frame, text="Refresh", command=self.load_flags)\
+            .pack(side="left", padx=5)
+
+        self.message_label = ctk.CTkLabel(self, text="Pending Review",
+                                          font=ctk.CTkFont(size=14, weight="bold"))
+        self.message_label.pack(pady=5)
+
+        self.scroll_frame = ctk.CTkScrollableFrame(self, width=950, height=400)
+        self.scroll_frame.pack(pady=10)
+
+        self.load_flags()
+
+    def load_flags(self):
+        for widget in self.scroll_frame.winfo_children():
+            widget.destroy()
+
+        filter_status = self.status_var.get()
+        success, flags = FinanceAdminWallet.get_flagged_transactions(status_filter=filter_status)
+
+        title = filter_status.capitalize() if filter_status != "all" else "All"
+        self.message_label.configure(text=f"{title} Flagged Transfers")
+
+        if not success or len(flags) == 0:
+            self.message_label.configure(text=flags if not success else "No flagged transfers found")
+            return
+
+        for flag in flags:
+            card = ctk.CTkFrame(self.scroll_frame, fg_color="#D9FDD3", corner_radius=10)
+            card.pack(pady=5, padx=10, fill="x")
+
+            ctk.CTkLabel(
+                card,
+                text=f"Transaction ID: {flag['transaction_id']} | From: {flag['sender_student_id']} "
+                     f"| To: {flag['receiver_identifier']} | Amount: ₱{flag['amount']:.2f} "
+                     f"| Score: {flag['score']} | Status: {flag['status']}",
+                text_color="#333333",
+                anchor="w",
+                font=ctk.CTkFont(size=14, weight="bold")
+            ).pack(padx=10, pady=(10, 0), fill="x")
+
+            ctk.CTkLabel(
+                card,
+                text=f"Flagged {flag['flagged_at']}: {flag['reasons']}",
+                text_color="#333333",
+                anchor="w",
+                font=ctk.CTkFont(size=13)
+            ).pack(padx=10, pady=5, fill="x")
+
+            if flag["status"] == "pending":
+                btn_frame = ctk.CTkFrame(card, fg_color="transparent")
+                btn_frame.pack(padx=10, pady=(0, 10), anchor="e")
+                ctk.CTkButton(btn_frame, text="Clear", width=100,
+                              command=lambda f=flag: self.review(f, "cleared"))\
+                    .grid(row=0, column=0, padx=5)
+                ctk.CTkButton(btn_frame, text="Confirm Fraud", width=120,
+                              command=lambda f=flag: self.review(f, "confirmed"))\
+                    .grid(row=0, column=1, padx=5)
+
+    def review(self, flag, decision):
+        action = "Clear" if decision == "cleared" else "Confirm as fraud"
+        if messagebox.askyesno("Confirm", f"{action} transfer {flag['transaction_id']}?"):
+            success, msg = FinanceAdminWallet.review_flagged_transaction(
+                flag["transaction_id"], decision, self.admin_user_id
+            )
+            messagebox.showinfo("Result", msg)
+            self.load_flags()
+
+
 # Transactions Page
 class TransactionsPage(ctk.CTkFrame):
     def __init__(self, parent, switch_callback):
@@ -545,11 +748,25 @@ class TransactionsPage(ctk.CTkFrame):
         search_frame = ctk.CTkFrame(self)
         search_frame.pack(pady=5, fill="x", padx=10)
         ctk.CTkEntry(search_frame, placeholder_text="Search...", textvariable=self.search_var).pack(side="left", fill="x", expand=True)
+
+        # Optional date range (YYYY-MM-DD), both ends inclusive
+        self.start_date_var = ctk.StringVar()
+        self.end_date_var = ctk.StringVar()
+        ctk.CTkEntry(search_frame, placeholder_text="From (YYYY-MM-DD)", width=150,
+                     textvariable=self.start_date_var).pack(side="left", padx=(5, 0))
+        ctk.CTkEntry(search_frame, placeholder_text="To (YYYY-MM-DD)", width=150,
+                     textvariable=self.end_date_var).pack(side="left", padx=(5, 0))
+
         ctk.CTkButton(search_frame, text="Search", command=self.load_transactions).pack(side="left", padx=5)
+        self.export_btn = ctk.CTkButton(search_frame, text="Export", command=self.export_transactions)
+        self.export_btn.pack(side="left", padx=5)
 
         self.message_label = ctk.CTkLabel(self, text="All Transactions", font=ctk.CTkFont(size=14, weight="bold"))
         self.message_label.pack(pady=5)
 
+        self.export_progress = ctk.CTkProgressBar(self, width=400)
+        self.export_progress.set(0)
+
         self.scroll_frame = ctk.CTkScrollableFrame(self, width=950, height=400)
         self.scroll_frame.pack(pady=10)
 
@@ -565,13 +782,21 @@ class TransactionsPage(ctk.CTkFrame):
             widget.destroy()
 
         search = self.search_var.get()
-        success, transactions = FinanceAdminWallet.get_all_transactions(search=search)
+        success, transactions = FinanceAdminWallet.get_all_transactions(
+            search=search,
+            start_date=self.start_date_var.get().strip() or None,
+            end_date=self.end_date_var.get().strip() or None
+        )
         if search:
             self.message_label.configure(text=f"Results for '{search}'")
         else:
             self.message_label.configure(text="All Transactions")
 
-        if not success or len(transactions) == 0:
+        if not success:
+            self.message_label.configure(text=transactions)
+            return
+
+        if len(transactions) == 0:
             self.message_label.configure(text=f"No results found for '{search}'" if search else "No transactions")
             return
 
@@ -593,6 +818,45 @@ class TransactionsPage(ctk.CTkFrame):
             )
             info_label.pack(padx=10, pady=10, fill="x")
 
+    def export_transactions(self):
+        path = filedialog.asksaveasfilename(
+            title="Export Transactions",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("CSV (gzip)", "*.csv.gz"),
+                       ("JSON Lines", "*.jsonl"), ("JSON Lines (gzip)", "*.jsonl.gz")]
+        )
+        if not path:
+            return
+
+        filters = {
+            "search": self.search_var.get() or None,
+            "start_date": self.start_date_var.get().strip() or None,
+            "end_date": self.end_date_var.get().strip() or None,
+        }
+
+        self.export_btn.configure(state="disabled")
+        self.export_progress.set(0)
+        self.export_progress.pack(pady=5)
+
+        # Export runs in the background; UI updates are handed back to the Tk thread
+        def on_progress(done, total):
+            fraction = done / total if total else 0
+            self.after(0, lambda: self.export_progress.set(min(fraction, 1)))
+
+        def run():
+            success, result = FinanceAdminWallet.export_transactions(path, progress_callback=on_progress, **filters)
+            self.after(0, lambda: self.on_export_finished(success, result))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def on_export_finished(self, success, result):
+        self.export_btn.configure(state="normal")
+        self.export_progress.pack_forget()
+        if success:
+            messagebox.showinfo("Export", f"Exported {result['rows']} transactions to {result['path']}")
+        else:
+            messagebox.showerror("Export", f"{result}\nRun the export again to resume.")
+
 
 if __name__ == "__main__":
     app = App()
@@ -13,9 +13,10 @@ from customtkinter import CTkImage
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(BASE_DIR)
 
-from system_backend.login import LoginSystem
-from system_backend.students_wallet import StudentWallet
-from system_backend.organization_wallet import OrganizationWallet 
+from system_backend.api_client import get_backend
+
+# Local classes, or thin clients of the API server when CAMPUS_EWALLET_API_URL is set
+LoginSystem, StudentWallet, OrganizationWallet, _ = get_backend()
 from StudentDashboardSample import StudentDashboard, StudentOrganizationDashboard
 from finance_admin_ui import App as FinanceAdminDashboardApp 
 
@@ -0,0 +1,292 @@
+"""
+API Client Module
+
+This module is the thin client side of api_server. It gives the
+customtkinter UIs objects with the same methods as LoginSystem,
+StudentWallet, OrganizationWallet and FinanceAdminWallet that forward each
+call to the API server instead of connecting to MySQL.
+
+How it works:
+- ApiClient keeps one HTTP/1.1 keep-alive connection to the server. A
+  request that could not be sent on a reused connection is resent once on
+  a fresh one; a connection lost after the request was sent raises
+  ApiError instead, since the server may already have run the calls (a
+  resend could repeat a payment)
+- RemoteLoginSystem.login stores the session token on the client; the
+  remote wallets created afterwards act as that logged-in user
+- ApiClient.batch() sends several calls in one round trip, e.g. a
+  dashboard refresh:
+      balance, history = client.batch([
+          ("student", "get_balance"),
+          ("student", "view_transactions"),
+      ])
+- Tagged Decimal and datetime values are restored, so results have the
+  same types as with the local backend
+- get_backend() picks the remote classes when CAMPUS_EWALLET_API_URL is
+  set (e.g. http://wallet-server:8750) and the local ones otherwise
+
+Dependencies:
+- http.client and json from the standard library
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+from urllib.parse import urlsplit
+
+
+API_URL_ENV = "CAMPUS_EWALLET_API_URL"
+DEFAULT_TIMEOUT_SECONDS = 30
+
+# Reconnect rather than reuse a connection the server may be closing
+# (api_server.KEEPALIVE_SECONDS is 75)
+MAX_IDLE_SECONDS = 60
+
+Backend = namedtuple("Backend", ["LoginSystem", "StudentWallet", "OrganizationWallet", "FinanceAdminWallet"])
+
+
+class ApiError(Exception):
+    """Raised when the API server rejects a request or cannot be reached."""
+
+
+def decode_value(value):
+    """json.loads object_hook restoring the values tagged by api_server.encode_value."""
+    if len(value) == 1:
+        if "$decimal" in value:
+            return Decimal(value["$decimal"])
+        if "$datetime" in value:
+            return datetime.fromisoformat(value["$datetime"])
+        if "$date" in value:
+            return date.fromisoformat(value["$date"])
+    return value
+
+
+class ApiClient:
+    """
+    Keep-alive JSON client for api_server.
+
+    Attributes:
+        token (str): Session token after a successful login.
+    """
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT_SECONDS):
+        parts = urlsplit(base_url)
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._timeout = timeout
+        self._connection = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+        self.token = None
+
+    def _post(self, path, payload):
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        with self._lock:
+            if self._connection is not None and time.monotonic() - self._last_used > MAX_IDLE_SECONDS:
+                self._connection.close()
+                self._connection = None
+
+            while True:
+                reused = self._connection is not None
+                if not reused:
+                    self._connection = self._connection_class(self._host, self._port, timeout=self._timeout)
+                try:
+                    self._connection.request("POST", path, body, headers)
+                except (http.client.CannotSendRequest, ConnectionError) as e:
+                    # Not fully sent, so the server never ran it; a reused
+                    # connection may have been closed while idle
+                    self._connection.close()
+                    self._connection = None
+                    if not reused:
+                        raise ApiError(f"Unable to reach the wallet server: {e}")
+                    continue
+                except OSError as e:
+                    self._connection.close()
+                    self._connection = None
+                    raise ApiError(f"Unable to reach the wallet server: {e}")
+
+                try:
+                    response = self._connection.getresponse()
+                    data = response.read()
+                    self._last_used = time.monotonic()
+                    break
+                except (http.client.HTTPException, OSError) as e:
+                    # The request was sent and may have run; never resend it
+                    self._connection.close()
+                    self._connection = None
+                    raise ApiError(f"Lost the connection to the wallet server; the last action may have completed: {e}")
+
+        try:
+            result = json.loads(data, object_hook=decode_value)
+        except ValueError:
+            raise ApiError(f"Unexpected response from the wallet server (HTTP {response.status}).")
+        if response.status != 200:
+            raise ApiError(result.get("error") or f"HTTP {response.status}")
+        return result
+
+    def login(self, input_id, password):
+        """
+        Log in and keep the session token for later calls.
+
+        Returns:
+            dict: LoginSystem.login result.
+        """
+        result = self._post("/login", {"input_id": input_id, "password": password})
+        self.token = result.pop("token", None)
+        return result
+
+    def logout(self):
+        """End the session on the server."""
+        if self.token:
+            self._post("/logout", {})
+            self.token = None
+
+    def batch(self, calls):
+        """
+        Run several calls in one round trip, in order.
+
+        Parameters:
+            calls (list): (service, method[, args[, kwargs]]) tuples.
+
+        Returns:
+            list: The value of each call.
+
+        Raises:
+            ApiError: If any call failed; earlier calls have still run.
+        """
+        payload = []
+        for call in calls:
+            service, method = call[0], call[1]
+            args = list(call[2]) if len(call) > 2 else []
+            kwargs = call[3] if len(call) > 3 else {}
+            payload.append({"service": service, "method": method, "args": args, "kwargs": kwargs})
+
+        results = self._post("/rpc", {"calls": payload})["results"]
+        errors = [result["error"] for result in results if not result["ok"]]
+        if errors:
+            raise ApiError("; ".join(errors))
+        return [result["value"] for result in results]
+
+    def call(self, service, method, *args, **kwargs):
+        """
+        Run one service method on the server.
+
+        Returns:
+            The method's return value.
+        """
+        return self.batch([(service, method, args, kwargs)])[0]
+
+
+_default_client = None
+
+
+def get_default_client():
+    """
+    Return the process-wide client for CAMPUS_EWALLET_API_URL.
+
+    Returns:
+        ApiClient: Shared client (and session) of the desktop application.
+    """
+    global _default_client
+    if _default_client is None:
+        url = os.environ.get(API_URL_ENV)
+        if not url:
+            raise ApiError(f"{API_URL_ENV} is not set.")
+        _default_client = ApiClient(url)
+    return _default_client
+
+
+class _RemoteService:
+    """Forward every public method call to one service on the API server."""
+
+    _service = None
+
+    def __init__(self, client=None):
+        self._client = client or get_default_client()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self._client.call(self._service, name, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+
+class RemoteLoginSystem(_RemoteService):
+    """LoginSystem over the API. login() opens the client's session."""
+
+    _service = "login"
+
+    def login(self, input_id, password):
+        return self._client.login(input_id, password)
+
+
+class RemoteStudentWallet(_RemoteService):
+    """StudentWallet over the API, acting as the logged-in user."""
+
+    _service = "student"
+
+    def __init__(self, user_id=None, client=None):
+        super().__init__(client)
+        self.user_id = user_id
+
+
+class RemoteOrganizationWallet(_RemoteService):
+    """OrganizationWallet over the API, for the logged-in treasurer."""
+
+    _service = "organization"
+
+    def __init__(self, student_id=None, client=None):
+        super().__init__(client)
+        self.student_id = student_id
+
+
+class RemoteFinanceAdminWallet(_RemoteService):
+    """
+    FinanceAdminWallet over the API. Used as an instance in place of the
+    class (FinanceAdminWallet.get_all_cashin_requests(...) keeps working);
+    admin_user_id arguments are taken from the session by the server.
+    """
+
+    _service = "finance"
+
+    def export_transactions(self, path, **options):
+        """Export to a file on this machine, paging the rows from the server."""
+        from system_backend.transaction_export import export_transactions
+        return export_transactions(path, backend=self, **options)
+
+
+def get_backend():
+    """
+    Choose the backend classes for the desktop UIs.
+
+    Returns:
+        Backend: Remote classes when CAMPUS_EWALLET_API_URL is set, the
+            local (direct MySQL) classes otherwise.
+    """
+    if os.environ.get(API_URL_ENV):
+        return Backend(
+            LoginSystem=RemoteLoginSystem,
+            StudentWallet=RemoteStudentWallet,
+            OrganizationWallet=RemoteOrganizationWallet,
+            FinanceAdminWallet=RemoteFinanceAdminWallet(),
+        )
+
+    from system_backend.login import LoginSystem
+    from system_backend.students_wallet import StudentWallet
+    from system_backend.organization_wallet import OrganizationWallet
+    from system_backend.finance_admin_wallet import FinanceAdminWallet
+    return Backend(LoginSystem, StudentWallet, OrganizationWallet, FinanceAdminWallet)
@@ -0,0 +1,423 @@
+"""
+API Server Module
+
+This module runs the wallet backend as a central HTTP/JSON service, so
+desktop clients no longer need database credentials: the server process
+owns the connection pool and every in-process cache (receivers,
+organization wallets, spending analytics, fraud scoring), and the
+customtkinter UIs talk to it through api_client.
+
+How it works:
+- One asyncio event loop serves every client connection on top of the
+  async services (see async_services) and the async_db pool
+- Connections are HTTP/1.1 keep-alive: a client reuses one TCP connection
+  for all its calls until it is idle for KEEPALIVE_SECONDS
+- POST /login authenticates through LoginSystem and returns a session
+  token; later requests send it as "Authorization: Bearer <token>"
+- POST /rpc takes a batch of calls, {"calls": [{"service", "method",
+  "args", "kwargs"}, ...]}, runs them in order and answers with one result
+  per call, {"results": [{"ok": true, "value": ...} | {"ok": false,
+  "error": ...}]}, so a screen refresh is one round trip. login.* calls
+  must be sent alone, so a batch cannot multiply guesses at a reset code
+- Failed reset code checks are also capped per client address
+  (MAX_CODE_FAILURES_PER_IP per CODE_FAILURE_WINDOW_SECONDS), on top of
+  the per-code cap in LoginSystem.verify_code
+- Calls always act as the session's user: wallets are built from the
+  session, and admin_user_id arguments are replaced with the session's
+  user. Services are gated by role and only the methods listed in
+  SERVICE_METHODS can be called
+- Decimals and datetimes are tagged in JSON (see encode_value) so the
+  client gets back the same types the local backend returns
+
+Usage:
+    python -m system_backend.api_server [--host HOST] [--port PORT] [--pool-size N]
+
+Dependencies:
+- async_services and async_db (aiomysql) for the wallet operations
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import secrets
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from system_backend import async_db
+from system_backend.async_services import (
+    AsyncStudentWallet, AsyncOrganizationWallet, AsyncFinanceAdminWallet, AsyncLoginSystem
+)
+from system_backend.finance_admin_wallet import FinanceAdminWallet
+from system_backend.login import LoginSystem
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8750
+
+KEEPALIVE_SECONDS = 75
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_CALLS = 50
+SESSION_IDLE_SECONDS = 8 * 60 * 60
+
+# Methods reachable over the API, per service. Anything that writes files
+# on the server (receipt images, PDFs) stays local to the desktop client.
+SERVICE_METHODS = {
+    "student": {
+        "display_welcome_info", "display_balance", "get_balance", "send_money", "send_batch_payout",
+        "request_funds", "view_cashin_requests", "load_organization_posts", "pay_organization_bill",
+        "view_posted_bills", "get_posted_bills_summary", "view_transactions", "view_monthly_statement",
+        "schedule_transfer", "schedule_bill_payment", "view_scheduled_transfers",
+        "cancel_scheduled_transfer", "create_split_request", "pay_split_share",
+        "view_split_obligations", "view_my_splits", "cancel_split_request", "view_spending_insights",
+    },
+    "organization": {
+        "display_balance", "get_balance", "post_bill", "post_bills", "view_transactions",
+        "view_bill_collection_progress", "view_bill_payers", "request_cash_out",
+        "view_cash_out_requests", "org_transaction", "view_monthly_statement",
+    },
+    "finance": {
+        "admin_create_student_account", "get_all_cashin_requests", "get_all_cashout_requests",
+        "approve_cashin_request", "decline_cashin_request", "approve_cashout_request",
+        "decline_cashout_request", "claim_cashin_requests", "claim_cashout_requests",
+        "release_claimed_requests", "get_dashboard_snapshot", "get_flagged_transactions",
+        "review_flagged_transaction", "get_all_transactions", "count_transactions", "get_transactions_page",
+    },
+}
+
+# Roles allowed to use each service (None: any logged-in user)
+SERVICE_ROLES = {
+    "student": None,
+    "organization": {"treasurer"},
+    "finance": {"finance admin"},
+}
+
+# Reachable without a session; reset_password(force_change=True) needs one
+PUBLIC_LOGIN_METHODS = {"forgot_password_request", "verify_code", "reset_password"}
+
+MAX_CODE_FAILURES_PER_IP = 20
+CODE_FAILURE_WINDOW_SECONDS = 15 * 60
+
+
+class ApiError(Exception):
+    """Raised while handling a call; the message is returned to the client."""
+
+
+def encode_value(value):
+    """
+    json.dumps default= hook for the types the wallet services return.
+
+    Decimal, datetime and date values are tagged so api_client can restore
+    them; NumPy scalars and arrays become plain numbers and lists.
+    """
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(payload):
+    return json.dumps(payload, default=encode_value).encode()
+
+
+class ApiServer:
+    """
+    HTTP/JSON front end of the async wallet services.
+
+    Attributes:
+        sessions (dict): Session token -> session dictionary.
+        code_failures (dict): Client address -> times of failed code checks.
+    """
+
+    def __init__(self):
+        self.sessions = {}
+        self.code_failures = {}
+        self.login_system = AsyncLoginSystem()
+
+    # Sessions
+    def _open_session(self, login_id, user):
+        now = time.time()
+        for token in [t for t, s in self.sessions.items() if s["expires_at"] <= now]:
+            del self.sessions[token]
+
+        token = secrets.token_urlsafe(32)
+        self.sessions[token] = {
+            "login_id": login_id,
+            "user_id": user["user_id"],
+            "role": (user.get("role") or "").lower(),
+            "student_id": user.get("student_id"),
+            "must_change_password": user.get("must_change_password", False),
+            "services": {},
+            "expires_at": now + SESSION_IDLE_SECONDS,
+        }
+        return token
+
+    @staticmethod
+    def _token(headers):
+        auth = headers.get("authorization", "")
+        return auth[7:].strip() if auth.lower().startswith("bearer ") else None
+
+    def _session(self, headers):
+        token = self._token(headers)
+        session = self.sessions.get(token) if token else None
+        if not session or session["expires_at"] <= time.time():
+            return None
+        session["expires_at"] = time.time() + SESSION_IDLE_SECONDS
+        return session
+
+    async def _service(self, session, name):
+        allowed_roles = SERVICE_ROLES[name]
+        if allowed_roles is not None and session["role"] not in allowed_roles:
+            raise ApiError("Not allowed for this account.")
+        if session["must_change_password"]:
+            raise ApiError("You must change your temporary password first.")
+
+        service = session["services"].get(name)
+        if service is None:
+            if name == "student":
+                service = await AsyncStudentWallet.create(session["user_id"])
+            elif name == "organization":
+                service = AsyncOrganizationWallet(session["student_id"])
+            else:
+                service = AsyncFinanceAdminWallet()
+            session["services"][name] = service
+        return service
+
+    # Endpoints
+    async def handle_login(self, body):
+        """POST /login {"input_id", "password"} -> LoginSystem.login result plus "token"."""
+        input_id = str(body.get("input_id", "")).strip()
+        result = await self.login_system.login(input_id, body.get("password", ""))
+        if result.get("ok"):
+            result["token"] = self._open_session(input_id, result["data"])
+        return result
+
+    def handle_logout(self, headers):
+        """POST /logout: drop the caller's session."""
+        token = self._token(headers)
+        if token:
+            self.sessions.pop(token, None)
+        return {"ok": True}
+
+    async def handle_rpc(self, headers, body, client_ip=None):
+        """POST /rpc {"calls": [...]} -> {"results": [...]} in call order."""
+        calls = body.get("calls")
+        if not isinstance(calls, list) or not calls:
+            raise ApiError("Expected a non-empty list of calls.")
+        if len(calls) > MAX_BATCH_CALLS:
+            raise ApiError(f"A batch is limited to {MAX_BATCH_CALLS} calls.")
+        if len(calls) > 1 and any(isinstance(call, dict) and call.get("service") == "login" for call in calls):
+            raise ApiError("Login calls cannot be batched.")
+
+        session = self._session(headers)
+        results = []
+        for call in calls:
+            try:
+                value = await self._call(session, call, client_ip)
+                results.append({"ok": True, "value": value})
+            except ApiError as e:
+                results.append({"ok": False, "error": str(e)})
+            except Exception as e:
+                print(f"API Error in {call.get('service')}.{call.get('method')}: {e}")
+                results.append({"ok": False, "error": "A system error occurred."})
+        return {"results": results}
+
+    async def _call(self, session, call, client_ip=None):
+        if not isinstance(call, dict):
+            raise ApiError("Each call must be an object.")
+        service_name = call.get("service")
+        method = call.get("method")
+        args = call.get("args") or []
+        kwargs = call.get("kwargs") or {}
+        if not isinstance(args, list) or not isinstance(kwargs, dict):
+            raise ApiError("Invalid call arguments.")
+
+        if service_name == "login":
+            return await self._call_login(session, method, args, kwargs, client_ip)
+
+        if method not in SERVICE_METHODS.get(service_name, ()):
+            raise ApiError(f"Unknown method {service_name}.{method}.")
+        if session is None:
+            raise ApiError("Not logged in or session expired.")
+
+        service = await self._service(session, service_name)
+        if service_name == "finance":
+            args, kwargs = self._as_session_admin(method, args, kwargs, session["user_id"])
+        return await getattr(service, method)(*args, **kwargs)
+
+    async def _call_login(self, session, method, args, kwargs, client_ip=None):
+        if method not in PUBLIC_LOGIN_METHODS:
+            raise ApiError(f"Unknown method login.{method}.")
+
+        if method == "verify_code":
+            now = time.time()
+            for ip in [ip for ip, times in self.code_failures.items() if times[-1] <= now - CODE_FAILURE_WINDOW_SECONDS]:
+                del self.code_failures[ip]
+            failures = [t for t in self.code_failures.get(client_ip, ()) if t > now - CODE_FAILURE_WINDOW_SECONDS]
+            if len(failures) >= MAX_CODE_FAILURES_PER_IP:
+                self.code_failures[client_ip] = failures
+                raise ApiError("Too many verification attempts. Try again later.")
+            result = await self.login_system.verify_code(*args, **kwargs)
+            if result.get("ok"):
+                self.code_failures.pop(client_ip, None)
+            else:
+                self.code_failures[client_ip] = failures + [now]
+            return result
+
+        if method == "reset_password":
+            bound = inspect.signature(LoginSystem.reset_password).bind(None, *args, **kwargs)
+            if bound.arguments.get("force_change"):
+                # A forced change skips the emailed code, so only the logged-in user may do it
+                if session is None:
+                    raise ApiError("Not logged in or session expired.")
+                bound.arguments["input_id"] = session["login_id"]
+                result = await self.login_system.reset_password(*bound.args[1:], **bound.kwargs)
+                if result.get("ok"):
+                    session["must_change_password"] = False
+                return result
+
+        return await getattr(self.login_system, method)(*args, **kwargs)
+
+    @staticmethod
+    def _as_session_admin(method, args, kwargs, admin_user_id):
+        """Replace any admin_user_id argument with the session's user."""
+        signature = inspect.signature(getattr(FinanceAdminWallet, method))
+        if "admin_user_id" not in signature.parameters:
+            return args, kwargs
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError as e:
+            raise ApiError(str(e))
+        bound.arguments["admin_user_id"] = admin_user_id
+        return list(bound.args), bound.kwargs
+
+    # HTTP
+    async def dispatch(self, method, path, headers, body, client_ip=None):
+        """
+        Route one HTTP request.
+
+        Parameters:
+            client_ip (str, optional): Peer address, for per-client limits.
+
+        Returns:
+            tuple: (int, dict) HTTP status and JSON payload.
+        """
+        if method == "GET" and path == "/health":
+            return 200, {"ok": True}
+        if method != "POST" or path not in ("/login", "/logout", "/rpc"):
+            return 404, {"ok": False, "error": "Not found."}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"ok": False, "error": "Invalid JSON."}
+        if not isinstance(payload, dict):
+            return 400, {"ok": False, "error": "Expected a JSON object."}
+
+        try:
+            if path == "/login":
+                return 200, await self.handle_login(payload)
+            if path == "/logout":
+                return 200, self.handle_logout(headers)
+            return 200, await self.handle_rpc(headers, payload, client_ip)
+        except ApiError as e:
+            return 400, {"ok": False, "error": str(e)}
+        except Exception as e:
+            print(f"API Error on {path}: {e}")
+            return 500, {"ok": False, "error": "A system error occurred."}
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one keep-alive connection."""
+        peer = writer.get_extra_info("peername")
+        client_ip = peer[0] if peer else None
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"ok": False, "error": "Request too large."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method, path.split("?", 1)[0], headers, body, client_ip)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = _dumps(payload)
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large"}.get(status, "Error")
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, pool_size=async_db.POOL_MAX_SIZE):
+    """
+    Open the database pool and serve the API until cancelled.
+
+    Parameters:
+        host (str): Interface to listen on.
+        port (int): TCP port to listen on.
+        pool_size (int): Maximum database connections for the process.
+    """
+    await async_db.init_pool(maxsize=pool_size)
+    server = await asyncio.start_server(ApiServer().handle_connection, host, port)
+    print(f"Campus E-Wallet API listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await async_db.close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Campus E-Wallet API server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--pool-size", type=int, default=async_db.POOL_MAX_SIZE)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.pool_size))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,147 @@
+"""
+Approval Queue Module
+
+This module lets several finance admins work through pending cash-in and
+cash-out requests at the same time without stepping on each other.
+
+How it works:
+- claim_requests() locks the oldest unclaimed pending requests with
+  SELECT ... FOR UPDATE SKIP LOCKED, so concurrent admins skip rows another
+  admin is claiming instead of waiting on them, and leases them to the
+  caller by setting claimed_by and claim_expires_at
+- A lease expires after LEASE_SECONDS; expired leases are claimable again,
+  so requests held by an admin who walked away return to the queue
+- Approvals and declines are compare-and-set on status (see
+  finance_admin_wallet): the status update only succeeds while the request
+  is still pending and not leased to another admin, so a request can never
+  be approved twice or credited twice
+- release_claims() hands an admin's leased requests back to the queue
+
+Dependencies:
+- campusEwallet_db for database queries and transactions
+"""
+
+from system_backend.campusEwallet_db import execute_query, transaction
+
+
+LEASE_SECONDS = 300
+DEFAULT_CLAIM_SIZE = 10
+MAX_CLAIM_SIZE = 100
+
+REQUEST_TABLES = {"cashin": "cashin_requests", "cashout": "cashout_requests"}
+
+# Condition a request must meet for admin %s to act on it
+CLAIMABLE_BY = "(claimed_by IS NULL OR claimed_by = %s OR claim_expires_at < NOW())"
+
+_CLAIMED_DETAILS = {
+    "cashin": """
+        SELECT cr.request_id, cr.user_id, wu.student_id, es.name AS student_name,
+               cr.amount, cr.status, cr.date_requested, cr.claim_expires_at
+        FROM cashin_requests cr
+        JOIN wallet_users wu ON cr.user_id = wu.user_id
+        LEFT JOIN enrolled_students es ON wu.student_id = es.student_id
+        WHERE cr.request_id IN ({ids})
+        ORDER BY cr.date_requested
+    """,
+    "cashout": """
+        SELECT cor.request_id, cor.org_wallet_id, cor.wallet_id,
+               ow.organization_name, ow.treasurer_id, es.name AS treasurer_name,
+               wu.office_name AS service_name,
+               cor.amount, cor.message, cor.status, cor.date_requested, cor.claim_expires_at
+        FROM cashout_requests cor
+        LEFT JOIN organization_wallets ow ON cor.org_wallet_id = ow.org_wallet_id
+        LEFT JOIN enrolled_students es ON ow.treasurer_id = es.student_id
+        LEFT JOIN wallets w ON cor.wallet_id = w.wallet_id
+        LEFT JOIN wallet_users wu ON w.user_id = wu.user_id
+        WHERE cor.request_id IN ({ids})
+        ORDER BY cor.date_requested
+    """,
+}
+
+
+def claim_requests(kind, admin_user_id, limit=DEFAULT_CLAIM_SIZE, lease_seconds=LEASE_SECONDS):
+    """
+    Lease the next pending requests of one kind to an admin.
+
+    Requests the admin already holds are included and their lease renewed.
+
+    Parameters:
+        kind (str): 'cashin' or 'cashout'.
+        admin_user_id (int): The claiming finance admin.
+        limit (int): Maximum number of requests to claim.
+        lease_seconds (int): How long the claim is held.
+
+    Returns:
+        tuple: (bool, list or str) True and the claimed requests (oldest
+            first), or False and an error message.
+    """
+    if kind not in REQUEST_TABLES:
+        return False, "Invalid request type."
+    if not admin_user_id:
+        return False, "An admin account is required to claim requests."
+
+    table = REQUEST_TABLES[kind]
+    limit = max(1, min(int(limit), MAX_CLAIM_SIZE))
+
+    try:
+        with transaction() as cursor:
+            cursor.execute(f"""
+                SELECT request_id FROM {table}
+                WHERE status = 'pending' AND {CLAIMABLE_BY}
+                ORDER BY date_requested, request_id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """, (admin_user_id, limit))
+            request_ids = [row["request_id"] for row in cursor.fetchall()]
+            if not request_ids:
+                return True, []
+
+            placeholders = ", ".join(["%s"] * len(request_ids))
+            cursor.execute(f"""
+                UPDATE {table}
+                SET claimed_by = %s, claim_expires_at = NOW() + INTERVAL %s SECOND
+                WHERE request_id IN ({placeholders})
+            """, (admin_user_id, lease_seconds, *request_ids))
+
+            cursor.execute(_CLAIMED_DETAILS[kind].format(ids=placeholders), tuple(request_ids))
+            claimed = cursor.fetchall()
+
+    except Exception as e:
+        print(f"Database Error in claim_requests: {e}")
+        return False, "Unable to claim requests right now."
+
+    for r in claimed:
+        if r.get("org_wallet_id") and not r.get("treasurer_name"):
+            r["treasurer_name"] = "N/A"
+    return True, claimed
+
+
+def release_claims(kind, admin_user_id, request_ids=None):
+    """
+    Return an admin's leased requests to the queue.
+
+    Parameters:
+        kind (str): 'cashin' or 'cashout'.
+        admin_user_id (int): The admin holding the leases.
+        request_ids (list[str], optional): Only release these requests.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    if kind not in REQUEST_TABLES:
+        return False, "Invalid request type."
+
+    query = f"""
+        UPDATE {REQUEST_TABLES[kind]}
+        SET claimed_by = NULL, claim_expires_at = NULL
+        WHERE claimed_by = %s AND status = 'pending'
+    """
+    params = [admin_user_id]
+    if request_ids:
+        query += " AND request_id IN (" + ", ".join(["%s"] * len(request_ids)) + ")"
+        params.extend(request_ids)
+
+    cursor = execute_query(query, tuple(params))
+    if cursor is None:
+        return False, "Unable to release claimed requests."
+    return True, f"Released {cursor.rowcount} request(s)."
@@ -0,0 +1,249 @@
+"""
+Async Database Module
+
+This module is the asyncio counterpart of campusEwallet_db. It offers the
+same helpers (execute_query, fetch_one, fetch_all and transaction) as
+coroutines backed by an aiomysql connection pool, so one event loop can
+serve many concurrent sessions without a thread per request.
+
+How it works:
+- The pool is created on first use (or explicitly with init_pool) from the
+  same DB_CONFIG as the synchronous layer, and shared by every coroutine
+  running on the event loop; a query waiting for MySQL yields the loop
+  instead of blocking a thread
+- Pool connections run in autocommit mode and return rows as dictionaries,
+  matching the synchronous helpers
+- transaction() borrows one connection for the whole block, commits when
+  the block finishes and rolls back (and re-raises) if it raises
+- Named queries from the query registry are accepted anywhere plain SQL
+  is; aiomysql has no server-side prepared statements, so they are sent
+  as text
+- With the SQLite backend (campusEwallet_db.use_sqlite) no pool is used:
+  the synchronous helpers run inline, one coroutine at a time, since the
+  database is in-process and has a single writer anyway
+
+Usage:
+    await init_pool(maxsize=50)
+    row = await fetch_one("SELECT balance FROM wallets WHERE user_id = %s", (user_id,))
+    await close_pool()
+
+Dependencies:
+- aiomysql (imported when the pool is created)
+- campusEwallet_db for the connection settings and the SQLite backend
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from system_backend import campusEwallet_db
+from system_backend.campusEwallet_db import DB_CONFIG
+
+
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 20
+
+_pool = None
+_pool_lock = None
+_sqlite_lock = None  # (event loop, asyncio.Lock)
+
+
+async def init_pool(minsize=POOL_MIN_SIZE, maxsize=POOL_MAX_SIZE):
+    """
+    Create the shared connection pool if it does not exist yet.
+
+    Parameters:
+        minsize (int): Connections opened up front.
+        maxsize (int): Upper bound of concurrently borrowed connections;
+            further queries wait for a free connection.
+
+    Returns:
+        aiomysql.Pool: The shared pool.
+    """
+    global _pool, _pool_lock
+    if _pool is not None:
+        return _pool
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+
+    async with _pool_lock:
+        if _pool is None:
+            import aiomysql
+
+            _pool = await aiomysql.create_pool(
+                host=DB_CONFIG["host"],
+                user=DB_CONFIG["user"],
+                password=DB_CONFIG["password"],
+                db=DB_CONFIG["database"],
+                minsize=minsize,
+                maxsize=maxsize,
+                autocommit=True,
+                cursorclass=aiomysql.DictCursor,
+            )
+    return _pool
+
+
+async def close_pool():
+    """Close the shared pool and wait for its connections to be released."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+        await pool.wait_closed()
+
+
+def _sqlite_turn():
+    """Return the running loop's lock that runs SQLite statements one coroutine at a time."""
+    global _sqlite_lock
+    loop = asyncio.get_running_loop()
+    if _sqlite_lock is None or _sqlite_lock[0] is not loop:
+        _sqlite_lock = (loop, asyncio.Lock())
+    return _sqlite_lock[1]
+
+
+class _SQLiteAsyncCursor:
+    """Awaitable facade over a campusEwallet_db transaction cursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    async def execute(self, query, parameters=None):
+        return self._cursor.execute(query, parameters)
+
+    async def executemany(self, query, seq_params):
+        return self._cursor.executemany(query, seq_params)
+
+    async def fetchone(self):
+        return self._cursor.fetchone()
+
+    async def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+async def execute_query(query, parameters=None):
+    """
+    Execute an SQL query that modifies the database.
+
+    Parameters:
+        query (str): The SQL query to be executed.
+        parameters (tuple | None): Optional values for
+            parameterized SQL queries.
+
+    Returns:
+        aiomysql.Cursor | None:
+            The (closed) cursor after execution, for rowcount and
+            lastrowid, or None if an error occurs.
+    """
+    if campusEwallet_db.using_sqlite():
+        async with _sqlite_turn():
+            return campusEwallet_db.execute_query(query, parameters)
+
+    try:
+        pool = await init_pool()
+        async with pool.acquire() as database:
+            async with database.cursor() as cursor:
+                await cursor.execute(query, parameters)
+        return cursor
+
+    except Exception as e:
+        print(f"An error occured while executing SQL query: {e}")
+        return None
+
+
+async def fetch_one(query, parameters=None):
+    """
+    Fetch a single record from the database.
+
+    Parameters:
+        query (str): The SQL SELECT query to be executed.
+        parameters (tuple | None): Optional values for
+            parameterized SQL queries.
+
+    Returns:
+        dict | None:
+            A dictionary representing one database record,
+            or None if no record is found or an error occurs.
+    """
+    if campusEwallet_db.using_sqlite():
+        async with _sqlite_turn():
+            return campusEwallet_db.fetch_one(query, parameters)
+
+    try:
+        pool = await init_pool()
+        async with pool.acquire() as database:
+            async with database.cursor() as cursor:
+                await cursor.execute(query, parameters)
+                return await cursor.fetchone()
+
+    except Exception as e:
+        print(f"An error occured while retrieving data from the database: {e}")
+        return None
+
+
+async def fetch_all(query, parameters=None):
+    """
+    Fetch multiple records from the database.
+
+    Parameters:
+        query (str): The SQL SELECT query to be executed.
+        parameters (tuple | None): Optional values for
+            parameterized SQL queries.
+
+    Returns:
+        list[dict] | None:
+            A list of dictionaries containing database records,
+            or None if an error occurs.
+    """
+    if campusEwallet_db.using_sqlite():
+        async with _sqlite_turn():
+            return campusEwallet_db.fetch_all(query, parameters)
+
+    try:
+        pool = await init_pool()
+        async with pool.acquire() as database:
+            async with database.cursor() as cursor:
+                await cursor.execute(query, parameters)
+                return list(await cursor.fetchall())
+
+    except Exception as e:
+        print(f"An error occured while retrieving data from the database: {e}")
+        return None
+
+
+@asynccontextmanager
+async def transaction():
+    """
+    Run several SQL statements atomically on one pooled connection.
+
+    Usage:
+        async with transaction() as cursor:
+            await cursor.execute(query, parameters)
+
+    Yields:
+        aiomysql.DictCursor: Cursor bound to the open transaction.
+
+    Raises:
+        Exception: If the pool cannot be created or any statement inside
+            the block fails; the transaction is rolled back first.
+    """
+    if campusEwallet_db.using_sqlite():
+        async with _sqlite_turn():
+            with campusEwallet_db.transaction() as cursor:
+                yield _SQLiteAsyncCursor(cursor)
+        return
+
+    pool = await init_pool()
+    async with pool.acquire() as database:
+        async with database.cursor() as cursor:
+            try:
+                await database.begin()
+                yield cursor
+                await database.commit()
+            except BaseException:
+                # Also roll back when the awaiting task is cancelled
+                try:
+                    await database.rollback()
+                except Exception as e:
+                    print(f"Rollback failed: {e}")
+                raise
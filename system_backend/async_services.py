@@ -0,0 +1,507 @@
+"""
+Async Services Module
+
+This module provides asyncio versions of the wallet services, so a single
+service process can serve thousands of concurrent sessions on one event
+loop: AsyncStudentWallet, AsyncOrganizationWallet, AsyncFinanceAdminWallet
+and AsyncLoginSystem.
+
+How it works:
+- Session-facing operations (login, balances, transfers, cash-in and
+  cash-out requests, request lists, transaction history, cash-in approval)
+  are native coroutines on async_db. They reuse the statements, query
+  builders and result helpers of the synchronous classes, so both versions
+  return the same data and enforce the same checks
+- CPU-bound work (bcrypt) and every other method of the synchronous class
+  (receipts, statements, bill posting, analytics, ...) run the synchronous
+  implementation on one shared executor of BLOCKING_WORKERS threads, so
+  the thread count stays fixed however many sessions are open:
+      pdf = await wallet.generate_receipts_pdf(start, end, path)
+- Post-commit side effects (spending cache invalidation, fraud scoring)
+  are the same in-memory calls the synchronous services make
+
+Usage:
+    wallet = await AsyncStudentWallet.create(user_id)
+    ok, result = await wallet.send_money("2023-00123", 50)
+
+Dependencies:
+- async_db for database access
+- students_wallet, organization_wallet, finance_admin_wallet and login for
+  the shared SQL and the synchronous fallbacks
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from system_backend import async_db
+from system_backend.students_wallet import (
+    StudentWallet, WALLET_BALANCE, INSERT_CASHIN_REQUEST, generate_request_id
+)
+from system_backend.organization_wallet import (
+    OrganizationWallet, ORG_WALLET_BALANCE, ORG_WALLET_LOOKUP, HOLD_CASH_OUT, INSERT_CASH_OUT_REQUEST
+)
+from system_backend.finance_admin_wallet import (
+    FinanceAdminWallet, APPROVE_CASHIN, DECLINE_CASHIN, CASHIN_REQUEST_AMOUNT, CREDIT_WALLET
+)
+from system_backend.login import LoginSystem, FIND_USER, RESET_FAILED_ATTEMPTS, INCREMENT_FAILED_ATTEMPTS
+from system_backend.transfers import transfer_funds_async, InsufficientBalance
+from system_backend.receiver_cache import lookup_receiver_async
+from system_backend.spending_analytics import invalidate_spending_analytics
+from system_backend.fraud_detection import check_transfer
+
+
+BLOCKING_WORKERS = 8
+
+_blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="async-services")
+
+STUDENT_PROFILE = """
+    SELECT wu.student_id, es.name
+    FROM wallet_users wu
+    LEFT JOIN enrolled_students es ON es.student_id = wu.student_id
+    WHERE wu.user_id = %s
+"""
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking call on the shared executor without blocking the event loop.
+
+    Parameters:
+        func (callable): Synchronous function to run.
+        *args, **kwargs: Arguments passed to func.
+
+    Returns:
+        Whatever func returns.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, functools.partial(func, *args, **kwargs))
+
+
+class _BlockingFallback:
+    """
+    Expose the public methods of the synchronous service that have no
+    native coroutine as coroutines run on the blocking executor.
+    """
+
+    _sync_class = None
+
+    def _sync_service(self):
+        """Return the synchronous service instance the fallbacks call into."""
+        raise NotImplementedError
+
+    def __getattr__(self, name):
+        if name.startswith("_") or not callable(getattr(self._sync_class, name, None)):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        def call_sync(*args, **kwargs):
+            return getattr(self._sync_service(), name)(*args, **kwargs)
+
+        async def call(*args, **kwargs):
+            return await run_blocking(call_sync, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+
+class AsyncStudentWallet(_BlockingFallback):
+    """
+    Asyncio version of StudentWallet.
+
+    Attributes:
+        user_id (int): Wallet user ID.
+        student_id (str): Linked student ID (if available).
+        student_name (str): Name of the student.
+    """
+
+    _sync_class = StudentWallet
+
+    def __init__(self, user_id, student_id=None, student_name=None):
+        """
+        Use AsyncStudentWallet.create() to load the student's details.
+
+        Parameters:
+            user_id (int): Wallet user ID.
+            student_id (str, optional): Linked student ID.
+            student_name (str, optional): Name of the student.
+        """
+        self.user_id = user_id
+        self.student_id = student_id
+        self.student_name = student_name
+        self._sync = None
+
+    @classmethod
+    async def create(cls, user_id):
+        """
+        Create a wallet and load the linked student's ID and name.
+
+        Parameters:
+            user_id (int): Wallet user ID.
+
+        Returns:
+            AsyncStudentWallet: The wallet.
+        """
+        row = await async_db.fetch_one(STUDENT_PROFILE, (user_id,))
+        wallet = cls(user_id, row["student_id"] if row else None, row["name"] if row else None)
+        if not wallet.student_name:
+            print(f"Warning: Name not found for User ID {user_id}")
+        return wallet
+
+    def _sync_service(self):
+        if self._sync is None:
+            self._sync = StudentWallet(self.user_id)
+        return self._sync
+
+    async def display_balance(self):
+        """
+        Fetch the current balance of the user's wallet.
+
+        Returns:
+            float: Wallet balance, 0.0 if not found or on error.
+        """
+        row = await async_db.fetch_one(WALLET_BALANCE, (self.user_id,))
+        return float(row["balance"]) if row and row["balance"] is not None else 0.0
+
+    async def get_balance(self):
+        """
+        Get the wallet balance (wrapper for display_balance).
+
+        Returns:
+            float: Wallet balance.
+        """
+        return await self.display_balance()
+
+    async def send_money(self, receiver_identifier, amount, message=None):
+        """
+        Send money from the user's wallet to another student or office.
+
+        Parameters:
+            receiver_identifier (str): Receiver's student or office ID.
+            amount (float or str): Amount to transfer.
+            message (str, optional): Optional message for the transaction.
+
+        Returns:
+            tuple: (bool, dict/str) As StudentWallet.send_money.
+        """
+        try:
+            amount = float(amount)
+        except (TypeError, ValueError):
+            return False, "Invalid amount format."
+
+        if amount <= 0:
+            return False, "Amount must be greater than zero."
+
+        try:
+            sender_wallet = await async_db.fetch_one(WALLET_BALANCE, (self.user_id,))
+            if not sender_wallet:
+                return False, "Sender wallet not found in the system."
+            if sender_wallet["balance"] < amount:
+                return False, "Insufficient balance."
+
+            receiver = await lookup_receiver_async(receiver_identifier)
+            if not receiver:
+                return False, "Receiver not found with the provided identifier."
+            if receiver["user_id"] == self.user_id:
+                return False, "Cannot send money to yourself."
+            if not receiver["wallet_exists"]:
+                return False, "Receiver wallet does not exist."
+
+            try:
+                async with async_db.transaction() as cursor:
+                    trx_id = await transfer_funds_async(cursor, self.user_id, receiver["user_id"], amount, message)
+            except InsufficientBalance as e:
+                return False, str(e)
+
+            invalidate_spending_analytics(self.user_id)
+            invalidate_spending_analytics(receiver["user_id"])
+            check_transfer(trx_id, self.user_id, receiver["user_id"], amount)
+            return True, StudentWallet._transfer_result(self, trx_id, receiver, amount, message)
+
+        except Exception as e:
+            print(f"FATAL ERROR in send_money: {e}")
+            return False, f"A system error occurred during the transfer: {str(e)}"
+
+    async def request_funds(self, amount):
+        """
+        Submit a cash-in request for the user's wallet.
+
+        Parameters:
+            amount (float or str): Amount requested.
+
+        Returns:
+            tuple: (bool, dict/str) As StudentWallet.request_funds.
+        """
+        try:
+            amount = float(amount)
+        except (TypeError, ValueError):
+            return False, "Invalid amount format."
+
+        if amount <= 0:
+            return False, "Amount must be greater than zero."
+
+        request_id = generate_request_id()
+        ok = await async_db.execute_query(INSERT_CASHIN_REQUEST, (request_id, self.user_id, amount))
+        if not ok:
+            return False, "Database error while submitting cash-in request."
+
+        return True, {
+            "request_id": request_id,
+            "user_id": self.user_id,
+            "amount": amount,
+            "status": "pending"
+        }
+
+    async def view_cashin_requests(self, search_id=None, status_filter=None):
+        """
+        Retrieve cash-in requests for the user, optionally filtered by ID or status.
+
+        Returns:
+            list: List of cash-in requests.
+        """
+        query, params = StudentWallet._cashin_requests_query(self, search_id, status_filter)
+        return await async_db.fetch_all(query, params)
+
+    async def view_posted_bills(self, bill_id_search=None):
+        """
+        List the posted bills the user has not paid yet (see StudentWallet.view_posted_bills).
+
+        Returns:
+            list: Bill dictionaries.
+        """
+        query, params = StudentWallet._posted_bills_query(self, bill_id_search)
+        return await async_db.fetch_all(query, params)
+
+    async def view_transactions(self, start_date=None, end_date=None):
+        """
+        View the user's transactions, optionally by date range
+        (see StudentWallet.view_transactions).
+
+        Returns:
+            list: Transaction dictionaries, newest first.
+        """
+        if start_date:
+            # May read the archive horizon, which is a blocking (if cached) lookup
+            query, params = await run_blocking(StudentWallet._transactions_query, self, start_date, end_date)
+        else:
+            query, params = StudentWallet._transactions_query(self, start_date, end_date)
+        return await async_db.fetch_all(query, params)
+
+
+class AsyncOrganizationWallet(_BlockingFallback):
+    """
+    Asyncio version of OrganizationWallet. Shares the resolved-wallet cache
+    with the synchronous class.
+
+    Attributes:
+        student_id (str): ID of the treasurer.
+        org_wallet_id (int): Organization wallet, once loaded.
+    """
+
+    _sync_class = OrganizationWallet
+
+    def __init__(self, student_id):
+        self.student_id = str(student_id).strip()
+        self.org_wallet_id = None
+        self._sync = None
+
+    def _sync_service(self):
+        if self._sync is None:
+            self._sync = OrganizationWallet(self.student_id)
+        return self._sync
+
+    async def _load_org_wallet(self):
+        """Load the treasurer's wallet info, as OrganizationWallet._load_org_wallet."""
+        cached = OrganizationWallet._cached_wallet_info(self)
+        if cached:
+            balance_row = await async_db.fetch_one(
+                ORG_WALLET_BALANCE, (cached["org_wallet_id"], self.student_id)
+            )
+            row = OrganizationWallet._with_balance(self, cached, balance_row)
+            if row:
+                return row
+
+        row = await async_db.fetch_one(ORG_WALLET_LOOKUP, (self.student_id,))
+        return OrganizationWallet._remember_wallet(self, row)
+
+    async def display_balance(self):
+        """
+        Return basic info about the organization wallet, including balance.
+
+        Returns:
+            dict or None: As OrganizationWallet.display_balance.
+        """
+        return OrganizationWallet._balance_summary(await self._load_org_wallet())
+
+    async def get_balance(self):
+        """
+        Return the organization wallet balance for the current student.
+
+        Returns:
+            float or None: Wallet balance. None if wallet cannot be loaded.
+        """
+        info = await self.display_balance()
+        return float(info["balance"]) if info else None
+
+    async def request_cash_out(self, amount, message=None):
+        """
+        Submit a cash-out request and hold the amount on the wallet.
+
+        Returns:
+            tuple: (bool, str) Status and feedback message.
+        """
+        if not self.org_wallet_id:
+            if not await self._load_org_wallet():
+                return False, "Organization wallet not found."
+
+        try:
+            amount = float(amount)
+        except (TypeError, ValueError):
+            return False, "Invalid amount."
+
+        if amount <= 0:
+            return False, "Amount must be greater than zero."
+
+        request_id = generate_request_id()
+        try:
+            async with async_db.transaction() as cursor:
+                await cursor.execute(HOLD_CASH_OUT, (amount, self.org_wallet_id, amount))
+                if cursor.rowcount == 0:
+                    return False, "Insufficient available balance. Funds held by pending cash-outs cannot be requested again."
+                await cursor.execute(INSERT_CASH_OUT_REQUEST, (request_id, self.org_wallet_id, amount, message))
+
+        except Exception as e:
+            print(f"Database Error in request_cash_out: {e}")
+            return False, "Failed to submit cash-out request."
+
+        return True, f"Cash-out request submitted. ID: {request_id}"
+
+    async def view_cash_out_requests(self, request_id_search=None, status_filter=None):
+        """
+        View the organization's cash-out requests, optionally filtered.
+
+        Returns:
+            list: List of cash-out request dictionaries.
+        """
+        if not self.org_wallet_id:
+            if not await self._load_org_wallet():
+                return []
+
+        query, params = OrganizationWallet._cash_out_requests_query(self, request_id_search, status_filter)
+        return await async_db.fetch_all(query, params)
+
+
+class AsyncFinanceAdminWallet(_BlockingFallback):
+    """Asyncio version of FinanceAdminWallet; use an instance."""
+
+    _sync_class = FinanceAdminWallet
+
+    def _sync_service(self):
+        return FinanceAdminWallet
+
+    @staticmethod
+    async def get_all_cashin_requests(search=None, status_filter="pending"):
+        """
+        Retrieve all cash-in requests with optional search and status filter.
+
+        Returns:
+            tuple: (bool, list of requests or error message)
+        """
+        query, params = FinanceAdminWallet._cashin_requests_query(search, status_filter)
+        results = await async_db.fetch_all(query, params)
+        if results is None:
+            return False, "Unable to load cash-in requests."
+        return True, results
+
+    @staticmethod
+    async def get_all_cashout_requests(search=None, status_filter="pending"):
+        """
+        Retrieve all cash-out requests with optional search and status filter.
+
+        Returns:
+            tuple: (bool, list of requests or error message)
+        """
+        query, params = FinanceAdminWallet._cashout_requests_query(search, status_filter)
+        results = await async_db.fetch_all(query, params)
+        if results is None:
+            return False, "Unable to load cash-out requests."
+        return True, FinanceAdminWallet._fill_missing_names(results)
+
+    @staticmethod
+    async def approve_cashin_request(request_id, admin_user_id):
+        """
+        Approve a pending cash-in request and credit the user's wallet.
+
+        Returns:
+            tuple: (bool, str) Status and message.
+        """
+        try:
+            async with async_db.transaction() as cursor:
+                await cursor.execute(APPROVE_CASHIN, (request_id, admin_user_id))
+                if cursor.rowcount == 0:
+                    return False, "Cash-In request not found, already processed, or claimed by another admin."
+
+                await cursor.execute(CASHIN_REQUEST_AMOUNT, (request_id,))
+                request = await cursor.fetchone()
+                await cursor.execute(CREDIT_WALLET, (request["amount"], request["user_id"]))
+
+            invalidate_spending_analytics(request["user_id"])
+            return True, "Cash-In request approved and wallet balance updated."
+
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    async def decline_cashin_request(request_id, reason=None, admin_user_id=None):
+        """
+        Decline a pending cash-in request.
+
+        Returns:
+            tuple: (bool, str) Status and message.
+        """
+        cursor = await async_db.execute_query(DECLINE_CASHIN, (reason, request_id, admin_user_id))
+        if cursor is None:
+            return False, "Unable to reject the Cash-In request."
+        if cursor.rowcount == 0:
+            return False, "Cash-In request not found, already processed, or claimed by another admin."
+        return True, "Cash-In request rejected."
+
+
+class AsyncLoginSystem(_BlockingFallback):
+    """
+    Asyncio version of LoginSystem. Login is native; bcrypt runs on the
+    blocking executor. The password reset flow (which sends email) uses
+    the synchronous implementation.
+    """
+
+    _sync_class = LoginSystem
+
+    def __init__(self):
+        self._sync = LoginSystem()
+
+    def _sync_service(self):
+        return self._sync
+
+    async def login(self, input_id, password):
+        """
+        Attempt user login with ID and password.
+
+        Returns:
+            dict: Result with keys 'ok', 'msg', and optionally 'data',
+                as LoginSystem.login.
+        """
+        user = await async_db.fetch_one(FIND_USER, (input_id, input_id))
+        if not user:
+            return {"ok": False, "msg": "Invalid ID or password."}
+
+        locked, secs, expired = self._sync._lock_status(user)
+        if expired:
+            await async_db.execute_query(RESET_FAILED_ATTEMPTS, (user["user_id"],))
+        if locked:
+            return {"ok": False, "msg": f"Account locked. Try again in {secs} seconds."}
+
+        if await run_blocking(self._sync._check_password, password, user["user_password"]):
+            await async_db.execute_query(RESET_FAILED_ATTEMPTS, (user["user_id"],))
+            return self._sync._login_success(user)
+
+        await async_db.execute_query(INCREMENT_FAILED_ATTEMPTS, (user["user_id"],))
+        refreshed = await async_db.fetch_one(FIND_USER, (input_id, input_id))
+        return self._sync._login_failure(refreshed)
@@ -0,0 +1,319 @@
+"""
+Benchmarks Module
+
+This module times the wallet hot paths (sending money, paying bills,
+histories, login, cash-in approval and the finance admin searches) on a
+seeded dataset, so performance changes between commits show up as numbers
+instead of impressions.
+
+How it works:
+- The benchmarks run on the SQLite backend (see sqlite_backend), in memory
+  by default, so no MySQL server is needed and runs are repeatable
+- data_generator.generate_dataset() fills the database with a
+  configurable number of students, organizations, bills, past
+  transactions and cash-in / cash-out requests, deterministically from a
+  seed
+- Every case is warmed up, then called a fixed number of times through
+  the real backend classes; calls that report a failure are counted as
+  errors
+- Results (median, p95, mean, min, max and calls per second per case) are
+  written to a JSON file together with the commit, dataset size and
+  settings they were measured with
+- compare_results() lines up two result files and flags the cases whose
+  median got slower than a threshold
+
+Usage:
+    python -m system_backend.benchmarks run --students 5000 --iterations 200
+    python -m system_backend.benchmarks run --cases send_money,login --output before.json
+    python -m system_backend.benchmarks compare before.json after.json --threshold 0.1
+
+Dependencies:
+- campusEwallet_db for the SQLite backend and bulk inserts
+- students_wallet, finance_admin_wallet and login for the benchmarked calls
+- data_generator for the seeded dataset
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime
+
+from system_backend import campusEwallet_db
+from system_backend.data_generator import DEFAULT_PASSWORD, generate_dataset
+from system_backend.finance_admin_wallet import FinanceAdminWallet
+from system_backend.login import LoginSystem
+from system_backend.students_wallet import StudentWallet
+
+
+DEFAULT_STUDENTS = 1000
+DEFAULT_ORGANIZATIONS = 20
+DEFAULT_BILLS_PER_ORG = 5
+DEFAULT_TRANSACTIONS_PER_STUDENT = 20
+DEFAULT_CASHOUTS_PER_ORG = 3
+DEFAULT_ITERATIONS = 100
+DEFAULT_WARMUP = 10
+DEFAULT_SEED = 48
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_RESULTS_DIR = "benchmark_results"
+
+# Large opening balances so the timed payments never run out of funds
+OPENING_BALANCE_CENTS = 10000000
+
+# Wallet objects are created once per sampled user, like a UI session
+SESSION_SAMPLE_SIZE = 50
+
+
+def _succeeded(result):
+    """Tell whether a backend call reported success."""
+    if isinstance(result, tuple) and result and isinstance(result[0], bool):
+        return result[0]
+    if isinstance(result, dict) and "ok" in result:
+        return bool(result["ok"])
+    return result is not None
+
+
+def _build_cases(dataset, rng):
+    """
+    Return the benchmark cases for a seeded dataset.
+
+    Returns:
+        dict: {name: callable(iteration)} in reporting order.
+    """
+    sample = rng.sample(dataset["user_ids"], min(SESSION_SAMPLE_SIZE, len(dataset["user_ids"])))
+    sessions = {user_id: StudentWallet(user_id) for user_id in sample}
+    student_ids = dataset["student_ids"]
+    bill_ids = dataset["bill_ids"]
+    pending = list(dataset["pending_cashin_ids"])
+    login = LoginSystem()
+
+    def wallet(iteration):
+        return sessions[sample[iteration % len(sample)]]
+
+    return {
+        "send_money": lambda i: wallet(i).send_money(rng.choice(student_ids), 1, "Benchmark"),
+        "pay_organization_bill": lambda i: wallet(i).pay_organization_bill(rng.choice(bill_ids)),
+        "view_transactions": lambda i: wallet(i).view_transactions(),
+        "view_posted_bills": lambda i: wallet(i).view_posted_bills(),
+        "login": lambda i: login.login(rng.choice(student_ids), DEFAULT_PASSWORD),
+        "approve_cashin_request": lambda i: FinanceAdminWallet.approve_cashin_request(pending.pop(), 0),
+        "admin_search_cashin": lambda i: FinanceAdminWallet.get_all_cashin_requests(
+            search=rng.choice(student_ids)[:8], status_filter="all"),
+        "admin_search_cashout": lambda i: FinanceAdminWallet.get_all_cashout_requests(
+            search=rng.choice(dataset["organization_names"])[:7], status_filter="all"),
+        "admin_search_transactions": lambda i: FinanceAdminWallet.get_all_transactions(
+            search=f"-{rng.randrange(1, dataset['transactions'] + 1):09d}"),
+    }
+
+
+CASES = ["send_money", "pay_organization_bill", "view_transactions", "view_posted_bills", "login",
+         "approve_cashin_request", "admin_search_cashin", "admin_search_cashout", "admin_search_transactions"]
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _summarize(durations, errors):
+    """Turn per-call durations (seconds) into the reported statistics."""
+    ordered = sorted(durations)
+    total = sum(ordered)
+    return {
+        "calls": len(ordered),
+        "errors": errors,
+        "median_ms": _percentile(ordered, 0.5) * 1000,
+        "p95_ms": _percentile(ordered, 0.95) * 1000,
+        "mean_ms": total / len(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "ops_per_sec": len(ordered) / total if total else 0.0,
+    }
+
+
+def _current_commit():
+    """Return the commit of the checkout holding this module, or None outside git."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(students=DEFAULT_STUDENTS, organizations=DEFAULT_ORGANIZATIONS,
+                   bills_per_org=DEFAULT_BILLS_PER_ORG, transactions_per_student=DEFAULT_TRANSACTIONS_PER_STUDENT,
+                   iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, cases=None, seed=DEFAULT_SEED,
+                   db_path=":memory:", password_rounds=12):
+    """
+    Seed a fresh SQLite database and time the selected cases on it.
+
+    Parameters:
+        students, organizations, bills_per_org, transactions_per_student:
+            Dataset size, see data_generator.generate_dataset.
+        iterations (int): Timed calls per case.
+        warmup (int): Untimed calls per case before timing.
+        cases (list[str] | None): Case names to run; all of CASES if None.
+        seed (int): Random seed for the dataset and the call arguments.
+        db_path (str): SQLite file to build the dataset in, or ":memory:".
+        password_rounds (int): bcrypt cost of the seeded passwords.
+
+    Returns:
+        dict: The result document written by save_results.
+
+    Raises:
+        ValueError: If an unknown case is requested or db_path already
+            holds data.
+    """
+    selected = list(cases) if cases else list(CASES)
+    unknown = [name for name in selected if name not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark case(s): {', '.join(unknown)}")
+
+    campusEwallet_db.use_sqlite(db_path)
+    if campusEwallet_db.fetch_one("SELECT COUNT(*) AS n FROM wallet_users")["n"]:
+        raise ValueError(f"{db_path} already holds data; benchmarks need an empty database.")
+
+    pending = warmup + iterations if "approve_cashin_request" in selected else 0
+    dataset = generate_dataset(
+        students=students, organizations=organizations, bills_per_org=bills_per_org,
+        transactions=students * transactions_per_student, cashin_requests=pending,
+        cashout_requests_per_org=DEFAULT_CASHOUTS_PER_ORG, cashin_status_mix={"pending": 1.0},
+        opening_balance_cents=OPENING_BALANCE_CENTS, password_rounds=password_rounds,
+        seed=seed, history_days=90,
+    )
+    rng = random.Random(seed)
+
+    results = {}
+    # The backend prints debug lines on some paths; keep them out of the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        available = _build_cases(dataset, rng)
+        for name in selected:
+            call = available[name]
+            for iteration in range(warmup):
+                call(iteration)
+
+            durations, errors = [], 0
+            for iteration in range(iterations):
+                started = time.perf_counter()
+                result = call(iteration)
+                durations.append(time.perf_counter() - started)
+                if not _succeeded(result):
+                    errors += 1
+            results[name] = _summarize(durations, errors)
+
+    return {
+        "run_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": f"sqlite:{db_path}",
+        "settings": {"iterations": iterations, "warmup": warmup, "seed": seed, "password_rounds": password_rounds},
+        "dataset": {key: dataset[key] for key in ("students", "organizations", "bills", "transactions",
+                                                   "bill_payments", "cashin_requests")},
+        "results": results,
+    }
+
+
+def save_results(document, path=None):
+    """
+    Write a result document as JSON.
+
+    Parameters:
+        document (dict): Result of run_benchmarks.
+        path (str | None): Output file; defaults to
+            benchmark_results/<commit>-<timestamp>.json.
+
+    Returns:
+        str: The path written.
+    """
+    if path is None:
+        stamp = document["run_at"].replace(":", "").replace("-", "")
+        path = os.path.join(DEFAULT_RESULTS_DIR, f"{document['commit'] or 'local'}-{stamp}.json")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=2)
+    return path
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare the medians of two result documents.
+
+    Parameters:
+        baseline (dict): Earlier result document.
+        current (dict): Newer result document.
+        threshold (float): Relative slowdown reported as a regression
+            (0.10 = 10% slower median).
+
+    Returns:
+        list[dict]: One row per case present in both documents, with
+            "case", "baseline_ms", "current_ms", "change" (relative) and
+            "regression" (bool).
+    """
+    rows = []
+    for name, stats in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        change = (stats["median_ms"] - before["median_ms"]) / before["median_ms"] if before["median_ms"] else 0.0
+        rows.append({
+            "case": name,
+            "baseline_ms": before["median_ms"],
+            "current_ms": stats["median_ms"],
+            "change": change,
+            "regression": change > threshold,
+        })
+    return rows
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the wallet hot paths on a seeded SQLite database.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--students", type=int, default=DEFAULT_STUDENTS)
+    run_parser.add_argument("--organizations", type=int, default=DEFAULT_ORGANIZATIONS)
+    run_parser.add_argument("--bills-per-org", type=int, default=DEFAULT_BILLS_PER_ORG)
+    run_parser.add_argument("--transactions-per-student", type=int, default=DEFAULT_TRANSACTIONS_PER_STUDENT)
+    run_parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    run_parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    run_parser.add_argument("--cases", default=None, help=f"Comma-separated subset of: {', '.join(CASES)}")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--db", default=":memory:", help="SQLite file to build the dataset in.")
+    run_parser.add_argument("--password-rounds", type=int, default=12, help="bcrypt cost of the seeded passwords.")
+    run_parser.add_argument("--output", default=None, help="Result file (JSON).")
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        document = run_benchmarks(
+            args.students, args.organizations, args.bills_per_org, args.transactions_per_student,
+            args.iterations, args.warmup, args.cases.split(",") if args.cases else None, args.seed, args.db,
+            args.password_rounds,
+        )
+        for case, stats in document["results"].items():
+            print(f"{case:28} median {stats['median_ms']:8.3f} ms   p95 {stats['p95_ms']:8.3f} ms   "
+                  f"{stats['ops_per_sec']:9.1f} ops/s   errors {stats['errors']}")
+        print(f"Results written to {save_results(document, args.output)}")
+    else:
+        rows = compare_results(_load(args.baseline), _load(args.current), args.threshold)
+        for row in rows:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['case']:28} {row['baseline_ms']:8.3f} -> {row['current_ms']:8.3f} ms "
+                  f"({row['change']:+.1%}){flag}")
+        if any(row["regression"] for row in rows):
+            raise SystemExit(1)
@@ -0,0 +1,218 @@
+"""
+Bill Collection Module
+
+This module maintains the read model behind the organization bill
+collection views. Instead of re-joining every payment for every bill,
+two small tables are kept up to date as payments happen:
+
+- organization_bill_stats: one row per bill with the number of payments,
+  the total collected, and the latest payment
+- organization_bill_payers: one row per payment, keyed by
+  (bill_id, paid_at, transaction_id) so a bill's payer roster can be paged
+  with an index range scan
+
+Both tables are written by record_bill_payment() inside the same database
+transaction as the bill payment itself. If they ever drift (e.g. after a
+manual fix in the transactions table), rebuild_bill_collection() recreates
+them from the transactions history.
+
+Usage:
+    python -m system_backend.bill_collection rebuild [--bill-id BILL_ID]
+
+Dependencies:
+- campusEwallet_db for database queries and transactions
+"""
+
+import argparse
+from datetime import datetime
+from system_backend.campusEwallet_db import fetch_all, transaction
+from system_backend.transaction_archive import transactions_source
+
+
+DEFAULT_ROSTER_PAGE_SIZE = 50
+MAX_ROSTER_PAGE_SIZE = 500
+
+
+def record_bill_payment(cursor, transaction_id, org_wallet_id):
+    """
+    Add a completed bill payment to the collection read model.
+
+    Must be called with the cursor of the transaction that inserted the
+    payment row so the aggregate commits or rolls back together with it.
+
+    Parameters:
+        cursor: Cursor bound to the open payment transaction.
+        transaction_id (str): ID of the inserted 'Bill Payment' transaction.
+        org_wallet_id (int): Organization wallet that received the payment.
+    """
+    cursor.execute("""
+        INSERT INTO organization_bill_payers
+            (bill_id, paid_at, transaction_id, user_id, amount)
+        SELECT bill_id, created_at, transaction_id, sender_id, amount
+        FROM transactions
+        WHERE transaction_id = %s
+    """, (transaction_id,))
+
+    cursor.execute("""
+        INSERT INTO organization_bill_stats
+            (bill_id, org_wallet_id, paid_count, total_collected,
+             last_payment_at, last_transaction_id)
+        SELECT bill_id, %s, 1, amount, created_at, transaction_id
+        FROM transactions
+        WHERE transaction_id = %s
+        ON DUPLICATE KEY UPDATE
+            paid_count = paid_count + 1,
+            total_collected = total_collected + VALUES(total_collected),
+            last_payment_at = VALUES(last_payment_at),
+            last_transaction_id = VALUES(last_transaction_id)
+    """, (org_wallet_id, transaction_id))
+
+
+def get_collection_progress(org_wallet_id, bill_id=None):
+    """
+    Return collection progress for an organization's bills.
+
+    Parameters:
+        org_wallet_id (int): Organization wallet that posted the bills.
+        bill_id (int, optional): Only return progress for this bill.
+
+    Returns:
+        list: Bills with paid_count, total_collected and last payment info.
+    """
+    query = """
+        SELECT ob.bill_id, ob.title, ob.amount,
+               COALESCE(s.paid_count, 0) AS paid_count,
+               COALESCE(s.total_collected, 0) AS total_collected,
+               s.last_payment_at, s.last_transaction_id
+        FROM organization_bills ob
+        LEFT JOIN organization_bill_stats s ON s.bill_id = ob.bill_id
+        WHERE ob.org_wallet_id = %s
+    """
+    params = [org_wallet_id]
+
+    if bill_id is not None:
+        query += " AND ob.bill_id = %s"
+        params.append(bill_id)
+
+    query += " ORDER BY ob.bill_id DESC"
+    return fetch_all(query, tuple(params)) or []
+
+
+def get_bill_payers(org_wallet_id, bill_id, page_size=DEFAULT_ROSTER_PAGE_SIZE, after=None):
+    """
+    Return one page of a bill's payer roster, newest payment first.
+
+    Pages are addressed with a keyset cursor instead of OFFSET so every
+    page costs the same regardless of how deep the roster is.
+
+    Parameters:
+        org_wallet_id (int): Organization wallet that owns the bill.
+        bill_id (int): Bill to list payers for.
+        page_size (int): Number of payers per page.
+        after (tuple, optional): The next_cursor returned by the previous page.
+
+    Returns:
+        dict: {"payers": list, "next_cursor": tuple or None}
+    """
+    page_size = max(1, min(int(page_size), MAX_ROSTER_PAGE_SIZE))
+
+    query = """
+        SELECT p.transaction_id, p.paid_at, p.amount,
+               wu.student_id, es.name AS student_name
+        FROM organization_bill_payers p
+        JOIN organization_bills ob ON ob.bill_id = p.bill_id
+        JOIN wallet_users wu ON wu.user_id = p.user_id
+        LEFT JOIN enrolled_students es ON es.student_id = wu.student_id
+        WHERE p.bill_id = %s AND ob.org_wallet_id = %s
+    """
+    params = [bill_id, org_wallet_id]
+
+    if after:
+        paid_at, transaction_id = after
+        query += " AND (p.paid_at < %s OR (p.paid_at = %s AND p.transaction_id < %s))"
+        params.extend([paid_at, paid_at, transaction_id])
+
+    # Fetch one extra row to know whether another page exists
+    query += " ORDER BY p.paid_at DESC, p.transaction_id DESC LIMIT %s"
+    params.append(page_size + 1)
+
+    rows = fetch_all(query, tuple(params)) or []
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = (rows[-1]["paid_at"], rows[-1]["transaction_id"])
+
+    return {"payers": rows, "next_cursor": next_cursor}
+
+
+def rebuild_bill_collection(bill_id=None):
+    """
+    Recreate the collection read model from the transactions history,
+    including archived months.
+
+    Parameters:
+        bill_id (int, optional): Only rebuild this bill. Rebuilds every
+            bill when omitted.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    bill_filter = ""
+    params = ()
+    if bill_id is not None:
+        bill_filter = " AND t.bill_id = %s"
+        params = (bill_id,)
+
+    try:
+        with transaction() as cursor:
+            if bill_id is None:
+                cursor.execute("DELETE FROM organization_bill_payers")
+                cursor.execute("DELETE FROM organization_bill_stats")
+            else:
+                cursor.execute("DELETE FROM organization_bill_payers WHERE bill_id = %s", params)
+                cursor.execute("DELETE FROM organization_bill_stats WHERE bill_id = %s", params)
+
+            cursor.execute("""
+                INSERT INTO organization_bill_payers
+                    (bill_id, paid_at, transaction_id, user_id, amount)
+                SELECT t.bill_id, t.created_at, t.transaction_id, t.sender_id, t.amount
+                FROM """ + transactions_source(datetime.min, alias="t") + """
+                WHERE t.transaction_type = 'Bill Payment'
+                  AND t.status = 'completed'
+                  AND t.bill_id IS NOT NULL
+            """ + bill_filter, params)
+
+            cursor.execute("""
+                INSERT INTO organization_bill_stats
+                    (bill_id, org_wallet_id, paid_count, total_collected,
+                     last_payment_at, last_transaction_id)
+                SELECT ob.bill_id, ob.org_wallet_id, COUNT(*), SUM(p.amount), MAX(p.paid_at),
+                       (SELECT p2.transaction_id
+                        FROM organization_bill_payers p2
+                        WHERE p2.bill_id = ob.bill_id
+                        ORDER BY p2.paid_at DESC, p2.transaction_id DESC
+                        LIMIT 1)
+                FROM organization_bill_payers p
+                JOIN organization_bills ob ON ob.bill_id = p.bill_id
+                WHERE 1=1
+            """ + bill_filter.replace("t.bill_id", "p.bill_id") + """
+                GROUP BY ob.bill_id, ob.org_wallet_id
+            """, params)
+
+    except Exception as e:
+        print(f"Database Error in rebuild_bill_collection: {e}")
+        return False, f"Failed to rebuild bill collection data: {e}"
+
+    if bill_id is None:
+        return True, "Bill collection data rebuilt for all bills."
+    return True, f"Bill collection data rebuilt for bill {bill_id}."
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the bill collection read model.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--bill-id", type=int, default=None, help="Only rebuild this bill.")
+    args = parser.parse_args()
+
+    ok, message = rebuild_bill_collection(args.bill_id)
+    print(message)
@@ -4,32 +4,89 @@ Database Module
 This module provides helper functions for connecting to the MySQL database
 and executing SQL queries. It supports executing write operations
 (INSERT, UPDATE, DELETE) and fetching single or multiple records
-from the database using parameterized queries.
+from the database using parameterized queries. Statements that must
+succeed or fail together can be run inside a single transaction, and
+large result sets can be streamed from a server-side cursor or fetched
+column by column for vectorized processing.
+
+Hot statements can be declared once in a named query registry:
+
+    WALLET_BALANCE = register_query(
+        "wallet.balance", "SELECT balance FROM wallets WHERE user_id = %s")
+    row = fetch_one(WALLET_BALANCE, (user_id,))
+
+How it works:
+- register_query() returns a NamedQuery, a str carrying its registry name,
+  so it can be passed to fetch_one, fetch_all, execute_query or a
+  transaction cursor anywhere plain SQL is accepted
+- Named queries run on a persistent autocommit connection per thread,
+  through a prepared-statement cursor cached per connection and query
+  name: MySQL parses and plans each statement once per connection and
+  later calls only send the parameters
+- Inside transaction() named queries are prepared the same way on the
+  transaction's connection; plain SQL keeps using the text protocol
+- Every named query execution is timed; get_query_timings() reports
+  calls, errors, average and maximum milliseconds per query name
+- use_sqlite() (or CAMPUS_EWALLET_DB=sqlite://...) switches every helper
+  to an in-process SQLite database, see sqlite_backend
 """
 
+from contextlib import contextmanager
+import os
+import threading
+import time
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, InterfaceError, OperationalError
+
+
+class NamedQuery(str):
+    """SQL text declared in the query registry (see register_query)."""
+
+    name = None
+
+
+_registry = {}
+_timings = {}
+_timings_lock = threading.Lock()
+
+# Persistent connection and its prepared cursors, one per thread
+_local = threading.local()
+
+# Connection settings shared with the asyncio layer (see async_db)
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "",
+    "database": "campusewallet_db",
+}
+
+# sqlite:// (in-memory) or sqlite:///path/to/file selects the SQLite backend
+DB_URL_ENV = "CAMPUS_EWALLET_DB"
+
+# SQLite database in use, or None for MySQL
+_sqlite_database = None
+# Bumped on every backend switch so threads drop connections to the old one
+_backend_generation = 0
 
 
 def connect_to_db():
     """
-    Establish a connection to the MySQL database.
+    Establish a connection to the database.
 
     This function attempts to connect to the MySQL database using
-    the configured connection credentials.
+    the configured connection credentials, or to the SQLite database
+    selected with use_sqlite.
 
     Returns:
-        mysql.connector.connection.MySQLConnection | None:
+        mysql.connector.connection.MySQLConnection | SQLiteConnection | None:
             A database connection object if the connection is successful,
             otherwise None if the connection fails.
     """
+    if _sqlite_database is not None:
+        return _sqlite_database.connect()
+
     try:
-        database = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="campusewallet_db"
-        )
+        database = mysql.connector.connect(**DB_CONFIG)
 
         if database.is_connected():
             return database
@@ -39,6 +96,196 @@ def connect_to_db():
         return None
 
 
+def use_sqlite(path=":memory:", create_schema=True):
+    """
+    Run every database helper on an in-process SQLite database.
+
+    Parameters:
+        path (str): Database file, or ":memory:" for a new private
+            in-memory database.
+        create_schema (bool): Create the migrated schema if it is missing.
+
+    Returns:
+        SQLiteDatabase: The database now in use.
+    """
+    global _sqlite_database, _backend_generation
+    from system_backend.sqlite_backend import SQLiteDatabase
+
+    database = SQLiteDatabase(path)
+    if create_schema:
+        database.create_schema()
+    _sqlite_database = database
+    _backend_generation += 1
+    return database
+
+
+def use_mysql():
+    """Switch the database helpers back to the MySQL server in DB_CONFIG."""
+    global _sqlite_database, _backend_generation
+    _sqlite_database = None
+    _backend_generation += 1
+
+
+def using_sqlite():
+    """
+    Tell whether the SQLite backend is in use.
+
+    Returns:
+        bool: True after use_sqlite, False for MySQL.
+    """
+    return _sqlite_database is not None
+
+
+def register_query(name, query):
+    """
+    Declare a named statement in the query registry.
+
+    Registering the same name again with the same SQL returns the
+    existing entry, so modules may declare their statements at import.
+
+    Parameters:
+        name (str): Registry name, e.g. "wallet.balance".
+        query (str): The parameterized SQL statement.
+
+    Returns:
+        NamedQuery: The registered statement.
+
+    Raises:
+        ValueError: If the name is already registered with different SQL.
+    """
+    registered = _registry.get(name)
+    if registered is not None:
+        if registered != query:
+            raise ValueError(f"Query {name!r} is already registered with different SQL.")
+        return registered
+
+    registered = NamedQuery(query)
+    registered.name = name
+    _registry[name] = registered
+    return registered
+
+
+def get_query_timings():
+    """
+    Report execution timings of named queries in this process.
+
+    Returns:
+        dict: {name: {"calls", "errors", "total_ms", "avg_ms", "max_ms"}}
+            for every named query executed at least once.
+    """
+    with _timings_lock:
+        return {
+            name: {
+                "calls": stats["calls"],
+                "errors": stats["errors"],
+                "total_ms": stats["total_ms"],
+                "avg_ms": stats["total_ms"] / stats["calls"] if stats["calls"] else 0.0,
+                "max_ms": stats["max_ms"],
+            }
+            for name, stats in _timings.items()
+        }
+
+
+def reset_query_timings():
+    """Clear the collected named query timings."""
+    with _timings_lock:
+        _timings.clear()
+
+
+def _record_timing(name, started, failed=False):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _timings_lock:
+        stats = _timings.get(name)
+        if stats is None:
+            stats = _timings[name] = {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        if elapsed_ms > stats["max_ms"]:
+            stats["max_ms"] = elapsed_ms
+        if failed:
+            stats["errors"] += 1
+
+
+def _thread_connection():
+    """Return this thread's persistent connection, connecting if needed."""
+    database = getattr(_local, "database", None)
+    if database is not None and _local.generation != _backend_generation:
+        _drop_thread_connection()
+        database = None
+    if database is None:
+        database = connect_to_db()
+        if not database:
+            return None
+        # Autocommit so single reads never see a stale snapshot
+        database.autocommit = True
+        _local.database = database
+        _local.prepared = {}
+        _local.generation = _backend_generation
+    return database
+
+
+def _drop_thread_connection():
+    """Forget this thread's connection, e.g. after the server closed it."""
+    database = getattr(_local, "database", None)
+    _local.database = None
+    _local.prepared = {}
+    if database is not None:
+        try:
+            database.close()
+        except Error:
+            pass
+
+
+def _prepared_cursor(database, prepared, query):
+    """Return the connection's prepared cursor for a named query."""
+    cursor = prepared.get(query.name)
+    if cursor is None:
+        cursor = prepared[query.name] = database.cursor(prepared=True, dictionary=True)
+    return cursor
+
+
+def _run_named(query, parameters, mode):
+    """
+    Execute a named query on this thread's connection.
+
+    Reads are retried once on a fresh connection when the persistent one
+    was dropped by the server; writes are not, as they may have applied.
+
+    Returns:
+        The cursor ("execute"), one row ("one") or all rows ("all"),
+        or None if an error occurs.
+    """
+    attempts = 1 if mode == "execute" else 2
+    for attempt in range(attempts):
+        database = _thread_connection()
+        if not database:
+            return None
+
+        started = time.perf_counter()
+        try:
+            cursor = _prepared_cursor(database, _local.prepared, query)
+            cursor.execute(query, parameters)
+            if mode == "execute":
+                result = cursor
+            else:
+                # Read the whole result so the cursor can be executed again
+                rows = cursor.fetchall()
+                result = rows if mode == "all" else (rows[0] if rows else None)
+            _record_timing(query.name, started)
+            return result
+
+        except (InterfaceError, OperationalError) as e:
+            _record_timing(query.name, started, failed=True)
+            _drop_thread_connection()
+            if attempt == attempts - 1:
+                print(f"An error occured while executing query {query.name}: {e}")
+        except Error as e:
+            _record_timing(query.name, started, failed=True)
+            print(f"An error occured while executing query {query.name}: {e}")
+            return None
+    return None
+
+
 def execute_query(query, parameters=None):
     """
     Execute an SQL query that modifies the database.
@@ -57,6 +304,9 @@ def execute_query(query, parameters=None):
             The cursor object after execution,
             or None if an error occurs.
     """
+    if isinstance(query, NamedQuery):
+        return _run_named(query, parameters, "execute")
+
     try:
         database = connect_to_db()
         if not database:
@@ -90,6 +340,9 @@ def fetch_one(query, parameters=None):
             A dictionary representing one database record,
             or None if no record is found or an error occurs.
     """
+    if isinstance(query, NamedQuery):
+        return _run_named(query, parameters, "one")
+
     try:
         database = connect_to_db()
         if not database:
@@ -122,6 +375,9 @@ def fetch_all(query, parameters=None):
             A list of dictionaries containing database records,
             or None if an error occurs.
     """
+    if isinstance(query, NamedQuery):
+        return _run_named(query, parameters, "all")
+
     try:
         database = connect_to_db()
         if not database:
@@ -134,4 +390,204 @@ def fetch_all(query, parameters=None):
     
     except Error as e:
         print(f"An error occured while retrieving data from the database: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def fetch_columns(query, parameters=None):
+    """
+    Fetch a result set column by column.
+
+    Rows are read through a plain (tuple) cursor in one round trip and
+    transposed, which is the shape NumPy arrays are built from.
+
+    Parameters:
+        query (str): The SQL SELECT query to be executed.
+        parameters (tuple | None): Optional values for
+            parameterized SQL queries.
+
+    Returns:
+        dict[str, tuple] | None:
+            Column values keyed by column name (empty tuples when no
+            rows match), or None if an error occurs.
+    """
+    try:
+        database = connect_to_db()
+        if not database:
+            return None
+
+        cursor = database.cursor()
+        cursor.execute(query, parameters)
+        rows = cursor.fetchall()
+        names = [column[0] for column in cursor.description]
+
+        if not rows:
+            return {name: () for name in names}
+        return dict(zip(names, zip(*rows)))
+
+    except Error as e:
+        print(f"An error occured while retrieving data from the database: {e}")
+        return None
+
+class _TransactionCursor:
+    """
+    Dictionary cursor of an open transaction.
+
+    Plain SQL runs on a regular dictionary cursor; named queries run on the
+    connection's prepared cursors and their rows are read at once. Other
+    attributes (rowcount, lastrowid, ...) come from the cursor used last.
+    """
+
+    def __init__(self, database, prepared):
+        self._database = database
+        self._prepared = prepared
+        self._text = database.cursor(dictionary=True)
+        self._last = self._text
+        self._rows = None
+
+    def execute(self, query, parameters=None):
+        if not isinstance(query, NamedQuery):
+            self._last, self._rows = self._text, None
+            return self._text.execute(query, parameters)
+
+        cursor = _prepared_cursor(self._database, self._prepared, query)
+        started = time.perf_counter()
+        try:
+            cursor.execute(query, parameters)
+            self._rows = cursor.fetchall() if cursor.with_rows else []
+        except Exception:
+            _record_timing(query.name, started, failed=True)
+            raise
+        _record_timing(query.name, started)
+        self._last = cursor
+
+    def executemany(self, query, seq_params):
+        self._last, self._rows = self._text, None
+        return self._text.executemany(query, seq_params)
+
+    def fetchone(self):
+        if self._rows is None:
+            return self._text.fetchone()
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        if self._rows is None:
+            return self._text.fetchall()
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        self._text.close()
+
+    def __getattr__(self, name):
+        return getattr(self._last, name)
+
+
+@contextmanager
+def transaction():
+    """
+    Run several SQL statements atomically on one connection.
+
+    The block receives a dictionary cursor. The transaction is committed
+    when the block finishes and rolled back if it raises, after which the
+    exception is re-raised to the caller. Named queries executed on the
+    cursor run as prepared statements (see register_query).
+
+    The transaction uses this thread's persistent connection, so its
+    prepared statements are reused by later transactions; a transaction
+    opened inside another one gets a connection of its own.
+
+    Usage:
+        with transaction() as cursor:
+            cursor.execute(query, parameters)
+
+    Yields:
+        Cursor bound to the open transaction, with the interface of
+            mysql.connector.cursor.MySQLCursorDict.
+
+    Raises:
+        Error: If the database connection cannot be established or
+            any statement inside the block fails.
+    """
+    database = _thread_connection()
+    shared = database is not None and not database.in_transaction
+    if shared:
+        prepared = _local.prepared
+    else:
+        database = connect_to_db()
+        prepared = {}
+    if not database:
+        raise Error("Unable to connect to the database.")
+
+    cursor = _TransactionCursor(database, prepared)
+    try:
+        database.start_transaction()
+        yield cursor
+        database.commit()
+    except Exception as e:
+        try:
+            database.rollback()
+        except Error:
+            pass
+        if shared and isinstance(e, (InterfaceError, OperationalError)):
+            # The persistent connection is likely gone; reconnect next time
+            _drop_thread_connection()
+        raise
+    finally:
+        try:
+            cursor.close()
+        except Error:
+            pass
+        if not shared:
+            database.close()
+
+
+def stream_rows(query, parameters=None, batch_size=1000):
+    """
+    Stream the rows of a SELECT query without loading them all in memory.
+
+    Rows are read from an unbuffered (server-side) cursor in batches of
+    batch_size, so memory use stays constant regardless of the result size.
+    The connection stays open until the generator is exhausted or closed.
+
+    Parameters:
+        query (str): The SQL SELECT query to be executed.
+        parameters (tuple | None): Optional values for
+            parameterized SQL queries.
+        batch_size (int): Number of rows fetched per round trip.
+
+    Yields:
+        dict: One database record at a time.
+
+    Raises:
+        Error: If the connection fails or the query cannot be executed.
+    """
+    database = connect_to_db()
+    if not database:
+        raise Error("Unable to connect to the database.")
+
+    cursor = database.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute(query, parameters)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        # Closing an abandoned unbuffered result can raise "Unread result
+        # found"; the connection is discarded either way.
+        for close in (cursor.close, database.close):
+            try:
+                close()
+            except Error:
+                pass
+
+
+def _configure_from_environment():
+    """Select the SQLite backend when CAMPUS_EWALLET_DB names one."""
+    url = os.environ.get(DB_URL_ENV, "").strip()
+    if url.startswith("sqlite://"):
+        use_sqlite(url[len("sqlite://"):] or ":memory:")
+
+
+_configure_from_environment()
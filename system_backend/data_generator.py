@@ -0,0 +1,514 @@
+"""
+Data Generator Module
+
+This module builds synthetic campus data for load and scale testing:
+students, wallet accounts, organizations, bills, transfers, bill payments
+and cash-in / cash-out requests, from a few thousand rows up to tens of
+millions.
+
+How it works:
+- Every row is drawn from one random.Random(seed), so the same arguments
+  (including `end`) always produce the same dataset
+- Who sends money follows a Zipf distribution (a few students send most
+  of the transfers), receivers and bill popularity follow their own Zipf
+  exponents; an exponent of 0 means uniform
+- Dates are spread over a history window with configurable seasonal peaks
+  (month -> multiplier, e.g. enrollment months) and quieter weekends
+- The data is referentially consistent and balanced: every transfer,
+  payment and request points to existing rows, bills are paid at most
+  once per student and only after they were posted (so the effective
+  bill payment share is somewhat below bill_payment_share), each
+  student receives an opening cash-in large enough to never end below
+  zero, stored wallet balances equal what the history implies (so
+  reconciliation finds no discrepancies) and pending organization
+  cash-outs are held
+- Rows are bulk loaded with executemany in batches of batch_size, one
+  transaction per batch (mysql.connector turns these into multi-row
+  INSERTs), and generated lazily so memory stays flat however many
+  transactions are requested
+- The bill collection read model (organization_bill_payers and
+  organization_bill_stats) is filled along with the payments
+
+The target tables must be empty; IDs are assigned by the generator.
+
+Usage:
+    python -m system_backend.data_generator --students 200000 --transactions 10000000
+    python -m system_backend.data_generator --sqlite campus.sqlite3 --students 5000 --seed 7
+
+Dependencies:
+- campusEwallet_db for the bulk inserts (MySQL, or SQLite with --sqlite)
+- bcrypt for the shared password hash of the generated accounts
+"""
+
+import argparse
+import itertools
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+import bcrypt
+
+from system_backend import campusEwallet_db
+from system_backend.campusEwallet_db import fetch_one, transaction
+
+
+DEFAULT_STUDENTS = 10000
+DEFAULT_ORGANIZATIONS = 50
+DEFAULT_BILLS_PER_ORG = 8
+DEFAULT_TRANSACTIONS = 200000
+DEFAULT_CASHIN_REQUESTS = 20000
+DEFAULT_CASHOUT_REQUESTS_PER_ORG = 6
+DEFAULT_HISTORY_DAYS = 365
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_SEED = 49
+
+DEFAULT_SENDER_SKEW = 1.1
+DEFAULT_RECEIVER_SKEW = 0.7
+DEFAULT_BILL_SKEW = 1.0
+DEFAULT_BILL_PAYMENT_SHARE = 0.3
+# Semester starts (August, January) and the June enrollment rush
+DEFAULT_SEASONAL_PEAKS = {1: 2.0, 6: 1.5, 8: 3.0}
+DEFAULT_WEEKEND_FACTOR = 0.4
+DEFAULT_CASHIN_STATUS_MIX = {"approved": 0.85, "pending": 0.10, "rejected": 0.05}
+
+DEFAULT_PASSWORD = "campus-pass"
+OPENING_CASHIN_CENTS = (50000, 100000, 200000, 300000)
+CASHIN_CENTS = (10000, 20000, 30000, 50000, 100000, 200000)
+BILL_CENTS = (5000, 10000, 15000, 20000, 25000, 30000, 50000)
+TRANSFER_MEDIAN_CENTS = 8000
+TRANSFER_MAX_CENTS = 500000
+
+FIRST_NAMES = ["Ana", "Ben", "Cara", "Dan", "Ela", "Franz", "Gia", "Hans", "Ivy", "Jose", "Kim", "Luis",
+               "Mara", "Nico", "Olive", "Paolo", "Queenie", "Rafa", "Sam", "Tess", "Uly", "Vince", "Wena", "Yza"]
+LAST_NAMES = ["Cruz", "Reyes", "Lim", "Santos", "Garcia", "Mendoza", "Torres", "Flores", "Ramos", "Tan",
+              "Bautista", "Villanueva", "Aquino", "Castillo", "Dizon", "Navarro", "Pascual", "Soriano"]
+PROGRAMS = ["BSCS", "BSIT", "BSIS", "BSEMC", "BSA", "BSBA", "BSED", "BSN"]
+ORGANIZATION_KINDS = ["Society", "Guild", "Council", "Club", "Circle"]
+BILL_TITLES = ["Membership Fee", "Org Shirt", "Seminar Fee", "Sportsfest Fee", "Field Trip", "Outreach Fund",
+               "General Assembly", "Year-end Party"]
+DECLINE_REASONS = ["Blurry deposit slip", "Amount does not match slip", "Duplicate request"]
+TRANSFER_MESSAGES = [None, "Lunch", "Thanks!", "Share for the project", "Load", "Printing", "Fare"]
+
+TABLES = ["enrolled_students", "wallet_users", "wallets", "organization_wallets", "organization_bills",
+          "transactions", "cashin_requests", "cashout_requests"]
+
+
+def student_id(number):
+    """Return the student ID of the n-th generated student (1-based)."""
+    return f"2024-{number:06d}"
+
+
+def organization_name(number):
+    """Return the name of the n-th generated organization (1-based)."""
+    return f"Org {number:04d} {ORGANIZATION_KINDS[number % len(ORGANIZATION_KINDS)]}"
+
+
+def _zipf_cum_weights(count, skew):
+    """Cumulative weights 1/rank**skew for ranks 1..count."""
+    return list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+def _day_cum_weights(start, days, seasonal_peaks, weekend_factor):
+    """Cumulative weights of the days in the history window."""
+    weights = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        weight = seasonal_peaks.get(day.month, 1.0)
+        if day.weekday() >= 5:
+            weight *= weekend_factor
+        weights.append(weight)
+    return list(itertools.accumulate(weights))
+
+
+def _cents(value):
+    """Render integer cents as the decimal amount stored in the database."""
+    return round(value / 100, 2)
+
+
+def _stamp(moment):
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _bulk_insert(query, rows, batch_size):
+    """
+    Insert rows with executemany, batch_size rows per transaction.
+
+    Parameters:
+        query (str): INSERT statement with %s placeholders.
+        rows (iterable): Parameter tuples; consumed lazily.
+        batch_size (int): Rows per executemany call and transaction.
+
+    Returns:
+        int: Number of rows inserted.
+    """
+    inserted = 0
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return inserted
+        with transaction() as cursor:
+            cursor.executemany(query, batch)
+        inserted += len(batch)
+
+
+def generate_dataset(students=DEFAULT_STUDENTS, organizations=DEFAULT_ORGANIZATIONS,
+                     bills_per_org=DEFAULT_BILLS_PER_ORG, transactions=DEFAULT_TRANSACTIONS,
+                     cashin_requests=DEFAULT_CASHIN_REQUESTS,
+                     cashout_requests_per_org=DEFAULT_CASHOUT_REQUESTS_PER_ORG,
+                     history_days=DEFAULT_HISTORY_DAYS, end=None,
+                     sender_skew=DEFAULT_SENDER_SKEW, receiver_skew=DEFAULT_RECEIVER_SKEW,
+                     bill_skew=DEFAULT_BILL_SKEW, bill_payment_share=DEFAULT_BILL_PAYMENT_SHARE,
+                     seasonal_peaks=None, weekend_factor=DEFAULT_WEEKEND_FACTOR,
+                     cashin_status_mix=None, opening_balance_cents=None,
+                     password=DEFAULT_PASSWORD, password_rounds=12,
+                     seed=DEFAULT_SEED, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Fill the empty campus tables with a synthetic, consistent dataset.
+
+    Parameters:
+        students (int): Enrolled students, each with a wallet account.
+        organizations (int): Organizations; the first students are their
+            treasurers.
+        bills_per_org (int): Bills posted by each organization.
+        transactions (int): Rows in transactions (transfers and bill
+            payments together).
+        cashin_requests (int): Cash-in requests on top of the one opening
+            cash-in every student gets.
+        cashout_requests_per_org (int): Cash-out requests per organization.
+        history_days (int): Length of the history window.
+        end (datetime, optional): End of the history window; defaults to
+            today at midnight. Pass it explicitly for identical reruns on
+            different days.
+        sender_skew, receiver_skew, bill_skew (float): Zipf exponents of
+            the senders, receivers and bill popularity (0 = uniform).
+        bill_payment_share (float): Fraction of transactions that are bill
+            payments instead of transfers.
+        seasonal_peaks (dict, optional): {month: multiplier} of transaction
+            volume; defaults to DEFAULT_SEASONAL_PEAKS.
+        weekend_factor (float): Volume multiplier of Saturdays and Sundays.
+        cashin_status_mix (dict, optional): {status: share} of the extra
+            cash-in requests; defaults to DEFAULT_CASHIN_STATUS_MIX.
+        opening_balance_cents (int, optional): Fixed minimum opening
+            cash-in per student, in cents; drawn from OPENING_CASHIN_CENTS
+            if omitted.
+        password (str): Password of every generated account.
+        password_rounds (int): bcrypt cost of the shared password hash.
+        seed (int): Random seed.
+        batch_size (int): Rows per executemany call and transaction.
+        progress (callable, optional): Called as progress(table, rows)
+            after each table is loaded.
+
+    Returns:
+        dict: Row counts per table plus the IDs load tools draw from
+            ("student_ids", "user_ids", "bill_ids", "organization_names",
+            "pending_cashin_ids").
+
+    Raises:
+        ValueError: If a target table already holds rows or the arguments
+            are inconsistent.
+    """
+    if students < 2:
+        raise ValueError("At least two students are needed for transfers.")
+    if organizations > students:
+        raise ValueError("Every organization needs its own treasurer; add students.")
+    for table in TABLES:
+        if fetch_one(f"SELECT COUNT(*) AS n FROM {table}")["n"]:
+            raise ValueError(f"Table {table} already holds rows; the generator needs empty tables.")
+
+    report = progress or (lambda table, rows: None)
+    rng = random.Random(seed)
+    peaks = DEFAULT_SEASONAL_PEAKS if seasonal_peaks is None else seasonal_peaks
+    status_mix = DEFAULT_CASHIN_STATUS_MIX if cashin_status_mix is None else cashin_status_mix
+    end = end or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=history_days)
+    day_weights = _day_cum_weights(start, history_days, peaks, weekend_factor)
+    days = range(history_days)
+
+    def moments(count):
+        """Draw count timestamps following the seasonal day weights."""
+        drawn = rng.choices(days, cum_weights=day_weights, k=count)
+        return [start + timedelta(days=day, seconds=rng.randrange(7 * 3600, 21 * 3600)) for day in drawn]
+
+    user_ids = list(range(1, students + 1))
+    student_ids = [student_id(number) for number in user_ids]
+    organization_names = [organization_name(number) for number in range(1, organizations + 1)]
+    bill_count = organizations * bills_per_org
+    balances = [0] * (students + 1)          # cents, indexed by user_id
+    org_balances = [0] * (organizations + 1)  # cents, indexed by org_wallet_id
+
+    # ---- Students and accounts ----
+    password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt(password_rounds)).decode()
+
+    def student_rows():
+        for index, sid in enumerate(student_ids):
+            treasurer = index < organizations
+            yield (sid, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"{sid}@campus.example",
+                   rng.choice(PROGRAMS), f"{rng.randint(1, 4)}{rng.choice('ABCD')}",
+                   "Treasurer" if treasurer else "Student",
+                   organization_names[index] if treasurer else None, sid if treasurer else None)
+
+    report("enrolled_students", _bulk_insert(
+        "INSERT INTO enrolled_students "
+        "(student_id, name, email, program, section, student_role, organization, treasurer_id) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)", student_rows(), batch_size))
+
+    report("wallet_users", _bulk_insert(
+        "INSERT INTO wallet_users (user_id, student_id, email, user_password, role, created_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        ((user_id, sid, f"{sid}@campus.example", password_hash,
+          "Treasurer" if user_id <= organizations else "Student",
+          _stamp(start - timedelta(seconds=rng.randrange(365 * 86400))))
+         for user_id, sid in zip(user_ids, student_ids)), batch_size))
+
+    # ---- Bills ----
+    bill_orgs = [bill // bills_per_org + 1 for bill in range(bill_count)]  # index bill_id - 1
+    bill_amounts = [rng.choice(BILL_CENTS) for _ in range(bill_count)]
+    bill_posted = moments(bill_count)
+    report("organization_bills", _bulk_insert(
+        "INSERT INTO organization_bills (bill_id, org_wallet_id, title, description, amount, created_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        ((bill + 1, bill_orgs[bill], f"{BILL_TITLES[bill % len(BILL_TITLES)]} #{bill // len(BILL_TITLES) + 1}",
+          f"Posted by {organization_names[bill_orgs[bill] - 1]}", _cents(bill_amounts[bill]),
+          _stamp(bill_posted[bill]))
+         for bill in range(bill_count)), batch_size))
+
+    # ---- Extra cash-in requests (the frequent senders cash in more) ----
+    sender_rank = user_ids[:]
+    rng.shuffle(sender_rank)
+    sender_weights = _zipf_cum_weights(students, sender_skew)
+    receiver_rank = user_ids[:]
+    rng.shuffle(receiver_rank)
+    receiver_weights = _zipf_cum_weights(students, receiver_skew)
+    bill_rank = list(range(1, bill_count + 1))
+    rng.shuffle(bill_rank)
+    bill_weights = _zipf_cum_weights(bill_count, bill_skew) if bill_count else []
+
+    statuses = list(status_mix)
+    status_weights = list(itertools.accumulate(status_mix[status] for status in statuses))
+    pending_cashin_ids = []
+
+    def cashin_rows():
+        remaining, sequence = cashin_requests, 0
+        while remaining:
+            count = min(remaining, batch_size)
+            remaining -= count
+            users = rng.choices(sender_rank, cum_weights=sender_weights, k=count)
+            drawn = rng.choices(statuses, cum_weights=status_weights, k=count)
+            for user_id, status, requested in zip(users, drawn, moments(count)):
+                sequence += 1
+                amount = rng.choice(CASHIN_CENTS)
+                request_id = f"REQ-{requested:%Y%m%d}-{sequence:08d}"
+                processed = None
+                if status == "pending":
+                    pending_cashin_ids.append(request_id)
+                else:
+                    processed = _stamp(requested + timedelta(minutes=rng.randint(5, 600)))
+                    if status == "approved":
+                        balances[user_id] += amount
+                yield (request_id, user_id, _cents(amount), status, _stamp(requested), processed,
+                       rng.choice(DECLINE_REASONS) if status == "rejected" else None)
+
+    cashin_query = (
+        "INSERT INTO cashin_requests "
+        "(request_id, user_id, amount, status, date_requested, date_processed, decline_reason) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+    )
+    extra_cashins = _bulk_insert(cashin_query, cashin_rows(), batch_size)
+
+    # ---- Transfers and bill payments ----
+    paid = set()  # user_id * (bill_count + 1) + bill_id
+    bill_stats = {}  # bill_id -> [paid_count, total_cents, last_payment_at, last_transaction_id]
+    payers = []
+
+    def transaction_rows():
+        remaining, sequence = transactions, 0
+        while remaining:
+            count = min(remaining, batch_size)
+            remaining -= count
+            senders = rng.choices(sender_rank, cum_weights=sender_weights, k=count)
+            receivers = rng.choices(receiver_rank, cum_weights=receiver_weights, k=count)
+            bills = rng.choices(bill_rank, cum_weights=bill_weights, k=count) if bill_count else [None] * count
+            for sender, receiver, bill_id, moment in zip(senders, receivers, bills, moments(count)):
+                sequence += 1
+                trx_id = f"TRNX-{moment:%Y%m%d}-{sequence:09d}"
+                created_at = _stamp(moment)
+                key = sender * (bill_count + 1) + bill_id if bill_id else None
+                # A bill can be paid once per student, and only after it was posted
+                if (bill_id and key not in paid and moment > bill_posted[bill_id - 1]
+                        and rng.random() < bill_payment_share):
+                    paid.add(key)
+                    amount = bill_amounts[bill_id - 1]
+                    org_wallet_id = bill_orgs[bill_id - 1]
+                    balances[sender] -= amount
+                    org_balances[org_wallet_id] += amount
+                    stats = bill_stats.setdefault(bill_id, [0, 0, created_at, trx_id])
+                    stats[0] += 1
+                    stats[1] += amount
+                    if created_at >= stats[2]:
+                        stats[2], stats[3] = created_at, trx_id
+                    payers.append((bill_id, created_at, trx_id, sender, _cents(amount)))
+                    yield (trx_id, sender, None, bill_id, _cents(amount), "Bill Payment", created_at, None)
+                    continue
+
+                if receiver == sender:
+                    receiver = sender % students + 1
+                amount = min(TRANSFER_MAX_CENTS,
+                             max(100, int(rng.lognormvariate(math.log(TRANSFER_MEDIAN_CENTS), 0.9))))
+                balances[sender] -= amount
+                balances[receiver] += amount
+                yield (trx_id, sender, receiver, None, _cents(amount), "Send Money", created_at,
+                       rng.choice(TRANSFER_MESSAGES))
+
+    transaction_query = (
+        "INSERT INTO transactions "
+        "(transaction_id, sender_id, receiver_id, bill_id, amount, transaction_type, created_at, status, message) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, 'completed', %s)"
+    )
+    payer_query = (
+        "INSERT INTO organization_bill_payers (bill_id, paid_at, transaction_id, user_id, amount) "
+        "VALUES (%s, %s, %s, %s, %s)"
+    )
+    inserted = 0
+    rows = transaction_rows()
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        with transaction() as cursor:
+            cursor.executemany(transaction_query, batch)
+            if payers:
+                cursor.executemany(payer_query, payers)
+        payers.clear()
+        inserted += len(batch)
+    report("transactions", inserted)
+
+    # ---- Opening cash-ins: nobody ever ends below zero ----
+    opening_day = start + timedelta(days=min(7, history_days))
+
+    def opening_rows():
+        for user_id in user_ids:
+            amount = opening_balance_cents or rng.choice(OPENING_CASHIN_CENTS)
+            if balances[user_id] < 0:
+                # Cover the deficit, rounded up to whole pesos like a real deposit
+                amount += -(balances[user_id] // 100) * 100
+            balances[user_id] += amount
+            requested = start + timedelta(seconds=rng.randrange(max(1, (opening_day - start).days) * 86400))
+            yield (f"REQ-{requested:%Y%m%d}-O{user_id:08d}", user_id, _cents(amount), "approved",
+                   _stamp(requested), _stamp(requested + timedelta(minutes=30)), None)
+
+    report("cashin_requests", extra_cashins + _bulk_insert(cashin_query, opening_rows(), batch_size))
+
+    # ---- Organization cash-outs, wallets and bill stats ----
+    org_held = [0] * (organizations + 1)
+
+    def cashout_rows():
+        sequence = 0
+        for org_wallet_id in range(1, organizations + 1):
+            for requested in sorted(moments(cashout_requests_per_org)):
+                available = org_balances[org_wallet_id] - org_held[org_wallet_id]
+                if available < 1000:
+                    continue
+                sequence += 1
+                amount = rng.randint(1, available // 200) * 100
+                status = "pending" if requested > end - timedelta(days=14) else rng.choice(
+                    ("approved", "approved", "approved", "rejected"))
+                processed = None if status == "pending" else _stamp(requested + timedelta(hours=rng.randint(1, 48)))
+                if status == "approved":
+                    org_balances[org_wallet_id] -= amount
+                elif status == "pending":
+                    org_held[org_wallet_id] += amount
+                yield (f"CO-{requested:%Y%m%d}-{sequence:08d}", org_wallet_id, _cents(amount),
+                       "Event expenses", status, _stamp(requested), processed,
+                       "Missing liquidation report" if status == "rejected" else None)
+
+    report("cashout_requests", _bulk_insert(
+        "INSERT INTO cashout_requests "
+        "(request_id, org_wallet_id, amount, message, status, date_requested, date_processed, decline_reason) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)", cashout_rows(), batch_size))
+
+    report("wallets", _bulk_insert(
+        "INSERT INTO wallets (wallet_id, user_id, balance) VALUES (%s, %s, %s)",
+        ((user_id, user_id, _cents(balances[user_id])) for user_id in user_ids), batch_size))
+
+    report("organization_wallets", _bulk_insert(
+        "INSERT INTO organization_wallets "
+        "(org_wallet_id, treasurer_id, organization_name, role, org_wallet_balance, org_wallet_held) "
+        "VALUES (%s, %s, %s, 'Treasurer', %s, %s)",
+        ((org_wallet_id, student_ids[org_wallet_id - 1], organization_names[org_wallet_id - 1],
+          _cents(org_balances[org_wallet_id]), _cents(org_held[org_wallet_id]))
+         for org_wallet_id in range(1, organizations + 1)), batch_size))
+
+    _bulk_insert(
+        "INSERT INTO organization_bill_stats "
+        "(bill_id, org_wallet_id, paid_count, total_collected, last_payment_at, last_transaction_id) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        ((bill_id, bill_orgs[bill_id - 1], stats[0], _cents(stats[1]), stats[2], stats[3])
+         for bill_id, stats in sorted(bill_stats.items())), batch_size)
+
+    return {
+        "students": students,
+        "organizations": organizations,
+        "bills": bill_count,
+        "transactions": inserted,
+        "bill_payments": len(paid),
+        "cashin_requests": extra_cashins + students,
+        "pending_cashins": len(pending_cashin_ids),
+        "student_ids": student_ids,
+        "user_ids": user_ids,
+        "bill_ids": list(range(1, bill_count + 1)),
+        "organization_names": organization_names,
+        "pending_cashin_ids": pending_cashin_ids,
+    }
+
+
+def _parse_peaks(text):
+    """Parse "8:3,1:2" into {8: 3.0, 1: 2.0}."""
+    peaks = {}
+    for item in filter(None, text.split(",")):
+        month, multiplier = item.split(":")
+        peaks[int(month)] = float(multiplier)
+    return peaks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the campus tables with synthetic data.")
+    parser.add_argument("--sqlite", default=None, help="Build the dataset in this SQLite file instead of MySQL.")
+    parser.add_argument("--students", type=int, default=DEFAULT_STUDENTS)
+    parser.add_argument("--organizations", type=int, default=DEFAULT_ORGANIZATIONS)
+    parser.add_argument("--bills-per-org", type=int, default=DEFAULT_BILLS_PER_ORG)
+    parser.add_argument("--transactions", type=int, default=DEFAULT_TRANSACTIONS)
+    parser.add_argument("--cashin-requests", type=int, default=DEFAULT_CASHIN_REQUESTS)
+    parser.add_argument("--cashout-requests-per-org", type=int, default=DEFAULT_CASHOUT_REQUESTS_PER_ORG)
+    parser.add_argument("--history-days", type=int, default=DEFAULT_HISTORY_DAYS)
+    parser.add_argument("--end", default=None, help="End of the history window (YYYY-MM-DD).")
+    parser.add_argument("--sender-skew", type=float, default=DEFAULT_SENDER_SKEW)
+    parser.add_argument("--receiver-skew", type=float, default=DEFAULT_RECEIVER_SKEW)
+    parser.add_argument("--bill-skew", type=float, default=DEFAULT_BILL_SKEW)
+    parser.add_argument("--bill-payment-share", type=float, default=DEFAULT_BILL_PAYMENT_SHARE)
+    parser.add_argument("--peaks", default=None, help='Seasonal peaks as "month:multiplier,...", e.g. "8:3,1:2".')
+    parser.add_argument("--weekend-factor", type=float, default=DEFAULT_WEEKEND_FACTOR)
+    parser.add_argument("--password-rounds", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.sqlite:
+        campusEwallet_db.use_sqlite(args.sqlite)
+
+    started = time.perf_counter()
+    summary = generate_dataset(
+        students=args.students, organizations=args.organizations, bills_per_org=args.bills_per_org,
+        transactions=args.transactions, cashin_requests=args.cashin_requests,
+        cashout_requests_per_org=args.cashout_requests_per_org, history_days=args.history_days,
+        end=datetime.strptime(args.end, "%Y-%m-%d") if args.end else None,
+        sender_skew=args.sender_skew, receiver_skew=args.receiver_skew, bill_skew=args.bill_skew,
+        bill_payment_share=args.bill_payment_share,
+        seasonal_peaks=_parse_peaks(args.peaks) if args.peaks is not None else None,
+        weekend_factor=args.weekend_factor, password_rounds=args.password_rounds,
+        seed=args.seed, batch_size=args.batch_size,
+        progress=lambda table, rows: print(f"{table:22} {rows:>12,} rows  ({time.perf_counter() - started:.1f}s)"),
+    )
+    print(f"Done in {time.perf_counter() - started:.1f}s: {summary['transactions']:,} transactions, "
+          f"{summary['bill_payments']:,} bill payments, {summary['pending_cashins']:,} pending cash-ins.")
@@ -0,0 +1,112 @@
+"""
+Date Ranges Module
+
+This module turns the calendar dates entered in the UI into half-open
+datetime ranges that can be compared directly against indexed DATETIME
+columns (created_at >= start AND created_at < end), instead of wrapping
+the column in DATE(), which prevents index use.
+
+Day boundaries are computed in the campus time zone and then converted to
+the time zone the database writes its DATETIME values in (the MySQL server's
+NOW()). Both default to Philippine time, which has no daylight saving time.
+
+Dependencies:
+- datetime for date parsing and time zone conversion
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+
+# Time zone used to decide where a calendar day starts and ends
+CAMPUS_TIMEZONE = timezone(timedelta(hours=8), "PHT")
+
+# Time zone of the naive DATETIME values stored by the database server
+DATABASE_TIMEZONE = timezone(timedelta(hours=8), "PHT")
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_date(value):
+    """
+    Parse a date given as a date, datetime or YYYY-MM-DD string.
+
+    Parameters:
+        value (date | datetime | str): Date to parse.
+
+    Returns:
+        date: Parsed calendar date.
+
+    Raises:
+        ValueError: If the value is not a valid date.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value).strip(), DATE_FORMAT).date()
+
+
+def day_start(day, tz=None):
+    """
+    Return the database-time instant at which a campus calendar day starts.
+
+    Parameters:
+        day (date | datetime | str): Calendar day.
+        tz (tzinfo, optional): Time zone of the calendar day. Defaults to
+            CAMPUS_TIMEZONE.
+
+    Returns:
+        datetime: Naive datetime in DATABASE_TIMEZONE.
+    """
+    local_midnight = datetime.combine(parse_date(day), time.min, tzinfo=tz or CAMPUS_TIMEZONE)
+    return local_midnight.astimezone(DATABASE_TIMEZONE).replace(tzinfo=None)
+
+
+def day_range(start_date=None, end_date=None, tz=None):
+    """
+    Build a half-open [start, end) range covering whole calendar days.
+
+    Either bound may be omitted for an open-ended range. A single day is
+    requested by passing the same date as start_date and end_date.
+
+    Parameters:
+        start_date (date | str, optional): First day included in the range.
+        end_date (date | str, optional): Last day included in the range.
+        tz (tzinfo, optional): Time zone of the calendar days.
+
+    Returns:
+        tuple: (datetime or None, datetime or None) Naive database-time
+            bounds, where the end bound is exclusive.
+
+    Raises:
+        ValueError: If a date is invalid or end_date is before start_date.
+    """
+    start = day_start(start_date, tz) if start_date else None
+    end = day_start(parse_date(end_date) + timedelta(days=1), tz) if end_date else None
+
+    if start and end and end <= start:
+        raise ValueError("End date must not be before start date.")
+    return start, end
+
+
+def add_range_filter(query, params, column, start, end):
+    """
+    Append half-open range predicates on a column to a query being built.
+
+    Parameters:
+        query (str): SQL built so far (ending inside a WHERE clause).
+        params (list): Query parameters, extended in place.
+        column (str): Column to filter on, e.g. "created_at".
+        start (datetime | None): Inclusive lower bound.
+        end (datetime | None): Exclusive upper bound.
+
+    Returns:
+        str: The query with the range predicates appended.
+    """
+    if start:
+        query += f" AND {column} >= %s"
+        params.append(start)
+    if end:
+        query += f" AND {column} < %s"
+        params.append(end)
+    return query
@@ -7,7 +7,10 @@ It includes functionality for:
 - Creating student wallet accounts with temporary passwords
 - Viewing, approving, and rejecting cash-in requests
 - Viewing, approving, and rejecting cash-out requests
+- Claiming batches of pending requests so several admins can share the queue
 - Retrieving transaction records for reporting and monitoring
+- Reading the dashboard KPIs maintained in summary tables (see finance_kpis)
+- Reviewing transfers flagged by fraud scoring (see fraud_detection)
 
 The module interacts with the database layer for data persistence
 and uses email services to send temporary login credentials.
@@ -15,8 +18,35 @@ and uses email services to send temporary login credentials.
 
 import bcrypt
 import secrets
-from system_backend.campusEwallet_db import execute_query, fetch_one, fetch_all
+from datetime import datetime
+from system_backend.campusEwallet_db import execute_query, fetch_one, fetch_all, transaction
 from system_backend.temp_pass_email_sender import send_temp_password
+from system_backend.migrations import normalize_organization_key
+from system_backend.date_ranges import day_range, add_range_filter
+from system_backend.transaction_archive import transactions_source
+from system_backend.spending_analytics import invalidate_spending_analytics
+from system_backend.finance_kpis import get_finance_snapshot, DEFAULT_VOLUME_DAYS
+from system_backend.fraud_detection import REVIEW_DECISIONS
+from system_backend.receiver_cache import invalidate_receiver_cache
+from system_backend.approval_queue import claim_requests, release_claims, CLAIMABLE_BY, DEFAULT_CLAIM_SIZE
+
+# Compare-and-set: only one admin can move a request out of pending
+APPROVE_CASHIN = f"""
+    UPDATE cashin_requests
+    SET status = 'approved', date_processed = NOW(), claimed_by = NULL, claim_expires_at = NULL
+    WHERE request_id = %s AND status = 'pending' AND {CLAIMABLE_BY}
+"""
+DECLINE_CASHIN = (
+    "UPDATE cashin_requests SET status='rejected', decline_reason=%s, date_processed=NOW(), "
+    f"claimed_by=NULL, claim_expires_at=NULL WHERE request_id=%s AND status='pending' AND {CLAIMABLE_BY}"
+)
+CASHIN_REQUEST_AMOUNT = "SELECT user_id, amount FROM cashin_requests WHERE request_id = %s"
+CREDIT_WALLET = """
+    UPDATE wallets
+    SET balance = balance + %s
+    WHERE user_id = %s
+"""
+TRANSACTION_PAGE_SIZE = 5000
 
 class FinanceAdminWallet:
     @staticmethod
@@ -93,12 +123,13 @@ class FinanceAdminWallet:
                 "INSERT INTO wallets (user_id, balance) VALUES (%s, %s)",
                 (user_id, 0.00)
             )
+            invalidate_receiver_cache(student_id)
 
             # If student is a treasurer, create organization wallet if not existing
             if student["student_role"].lower() == "treasurer" and student["organization"]:
                 exists = fetch_one(
-                    "SELECT org_wallet_id FROM organization_wallets WHERE organization_name = %s",
-                    (student["organization"],)
+                    "SELECT org_wallet_id FROM organization_wallets WHERE organization_key = %s",
+                    (normalize_organization_key(student["organization"]),)
                 )
                 if not exists:
                     execute_query(
@@ -142,38 +173,44 @@ class FinanceAdminWallet:
             tuple: (bool, list of requests or error message)
         """
         try:
-            params = []
-
-            # Base query for cash-in requests
-            query = """
-                SELECT cr.request_id, cr.user_id, wu.student_id, es.name AS student_name,
-                       cr.amount, cr.status, cr.date_requested
-                FROM cashin_requests cr
-                JOIN wallet_users wu ON cr.user_id = wu.user_id
-                LEFT JOIN enrolled_students es ON wu.student_id = es.student_id
-                WHERE 1=1
-            """
-
-            # Filter by request status
-            if status_filter != "all":
-                query += " AND cr.status = %s"
-                params.append(status_filter)
-            
-            # Apply search filter
-            if search:
-                query += " AND (cr.request_id LIKE %s OR wu.student_id LIKE %s OR es.name LIKE %s)"
-                search_param = f"%{search}%"
-                params.extend([search_param]*3)
-            
-            # Sort newest first
-            query += " ORDER BY cr.date_requested DESC"
-
-            results = fetch_all(query, tuple(params) if params else None)
+            query, params = FinanceAdminWallet._cashin_requests_query(search, status_filter)
+            results = fetch_all(query, params)
             return True, results if results else []
 
         except Exception as e:
             return False, str(e)
 
+    @staticmethod
+    def _cashin_requests_query(search=None, status_filter="pending"):
+        """Build the get_all_cashin_requests query; returns (query, params)."""
+        params = []
+
+        # Base query for cash-in requests
+        query = """
+            SELECT cr.request_id, cr.user_id, wu.student_id, es.name AS student_name,
+                   cr.amount, cr.status, cr.date_requested
+            FROM cashin_requests cr
+            JOIN wallet_users wu ON cr.user_id = wu.user_id
+            LEFT JOIN enrolled_students es ON wu.student_id = es.student_id
+            WHERE 1=1
+        """
+
+        # Filter by request status
+        if status_filter != "all":
+            query += " AND cr.status = %s"
+            params.append(status_filter)
+
+        # Apply search filter
+        if search:
+            query += " AND (cr.request_id LIKE %s OR wu.student_id LIKE %s OR es.name LIKE %s)"
+            search_param = f"%{search}%"
+            params.extend([search_param]*3)
+
+        # Sort newest first
+        query += " ORDER BY cr.date_requested DESC"
+
+        return query, tuple(params) if params else None
+
 
     @staticmethod
     def get_all_cashout_requests(search=None, status_filter="pending"):
@@ -197,46 +234,55 @@ class FinanceAdminWallet:
                 or an error message if an exception occurs.
         """
         try:
-            params = []
-
-            # Base query for cash-out requests
-            query = """
-                SELECT cor.request_id, cor.org_wallet_id, cor.wallet_id,
-                       ow.organization_name, ow.treasurer_id, es.name AS treasurer_name,
-                       w.wallet_id AS service_wallet_id, wu.user_id AS service_user_id, wu.office_name AS service_name,
-                       cor.amount, cor.message, cor.status, cor.date_requested, cor.date_processed
-                FROM cashout_requests cor
-                LEFT JOIN organization_wallets ow ON cor.org_wallet_id = ow.org_wallet_id
-                LEFT JOIN enrolled_students es ON ow.treasurer_id = es.student_id
-                LEFT JOIN wallets w ON cor.wallet_id = w.wallet_id
-                LEFT JOIN wallet_users wu ON w.user_id = wu.user_id
-                WHERE 1=1
-            """
-
-            # Filter by status
-            if status_filter != "all":
-                query += " AND cor.status = %s"
-                params.append(status_filter)
-            
-            # Apply search filter
-            if search:
-                query += " AND (cor.request_id LIKE %s OR ow.organization_name LIKE %s OR wu.office_name LIKE %s)"
-                search_param = f"%{search}%"
-                params.extend([search_param]*3)
-            query += " ORDER BY cor.date_requested DESC"
-
-            results = fetch_all(query, tuple(params) if params else None)
-
-            # Replace missing names with N/A for display purposes
-            for r in results:
-                if r.get("org_wallet_id") and not r.get("treasurer_name"):
-                    r["treasurer_name"] = "N/A"
-                if r.get("wallet_id") and not r.get("service_name"):
-                    r["service_name"] = "N/A"
+            query, params = FinanceAdminWallet._cashout_requests_query(search, status_filter)
+            results = FinanceAdminWallet._fill_missing_names(fetch_all(query, params))
             return True, results
         except Exception as e:
             return False, str(e)
 
+    @staticmethod
+    def _cashout_requests_query(search=None, status_filter="pending"):
+        """Build the get_all_cashout_requests query; returns (query, params)."""
+        params = []
+
+        # Base query for cash-out requests
+        query = """
+            SELECT cor.request_id, cor.org_wallet_id, cor.wallet_id,
+                   ow.organization_name, ow.treasurer_id, es.name AS treasurer_name,
+                   w.wallet_id AS service_wallet_id, wu.user_id AS service_user_id, wu.office_name AS service_name,
+                   cor.amount, cor.message, cor.status, cor.date_requested, cor.date_processed
+            FROM cashout_requests cor
+            LEFT JOIN organization_wallets ow ON cor.org_wallet_id = ow.org_wallet_id
+            LEFT JOIN enrolled_students es ON ow.treasurer_id = es.student_id
+            LEFT JOIN wallets w ON cor.wallet_id = w.wallet_id
+            LEFT JOIN wallet_users wu ON w.user_id = wu.user_id
+            WHERE 1=1
+        """
+
+        # Filter by status
+        if status_filter != "all":
+            query += " AND cor.status = %s"
+            params.append(status_filter)
+
+        # Apply search filter
+        if search:
+            query += " AND (cor.request_id LIKE %s OR ow.organization_name LIKE %s OR wu.office_name LIKE %s)"
+            search_param = f"%{search}%"
+            params.extend([search_param]*3)
+        query += " ORDER BY cor.date_requested DESC"
+
+        return query, tuple(params) if params else None
+
+    @staticmethod
+    def _fill_missing_names(results):
+        """Replace missing names with N/A for display purposes."""
+        for r in results:
+            if r.get("org_wallet_id") and not r.get("treasurer_name"):
+                r["treasurer_name"] = "N/A"
+            if r.get("wallet_id") and not r.get("service_name"):
+                r["service_name"] = "N/A"
+        return results
+
 
     @staticmethod
     def approve_cashin_request(request_id, admin_user_id):
@@ -261,40 +307,26 @@ class FinanceAdminWallet:
                 if the operation fails.
         """
         try:
-            # Retrieve pending cash-in request
-            request = fetch_one("""
-                SELECT user_id, amount
-                FROM cashin_requests
-                WHERE request_id = %s AND status = 'pending'
-            """, (request_id,))
-
-            if not request:
-                return False, "Cash-In request not found or already processed."
-
-            user_id = request["user_id"]
-            amount = request["amount"]
-
-            # Add amount to user's wallet balance
-            execute_query("""
-                UPDATE wallets
-                SET balance = balance + %s
-                WHERE user_id = %s
-            """, (amount, user_id))
-
-            # Mark request as approved
-            execute_query("""
-                UPDATE cashin_requests
-                SET status = 'approved'
-                WHERE request_id = %s
-            """, (request_id,))
+            with transaction() as cursor:
+                cursor.execute(APPROVE_CASHIN, (request_id, admin_user_id))
+                if cursor.rowcount == 0:
+                    return False, "Cash-In request not found, already processed, or claimed by another admin."
+
+                cursor.execute(CASHIN_REQUEST_AMOUNT, (request_id,))
+                request = cursor.fetchone()
+                user_id = request["user_id"]
 
+                # Add amount to user's wallet balance
+                cursor.execute(CREDIT_WALLET, (request["amount"], user_id))
+
+            invalidate_spending_analytics(user_id)
             return True, "Cash-In request approved and wallet balance updated."
 
         except Exception as e:
             return False, str(e)
 
     @staticmethod
-    def decline_cashin_request(request_id, reason=None):
+    def decline_cashin_request(request_id, reason=None, admin_user_id=None):
         """
         Decline a cash-in request and optionally record a rejection reason.
 
@@ -307,6 +339,8 @@ class FinanceAdminWallet:
                 to be rejected.
             reason (str | None): Optional reason explaining why the
                 cash-in request was declined.
+            admin_user_id (str | int | None): The declining administrator;
+                requests leased to another admin cannot be declined.
 
         Returns:
             tuple:
@@ -316,11 +350,12 @@ class FinanceAdminWallet:
                 if the operation fails.
         """
         try:
-            # Reject cash-in request and record reason
-            execute_query(
-                "UPDATE cashin_requests SET status='rejected', decline_reason=%s, date_processed=NOW() WHERE request_id=%s",
-                (reason, request_id)
-            )
+            # Reject cash-in request and record reason, if it is still pending
+            cursor = execute_query(DECLINE_CASHIN, (reason, request_id, admin_user_id))
+            if cursor is None:
+                return False, "Unable to reject the Cash-In request."
+            if cursor.rowcount == 0:
+                return False, "Cash-In request not found, already processed, or claimed by another admin."
             return True, "Cash-In request rejected."
         except Exception as e:
             return False, str(e)
@@ -349,63 +384,71 @@ class FinanceAdminWallet:
                 if the operation fails.
         """
         try:
-            # Retrieve pending cash-out request
-            req = fetch_one("""
-                SELECT org_wallet_id, wallet_id, amount
-                FROM cashout_requests
-                WHERE request_id = %s AND status = 'pending'
-            """, (request_id,))
-
-            if not req:
-                return False, "Cash-Out request not found or already processed."
-
-            amount = req["amount"]
-
-            # Deduct from organization wallet
-            if req["org_wallet_id"]:
-                execute_query("""
-                    UPDATE organization_wallets
-                    SET org_wallet_balance = org_wallet_balance - %s
-                    WHERE org_wallet_id = %s
-                """, (amount, req["org_wallet_id"]))
-
-            # Deduct from service wallet
-            elif req["wallet_id"]:
-                execute_query("""
-                    UPDATE wallets
-                    SET balance = balance - %s
-                    WHERE wallet_id = %s
-                """, (amount, req["wallet_id"]))
-
-            else:
-                return False, "Invalid cash-out request."
-
-            # Mark request as approved
-            execute_query("""
-                UPDATE cashout_requests
-                SET status = 'approved'
-                WHERE request_id = %s
-            """, (request_id,))
-
+            with transaction() as cursor:
+                # Compare-and-set: only one admin can move the request out of pending
+                cursor.execute(f"""
+                    UPDATE cashout_requests
+                    SET status = 'approved', date_processed = NOW(), claimed_by = NULL, claim_expires_at = NULL
+                    WHERE request_id = %s AND status = 'pending' AND {CLAIMABLE_BY}
+                """, (request_id, admin_user_id))
+                if cursor.rowcount == 0:
+                    return False, "Cash-Out request not found, already processed, or claimed by another admin."
+
+                cursor.execute(
+                    "SELECT org_wallet_id, wallet_id, amount FROM cashout_requests WHERE request_id = %s",
+                    (request_id,)
+                )
+                req = cursor.fetchone()
+                amount = req["amount"]
+
+                # Deduct from organization wallet and settle the hold placed on request
+                if req["org_wallet_id"]:
+                    cursor.execute("""
+                        UPDATE organization_wallets
+                        SET org_wallet_balance = org_wallet_balance - %s,
+                            org_wallet_held = org_wallet_held - %s
+                        WHERE org_wallet_id = %s
+                    """, (amount, amount, req["org_wallet_id"]))
+
+                # Deduct from service wallet
+                elif req["wallet_id"]:
+                    cursor.execute("""
+                        UPDATE wallets
+                        SET balance = balance - %s
+                        WHERE wallet_id = %s AND balance >= %s
+                    """, (amount, req["wallet_id"], amount))
+                    if cursor.rowcount == 0:
+                        # Undo the status change
+                        raise ValueError("Insufficient wallet balance for this cash-out.")
+
+                else:
+                    # Undo the status change
+                    raise ValueError("Invalid cash-out request.")
+
+            if req["wallet_id"]:
+                invalidate_spending_analytics()
             return True, "Cash-Out request approved."
 
         except Exception as e:
             return False, str(e)
     
     @staticmethod
-    def decline_cashout_request(request_id, reason=None):
+    def decline_cashout_request(request_id, reason=None, admin_user_id=None):
         """
         Decline a cash-out request and optionally record a rejection reason.
 
         This method updates the specified cash-out request by marking it
         as rejected and storing an optional decline reason along with
-        the date the request was processed.
+        the date the request was processed. Funds held on an organization
+        wallet for the request are released.
 
         Parameters:
             request_id (str): The unique identifier of the cash-out request
                 to be rejected.
             reason (str | None): Optional reason explaining why the
                 cash-out request was declined.
+            admin_user_id (str | int | None): The declining administrator;
+                requests leased to another admin cannot be declined.
 
         Returns:
             tuple:
@@ -415,43 +458,299 @@ class FinanceAdminWallet:
                 if the operation fails.
         """
         try:
-            # Reject cash-out request and record reason
-            execute_query(
-                "UPDATE cashout_requests SET status='rejected', decline_reason=%s, date_processed=NOW() WHERE request_id=%s",
-                (reason, request_id)
-            )
+            with transaction() as cursor:
+                # Reject cash-out request and record reason, if it is still pending
+                cursor.execute(
+                    "UPDATE cashout_requests SET status='rejected', decline_reason=%s, date_processed=NOW(), "
+                    f"claimed_by=NULL, claim_expires_at=NULL WHERE request_id=%s AND status='pending' AND {CLAIMABLE_BY}",
+                    (reason, request_id, admin_user_id)
+                )
+                if cursor.rowcount == 0:
+                    return False, "Cash-Out request not found, already processed, or claimed by another admin."
+
+                # Release the funds held for an organization request
+                cursor.execute(
+                    "SELECT org_wallet_id, amount FROM cashout_requests WHERE request_id = %s",
+                    (request_id,)
+                )
+                req = cursor.fetchone()
+                if req["org_wallet_id"]:
+                    cursor.execute("""
+                        UPDATE organization_wallets
+                        SET org_wallet_held = org_wallet_held - %s
+                        WHERE org_wallet_id = %s
+                    """, (req["amount"], req["org_wallet_id"]))
+
             return True, "Cash-Out request rejected."
         except Exception as e:
             return False, str(e)
 
+    @staticmethod
+    def claim_cashin_requests(admin_user_id, limit=DEFAULT_CLAIM_SIZE):
+        """
+        Lease the next pending cash-in requests to an admin.
+
+        Claimed requests are hidden from other admins' claims until they
+        are processed, released, or the lease expires.
+
+        Parameters:
+            admin_user_id (str | int): The claiming finance admin.
+            limit (int): Maximum number of requests to claim.
+
+        Returns:
+            tuple: (bool, list of claimed requests or error message)
+        """
+        return claim_requests("cashin", admin_user_id, limit)
+
+    @staticmethod
+    def claim_cashout_requests(admin_user_id, limit=DEFAULT_CLAIM_SIZE):
+        """
+        Lease the next pending cash-out requests to an admin.
+
+        Parameters:
+            admin_user_id (str | int): The claiming finance admin.
+            limit (int): Maximum number of requests to claim.
+
+        Returns:
+            tuple: (bool, list of claimed requests or error message)
+        """
+        return claim_requests("cashout", admin_user_id, limit)
+
+    @staticmethod
+    def release_claimed_requests(admin_user_id):
+        """
+        Return all of an admin's unprocessed claims to the queue.
+
+        Parameters:
+            admin_user_id (str | int): The finance admin releasing claims.
+
+        Returns:
+            tuple: (bool, str) Status and feedback message.
+        """
+        ok_in, _ = release_claims("cashin", admin_user_id)
+        ok_out, _ = release_claims("cashout", admin_user_id)
+        if not (ok_in and ok_out):
+            return False, "Unable to release claimed requests."
+        return True, "Claimed requests released."
+
+    @staticmethod
+    def get_dashboard_snapshot(days=DEFAULT_VOLUME_DAYS):
+        """
+        Retrieve the campus-wide KPIs for the finance admin dashboard.
+
+        The totals come from counters maintained on every write, so this
+        does not scan the transaction or request tables.
+
+        Parameters:
+            days (int): Number of days of daily volume to include.
+
+        Returns:
+            tuple:
+                - bool: True if the KPIs were loaded, False otherwise.
+                - dict | str: The snapshot (see finance_kpis.get_finance_snapshot),
+                or an error message.
+        """
+        snapshot = get_finance_snapshot(days)
+        if snapshot is None:
+            return False, "Unable to load dashboard totals."
+        return True, snapshot
+
+    @staticmethod
+    def get_flagged_transactions(status_filter="pending"):
+        """
+        Retrieve transfers flagged by fraud scoring.
+
+        Parameters:
+            status_filter (str): Filter by review status ('pending', 'cleared', 'confirmed', 'all').
+
+        Returns:
+            tuple: (bool, list of flagged transfers or error message)
+        """
+        params = []
+        query = """
+            SELECT ft.transaction_id, ft.amount, ft.score, ft.reasons, ft.flagged_at, ft.status,
+                   ft.sender_id, sender.student_id AS sender_student_id, sender_es.name AS sender_name,
+                   ft.receiver_id, COALESCE(receiver.student_id, receiver.office_id) AS receiver_identifier,
+                   COALESCE(receiver_es.name, receiver.office_name) AS receiver_name
+            FROM flagged_transactions ft
+            JOIN wallet_users sender ON ft.sender_id = sender.user_id
+            LEFT JOIN enrolled_students sender_es ON sender.student_id = sender_es.student_id
+            JOIN wallet_users receiver ON ft.receiver_id = receiver.user_id
+            LEFT JOIN enrolled_students receiver_es ON receiver.student_id = receiver_es.student_id
+        """
+        if status_filter != "all":
+            query += " WHERE ft.status = %s"
+            params.append(status_filter)
+        query += " ORDER BY ft.flagged_at DESC"
+
+        results = fetch_all(query, tuple(params) if params else None)
+        if results is None:
+            return False, "Unable to load flagged transactions."
+        return True, results
+
+    @staticmethod
+    def review_flagged_transaction(transaction_id, decision, admin_user_id):
+        """
+        Record an admin's decision on a flagged transfer.
+
+        Parameters:
+            transaction_id (str): The flagged transfer.
+            decision (str): 'cleared' (legitimate) or 'confirmed' (fraudulent).
+            admin_user_id (int): The reviewing finance admin.
+
+        Returns:
+            tuple: (bool, str) Status and feedback message.
+        """
+        if decision not in REVIEW_DECISIONS:
+            return False, "Invalid review decision."
+
+        cursor = execute_query("""
+            UPDATE flagged_transactions
+            SET status = %s, reviewed_by = %s, reviewed_at = NOW()
+            WHERE transaction_id = %s AND status = 'pending'
+        """, (decision, admin_user_id, transaction_id))
+        if cursor is None:
+            return False, "Unable to save the review."
+        if cursor.rowcount == 0:
+            return False, "Flagged transaction not found or already reviewed."
+        return True, f"Transaction {transaction_id} marked as {decision}."
+
+    @staticmethod
+    def build_transaction_filters(filter_type=None, search=None, start_date=None, end_date=None):
+        """
+        Build the FROM/WHERE part shared by the transaction listing and export.
+
+        Parameters:
+            filter_type (str): Optional transaction type filter.
+            search (str): Optional transaction ID search.
+            start_date (str): Optional start date filter (YYYY-MM-DD), inclusive.
+            end_date (str): Optional end date filter (YYYY-MM-DD), inclusive.
+
+        Returns:
+            tuple: (str, list) SQL starting at FROM, and its parameters.
+
+        Raises:
+            ValueError: If a date filter is invalid.
+        """
+        start, end = day_range(start_date, end_date)
+
+        # Without a start date the range is unbounded, so archived months are included
+        query = f"FROM {transactions_source(start or datetime.min)} WHERE 1=1"
+        params = []
+
+        # Filter by transaction type
+        if filter_type:
+            query += " AND transaction_type=%s"
+            params.append(filter_type)
+
+        # Search by transaction ID
+        if search:
+            query += " AND transaction_id LIKE %s"
+            params.append(f"%{search}%")
+
+        # Filter by date range
+        query = add_range_filter(query, params, "created_at", start, end)
+        return query, params
+
     @staticmethod
     def get_all_transactions(filter_type=None, search=None, start_date=None, end_date=None):
         """
-        Retrieve all transactions with optional filters.
+        Retrieve all transactions with optional filters, newest first.
+
+        Date filters are applied as half-open created_at ranges over whole
+        campus-time days, so only rows inside the range are read. A start
+        date before the archive horizon also reads transactions_archive.
 
         Parameters:
             filter_type (str): Optional transaction type filter.
             search (str): Optional transaction ID search.
-            start_date (str): Optional start date filter (YYYY-MM-DD).
-            end_date (str): Optional end date filter (YYYY-MM-DD).
+            start_date (str): Optional start date filter (YYYY-MM-DD), inclusive.
+            end_date (str): Optional end date filter (YYYY-MM-DD), inclusive.
 
         Returns:
             tuple: (bool, list of transactions or error message)
         """
         try:
-            query = "SELECT * FROM transactions WHERE 1=1"
-            params = []
-            
-            # Filter by transaction type
-            if filter_type:
-                query += " AND transaction_type=%s"
-                params.append(filter_type)
-            
-            # Search by transaction ID
-            if search:
-                query += " AND transaction_id LIKE %s"
-                params.append(f"%{search}%")
+            filters, params = FinanceAdminWallet.build_transaction_filters(
+                filter_type, search, start_date, end_date
+            )
+        except ValueError as e:
+            return False, f"Invalid date filter: {e}"
+
+        try:
+            query = f"SELECT * {filters} ORDER BY created_at DESC"
             results = fetch_all(query, tuple(params) if params else None)
             return True, results if results else []
         except Exception as e:
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
+
+    @staticmethod
+    def count_transactions(filter_type=None, search=None, start_date=None, end_date=None):
+        """
+        Count the transactions matching the admin filters.
+
+        Parameters:
+            filter_type, search, start_date, end_date: As for get_all_transactions.
+
+        Returns:
+            tuple: (bool, int or error message)
+        """
+        try:
+            filters, params = FinanceAdminWallet.build_transaction_filters(
+                filter_type, search, start_date, end_date
+            )
+        except ValueError as e:
+            return False, f"Invalid date filter: {e}"
+
+        row = fetch_one(f"SELECT COUNT(*) AS total {filters}", tuple(params) if params else None)
+        if row is None:
+            return False, "Unable to count transactions."
+        return True, row["total"]
+
+    @staticmethod
+    def get_transactions_page(filter_type=None, search=None, start_date=None, end_date=None,
+                              after=None, limit=TRANSACTION_PAGE_SIZE):
+        """
+        Retrieve one page of filtered transactions, oldest first.
+
+        Pages are keyed on (created_at, transaction_id), so a client can
+        walk an export of any size without the server holding a cursor open.
+
+        Parameters:
+            filter_type, search, start_date, end_date: As for get_all_transactions.
+            after (list, optional): [created_at, transaction_id] of the last row
+                of the previous page; created_at as 'YYYY-MM-DD HH:MM:SS'.
+            limit (int): Maximum rows returned, at most TRANSACTION_PAGE_SIZE.
+
+        Returns:
+            tuple: (bool, list of transactions or error message)
+        """
+        try:
+            filters, params = FinanceAdminWallet.build_transaction_filters(
+                filter_type, search, start_date, end_date
+            )
+        except ValueError as e:
+            return False, f"Invalid date filter: {e}"
+
+        if after:
+            created_at, transaction_id = after
+            filters += " AND (created_at > %s OR (created_at = %s AND transaction_id > %s))"
+            params.extend([created_at, created_at, transaction_id])
+        params.append(max(1, min(int(limit), TRANSACTION_PAGE_SIZE)))
+
+        results = fetch_all(f"SELECT * {filters} ORDER BY created_at ASC, transaction_id ASC LIMIT %s", tuple(params))
+        if results is None:
+            return False, "Unable to load transactions."
+        return True, results
+
+    @staticmethod
+    def export_transactions(path, **options):
+        """
+        Export filtered transactions to a local file (see transaction_export).
+
+        Returns:
+            tuple: (bool, dict or str) As transaction_export.export_transactions.
+        """
+        # Imported here: transaction_export builds on this class
+        from system_backend.transaction_export import export_transactions
+        return export_transactions(path, **options)
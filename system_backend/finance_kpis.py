@@ -0,0 +1,155 @@
+"""
+Finance KPIs Module
+
+This module serves the campus-wide totals shown on the finance admin
+dashboard: money in circulation, pending cash-in and cash-out requests,
+and daily volume by transaction type.
+
+How it works:
+- finance_kpi_counters holds the running totals (wallet balances,
+  pending requests); finance_daily_volume holds the volume per day and
+  transaction type
+- Both are maintained by triggers on wallets, organization_wallets,
+  cashin_requests, cashout_requests and transactions (see migrations 0008
+  and 0018), so every write keeps them current whichever code path made it
+- Each total is spread over up to migrations.KPI_COUNTER_SLOTS rows and
+  every write adds to a random one, so concurrent transfers rarely wait
+  on each other for a counter row
+- get_finance_snapshot() sums those few rows per total, so the dashboard
+  never runs COUNT/SUM over the source tables
+- rebuild_finance_kpis() recomputes everything from the source tables if
+  the counters are ever in doubt (e.g. after restoring a backup)
+
+Usage:
+    python -m system_backend.finance_kpis rebuild
+
+Dependencies:
+- campusEwallet_db for database queries and transactions
+- date_ranges for the database time zone
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from decimal import Decimal
+from system_backend.campusEwallet_db import fetch_all, transaction
+from system_backend.date_ranges import DATABASE_TIMEZONE
+
+
+DEFAULT_VOLUME_DAYS = 7
+
+KPI_KEYS = ("student_wallets", "organization_wallets", "pending_cashin", "pending_cashout")
+
+_COUNTER_SOURCES = {
+    "student_wallets": "SELECT COUNT(*) AS n, COALESCE(SUM(balance), 0) AS total FROM wallets",
+    "organization_wallets": "SELECT COUNT(*) AS n, COALESCE(SUM(org_wallet_balance), 0) AS total FROM organization_wallets",
+    "pending_cashin": "SELECT COUNT(*) AS n, COALESCE(SUM(amount), 0) AS total FROM cashin_requests WHERE status = 'pending'",
+    "pending_cashout": "SELECT COUNT(*) AS n, COALESCE(SUM(amount), 0) AS total FROM cashout_requests WHERE status = 'pending'",
+}
+
+
+def get_finance_snapshot(days=DEFAULT_VOLUME_DAYS):
+    """
+    Return the finance dashboard KPIs.
+
+    Parameters:
+        days (int): Number of days of daily volume to include, today included.
+
+    Returns:
+        dict | None: {"money_in_circulation", "student_wallets",
+            "organization_wallets", "pending_cashin", "pending_cashout",
+            "daily_volume", "today_volume"}, or None if the counters could not be read.
+            Each counter is {"count", "amount"}; daily_volume rows are
+            {"volume_date", "transaction_type", "txn_count", "total_amount"},
+            newest day first.
+    """
+    counters = fetch_all("""
+        SELECT kpi_key, SUM(value_count) AS value_count, SUM(value_amount) AS value_amount
+        FROM finance_kpi_counters
+        GROUP BY kpi_key
+    """)
+    if counters is None:
+        return None
+
+    snapshot = {key: {"count": 0, "amount": Decimal("0")} for key in KPI_KEYS}
+    for row in counters:
+        if row["kpi_key"] in snapshot:
+            snapshot[row["kpi_key"]] = {"count": int(row["value_count"]), "amount": row["value_amount"]}
+
+    snapshot["money_in_circulation"] = (
+        snapshot["student_wallets"]["amount"] + snapshot["organization_wallets"]["amount"]
+    )
+
+    # volume_date is a database-local date
+    today = datetime.now(DATABASE_TIMEZONE).date()
+    since = today - timedelta(days=max(1, days) - 1)
+    snapshot["daily_volume"] = fetch_all("""
+        SELECT volume_date, transaction_type, SUM(txn_count) AS txn_count, SUM(total_amount) AS total_amount
+        FROM finance_daily_volume
+        WHERE volume_date >= %s
+        GROUP BY volume_date, transaction_type
+        ORDER BY volume_date DESC, transaction_type
+    """, (since,)) or []
+    for row in snapshot["daily_volume"]:
+        row["txn_count"] = int(row["txn_count"])
+    snapshot["today_volume"] = sum(
+        (row["total_amount"] for row in snapshot["daily_volume"] if row["volume_date"] == today),
+        Decimal("0")
+    )
+
+    return snapshot
+
+
+def rebuild_finance_kpis():
+    """
+    Recompute the KPI counters and daily volume from the source tables.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    try:
+        with transaction() as cursor:
+            for key, query in _COUNTER_SOURCES.items():
+                cursor.execute(query)
+                row = cursor.fetchone()
+                # The whole total goes to slot 0
+                cursor.execute("DELETE FROM finance_kpi_counters WHERE kpi_key = %s AND slot <> 0", (key,))
+                cursor.execute("""
+                    INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                    VALUES (%s, 0, %s, %s)
+                    ON DUPLICATE KEY UPDATE value_count = VALUES(value_count), value_amount = VALUES(value_amount)
+                """, (key, row["n"], row["total"]))
+
+            cursor.execute("DELETE FROM finance_daily_volume")
+            cursor.execute("""
+                INSERT INTO finance_daily_volume (volume_date, transaction_type, txn_count, total_amount)
+                SELECT volume_date, transaction_type, COUNT(*), SUM(amount)
+                FROM (
+                    SELECT DATE(created_at) AS volume_date, COALESCE(transaction_type, 'Other') AS transaction_type, amount
+                    FROM transactions WHERE status = 'completed'
+                    UNION ALL
+                    SELECT DATE(created_at), COALESCE(transaction_type, 'Other'), amount
+                    FROM transactions_archive WHERE status = 'completed'
+                    UNION ALL
+                    SELECT DATE(COALESCE(date_processed, date_requested)), 'Cash In', amount
+                    FROM cashin_requests WHERE status = 'approved'
+                    UNION ALL
+                    SELECT DATE(COALESCE(date_processed, date_requested)), 'Cash Out', amount
+                    FROM cashout_requests WHERE status = 'approved'
+                ) AS v
+                GROUP BY volume_date, transaction_type
+            """)
+
+    except Exception as e:
+        print(f"Database Error in rebuild_finance_kpis: {e}")
+        return False, f"Failed to rebuild finance KPIs: {e}"
+
+    return True, "Finance KPIs rebuilt."
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the finance dashboard KPIs.")
+    parser.add_argument("command", choices=["rebuild"])
+    args = parser.parse_args()
+
+    ok, message = rebuild_finance_kpis()
+    print(message)
@@ -0,0 +1,346 @@
+"""
+Fraud Detection Module
+
+This module scores student-to-student transfers for signs of fraud and
+puts suspicious ones in a review queue for the finance admins.
+
+Signals (all computed against the sender's recent activity):
+- velocity: too many transfers within VELOCITY_WINDOW_SECONDS
+- amount_zscore: an amount far above the sender's usual transfers
+- new_counterparty_burst: many first-time receivers within a short window
+- circular_transfer: money flowing back to the sender, directly
+  (A -> B -> A) or through one intermediary (A -> B -> X -> A)
+
+How it works:
+- Each user's recent outgoing and incoming transfers are kept in small
+  fixed-size NumPy ring buffers (RING_SIZE entries), so memory per user is
+  constant and every signal is a handful of vectorized array operations
+- Inline scoring (check_transfer, called by send_money) only touches the
+  in-memory buffers; writing a flag to the database happens on a
+  background thread, so a transfer is never slowed down or blocked
+- Batch mode (score_history) replays historical transfers through the
+  same detector to backfill the review queue, and warm_up() primes the
+  in-memory statistics after a restart without recording flags
+- Flagged transfers land in flagged_transactions with status 'pending'
+  until an admin marks them 'cleared' or 'confirmed'
+
+Usage:
+    python -m system_backend.fraud_detection backfill [--start-date D] [--end-date D]
+
+Dependencies:
+- numpy for the ring buffers and signal computations
+- campusEwallet_db for streaming history and recording flags
+"""
+
+import argparse
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import numpy as np
+from system_backend.campusEwallet_db import execute_query, stream_rows, transaction
+from system_backend.date_ranges import day_range, add_range_filter
+from system_backend.transaction_archive import transactions_source
+
+
+RING_SIZE = 64
+MAX_TRACKED_USERS = 50000
+
+VELOCITY_WINDOW_SECONDS = 600
+VELOCITY_LIMIT = 5
+ZSCORE_LIMIT = 3.0
+MIN_HISTORY_FOR_ZSCORE = 5
+NEW_COUNTERPARTY_WINDOW_SECONDS = 3600
+NEW_COUNTERPARTY_LIMIT = 3
+CIRCULAR_WINDOW_SECONDS = 86400
+
+# A transfer is flagged when the weights of its signals add up to FLAG_THRESHOLD
+SIGNAL_WEIGHTS = {
+    "velocity": 1.0,
+    "amount_zscore": 0.7,
+    "new_counterparty_burst": 0.7,
+    "circular_transfer": 1.0,
+}
+FLAG_THRESHOLD = 1.0
+
+FLAG_INSERT_BATCH_SIZE = 500
+REVIEW_DECISIONS = ("cleared", "confirmed")
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer of a user's most recent transfers in one direction.
+
+    Entries are not kept in time order; every signal works on the set of
+    entries, so only the write position has to be tracked.
+    """
+
+    __slots__ = ("times", "amounts", "parties", "size", "position")
+
+    def __init__(self, capacity=RING_SIZE):
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.amounts = np.zeros(capacity, dtype=np.float64)
+        self.parties = np.full(capacity, -1, dtype=np.int64)
+        self.size = 0
+        self.position = 0
+
+    def append(self, timestamp, amount, party):
+        """Record one transfer, overwriting the oldest entry when full."""
+        i = self.position
+        self.times[i] = timestamp
+        self.amounts[i] = amount
+        self.parties[i] = party
+        self.position = (i + 1) % len(self.times)
+        self.size = min(self.size + 1, len(self.times))
+
+    def view(self):
+        """Return (times, amounts, parties) of the valid entries."""
+        n = self.size
+        return self.times[:n], self.amounts[:n], self.parties[:n]
+
+
+class _UserActivity:
+    """Outgoing and incoming transfer buffers of one user."""
+
+    __slots__ = ("outgoing", "incoming")
+
+    def __init__(self):
+        self.outgoing = RingBuffer()
+        self.incoming = RingBuffer()
+
+
+class FraudDetector:
+    """
+    Scores transfers against per-user rolling statistics.
+
+    Parameters:
+        max_users (int): Users kept in memory; the least recently active
+            users are dropped first.
+    """
+
+    def __init__(self, max_users=MAX_TRACKED_USERS):
+        self.max_users = max_users
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _activity(self, user_id):
+        activity = self._users.get(user_id)
+        if activity is None:
+            activity = self._users[user_id] = _UserActivity()
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return activity
+
+    def _score(self, sender, receiver, receiver_id, sender_id, amount, timestamp):
+        """Compute (score, reasons) from the buffers, before recording the transfer."""
+        reasons = []
+        out_times, out_amounts, out_parties = sender.outgoing.view()
+
+        # Velocity, counting this transfer
+        velocity = int(np.count_nonzero(out_times >= timestamp - VELOCITY_WINDOW_SECONDS)) + 1
+        if velocity > VELOCITY_LIMIT:
+            reasons.append(("velocity", f"{velocity} transfers in {VELOCITY_WINDOW_SECONDS // 60} minutes"))
+
+        # Amount compared with the sender's usual transfers
+        if len(out_amounts) >= MIN_HISTORY_FOR_ZSCORE:
+            mean = out_amounts.mean()
+            spread = max(out_amounts.std(), 0.1 * mean, 1.0)
+            zscore = (amount - mean) / spread
+            if zscore > ZSCORE_LIMIT:
+                reasons.append(("amount_zscore", f"amount is {zscore:.1f} standard deviations above usual"))
+
+        # First-time receivers within the window
+        recent = out_times >= timestamp - NEW_COUNTERPARTY_WINDOW_SECONDS
+        window_parties = np.unique(np.append(out_parties[recent], receiver_id))
+        new_parties = window_parties[~np.isin(window_parties, out_parties[~recent])]
+        if len(new_parties) >= NEW_COUNTERPARTY_LIMIT:
+            reasons.append(("new_counterparty_burst", f"{len(new_parties)} new receivers within an hour"))
+
+        # Money returning to the sender via the receiver
+        since = timestamp - CIRCULAR_WINDOW_SECONDS
+        recv_times, _, recv_parties = receiver.outgoing.view()
+        receiver_sent_to = recv_parties[recv_times >= since]
+        in_times, _, in_parties = sender.incoming.view()
+        sent_to_sender = in_parties[in_times >= since]
+        if np.any(receiver_sent_to == sender_id):
+            reasons.append(("circular_transfer", "receiver recently sent money to the sender"))
+        elif np.intersect1d(receiver_sent_to, sent_to_sender).size:
+            reasons.append(("circular_transfer", "money returns to the sender through one intermediary"))
+
+        score = sum(SIGNAL_WEIGHTS[signal] for signal, _ in reasons)
+        return score, [text for _, text in reasons]
+
+    def score_and_observe(self, sender_id, receiver_id, amount, timestamp):
+        """
+        Score a transfer, then add it to both users' statistics.
+
+        Parameters:
+            sender_id (int): Sending wallet user ID.
+            receiver_id (int): Receiving wallet user ID.
+            amount (float): Transfer amount.
+            timestamp (float): Transfer time in epoch seconds.
+
+        Returns:
+            tuple: (float, list[str]) Score and the reasons behind it.
+        """
+        amount = float(amount)
+        with self._lock:
+            sender = self._activity(sender_id)
+            receiver = self._activity(receiver_id)
+            score, reasons = self._score(sender, receiver, receiver_id, sender_id, amount, timestamp)
+            sender.outgoing.append(timestamp, amount, receiver_id)
+            receiver.incoming.append(timestamp, amount, sender_id)
+        return score, reasons
+
+
+_detector = FraudDetector()
+_flag_writer = None
+_flag_writer_lock = threading.Lock()
+
+
+def _get_flag_writer():
+    """Create the background flag writer on first use."""
+    global _flag_writer
+    with _flag_writer_lock:
+        if _flag_writer is None:
+            _flag_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fraud-flags")
+        return _flag_writer
+
+
+def record_flag(transaction_id, sender_id, receiver_id, amount, score, reasons):
+    """
+    Add a transfer to the review queue (ignored if already queued).
+
+    Returns:
+        bool: True if the statement succeeded.
+    """
+    return bool(execute_query("""
+        INSERT IGNORE INTO flagged_transactions
+            (transaction_id, sender_id, receiver_id, amount, score, reasons, flagged_at, status)
+        VALUES (%s, %s, %s, %s, %s, %s, NOW(), 'pending')
+    """, (transaction_id, sender_id, receiver_id, amount, round(score, 2), "; ".join(reasons)[:255])))
+
+
+def check_transfer(transaction_id, sender_id, receiver_id, amount):
+    """
+    Score a completed transfer inline and queue it for review if suspicious.
+
+    Only in-memory statistics are used; the review queue is written on a
+    background thread. Errors are logged and never reach the caller's
+    transfer.
+
+    Parameters:
+        transaction_id (str): ID of the transfer.
+        sender_id (int): Sending wallet user ID.
+        receiver_id (int): Receiving wallet user ID.
+        amount (float): Transfer amount.
+
+    Returns:
+        tuple: (bool, float, list[str]) Flagged, score and reasons.
+    """
+    try:
+        score, reasons = _detector.score_and_observe(sender_id, receiver_id, amount, time.time())
+        flagged = score >= FLAG_THRESHOLD
+        if flagged:
+            _get_flag_writer().submit(record_flag, transaction_id, sender_id, receiver_id, amount, score, reasons)
+        return flagged, score, reasons
+
+    except Exception as e:
+        print(f"Error in check_transfer: {e}")
+        return False, 0.0, []
+
+
+def score_history(start_date=None, end_date=None, record=True, detector=None):
+    """
+    Replay completed transfers in time order through a detector.
+
+    Parameters:
+        start_date (str, optional): First day to replay (YYYY-MM-DD).
+            Replays the whole history when omitted.
+        end_date (str, optional): Last day to replay (YYYY-MM-DD).
+        record (bool): Write flagged transfers to the review queue.
+        detector (FraudDetector, optional): Detector to feed. A fresh one
+            is used by default, so a backfill does not disturb live scoring.
+
+    Returns:
+        tuple: (bool, dict or str) True and {"scored", "flagged"}, or False
+            and an error message.
+    """
+    try:
+        start, end = day_range(start_date, end_date)
+    except ValueError as e:
+        return False, f"Invalid date range: {e}"
+
+    detector = detector or FraudDetector()
+    params = []
+    query = """
+        SELECT transaction_id, sender_id, receiver_id, amount, created_at
+        FROM """ + transactions_source(start or datetime.min) + """
+        WHERE transaction_type = 'Send Money' AND status = 'completed'
+          AND sender_id IS NOT NULL AND receiver_id IS NOT NULL
+    """
+    query = add_range_filter(query, params, "created_at", start, end)
+    query += " ORDER BY created_at, transaction_id"
+
+    scored = 0
+    flagged = 0
+    pending = []
+
+    def flush():
+        with transaction() as cursor:
+            cursor.executemany("""
+                INSERT IGNORE INTO flagged_transactions
+                    (transaction_id, sender_id, receiver_id, amount, score, reasons, flagged_at, status)
+                VALUES (%s, %s, %s, %s, %s, %s, NOW(), 'pending')
+            """, pending)
+        pending.clear()
+
+    try:
+        for row in stream_rows(query, tuple(params) if params else None):
+            score, reasons = detector.score_and_observe(
+                row["sender_id"], row["receiver_id"], row["amount"], row["created_at"].timestamp()
+            )
+            scored += 1
+            if score >= FLAG_THRESHOLD:
+                flagged += 1
+                if record:
+                    pending.append((row["transaction_id"], row["sender_id"], row["receiver_id"],
+                                    row["amount"], round(score, 2), "; ".join(reasons)[:255]))
+                    if len(pending) >= FLAG_INSERT_BATCH_SIZE:
+                        flush()
+        if pending:
+            flush()
+
+    except Exception as e:
+        print(f"Database Error in score_history: {e}")
+        return False, f"Scoring stopped after {scored} transfers: {e}"
+
+    return True, {"scored": scored, "flagged": flagged}
+
+
+def warm_up(days=1):
+    """
+    Prime the live detector with recent transfers, e.g. at startup.
+
+    Parameters:
+        days (int): Number of recent days to replay.
+
+    Returns:
+        tuple: (bool, dict or str) See score_history.
+    """
+    start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    return score_history(start_date, None, record=False, detector=_detector)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the fraud review queue from transfer history.")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--start-date", default=None)
+    parser.add_argument("--end-date", default=None)
+    args = parser.parse_args()
+
+    ok, result = score_history(args.start_date, args.end_date)
+    print(f"Scored {result['scored']} transfers, flagged {result['flagged']}." if ok else result)
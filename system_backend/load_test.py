@@ -0,0 +1,543 @@
+"""
+Load Test Module
+
+This module drives the real backend classes (LoginSystem, StudentWallet,
+OrganizationWallet and FinanceAdminWallet) with many simulated users at
+once, to size hardware and find concurrency bugs before enrollment week.
+
+How it works:
+- Each virtual user is a thread running a closed loop: pick a scenario
+  from the weighted mix, run its steps one after another (the next call
+  only starts when the previous one returned), think for a random while,
+  repeat until the test duration is over
+- Scenarios are lists of steps, e.g. pay_bill = login -> balance ->
+  posted bills -> pay bill -> history; a failed step ends the scenario
+- Virtual users log in as random students and treasurers found in the
+  database; admin scenarios call FinanceAdminWallet directly with
+  admin_user_id, as the admin UI does after its own login
+- Every step is timed and classified as ok, failed (the call reported a
+  failure, e.g. "Insufficient balance."), error (it raised) or
+  id_collision (the database rejected a duplicate generated ID)
+- Console output of the backend is captured per thread, both to keep the
+  report readable and to recognize duplicate-key errors that the backend
+  only prints
+- Consistency is checked while the test runs (negative student or
+  organization balances, polled every check_interval seconds), from the
+  results (the same transaction or request ID handed out twice) and at
+  the end with a reconciliation run
+- The report has throughput, p50/p90/p95/p99 latency per step and per
+  scenario, the most frequent failure messages and all violations
+
+Run it against a test database: it moves money, posts bills and approves
+cash-in requests.
+
+Usage:
+    python -m system_backend.load_test --sqlite campus.sqlite3 --users 2000 --duration 300
+    python -m system_backend.load_test --generate 5000 --users 500 --mix pay_bill=60,send_money=40
+    python -m system_backend.load_test --users 1000 --output enrollment-week.json
+
+Dependencies:
+- campusEwallet_db for the account pool and the consistency checks
+- login, students_wallet, organization_wallet and finance_admin_wallet
+  for the simulated sessions
+- data_generator for --generate, reconciliation for the final check
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from system_backend import campusEwallet_db
+from system_backend.campusEwallet_db import fetch_all
+from system_backend.data_generator import DEFAULT_PASSWORD
+from system_backend.finance_admin_wallet import FinanceAdminWallet
+from system_backend.login import LoginSystem
+from system_backend.organization_wallet import OrganizationWallet
+from system_backend.reconciliation import run_reconciliation
+from system_backend.students_wallet import StudentWallet
+
+
+DEFAULT_USERS = 100
+DEFAULT_DURATION = 60
+DEFAULT_THINK_TIME = 1.0
+DEFAULT_CHECK_INTERVAL = 5.0
+DEFAULT_SEED = 50
+DEFAULT_ADMIN_USER_ID = 0
+
+SCENARIOS = {
+    "pay_bill": ["login", "balance", "posted_bills", "pay_bill", "history"],
+    "send_money": ["login", "balance", "send_money", "history"],
+    "cash_in": ["login", "request_funds", "cashin_history"],
+    "treasurer": ["treasurer_login", "org_balance", "post_bill", "org_transactions"],
+    "admin": ["cashin_queue", "approve_cashin"],
+}
+DEFAULT_MIX = {"pay_bill": 40, "send_money": 30, "cash_in": 10, "treasurer": 5, "admin": 15}
+
+OUTCOMES = ("ok", "failed", "error", "id_collision")
+DUPLICATE_KEY = re.compile(r"Duplicate entry|UNIQUE constraint failed|1062", re.IGNORECASE)
+PERCENTILES = {"p50_ms": 0.50, "p90_ms": 0.90, "p95_ms": 0.95, "p99_ms": 0.99}
+TOP_FAILURES = 10
+
+
+class _ThreadOutput:
+    """sys.stdout replacement keeping each thread's output apart."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = []
+        buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        """Return and clear what the calling thread printed."""
+        buffer = getattr(self._local, "buffer", None) or []
+        self._local.buffer = []
+        return "".join(buffer)
+
+
+def _succeeded(result):
+    """Tell whether a backend call reported success."""
+    if isinstance(result, tuple) and result and isinstance(result[0], bool):
+        return result[0]
+    if isinstance(result, dict) and "ok" in result:
+        return bool(result["ok"])
+    return result is not None
+
+
+def _failure_message(result):
+    if isinstance(result, tuple) and len(result) > 1:
+        return str(result[1])
+    if isinstance(result, dict):
+        return str(result.get("msg"))
+    return "No result"
+
+
+def load_accounts():
+    """
+    Return the student and treasurer accounts virtual users can log in as.
+
+    Returns:
+        tuple: (list[str] student IDs with a wallet,
+            list[str] student IDs of treasurers with an organization wallet)
+    """
+    students = fetch_all("""
+        SELECT wu.student_id
+        FROM wallet_users wu
+        JOIN wallets w ON w.user_id = wu.user_id
+        WHERE wu.student_id IS NOT NULL
+        ORDER BY wu.student_id
+    """) or []
+    treasurers = fetch_all("""
+        SELECT ow.treasurer_id
+        FROM organization_wallets ow
+        JOIN wallet_users wu ON wu.student_id = ow.treasurer_id
+        ORDER BY ow.treasurer_id
+    """) or []
+    return [row["student_id"] for row in students], [row["treasurer_id"] for row in treasurers]
+
+
+def find_negative_balances():
+    """
+    Return the wallets whose committed balance is below zero.
+
+    Organization wallets also count when more is held for pending
+    cash-outs than they contain.
+
+    Returns:
+        list[tuple]: ("user" | "org", wallet reference, balance) per wallet.
+    """
+    users = fetch_all("SELECT user_id, balance FROM wallets WHERE balance < 0") or []
+    orgs = fetch_all("""
+        SELECT org_wallet_id, org_wallet_balance - org_wallet_held AS available
+        FROM organization_wallets
+        WHERE org_wallet_balance < 0 OR org_wallet_balance - org_wallet_held < 0
+    """) or []
+    return ([("user", row["user_id"], float(row["balance"])) for row in users]
+            + [("org", row["org_wallet_id"], float(row["available"])) for row in orgs])
+
+
+class VirtualUser:
+    """
+    One simulated user running scenarios in a closed loop.
+
+    Parameters:
+        number (int): Index of the virtual user, also seeds its RNG.
+        students (list[str]): Student IDs to log in as.
+        treasurers (list[str]): Treasurer student IDs to log in as.
+        settings (dict): Shared run settings (password, admin_user_id,
+            think_time, seed, mix).
+        output (_ThreadOutput): Captured console output.
+    """
+
+    def __init__(self, number, students, treasurers, settings, output):
+        self.rng = random.Random(settings["seed"] * 100003 + number)
+        self.students = students
+        self.treasurers = treasurers
+        self.settings = settings
+        self.output = output
+        self.login_system = LoginSystem()
+        self.wallet = None
+        self.org = None
+        self.bills = []
+        self.pending = []
+        self.steps = []       # (step, seconds, outcome, message)
+        self.scenarios = []   # (scenario, seconds, completed)
+        self.issued_ids = []  # IDs returned by successful calls
+
+    # ---- Steps; each returns the backend result ----
+
+    def step_login(self):
+        result = self.login_system.login(self.rng.choice(self.students), self.settings["password"])
+        if result.get("ok"):
+            self.wallet = StudentWallet(result["data"]["user_id"])
+        return result
+
+    def step_treasurer_login(self):
+        student_id = self.rng.choice(self.treasurers)
+        result = self.login_system.login(student_id, self.settings["password"])
+        if result.get("ok"):
+            self.org = OrganizationWallet(student_id)
+        return result
+
+    def step_balance(self):
+        return self.wallet.get_balance()
+
+    def step_posted_bills(self):
+        self.bills = self.wallet.view_posted_bills() or []
+        return self.bills
+
+    def step_pay_bill(self):
+        if not self.bills:
+            return None
+        result = self.wallet.pay_organization_bill(self.rng.choice(self.bills)["bill_id"])
+        if _succeeded(result):
+            self.issued_ids.append(("transaction", result[1]["transaction_id"]))
+        return result
+
+    def step_history(self):
+        return self.wallet.view_transactions()
+
+    def step_send_money(self):
+        receiver = self.rng.choice(self.students)
+        if receiver == self.wallet.student_id:
+            return None
+        result = self.wallet.send_money(receiver, self.rng.randint(1, 50), "Load test")
+        if _succeeded(result):
+            self.issued_ids.append(("transaction", result[1]["transaction_id"]))
+        return result
+
+    def step_request_funds(self):
+        result = self.wallet.request_funds(self.rng.choice([100, 200, 500]))
+        if _succeeded(result):
+            self.issued_ids.append(("cashin_request", result[1]["request_id"]))
+        return result
+
+    def step_cashin_history(self):
+        return self.wallet.view_cashin_requests()
+
+    def step_org_balance(self):
+        return self.org.get_balance()
+
+    def step_post_bill(self):
+        return self.org.post_bill(f"Load test bill {self.rng.randrange(10 ** 6)}", "Posted by the load test",
+                                  self.rng.choice([10, 20, 50]))
+
+    def step_org_transactions(self):
+        return self.org.view_transactions()
+
+    def step_cashin_queue(self):
+        result = FinanceAdminWallet.get_all_cashin_requests()
+        self.pending = result[1] if _succeeded(result) else []
+        return result
+
+    def step_approve_cashin(self):
+        if not self.pending:
+            return None
+        request = self.rng.choice(self.pending)
+        return FinanceAdminWallet.approve_cashin_request(request["request_id"], self.settings["admin_user_id"])
+
+    # ---- Loop ----
+
+    def _run_step(self, step):
+        """Time one step; returns False if the scenario should stop."""
+        self.output.take()
+        started = time.perf_counter()
+        try:
+            result = getattr(self, f"step_{step}")()
+        except Exception as e:
+            self.steps.append((step, time.perf_counter() - started, "error", f"{type(e).__name__}: {e}"))
+            return False
+        seconds = time.perf_counter() - started
+
+        if result is None and step in ("pay_bill", "send_money", "approve_cashin"):
+            return True  # nothing to do this time (no open bill, picked oneself)
+        if _succeeded(result):
+            self.steps.append((step, seconds, "ok", None))
+            return True
+
+        printed = self.output.take()
+        outcome = "id_collision" if DUPLICATE_KEY.search(printed) else "failed"
+        self.steps.append((step, seconds, outcome, _failure_message(result)))
+        return False
+
+    def run(self, deadline, max_scenarios=None):
+        """Run scenarios until the deadline (or max_scenarios) is reached."""
+        names = list(self.settings["mix"])
+        weights = [self.settings["mix"][name] for name in names]
+        runs = 0
+        while time.monotonic() < deadline and (max_scenarios is None or runs < max_scenarios):
+            scenario = self.rng.choices(names, weights=weights)[0]
+            started = time.perf_counter()
+            completed = all(self._run_step(step) for step in SCENARIOS[scenario])
+            self.scenarios.append((scenario, time.perf_counter() - started, completed))
+            runs += 1
+
+            think = self.settings["think_time"]
+            if think:
+                time.sleep(min(self.rng.expovariate(1 / think), max(0.0, deadline - time.monotonic())))
+
+
+def _latency_summary(durations):
+    ordered = sorted(durations)
+    summary = {name: ordered[max(0, int(round(fraction * len(ordered) + 0.5)) - 1)] * 1000
+               for name, fraction in PERCENTILES.items()}
+    summary["max_ms"] = ordered[-1] * 1000
+    return summary
+
+
+def _monitor(stop, interval, negatives):
+    """Poll for negative balances until stop is set."""
+    while not stop.wait(interval):
+        for wallet in find_negative_balances():
+            negatives.setdefault(wallet[:2], wallet[2])
+
+
+def run_load_test(users=DEFAULT_USERS, duration=DEFAULT_DURATION, mix=None, think_time=DEFAULT_THINK_TIME,
+                  ramp_up=0.0, password=DEFAULT_PASSWORD, admin_user_id=DEFAULT_ADMIN_USER_ID,
+                  check_interval=DEFAULT_CHECK_INTERVAL, reconcile=True, seed=DEFAULT_SEED,
+                  max_scenarios=None):
+    """
+    Run a closed-loop load test against the configured database.
+
+    Parameters:
+        users (int): Concurrent virtual users (threads).
+        duration (float): Seconds to keep the load up, ramp-up included.
+        mix (dict, optional): {scenario: weight}; defaults to DEFAULT_MIX.
+        think_time (float): Mean pause between scenarios in seconds
+            (exponentially distributed); 0 for no pause.
+        ramp_up (float): Seconds over which the users are started.
+        password (str): Password of the student and treasurer accounts.
+        admin_user_id (int): Admin user ID used for approvals.
+        check_interval (float): Seconds between negative balance checks.
+        reconcile (bool): Run a reconciliation after the load.
+        seed (int): Random seed of the virtual users.
+        max_scenarios (int, optional): Stop each user after this many
+            scenarios, even before the duration is over.
+
+    Returns:
+        dict: The report (see format_report).
+
+    Raises:
+        ValueError: If the mix names an unknown scenario or the database
+            has no accounts for it.
+    """
+    mix = dict(DEFAULT_MIX if mix is None else mix)
+    unknown = [name for name in mix if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    students, treasurers = load_accounts()
+    if len(students) < 2:
+        raise ValueError("The database needs at least two student accounts.")
+    if mix.get("treasurer") and not treasurers:
+        raise ValueError("The treasurer scenario needs at least one organization wallet.")
+
+    settings = {"password": password, "admin_user_id": admin_user_id, "think_time": think_time,
+                "seed": seed, "mix": {name: weight for name, weight in mix.items() if weight > 0}}
+    output = _ThreadOutput()
+    virtual_users = [VirtualUser(number, students, treasurers, settings, output) for number in range(users)]
+    negatives = {}
+    stop = threading.Event()
+
+    started_at = datetime.now()
+    started = time.monotonic()
+    deadline = started + duration
+    original_stdout, sys.stdout = sys.stdout, output
+    try:
+        monitor = threading.Thread(target=_monitor, args=(stop, check_interval, negatives), daemon=True)
+        monitor.start()
+        threads = []
+        for number, user in enumerate(virtual_users):
+            delay = ramp_up * number / users if users else 0
+            thread = threading.Timer(delay, user.run, args=(deadline, max_scenarios))
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        stop.set()
+        monitor.join()
+
+        for wallet in find_negative_balances():
+            negatives.setdefault(wallet[:2], wallet[2])
+        reconciliation = run_reconciliation() if reconcile else None
+    finally:
+        sys.stdout = original_stdout
+
+    return _build_report(virtual_users, negatives, reconciliation, started_at, elapsed, users, settings["mix"])
+
+
+def _build_report(virtual_users, negatives, reconciliation, started_at, elapsed, users, mix):
+    """Merge the virtual users' records into the report dictionary."""
+    step_records, scenario_records, failures, issued = {}, {}, Counter(), Counter()
+    for user in virtual_users:
+        for step, seconds, outcome, message in user.steps:
+            step_records.setdefault(step, []).append((seconds, outcome))
+            if message:
+                failures[(step, message)] += 1
+        for scenario, seconds, completed in user.scenarios:
+            scenario_records.setdefault(scenario, []).append((seconds, completed))
+        issued.update(user.issued_ids)
+
+    steps = {}
+    for step, records in step_records.items():
+        counts = Counter(outcome for _, outcome in records)
+        steps[step] = dict({outcome: counts[outcome] for outcome in OUTCOMES}, calls=len(records),
+                           **_latency_summary([seconds for seconds, _ in records]))
+
+    scenarios = {}
+    for scenario, records in scenario_records.items():
+        completed = sum(1 for _, done in records if done)
+        scenarios[scenario] = dict(runs=len(records), completed=completed, aborted=len(records) - completed,
+                                   **_latency_summary([seconds for seconds, _ in records]))
+
+    total_steps = sum(len(records) for records in step_records.values())
+    total_scenarios = sum(len(records) for records in scenario_records.values())
+    if reconciliation is None:
+        discrepancies = None
+    elif reconciliation[0]:
+        discrepancies = len(reconciliation[1]["discrepancies"])
+    else:
+        discrepancies = reconciliation[1]
+
+    return {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "elapsed_s": elapsed,
+        "users": users,
+        "mix": mix,
+        "scenarios_completed": sum(record["completed"] for record in scenarios.values()),
+        "scenarios_per_sec": total_scenarios / elapsed if elapsed else 0.0,
+        "steps_per_sec": total_steps / elapsed if elapsed else 0.0,
+        "steps": steps,
+        "scenarios": scenarios,
+        "failures": [{"step": step, "message": message, "count": count}
+                     for (step, message), count in failures.most_common(TOP_FAILURES)],
+        "violations": {
+            "negative_balances": [{"wallet_kind": kind, "wallet_ref": ref, "balance": balance}
+                                  for (kind, ref), balance in sorted(negatives.items())],
+            "id_collisions": sum(record["id_collision"] for record in steps.values()),
+            "duplicate_ids": [{"kind": kind, "id": value} for (kind, value), count in issued.items() if count > 1],
+            "reconciliation_discrepancies": discrepancies,
+        },
+    }
+
+
+def format_report(report):
+    """
+    Render a load test report as text.
+
+    Parameters:
+        report (dict): Result of run_load_test.
+
+    Returns:
+        str: Human-readable summary.
+    """
+    lines = [
+        f"{report['users']} users, {report['elapsed_s']:.1f}s: "
+        f"{report['scenarios_per_sec']:.1f} scenarios/s, {report['steps_per_sec']:.1f} calls/s",
+        "",
+        f"{'step':18} {'calls':>8} {'failed':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    for step, stats in report["steps"].items():
+        lines.append(f"{step:18} {stats['calls']:>8} {stats['failed']:>7} "
+                     f"{stats['error'] + stats['id_collision']:>7} {stats['p50_ms']:>9.1f} "
+                     f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+    lines.append("")
+    for scenario, stats in report["scenarios"].items():
+        lines.append(f"{scenario:18} {stats['runs']:>8} runs, {stats['aborted']} aborted, "
+                     f"p95 {stats['p95_ms']:.1f} ms")
+
+    if report["failures"]:
+        lines += ["", "Most frequent failures:"]
+        lines += [f"  {row['count']:>6}  {row['step']}: {row['message']}" for row in report["failures"]]
+
+    violations = report["violations"]
+    lines += [
+        "",
+        f"Negative balances: {len(violations['negative_balances'])}",
+        f"ID collisions: {violations['id_collisions']} rejected, {len(violations['duplicate_ids'])} handed out twice",
+        f"Reconciliation discrepancies: {violations['reconciliation_discrepancies']}",
+    ]
+    return "\n".join(lines)
+
+
+def _parse_mix(text):
+    """Parse "pay_bill=60,send_money=40" into a scenario weight dict."""
+    mix = {}
+    for item in filter(None, text.split(",")):
+        name, weight = item.split("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Closed-loop load test of the wallet backend.")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds of load.")
+    parser.add_argument("--mix", default=None, help=f"Scenario weights, e.g. pay_bill=60,send_money=40. "
+                                                    f"Scenarios: {', '.join(SCENARIOS)}")
+    parser.add_argument("--think-time", type=float, default=DEFAULT_THINK_TIME)
+    parser.add_argument("--ramp-up", type=float, default=0.0)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--admin-user-id", type=int, default=DEFAULT_ADMIN_USER_ID)
+    parser.add_argument("--check-interval", type=float, default=DEFAULT_CHECK_INTERVAL)
+    parser.add_argument("--no-reconcile", action="store_true")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--sqlite", default=None, help="Run against this SQLite file instead of MySQL.")
+    parser.add_argument("--generate", type=int, default=None, metavar="STUDENTS",
+                        help="Load test a fresh in-memory database with this many generated students.")
+    parser.add_argument("--output", default=None, help="Also write the report as JSON.")
+    args = parser.parse_args()
+
+    if args.generate:
+        from system_backend.data_generator import generate_dataset
+
+        campusEwallet_db.use_sqlite()
+        generate_dataset(students=args.generate, transactions=args.generate * 20, password=args.password)
+    elif args.sqlite:
+        campusEwallet_db.use_sqlite(args.sqlite)
+
+    report = run_load_test(
+        users=args.users, duration=args.duration, mix=_parse_mix(args.mix) if args.mix else None,
+        think_time=args.think_time, ramp_up=args.ramp_up, password=args.password,
+        admin_user_id=args.admin_user_id, check_interval=args.check_interval,
+        reconcile=not args.no_reconcile, seed=args.seed,
+    )
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
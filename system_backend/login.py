@@ -16,7 +16,7 @@ Main Features:
 Security Controls:
 - Maximum login attempts before lockout
 - Time-based lockout enforcement
-- Verification codes with expiration time
+- Verification codes with expiration time and a cap on code checks
 - Minimum password length enforcement
 
 Dependencies:
@@ -36,6 +36,25 @@ from system_backend.campusEwallet_db import fetch_one, execute_query
 from system_backend.resetpass_email_sender import send_password_reset_email
 
 
+FIND_USER = """
+SELECT * FROM wallet_users
+WHERE student_id = %s OR office_id = %s
+LIMIT 1
+"""
+RESET_FAILED_ATTEMPTS = """
+UPDATE wallet_users
+SET failed_attempts = 0,
+    last_failed_time = NULL
+WHERE user_id = %s
+"""
+INCREMENT_FAILED_ATTEMPTS = """
+UPDATE wallet_users
+SET failed_attempts = failed_attempts + 1,
+    last_failed_time = NOW()
+WHERE user_id = %s
+"""
+
+
 class LoginSystem:
     """
     LoginSystem handles authentication, password reset, and account security.
@@ -46,6 +65,7 @@ class LoginSystem:
         VERIFICATION_CODE_LENGTH (int): Default length of verification codes.
         VERIFICATION_EXPIRE_MINUTES (int): Expiration time of codes in minutes.
         RESEND_COOLDOWN_SECONDS (int): Minimum wait time before resending codes.
+        MAX_CODE_ATTEMPTS (int): Code checks allowed per sent code.
         RESET_PASSWORD_WINDOW (int): Time window to complete a password reset.
         PASSWORD_MIN_LEN (int): Minimum allowed password length.
     """
@@ -55,6 +75,7 @@ class LoginSystem:
     VERIFICATION_CODE_LENGTH = 6
     VERIFICATION_EXPIRE_MINUTES = 10
     RESEND_COOLDOWN_SECONDS = 60
+    MAX_CODE_ATTEMPTS = 5
     RESET_PASSWORD_WINDOW = 5 * 60 
     PASSWORD_MIN_LEN = 8
 
@@ -122,12 +143,7 @@ class LoginSystem:
         Returns:
             dict or None: User record if found, else None.
         """
-        query = """
-        SELECT * FROM wallet_users
-        WHERE student_id = %s OR office_id = %s
-        LIMIT 1
-        """
-        return fetch_one(query, (input_id, input_id))
+        return fetch_one(FIND_USER, (input_id, input_id))
 
     def _reset_failed_attempts(self, user_id):
         """
@@ -136,13 +152,7 @@ class LoginSystem:
         Parameters:
             user_id (int): User identifier.
         """
-        query = """
-        UPDATE wallet_users
-        SET failed_attempts = 0,
-            last_failed_time = NULL
-        WHERE user_id = %s
-        """
-        execute_query(query, (user_id,))
+        execute_query(RESET_FAILED_ATTEMPTS, (user_id,))
 
     def _increment_failed_attempts(self, user_id):
         """
@@ -151,13 +161,7 @@ class LoginSystem:
         Parameters:
             user_id (int): User identifier.
         """
-        query = """
-        UPDATE wallet_users
-        SET failed_attempts = failed_attempts + 1,
-            last_failed_time = NOW()
-        WHERE user_id = %s
-        """
-        execute_query(query, (user_id,))
+        execute_query(INCREMENT_FAILED_ATTEMPTS, (user_id,))
 
     def _is_locked(self, user):
         """
@@ -169,23 +173,36 @@ class LoginSystem:
         Returns:
             tuple: (is_locked (bool), remaining_seconds (int))
         """
+        locked, secs, expired = self._lock_status(user)
+        if expired:
+            self._reset_failed_attempts(user["user_id"])
+        return locked, secs
+
+    def _lock_status(self, user):
+        """
+        Work out a user's lockout state without touching the database.
+
+        Parameters:
+            user (dict): User record.
+
+        Returns:
+            tuple: (is_locked (bool), remaining_seconds (int),
+                expired (bool) True when failed attempts should be reset)
+        """
         failed = user.get("failed_attempts") or 0
         last_failed = user.get("last_failed_time")
         if failed < self.MAX_ATTEMPTS:
-            return False, 0
+            return False, 0, False
         if last_failed is None:
-            self._reset_failed_attempts(user["user_id"])
-            return False, 0
+            return False, 0, True
 
         if isinstance(last_failed, str):
             last_failed = datetime.fromisoformat(last_failed)
 
         elapsed = (datetime.now() - last_failed).total_seconds()
         if elapsed < self.LOCKOUT_SECONDS:
-            return True, int(self.LOCKOUT_SECONDS - elapsed)
-        else:
-            self._reset_failed_attempts(user["user_id"])
-            return False, 0
+            return True, int(self.LOCKOUT_SECONDS - elapsed), False
+        return False, 0, True
 
     # Login
     def login(self, input_id, password):
@@ -209,48 +226,54 @@ class LoginSystem:
 
         if self._check_password(password, user["user_password"]):
             self._reset_failed_attempts(user["user_id"])
+            return self._login_success(user)
 
-            # Check if user has a temporary password (admin-assisted account), but skip for treasurer
-            if user.get("password_needs_change") and user["role"] != "treasurer":
-                return {
-                    "ok": True,
-                    "msg": "Login successful. You must change your temporary password.",
-                    "data": {
-                        "user_id": user["user_id"],
-                        "role": user["role"],
-                        "email": user["email"],
-                        "student_id": user.get("student_id"), # Add student_id
-                        "must_change_password": True
-                    }
-                }
+        else:
+            self._increment_failed_attempts(user["user_id"])
+            return self._login_failure(self._find_user(input_id))
 
+    def _login_success(self, user):
+        """Build the login result for a user whose password matched."""
+        # Check if user has a temporary password (admin-assisted account), but skip for treasurer
+        if user.get("password_needs_change") and user["role"] != "treasurer":
             return {
                 "ok": True,
-                "msg": "Login successful.",
+                "msg": "Login successful. You must change your temporary password.",
                 "data": {
                     "user_id": user["user_id"],
                     "role": user["role"],
                     "email": user["email"],
                     "student_id": user.get("student_id"), # Add student_id
-                    "must_change_password": False
+                    "must_change_password": True
                 }
             }
 
+        return {
+            "ok": True,
+            "msg": "Login successful.",
+            "data": {
+                "user_id": user["user_id"],
+                "role": user["role"],
+                "email": user["email"],
+                "student_id": user.get("student_id"), # Add student_id
+                "must_change_password": False
+            }
+        }
+
+    def _login_failure(self, refreshed):
+        """Build the login result after a wrong password, from the re-read user record."""
+        remaining = self.MAX_ATTEMPTS - refreshed.get("failed_attempts", 0)
+        if remaining <= 0:
+            return {
+                "ok": False,
+                "msg": f"Too many failed attempts. Account locked for {self.LOCKOUT_SECONDS} seconds."
+            }
         else:
-            self._increment_failed_attempts(user["user_id"])
-            refreshed = self._find_user(input_id)
-            remaining = self.MAX_ATTEMPTS - refreshed.get("failed_attempts", 0)
-            if remaining <= 0:
-                return {
-                    "ok": False,
-                    "msg": f"Too many failed attempts. Account locked for {self.LOCKOUT_SECONDS} seconds."
-                }
-            else:
-                return {
-                    "ok": False,
-                    "msg": "Invalid ID or password.",
-                    "data": {"remaining_attempts": remaining}
-                }
+            return {
+                "ok": False,
+                "msg": "Invalid ID or password.",
+                "data": {"remaining_attempts": remaining}
+            }
 
 
     # Forgot password
@@ -291,7 +314,8 @@ class LoginSystem:
             # update code
             query = """
             UPDATE password_resets
-            SET code = %s, resend_count = resend_count + 1, last_sent = NOW(), expires_at = %s, verified_at = NULL
+            SET code = %s, resend_count = resend_count + 1, last_sent = NOW(), expires_at = %s, verified_at = NULL,
+                code_attempts = 0
             WHERE id = %s
             """
             execute_query(query, (code, expires, existing["id"]))
@@ -341,6 +365,16 @@ class LoginSystem:
             execute_query("DELETE FROM password_resets WHERE user_id=%s", (user["user_id"],))
             return {"ok": False, "msg": "Verification code expired. Request new code."}
 
+        # Every check is counted before comparing, so parallel guesses cannot exceed the cap
+        cursor = execute_query(
+            "UPDATE password_resets SET code_attempts = code_attempts + 1 WHERE id=%s AND code_attempts < %s",
+            (reset["id"], self.MAX_CODE_ATTEMPTS)
+        )
+        if cursor is None:
+            return {"ok": False, "msg": "Unable to verify the code. Please try again."}
+        if cursor.rowcount == 0:
+            return {"ok": False, "msg": "Too many invalid codes. Request new code."}
+
         if str(reset["code"]) != str(code).strip():
             return {"ok": False, "msg": "Invalid code."}
 
@@ -0,0 +1,823 @@
+"""
+Schema Migrations Module
+
+This module keeps track of the schema changes applied on top of the base
+campusewallet_db database. Each migration is a named, ordered list of SQL
+statements. Applied migrations are recorded in the schema_migrations table
+so running the module again only applies the ones that are still missing.
+
+MySQL commits DDL statements one by one, so a migration that fails halfway
+cannot be rolled back. Every statement that succeeded is therefore recorded
+in schema_migration_steps, and a rerun continues with the failed statement
+instead of repeating (and failing on) the ones before it. Migrations listed
+in MIGRATION_CHECKS only start once their check query returns no rows.
+
+Usage:
+    python -m system_backend.migrations
+
+Dependencies:
+- campusEwallet_db for database queries and updates
+"""
+
+from system_backend.campusEwallet_db import fetch_all, execute_query
+
+
+# Rows each finance KPI counter and daily volume bucket is spread over
+# since migration 0018, so concurrent writes rarely wait on the same row
+KPI_COUNTER_SLOTS = 16
+
+
+def _kpi_slot_triggers():
+    """
+    Return the statements of migration 0018 that replace the finance KPI
+    triggers of 0008 with triggers writing to a random slot.
+
+    Each trigger is dropped and recreated on its own, so writes between
+    the two statements go uncounted; run finance_kpis rebuild afterwards
+    if the wallet was in use during the migration.
+    """
+    slot = f"FLOOR(RAND() * {KPI_COUNTER_SLOTS})"
+    add_counter = (
+        "ON DUPLICATE KEY UPDATE value_count = value_count + VALUES(value_count), "
+        "value_amount = value_amount + VALUES(value_amount)"
+    )
+    add_volume = (
+        "ON DUPLICATE KEY UPDATE txn_count = txn_count + 1, "
+        "total_amount = total_amount + VALUES(total_amount)"
+    )
+    triggers = []
+
+    # Updates that leave the balance alone (e.g. cash-out holds) skip the counter
+    for name, table, column, key in [
+        ("wallets", "wallets", "balance", "student_wallets"),
+        ("org_wallets", "organization_wallets", "org_wallet_balance", "organization_wallets"),
+    ]:
+        triggers += [
+            (f"trg_{name}_kpi_insert", f"""
+            CREATE TRIGGER trg_{name}_kpi_insert AFTER INSERT ON {table} FOR EACH ROW
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                VALUES ('{key}', {slot}, 1, NEW.{column})
+                {add_counter}
+            """),
+            (f"trg_{name}_kpi_update", f"""
+            CREATE TRIGGER trg_{name}_kpi_update AFTER UPDATE ON {table} FOR EACH ROW
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                SELECT '{key}', {slot}, 0, NEW.{column} - OLD.{column}
+                FROM DUAL
+                WHERE NEW.{column} <> OLD.{column}
+                {add_counter}
+            """),
+            (f"trg_{name}_kpi_delete", f"""
+            CREATE TRIGGER trg_{name}_kpi_delete AFTER DELETE ON {table} FOR EACH ROW
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                VALUES ('{key}', {slot}, -1, -OLD.{column})
+                {add_counter}
+            """),
+        ]
+
+    for name, table, key, volume_type in [
+        ("cashin", "cashin_requests", "pending_cashin", "Cash In"),
+        ("cashout", "cashout_requests", "pending_cashout", "Cash Out"),
+    ]:
+        triggers += [
+            (f"trg_{name}_kpi_insert", f"""
+            CREATE TRIGGER trg_{name}_kpi_insert AFTER INSERT ON {table} FOR EACH ROW
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                SELECT '{key}', {slot}, 1, NEW.amount
+                FROM DUAL
+                WHERE NEW.status = 'pending'
+                {add_counter}
+            """),
+            (f"trg_{name}_kpi_update", f"""
+            CREATE TRIGGER trg_{name}_kpi_update AFTER UPDATE ON {table} FOR EACH ROW
+            BEGIN
+                IF NEW.status = 'pending' OR OLD.status = 'pending' THEN
+                    INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                    VALUES ('{key}', {slot},
+                            (NEW.status = 'pending') - (OLD.status = 'pending'),
+                            IF(NEW.status = 'pending', NEW.amount, 0) - IF(OLD.status = 'pending', OLD.amount, 0))
+                    {add_counter};
+                END IF;
+                IF NEW.status = 'approved' AND OLD.status <> 'approved' THEN
+                    INSERT INTO finance_daily_volume (volume_date, transaction_type, slot, txn_count, total_amount)
+                    VALUES (DATE(COALESCE(NEW.date_processed, NOW())), '{volume_type}', {slot}, 1, NEW.amount)
+                    {add_volume};
+                END IF;
+            END
+            """),
+            (f"trg_{name}_kpi_delete", f"""
+            CREATE TRIGGER trg_{name}_kpi_delete AFTER DELETE ON {table} FOR EACH ROW
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                SELECT '{key}', {slot}, -1, -OLD.amount
+                FROM DUAL
+                WHERE OLD.status = 'pending'
+                {add_counter}
+            """),
+        ]
+
+    triggers.append(("trg_transactions_kpi_insert", f"""
+            CREATE TRIGGER trg_transactions_kpi_insert AFTER INSERT ON transactions FOR EACH ROW
+                INSERT INTO finance_daily_volume (volume_date, transaction_type, slot, txn_count, total_amount)
+                SELECT DATE(NEW.created_at), COALESCE(NEW.transaction_type, 'Other'), {slot}, 1, NEW.amount
+                FROM DUAL
+                WHERE NEW.status = 'completed'
+                {add_volume}
+            """))
+
+    statements = []
+    for trigger_name, create in triggers:
+        statements += [f"DROP TRIGGER IF EXISTS {trigger_name}", create]
+    return statements
+
+
+MIGRATIONS = [
+    (
+        "0001_normalized_organization_key",
+        [
+            # Normalized keys are STORED generated columns so MySQL keeps them
+            # in sync on every INSERT/UPDATE, including rows imported directly
+            # into enrolled_students by the registrar.
+            """
+            ALTER TABLE enrolled_students
+                ADD COLUMN organization_key VARCHAR(255)
+                    GENERATED ALWAYS AS (LOWER(TRIM(organization))) STORED,
+                ADD COLUMN student_role_key VARCHAR(50)
+                    GENERATED ALWAYS AS (LOWER(TRIM(student_role))) STORED
+            """,
+            """
+            ALTER TABLE organization_wallets
+                ADD COLUMN organization_key VARCHAR(255)
+                    GENERATED ALWAYS AS (LOWER(TRIM(organization_name))) STORED
+            """,
+            "CREATE INDEX idx_enrolled_students_org_role ON enrolled_students (organization_key, student_role_key)",
+            "CREATE UNIQUE INDEX idx_organization_wallets_org_key ON organization_wallets (organization_key)",
+        ],
+    ),
+    (
+        "0002_bill_collection_read_model",
+        [
+            """
+            CREATE TABLE organization_bill_stats (
+                bill_id INT PRIMARY KEY,
+                org_wallet_id INT NOT NULL,
+                paid_count INT NOT NULL DEFAULT 0,
+                total_collected DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+                last_payment_at DATETIME NULL,
+                last_transaction_id VARCHAR(50) NULL,
+                INDEX idx_bill_stats_org_wallet (org_wallet_id)
+            )
+            """,
+            """
+            CREATE TABLE organization_bill_payers (
+                bill_id INT NOT NULL,
+                paid_at DATETIME NOT NULL,
+                transaction_id VARCHAR(50) NOT NULL,
+                user_id INT NOT NULL,
+                amount DECIMAL(12, 2) NOT NULL,
+                PRIMARY KEY (bill_id, paid_at, transaction_id)
+            )
+            """,
+            # Backfill both tables from the payments made before the migration
+            """
+            INSERT INTO organization_bill_payers (bill_id, paid_at, transaction_id, user_id, amount)
+            SELECT bill_id, created_at, transaction_id, sender_id, amount
+            FROM transactions
+            WHERE transaction_type = 'Bill Payment'
+              AND status = 'completed'
+              AND bill_id IS NOT NULL
+            """,
+            """
+            INSERT INTO organization_bill_stats
+                (bill_id, org_wallet_id, paid_count, total_collected, last_payment_at)
+            SELECT ob.bill_id, ob.org_wallet_id, COUNT(*), SUM(p.amount), MAX(p.paid_at)
+            FROM organization_bill_payers p
+            JOIN organization_bills ob ON ob.bill_id = p.bill_id
+            GROUP BY ob.bill_id, ob.org_wallet_id
+            """,
+        ],
+    ),
+    (
+        "0003_targeted_organization_bills",
+        [
+            "ALTER TABLE organization_bills ADD COLUMN is_targeted TINYINT(1) NOT NULL DEFAULT 0",
+            # Clustered on (student_id, bill_id) so a student's targeted bills
+            # are one contiguous range for the unpaid-bills lookup.
+            """
+            CREATE TABLE organization_bill_audience (
+                student_id VARCHAR(20) NOT NULL,
+                bill_id INT NOT NULL,
+                PRIMARY KEY (student_id, bill_id),
+                INDEX idx_bill_audience_bill (bill_id)
+            )
+            """,
+            "CREATE INDEX idx_enrolled_students_program_section ON enrolled_students (program, section)",
+            "CREATE INDEX idx_transactions_sender_bill ON transactions (sender_id, bill_id)",
+        ],
+    ),
+    (
+        "0004_transaction_date_range_indexes",
+        [
+            "CREATE INDEX idx_transactions_created_at ON transactions (created_at)",
+            "CREATE INDEX idx_transactions_type_created_at ON transactions (transaction_type, created_at)",
+            "CREATE INDEX idx_transactions_org_wallet_created_at ON transactions (org_wallet_id, created_at)",
+        ],
+    ),
+    (
+        "0005_transaction_archive",
+        [
+            # Same columns and indexes as transactions, stored compressed
+            "CREATE TABLE transactions_archive LIKE transactions",
+            "ALTER TABLE transactions_archive ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8",
+            """
+            CREATE TABLE transaction_archive_periods (
+                period_month DATE PRIMARY KEY,
+                row_count INT NOT NULL DEFAULT 0,
+                archived_at DATETIME NOT NULL
+            )
+            """,
+            # Unpaid-bill checks read the payer read model, which is never archived
+            "CREATE INDEX idx_bill_payers_user_bill ON organization_bill_payers (user_id, bill_id)",
+        ],
+    ),
+    (
+        "0006_wallet_statement_aggregates",
+        [
+            # wallet_kind is 'user' (wallets.user_id) or 'org'
+            # (organization_wallets.org_wallet_id)
+            """
+            CREATE TABLE wallet_statement_aggregates (
+                wallet_kind VARCHAR(10) NOT NULL,
+                wallet_ref INT NOT NULL,
+                period_month DATE NOT NULL,
+                transaction_type VARCHAR(50) NOT NULL,
+                inflow DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                outflow DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                inflow_count INT NOT NULL DEFAULT 0,
+                outflow_count INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (wallet_kind, wallet_ref, period_month, transaction_type)
+            )
+            """,
+            """
+            CREATE TABLE statement_refresh_state (
+                id TINYINT PRIMARY KEY,
+                refreshed_until DATETIME NULL
+            )
+            """,
+            "INSERT INTO statement_refresh_state (id, refreshed_until) VALUES (1, NULL)",
+            "CREATE INDEX idx_cashin_requests_status_processed ON cashin_requests (status, date_processed)",
+            "CREATE INDEX idx_cashout_requests_status_processed ON cashout_requests (status, date_processed)",
+        ],
+    ),
+    (
+        "0007_wallet_reconciliation",
+        [
+            # Running ledger balance per wallet up to reconciliation_state.reconciled_until;
+            # adjustment holds differences a finance admin accepted
+            """
+            CREATE TABLE wallet_reconciliation (
+                wallet_kind VARCHAR(10) NOT NULL,
+                wallet_ref INT NOT NULL,
+                ledger_balance DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                adjustment DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                PRIMARY KEY (wallet_kind, wallet_ref)
+            )
+            """,
+            """
+            CREATE TABLE reconciliation_state (
+                id TINYINT PRIMARY KEY,
+                reconciled_until DATETIME NULL,
+                last_run_at DATETIME NULL
+            )
+            """,
+            "INSERT INTO reconciliation_state (id, reconciled_until, last_run_at) VALUES (1, NULL, NULL)",
+            """
+            CREATE TABLE reconciliation_discrepancies (
+                discrepancy_id INT AUTO_INCREMENT PRIMARY KEY,
+                run_at DATETIME NOT NULL,
+                wallet_kind VARCHAR(10) NOT NULL,
+                wallet_ref INT NOT NULL,
+                expected_balance DECIMAL(14, 2) NOT NULL,
+                stored_balance DECIMAL(14, 2) NOT NULL,
+                difference DECIMAL(14, 2) NOT NULL,
+                INDEX idx_reconciliation_discrepancies_run (run_at),
+                INDEX idx_reconciliation_discrepancies_wallet (wallet_kind, wallet_ref)
+            )
+            """,
+        ],
+    ),
+    (
+        "0008_finance_kpi_counters",
+        [
+            """
+            CREATE TABLE finance_kpi_counters (
+                kpi_key VARCHAR(50) PRIMARY KEY,
+                value_count BIGINT NOT NULL DEFAULT 0,
+                value_amount DECIMAL(16, 2) NOT NULL DEFAULT 0
+            )
+            """,
+            """
+            CREATE TABLE finance_daily_volume (
+                volume_date DATE NOT NULL,
+                transaction_type VARCHAR(50) NOT NULL,
+                txn_count INT NOT NULL DEFAULT 0,
+                total_amount DECIMAL(16, 2) NOT NULL DEFAULT 0,
+                PRIMARY KEY (volume_date, transaction_type)
+            )
+            """,
+            """
+            INSERT INTO finance_kpi_counters (kpi_key) VALUES
+                ('student_wallets'), ('organization_wallets'), ('pending_cashin'), ('pending_cashout')
+            """,
+            # Every write to the source tables adjusts the counters in the same
+            # statement, whichever code path (or manual fix) made it
+            """
+            CREATE TRIGGER trg_wallets_kpi_insert AFTER INSERT ON wallets FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_count = value_count + 1, value_amount = value_amount + NEW.balance
+                WHERE kpi_key = 'student_wallets'
+            """,
+            """
+            CREATE TRIGGER trg_wallets_kpi_update AFTER UPDATE ON wallets FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_amount = value_amount + NEW.balance - OLD.balance
+                WHERE kpi_key = 'student_wallets'
+            """,
+            """
+            CREATE TRIGGER trg_wallets_kpi_delete AFTER DELETE ON wallets FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_count = value_count - 1, value_amount = value_amount - OLD.balance
+                WHERE kpi_key = 'student_wallets'
+            """,
+            """
+            CREATE TRIGGER trg_org_wallets_kpi_insert AFTER INSERT ON organization_wallets FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_count = value_count + 1, value_amount = value_amount + NEW.org_wallet_balance
+                WHERE kpi_key = 'organization_wallets'
+            """,
+            """
+            CREATE TRIGGER trg_org_wallets_kpi_update AFTER UPDATE ON organization_wallets FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_amount = value_amount + NEW.org_wallet_balance - OLD.org_wallet_balance
+                WHERE kpi_key = 'organization_wallets'
+            """,
+            """
+            CREATE TRIGGER trg_org_wallets_kpi_delete AFTER DELETE ON organization_wallets FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_count = value_count - 1, value_amount = value_amount - OLD.org_wallet_balance
+                WHERE kpi_key = 'organization_wallets'
+            """,
+            """
+            CREATE TRIGGER trg_cashin_kpi_insert AFTER INSERT ON cashin_requests FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_count = value_count + (NEW.status = 'pending'),
+                    value_amount = value_amount + IF(NEW.status = 'pending', NEW.amount, 0)
+                WHERE kpi_key = 'pending_cashin'
+            """,
+            """
+            CREATE TRIGGER trg_cashin_kpi_update AFTER UPDATE ON cashin_requests FOR EACH ROW
+            BEGIN
+                UPDATE finance_kpi_counters
+                SET value_count = value_count + (NEW.status = 'pending') - (OLD.status = 'pending'),
+                    value_amount = value_amount + IF(NEW.status = 'pending', NEW.amount, 0)
+                                                - IF(OLD.status = 'pending', OLD.amount, 0)
+                WHERE kpi_key = 'pending_cashin';
+                IF NEW.status = 'approved' AND OLD.status <> 'approved' THEN
+                    INSERT INTO finance_daily_volume (volume_date, transaction_type, txn_count, total_amount)
+                    VALUES (DATE(COALESCE(NEW.date_processed, NOW())), 'Cash In', 1, NEW.amount)
+                    ON DUPLICATE KEY UPDATE txn_count = txn_count + 1, total_amount = total_amount + NEW.amount;
+                END IF;
+            END
+            """,
+            """
+            CREATE TRIGGER trg_cashin_kpi_delete AFTER DELETE ON cashin_requests FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_count = value_count - (OLD.status = 'pending'),
+                    value_amount = value_amount - IF(OLD.status = 'pending', OLD.amount, 0)
+                WHERE kpi_key = 'pending_cashin'
+            """,
+            """
+            CREATE TRIGGER trg_cashout_kpi_insert AFTER INSERT ON cashout_requests FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_count = value_count + (NEW.status = 'pending'),
+                    value_amount = value_amount + IF(NEW.status = 'pending', NEW.amount, 0)
+                WHERE kpi_key = 'pending_cashout'
+            """,
+            """
+            CREATE TRIGGER trg_cashout_kpi_update AFTER UPDATE ON cashout_requests FOR EACH ROW
+            BEGIN
+                UPDATE finance_kpi_counters
+                SET value_count = value_count + (NEW.status = 'pending') - (OLD.status = 'pending'),
+                    value_amount = value_amount + IF(NEW.status = 'pending', NEW.amount, 0)
+                                                - IF(OLD.status = 'pending', OLD.amount, 0)
+                WHERE kpi_key = 'pending_cashout';
+                IF NEW.status = 'approved' AND OLD.status <> 'approved' THEN
+                    INSERT INTO finance_daily_volume (volume_date, transaction_type, txn_count, total_amount)
+                    VALUES (DATE(COALESCE(NEW.date_processed, NOW())), 'Cash Out', 1, NEW.amount)
+                    ON DUPLICATE KEY UPDATE txn_count = txn_count + 1, total_amount = total_amount + NEW.amount;
+                END IF;
+            END
+            """,
+            """
+            CREATE TRIGGER trg_cashout_kpi_delete AFTER DELETE ON cashout_requests FOR EACH ROW
+                UPDATE finance_kpi_counters
+                SET value_count = value_count - (OLD.status = 'pending'),
+                    value_amount = value_amount - IF(OLD.status = 'pending', OLD.amount, 0)
+                WHERE kpi_key = 'pending_cashout'
+            """,
+            # Only inserts count: archiving copies rows into transactions_archive
+            # and removes them from transactions, which must not change the volume
+            """
+            CREATE TRIGGER trg_transactions_kpi_insert AFTER INSERT ON transactions FOR EACH ROW
+                INSERT INTO finance_daily_volume (volume_date, transaction_type, txn_count, total_amount)
+                SELECT DATE(NEW.created_at), COALESCE(NEW.transaction_type, 'Other'), 1, NEW.amount
+                FROM DUAL
+                WHERE NEW.status = 'completed'
+                ON DUPLICATE KEY UPDATE txn_count = txn_count + 1, total_amount = total_amount + NEW.amount
+            """,
+            # Backfill from the existing data
+            """
+            UPDATE finance_kpi_counters c
+            JOIN (SELECT COUNT(*) AS n, COALESCE(SUM(balance), 0) AS total FROM wallets) s
+            SET c.value_count = s.n, c.value_amount = s.total
+            WHERE c.kpi_key = 'student_wallets'
+            """,
+            """
+            UPDATE finance_kpi_counters c
+            JOIN (SELECT COUNT(*) AS n, COALESCE(SUM(org_wallet_balance), 0) AS total FROM organization_wallets) s
+            SET c.value_count = s.n, c.value_amount = s.total
+            WHERE c.kpi_key = 'organization_wallets'
+            """,
+            """
+            UPDATE finance_kpi_counters c
+            JOIN (SELECT COUNT(*) AS n, COALESCE(SUM(amount), 0) AS total FROM cashin_requests WHERE status = 'pending') s
+            SET c.value_count = s.n, c.value_amount = s.total
+            WHERE c.kpi_key = 'pending_cashin'
+            """,
+            """
+            UPDATE finance_kpi_counters c
+            JOIN (SELECT COUNT(*) AS n, COALESCE(SUM(amount), 0) AS total FROM cashout_requests WHERE status = 'pending') s
+            SET c.value_count = s.n, c.value_amount = s.total
+            WHERE c.kpi_key = 'pending_cashout'
+            """,
+            """
+            INSERT INTO finance_daily_volume (volume_date, transaction_type, txn_count, total_amount)
+            SELECT volume_date, transaction_type, COUNT(*), SUM(amount)
+            FROM (
+                SELECT DATE(created_at) AS volume_date, COALESCE(transaction_type, 'Other') AS transaction_type, amount
+                FROM transactions WHERE status = 'completed'
+                UNION ALL
+                SELECT DATE(created_at), COALESCE(transaction_type, 'Other'), amount
+                FROM transactions_archive WHERE status = 'completed'
+                UNION ALL
+                SELECT DATE(COALESCE(date_processed, date_requested)), 'Cash In', amount
+                FROM cashin_requests WHERE status = 'approved'
+                UNION ALL
+                SELECT DATE(COALESCE(date_processed, date_requested)), 'Cash Out', amount
+                FROM cashout_requests WHERE status = 'approved'
+            ) AS v
+            GROUP BY volume_date, transaction_type
+            """,
+        ],
+    ),
+    (
+        "0009_flagged_transactions",
+        [
+            # Review queue filled by fraud_detection; status is pending, cleared or confirmed
+            """
+            CREATE TABLE flagged_transactions (
+                transaction_id VARCHAR(50) PRIMARY KEY,
+                sender_id INT NOT NULL,
+                receiver_id INT NOT NULL,
+                amount DECIMAL(12, 2) NOT NULL,
+                score DECIMAL(5, 2) NOT NULL,
+                reasons VARCHAR(255) NOT NULL,
+                flagged_at DATETIME NOT NULL,
+                status ENUM('pending', 'cleared', 'confirmed') NOT NULL DEFAULT 'pending',
+                reviewed_by INT NULL,
+                reviewed_at DATETIME NULL,
+                INDEX idx_flagged_transactions_status (status, flagged_at)
+            )
+            """,
+        ],
+    ),
+    (
+        "0010_request_claims",
+        [
+            # Lease columns used by approval_queue so admins can split the pending queue
+            """
+            ALTER TABLE cashin_requests
+                ADD COLUMN claimed_by INT NULL,
+                ADD COLUMN claim_expires_at DATETIME NULL
+            """,
+            """
+            ALTER TABLE cashout_requests
+                ADD COLUMN claimed_by INT NULL,
+                ADD COLUMN claim_expires_at DATETIME NULL
+            """,
+            "CREATE INDEX idx_cashin_requests_queue ON cashin_requests (status, date_requested)",
+            "CREATE INDEX idx_cashout_requests_queue ON cashout_requests (status, date_requested)",
+        ],
+    ),
+    (
+        "0011_org_wallet_holds",
+        [
+            # Funds reserved by pending organization cash-outs; available = balance - held
+            """
+            ALTER TABLE organization_wallets
+                ADD COLUMN org_wallet_held DECIMAL(12, 2) NOT NULL DEFAULT 0
+            """,
+            """
+            UPDATE organization_wallets ow
+            JOIN (
+                SELECT org_wallet_id, SUM(amount) AS total
+                FROM cashout_requests
+                WHERE status = 'pending' AND org_wallet_id IS NOT NULL
+                GROUP BY org_wallet_id
+            ) p ON p.org_wallet_id = ow.org_wallet_id
+            SET ow.org_wallet_held = p.total
+            """,
+        ],
+    ),
+    (
+        "0012_recurring_transfers",
+        [
+            """
+            CREATE TABLE recurring_transfers (
+                schedule_id INT AUTO_INCREMENT PRIMARY KEY,
+                owner_user_id INT NOT NULL,
+                kind ENUM('send_money', 'bill_payment') NOT NULL,
+                receiver_identifier VARCHAR(50) NULL,
+                bill_id INT NULL,
+                amount DECIMAL(12, 2) NULL,
+                message VARCHAR(255) NULL,
+                interval_unit ENUM('day', 'week', 'month') NOT NULL,
+                interval_count INT NOT NULL DEFAULT 1,
+                next_run_at DATETIME NOT NULL,
+                end_at DATETIME NULL,
+                active TINYINT(1) NOT NULL DEFAULT 1,
+                failure_count INT NOT NULL DEFAULT 0,
+                last_error VARCHAR(255) NULL,
+                created_at DATETIME NOT NULL,
+                INDEX idx_recurring_transfers_due (active, next_run_at),
+                INDEX idx_recurring_transfers_owner (owner_user_id)
+            )
+            """,
+            # One row per executed occurrence; the primary key makes occurrences idempotent
+            """
+            CREATE TABLE recurring_transfer_runs (
+                schedule_id INT NOT NULL,
+                occurrence_at DATETIME NOT NULL,
+                status ENUM('pending', 'completed', 'failed') NOT NULL,
+                transaction_id VARCHAR(50) NULL,
+                detail VARCHAR(255) NULL,
+                run_at DATETIME NOT NULL,
+                PRIMARY KEY (schedule_id, occurrence_at)
+            )
+            """,
+        ],
+    ),
+    (
+        "0013_split_payments",
+        [
+            """
+            CREATE TABLE split_requests (
+                split_id INT AUTO_INCREMENT PRIMARY KEY,
+                initiator_user_id INT NOT NULL,
+                title VARCHAR(100) NOT NULL,
+                total_amount DECIMAL(12, 2) NOT NULL,
+                share_count INT NOT NULL,
+                paid_count INT NOT NULL DEFAULT 0,
+                collected_amount DECIMAL(12, 2) NOT NULL DEFAULT 0,
+                status ENUM('open', 'completed', 'cancelled') NOT NULL DEFAULT 'open',
+                created_at DATETIME NOT NULL,
+                INDEX idx_split_requests_initiator (initiator_user_id, created_at)
+            )
+            """,
+            # (payer_user_id, status) serves a student's open obligations
+            """
+            CREATE TABLE split_shares (
+                split_id INT NOT NULL,
+                payer_user_id INT NOT NULL,
+                amount DECIMAL(12, 2) NOT NULL,
+                status ENUM('pending', 'paid', 'cancelled') NOT NULL DEFAULT 'pending',
+                transaction_id VARCHAR(50) NULL,
+                paid_at DATETIME NULL,
+                PRIMARY KEY (split_id, payer_user_id),
+                INDEX idx_split_shares_payer (payer_user_id, status)
+            )
+            """,
+        ],
+    ),
+    (
+        "0014_transaction_archive_primary_key",
+        [
+            # Same key as the partitioned transactions table: transaction_id
+            # alone is not unique there, and archiving must keep both rows
+            """
+            ALTER TABLE transactions_archive
+                MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                DROP PRIMARY KEY,
+                ADD PRIMARY KEY (transaction_id, created_at)
+            """,
+        ],
+    ),
+    (
+        "0015_recurring_transfer_anchor_day",
+        [
+            # Monthly schedules are computed from the day they were set up on,
+            # so a run clamped to a short month does not move later runs
+            "ALTER TABLE recurring_transfers ADD COLUMN anchor_day TINYINT NULL AFTER interval_count",
+            "UPDATE recurring_transfers SET anchor_day = DAY(next_run_at) WHERE interval_unit = 'month'",
+        ],
+    ),
+    (
+        "0016_transaction_id_length",
+        [
+            # transfers.generate_transaction_id returns 46 characters
+            "ALTER TABLE transactions MODIFY transaction_id VARCHAR(50) NOT NULL",
+            "ALTER TABLE transactions_archive MODIFY transaction_id VARCHAR(50) NOT NULL",
+        ],
+    ),
+    (
+        "0017_password_reset_code_attempts",
+        [
+            # Checks of the current code; LoginSystem.verify_code stops at MAX_CODE_ATTEMPTS
+            "ALTER TABLE password_resets ADD COLUMN code_attempts INT NOT NULL DEFAULT 0",
+        ],
+    ),
+    (
+        "0018_finance_kpi_slots",
+        [
+            # One row per counter made every transfer, cash-in and cash-out
+            # wait on the same counter row. The existing totals become slot 0;
+            # the triggers add to a random slot (created on first use) and
+            # finance_kpis sums the slots when reading
+            """
+            ALTER TABLE finance_kpi_counters
+                ADD COLUMN slot TINYINT NOT NULL DEFAULT 0 AFTER kpi_key,
+                DROP PRIMARY KEY,
+                ADD PRIMARY KEY (kpi_key, slot)
+            """,
+            """
+            ALTER TABLE finance_daily_volume
+                ADD COLUMN slot TINYINT NOT NULL DEFAULT 0 AFTER transaction_type,
+                DROP PRIMARY KEY,
+                ADD PRIMARY KEY (volume_date, transaction_type, slot)
+            """,
+            *_kpi_slot_triggers(),
+        ],
+    ),
+]
+
+# Data that would make a migration fail halfway; (query, message) per
+# migration name. Each row the query returns is reported and blocks it.
+MIGRATION_CHECKS = {
+    # The UNIQUE organization_key index rejects names that only differ in
+    # case or surrounding spaces, which the old TRIM join tolerated
+    "0001_normalized_organization_key": (
+        """
+        SELECT LOWER(TRIM(organization_name)) AS organization_key, COUNT(*) AS wallets
+        FROM organization_wallets
+        GROUP BY LOWER(TRIM(organization_name))
+        HAVING COUNT(*) > 1
+        """,
+        "Organization wallets share a normalized name; merge or rename them first",
+    ),
+}
+
+
+def normalize_organization_key(organization_name):
+    """
+    Normalize an organization name the same way the organization_key
+    generated columns do (trimmed and lowercased).
+
+    Parameters:
+        organization_name (str | None): Organization name as entered.
+
+    Returns:
+        str | None: Normalized key, or None if no name was given.
+    """
+    if organization_name is None:
+        return None
+    return str(organization_name).strip(" ").lower()
+
+
+def _ensure_migrations_table():
+    """
+    Create the schema_migrations bookkeeping table if it does not exist.
+
+    Returns:
+        bool: True if the table is available, False otherwise.
+    """
+    ok = execute_query("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name VARCHAR(100) PRIMARY KEY,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    steps_ok = execute_query("""
+        CREATE TABLE IF NOT EXISTS schema_migration_steps (
+            name VARCHAR(100) NOT NULL,
+            step INT NOT NULL,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (name, step)
+        )
+    """)
+    return bool(ok) and bool(steps_ok)
+
+
+def get_applied_migrations():
+    """
+    Return the names of migrations that were already applied.
+
+    Returns:
+        set[str]: Applied migration names.
+    """
+    rows = fetch_all("SELECT name FROM schema_migrations")
+    return {row["name"] for row in rows} if rows else set()
+
+
+def get_completed_steps(name):
+    """
+    Return the statements of a partially applied migration that already ran.
+
+    Parameters:
+        name (str): Migration name.
+
+    Returns:
+        set[int]: Indexes into the migration's statement list.
+    """
+    rows = fetch_all("SELECT step FROM schema_migration_steps WHERE name = %s", (name,))
+    return {row["step"] for row in rows} if rows else set()
+
+
+def _check_migration(name):
+    """
+    Run the MIGRATION_CHECKS query of a migration, if it has one.
+
+    Returns:
+        bool: True if the migration can start, False (after printing the
+        offending rows) otherwise.
+    """
+    if name not in MIGRATION_CHECKS:
+        return True
+
+    query, message = MIGRATION_CHECKS[name]
+    rows = fetch_all(query)
+    if rows is None:
+        print(f"Migration {name}: pre-check failed.")
+        return False
+    if rows:
+        print(f"Migration {name}: {message}:")
+        for row in rows:
+            print("  " + ", ".join(f"{key}={value}" for key, value in row.items()))
+        return False
+    return True
+
+
+def apply_migrations():
+    """
+    Apply every pending migration in order.
+
+    Stops at the first failing statement so later migrations never run
+    on top of a partially migrated schema. Statements that succeeded are
+    recorded, so the next run resumes at the failed one.
+
+    Returns:
+        tuple: (bool, list[str]) Status and the names of the migrations
+        applied during this run.
+    """
+    if not _ensure_migrations_table():
+        return False, []
+
+    applied = get_applied_migrations()
+    newly_applied = []
+
+    for name, statements in MIGRATIONS:
+        if name in applied:
+            continue
+
+        if not _check_migration(name):
+            return False, newly_applied
+
+        completed = get_completed_steps(name)
+        for step, statement in enumerate(statements):
+            if step in completed:
+                continue
+            if not execute_query(statement):
+                print(f"Migration {name} failed at statement {step + 1} of {len(statements)}.")
+                return False, newly_applied
+            execute_query("INSERT INTO schema_migration_steps (name, step) VALUES (%s, %s)", (name, step))
+
+        execute_query("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+        newly_applied.append(name)
+
+    return True, newly_applied
+
+
+if __name__ == "__main__":
+    ok, names = apply_migrations()
+    for migration_name in names:
+        print(f"Applied {migration_name}")
+    if ok and not names:
+        print("Database schema is up to date.")
@@ -8,21 +8,27 @@ who are authorized to manage their organization’s shared funds.
 Main Responsibilities:
 - Load and validate an organization wallet linked to a treasurer
 - Display and retrieve organization wallet balances
-- Post organization bills for members to pay
+- Post organization bills for members to pay, individually or in bulk,
+  optionally targeted at an audience of enrolled students
 - View organization-related transactions and bill payments
+- Track bill collection progress and page through each bill's payers
 - Submit and track cash-out (withdrawal) requests
+- Produce monthly organization wallet statements (see statements)
 - Filter transactions and cash-out requests by status, date, or identifier
+- Cache resolved treasurer-to-wallet mappings for repeated dashboard loads
 
 Authorization Rules:
 - Only students with the role **treasurer** can access and manage
   an organization wallet
 - Wallet access is validated using the student's enrolled organization
-  and role
+  and role, matched through the indexed organization_key and
+  student_role_key columns (see migrations 0001)
 
 Data Sources:
 - enrolled_students
 - organization_wallets
-- organization_bills
+- organization_bills, organization_bill_audience
+- organization_bill_stats, organization_bill_payers (see bill_collection)
 - transactions
 - cashout_requests
 - wallet_users
@@ -30,18 +36,89 @@ Data Sources:
 Dependencies:
 - campusEwallet_db for database queries and updates
 - datetime for timestamp and request ID generation
+- date_ranges for index-friendly, time-zone-aware date filters
 - CTkMessagebox for GUI error feedback during login
 
 This module is intended to be used by backend services and GUI controllers
 that require organization wallet functionality.
 """
 
-from system_backend.campusEwallet_db import fetch_one, fetch_all, execute_query
+from system_backend.campusEwallet_db import fetch_one, fetch_all, execute_query, transaction, register_query
+from system_backend.migrations import normalize_organization_key
+from system_backend.date_ranges import day_range, add_range_filter
+from system_backend.transaction_archive import transactions_source
+from system_backend.bill_collection import get_collection_progress, get_bill_payers, DEFAULT_ROSTER_PAGE_SIZE
+from system_backend.statements import get_statement
 from datetime import datetime
 import random
+import time
 from CTkMessagebox import CTkMessagebox
 
 
+# Bulk bill posting limits
+MAX_BILLS_PER_POST = 200
+AUDIENCE_STUDENT_ID_CHUNK = 1000
+
+# Resolved treasurer -> organization wallet mappings, keyed by student_id.
+# Only the wallet identity is cached; balances are always read fresh.
+ORG_WALLET_CACHE_TTL_SECONDS = 300
+_org_wallet_cache = {}
+
+# Balance re-read on every cache hit; runs prepared (see campusEwallet_db).
+# The treasurer role and organization are re-checked too, so a demoted or
+# moved treasurer loses access at once instead of when the entry expires.
+ORG_WALLET_BALANCE = register_query("org_wallet.balance", """
+    SELECT ow.org_wallet_balance, ow.org_wallet_held
+    FROM organization_wallets ow
+    JOIN enrolled_students es
+    ON es.organization_key = ow.organization_key
+    WHERE ow.org_wallet_id = %s
+    AND es.student_id = %s
+    AND es.student_role_key = 'treasurer'
+""")
+ORG_WALLET_LOOKUP = """
+    SELECT es.student_id, 
+        es.name, 
+        es.student_role AS role, 
+        TRIM(es.organization) AS organization_name,
+        ow.org_wallet_id, 
+        ow.org_wallet_balance,
+        ow.org_wallet_held
+    FROM enrolled_students es
+    JOIN organization_wallets ow
+    ON ow.organization_key = es.organization_key
+    WHERE es.student_id = %s
+    AND es.student_role_key = 'treasurer'
+    LIMIT 1
+"""
+
+# Cash-out requests reserve funds with a conditional update (the balance check)
+HOLD_CASH_OUT = """
+    UPDATE organization_wallets
+    SET org_wallet_held = org_wallet_held + %s
+    WHERE org_wallet_id = %s AND org_wallet_balance - org_wallet_held >= %s
+"""
+INSERT_CASH_OUT_REQUEST = """
+    INSERT INTO cashout_requests
+        (request_id, org_wallet_id, amount, message, status, date_requested)
+    VALUES (%s, %s, %s, %s, 'pending', NOW())
+"""
+
+
+def invalidate_org_wallet_cache(student_id=None):
+    """
+    Drop cached organization wallet resolutions.
+
+    Parameters:
+        student_id (str, optional): Only drop the entry for this student.
+            Clears the whole cache when omitted.
+    """
+    if student_id is None:
+        _org_wallet_cache.clear()
+    else:
+        _org_wallet_cache.pop(str(student_id).strip(), None)
+
+
 class OrganizationWallet:
     """
         Initialize the OrganizationWallet instance.
@@ -58,33 +135,45 @@ class OrganizationWallet:
         """
         Load organization wallet info for the current student if they are a treasurer.
         Returns a dict with wallet and student info, or None if not found.
+        Resolved wallets are cached per student; cache hits only re-read the balance
+        and re-check the treasurer role.
 
         Returns:
             dict or None: Dictionary containing student and wallet info if found,
             None if the wallet cannot be loaded or user is unauthorized.
         """
-        query = """
-            SELECT es.student_id, 
-                es.name, 
-                es.student_role AS role, 
-                TRIM(es.organization) AS organization_name,
-                ow.org_wallet_id, 
-                ow.org_wallet_balance
-            FROM enrolled_students es
-            JOIN organization_wallets ow
-            ON TRIM(es.organization) = TRIM(ow.organization_name)
-            WHERE es.student_id = %s
-            AND LOWER(TRIM(es.student_role)) = 'treasurer'
-            LIMIT 1
-        """
-        row = fetch_one(query, (self.student_id,))
-
-        # Debug output to check the fetched row
-        if row:
-            print("DEBUG row:", row)
-            print("Student ID:", row.get("student_id"))
-            print("Wallet ID:", row.get("org_wallet_id"))
+        cached = self._cached_wallet_info()
+        if cached:
+            # Wallet identity is known, only the balance needs a primary key read
+            row = self._with_balance(
+                cached, fetch_one(ORG_WALLET_BALANCE, (cached["org_wallet_id"], self.student_id))
+            )
+            if row:
+                return row
+
+        return self._remember_wallet(fetch_one(ORG_WALLET_LOOKUP, (self.student_id,)))
+
+    def _cached_wallet_info(self):
+        """Return the cached wallet identity for this student, or None."""
+        cached = _org_wallet_cache.get(self.student_id)
+        if cached and cached["expires_at"] > time.time():
+            return cached["info"]
+        return None
+
+    def _with_balance(self, info, balance_row):
+        """Merge a fresh balance into cached wallet info; drops the cache entry if the wallet is gone
+        or the student is no longer its treasurer."""
+        if not balance_row:
+            _org_wallet_cache.pop(self.student_id, None)
+            return None
+        row = dict(info)
+        row["org_wallet_balance"] = balance_row["org_wallet_balance"]
+        row["org_wallet_held"] = balance_row.get("org_wallet_held", 0)
+        self.org_wallet_id = row["org_wallet_id"]
+        return row
 
+    def _remember_wallet(self, row):
+        """Record a freshly looked-up wallet (ORG_WALLET_LOOKUP row) and cache its identity."""
         # If no wallet found, reset org_wallet_id
         if not row:
             self.org_wallet_id = None
@@ -92,6 +181,11 @@ class OrganizationWallet:
 
         # Set wallet ID if found
         self.org_wallet_id = row["org_wallet_id"]
+        _org_wallet_cache[self.student_id] = {
+            "info": {key: value for key, value in row.items()
+                     if key not in ("org_wallet_balance", "org_wallet_held")},
+            "expires_at": time.time() + ORG_WALLET_CACHE_TTL_SECONDS
+        }
         return row
 
 
@@ -101,17 +195,26 @@ class OrganizationWallet:
         Returns None if wallet cannot be loaded.
 
         Returns:
-            dict or None: Dictionary containing student name, role, organization, and balance. None if wallet cannot be loaded.
+            dict or None: Dictionary containing student name, role, organization, balance,
+            the amount held by pending cash-outs and the available balance. None if wallet cannot be loaded.
         """
-        info = self._load_org_wallet()
+        return self._balance_summary(self._load_org_wallet())
+
+    @staticmethod
+    def _balance_summary(info):
+        """Shape loaded wallet info as display_balance returns it."""
         if not info:
             return None
 
+        balance = float(info.get("org_wallet_balance", 0.0))
+        held = float(info.get("org_wallet_held") or 0.0)
         return {
             "student_name": info.get("name", "Unknown"),
             "role": info.get("role", "Unknown"),
             "organization_name": info.get("organization_name", "Unknown"),
-            "balance": float(info.get("org_wallet_balance", 0.0))
+            "balance": balance,
+            "held": held,
+            "available_balance": balance - held
         }
 
     
@@ -130,7 +233,7 @@ class OrganizationWallet:
 
 
    
-    def post_bill(self, title, description, amount):
+    def post_bill(self, title, description, amount, audience=None):
         """
         Allows a treasurer to post a new bill for their organization.
         Validates title and amount before inserting into the database.
@@ -139,10 +242,23 @@ class OrganizationWallet:
             title (str): Title of the bill.
             description (str): Description or details of the bill.
             amount (float): Amount to be paid.
+            audience (list, optional): Audience selectors limiting who sees the
+                bill (see post_bills). Every student sees the bill when omitted.
 
         Returns:
             tuple: (bool, str) Status of the operation and message.
         """
+        if audience:
+            ok, result = self.post_bills([{
+                "title": title,
+                "description": description,
+                "amount": amount,
+                "audience": audience
+            }])
+            if not ok:
+                return False, result
+            return True, f"Bill '{title}' posted successfully to {result[0]['audience_size']} students."
+
         if not self.org_wallet_id:
             # Ensure wallet is loaded
             if not self._load_org_wallet():
@@ -169,6 +285,160 @@ class OrganizationWallet:
             return True, f"Bill '{title}' posted successfully."
         return False, "Failed to post bill."
 
+
+    def post_bills(self, bills):
+        """
+        Post many bills at once, e.g. a whole term's fees, in one transaction.
+
+        Each bill is a dict with "title", "description", "amount" and an
+        optional "audience". An audience is a list of selectors; a student
+        sees the bill if any selector matches them:
+            {"organization": "CS Society", "program": "BSCS", "section": "2A"}
+                members of enrolled_students matching every given field
+            {"student_ids": ["24-00001", "24-00002", ...]}
+                an explicit list of enrolled students
+        Bills without an audience are visible to every student.
+
+        Audience rows are written set-based (INSERT ... SELECT from
+        enrolled_students, explicit lists in chunks) so a bill can target
+        tens of thousands of students in a handful of statements.
+
+        Parameters:
+            bills (list[dict]): Bills to post.
+
+        Returns:
+            tuple: (bool, list or str) True and one result per bill
+                (bill_id, title, audience_size), or False and an error message.
+        """
+        if not self.org_wallet_id:
+            if not self._load_org_wallet():
+                return False, "You are not authorized to post bills. Only organization treasurers can post bills."
+
+        if not bills:
+            return False, "No bills to post."
+        if len(bills) > MAX_BILLS_PER_POST:
+            return False, f"Too many bills. Post at most {MAX_BILLS_PER_POST} at a time."
+
+        # Validate everything up front so a bad row never leaves a partial post
+        prepared = []
+        for index, bill in enumerate(bills, start=1):
+            title = (bill.get("title") or "").strip()
+            if not title:
+                return False, f"Bill #{index}: Title is required."
+            try:
+                amount = float(bill.get("amount"))
+            except (TypeError, ValueError):
+                return False, f"Bill #{index}: Invalid amount."
+            if amount <= 0:
+                return False, f"Bill #{index}: Amount must be greater than zero."
+
+            ok, audience = self._normalize_audience(bill.get("audience"))
+            if not ok:
+                return False, f"Bill #{index}: {audience}"
+
+            prepared.append((title, bill.get("description"), amount, audience))
+
+        results = []
+        try:
+            with transaction() as cursor:
+                for title, description, amount, audience in prepared:
+                    cursor.execute("""
+                        INSERT INTO organization_bills
+                            (org_wallet_id, title, description, amount, is_targeted)
+                        VALUES (%s, %s, %s, %s, %s)
+                    """, (self.org_wallet_id, title, description, amount, 1 if audience else 0))
+                    bill_id = cursor.lastrowid
+
+                    audience_size = self._insert_bill_audience(cursor, bill_id, audience) if audience else None
+                    results.append({"bill_id": bill_id, "title": title, "audience_size": audience_size})
+
+        except Exception as e:
+            print(f"Database Error in post_bills: {e}")
+            return False, "Failed to post bills."
+
+        return True, results
+
+
+    @staticmethod
+    def _normalize_audience(audience):
+        """
+        Validate audience selectors and normalize them for insertion.
+
+        Parameters:
+            audience (list | dict | None): Audience selectors from post_bills.
+
+        Returns:
+            tuple: (bool, list or str) Normalized selectors (empty for
+                "everyone"), or False and an error message.
+        """
+        if not audience:
+            return True, []
+        if isinstance(audience, dict):
+            audience = [audience]
+
+        normalized = []
+        for selector in audience:
+            student_ids = selector.get("student_ids")
+            if student_ids:
+                ids = sorted({str(sid).strip() for sid in student_ids if str(sid).strip()})
+                if ids:
+                    normalized.append({"student_ids": ids})
+                continue
+
+            fields = {
+                "organization_key": normalize_organization_key(selector.get("organization")) or None,
+                "program": (selector.get("program") or "").strip() or None,
+                "section": (selector.get("section") or "").strip() or None,
+            }
+            fields = {column: value for column, value in fields.items() if value}
+            if not fields:
+                return False, "Audience selectors need an organization, program, section or student_ids."
+            normalized.append(fields)
+
+        if not normalized:
+            return False, "Audience is empty."
+        return True, normalized
+
+
+    @staticmethod
+    def _insert_bill_audience(cursor, bill_id, audience):
+        """
+        Insert the audience rows of one bill inside the posting transaction.
+
+        Parameters:
+            cursor: Cursor bound to the open posting transaction.
+            bill_id (int): Newly inserted bill.
+            audience (list[dict]): Normalized selectors from _normalize_audience.
+
+        Returns:
+            int: Number of students the bill was targeted at.
+        """
+        for selector in audience:
+            if "student_ids" in selector:
+                ids = selector["student_ids"]
+                for start in range(0, len(ids), AUDIENCE_STUDENT_ID_CHUNK):
+                    chunk = ids[start:start + AUDIENCE_STUDENT_ID_CHUNK]
+                    placeholders = ", ".join(["%s"] * len(chunk))
+                    cursor.execute(
+                        "INSERT IGNORE INTO organization_bill_audience (student_id, bill_id) "
+                        f"SELECT student_id, %s FROM enrolled_students WHERE student_id IN ({placeholders})",
+                        (bill_id, *chunk)
+                    )
+                continue
+
+            conditions = " AND ".join(f"{column} = %s" for column in selector)
+            cursor.execute(
+                "INSERT IGNORE INTO organization_bill_audience (student_id, bill_id) "
+                f"SELECT student_id, %s FROM enrolled_students WHERE {conditions}",
+                (bill_id, *selector.values())
+            )
+
+        cursor.execute(
+            "SELECT COUNT(*) AS audience_size FROM organization_bill_audience WHERE bill_id = %s",
+            (bill_id,)
+        )
+        return cursor.fetchone()["audience_size"]
+
    
     def view_transactions(self, bill_title=None, sort_by="date"):
         """
@@ -216,11 +486,50 @@ class OrganizationWallet:
 
         return fetch_all(query, tuple(params))
 
+
+    def view_bill_collection_progress(self, bill_id=None):
+        """
+        View how much of each organization bill has been collected.
+        Served from the organization_bill_stats read model.
+
+        Parameters:
+            bill_id (int, optional): Only return progress for this bill.
+
+        Returns:
+            list: Bills with paid_count, total_collected and last_payment_at.
+        """
+        if not self.org_wallet_id:
+            if not self._load_org_wallet():
+                return []
+
+        return get_collection_progress(self.org_wallet_id, bill_id)
+
+
+    def view_bill_payers(self, bill_id, page_size=DEFAULT_ROSTER_PAGE_SIZE, after=None):
+        """
+        View one page of the students who paid a bill, newest first.
+
+        Parameters:
+            bill_id (int): Bill to list payers for.
+            page_size (int, optional): Number of payers per page.
+            after (tuple, optional): next_cursor from the previous page.
+
+        Returns:
+            dict: {"payers": list, "next_cursor": tuple or None}
+        """
+        if not self.org_wallet_id:
+            if not self._load_org_wallet():
+                return {"payers": [], "next_cursor": None}
+
+        return get_bill_payers(self.org_wallet_id, bill_id, page_size, after)
+
     
     def request_cash_out(self, amount, message=None):
         """
         Submit a cash-out (withdrawal) request for the organization wallet.
         Generates a unique request ID and inserts it into cashout_requests.
+        The amount is held on the wallet until the request is approved
+        (the hold is settled) or declined (the hold is released).
 
         Parameters:
             amount (float): Amount to withdraw.
@@ -244,15 +553,21 @@ class OrganizationWallet:
 
         # Generate unique request ID
         request_id = f"REQ-{datetime.now().strftime('%Y%m%d')}-{random.randint(10000,99999)}"
-        query = """
-            INSERT INTO cashout_requests
-                (request_id, org_wallet_id, amount, message, status, date_requested)
-            VALUES (%s, %s, %s, %s, 'pending', NOW())
-        """
-        ok = execute_query(query, (request_id, self.org_wallet_id, amount, message))
-        if ok:
-            return True, f"Cash-out request submitted. ID: {request_id}"
-        return False, "Failed to submit cash-out request."
+        try:
+            with transaction() as cursor:
+                # Reserve the funds; the conditional update is the balance check,
+                # so concurrent requests can never hold more than the balance
+                cursor.execute(HOLD_CASH_OUT, (amount, self.org_wallet_id, amount))
+                if cursor.rowcount == 0:
+                    return False, "Insufficient available balance. Funds held by pending cash-outs cannot be requested again."
+
+                cursor.execute(INSERT_CASH_OUT_REQUEST, (request_id, self.org_wallet_id, amount, message))
+
+        except Exception as e:
+            print(f"Database Error in request_cash_out: {e}")
+            return False, "Failed to submit cash-out request."
+
+        return True, f"Cash-out request submitted. ID: {request_id}"
 
     
     def view_cash_out_requests(self, request_id_search=None, status_filter=None):
@@ -271,6 +586,11 @@ class OrganizationWallet:
             if not self._load_org_wallet():
                 return []
 
+        query, params = self._cash_out_requests_query(request_id_search, status_filter)
+        return fetch_all(query, params)
+
+    def _cash_out_requests_query(self, request_id_search=None, status_filter=None):
+        """Build the view_cash_out_requests query; returns (query, params)."""
         query = """
             SELECT request_id, amount, message, status,
                    date_requested, date_processed
@@ -290,7 +610,7 @@ class OrganizationWallet:
             params.append(status_filter.lower())
 
         query += " ORDER BY date_requested DESC"
-        return fetch_all(query, tuple(params))
+        return query, tuple(params)
 
     def org_transaction(self, sender_id_search=None, date_filter=None):
         """
@@ -299,7 +619,8 @@ class OrganizationWallet:
 
         Parameters:
             sender_id_search (str, optional): Filter by sender ID.
-            date_filter (str, optional): Filter by transaction date (YYYY-MM-DD).
+            date_filter (str, optional): Filter by transaction date (YYYY-MM-DD),
+                matched as a campus-time day range on created_at.
 
         Returns:
             list: List of transaction dictionaries.
@@ -308,11 +629,16 @@ class OrganizationWallet:
             if not self._load_org_wallet():
                 return []
 
+        try:
+            start, end = day_range(date_filter, date_filter) if date_filter else (None, None)
+        except ValueError:
+            return []
+
         query = """
             SELECT transaction_id, sender_id, receiver_id, service_id,
                 amount, transaction_type, service_paid_for,
                 created_at, status, message, bill_id
-            FROM transactions
+            FROM """ + transactions_source(start) + """
             WHERE org_wallet_id = %s
             AND (transaction_type IS NULL OR transaction_type = '')
         """
@@ -323,14 +649,29 @@ class OrganizationWallet:
             query += " AND sender_id = %s"
             params.append(sender_id_search)
 
-        if date_filter:
-            query += " AND DATE(created_at) = %s"
-            params.append(date_filter)
+        query = add_range_filter(query, params, "created_at", start, end)
 
         query += " ORDER BY created_at DESC"
         return fetch_all(query, tuple(params))
 
 
+    def view_monthly_statement(self, period):
+        """
+        Return the organization wallet statement for one month.
+
+        Parameters:
+            period (str): Statement month (YYYY-MM).
+
+        Returns:
+            tuple: (bool, dict or str) True and the statement, or False and an error message.
+        """
+        if not self.org_wallet_id:
+            if not self._load_org_wallet():
+                return False, "Organization wallet not found."
+
+        return get_statement("org", self.org_wallet_id, period, refresh=False)
+
+
 def login_user(email, password):
     """
     Authenticate a user by email and password.
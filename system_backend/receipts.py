@@ -0,0 +1,312 @@
+"""
+Receipts Module
+
+This module renders transaction receipts as images for the Campus E-Wallet
+system, from the results of StudentWallet.send_money and
+StudentWallet.pay_organization_bill or from transaction history rows.
+
+How it works:
+- Fonts and the blank receipt template are loaded once and cached
+- Receipt content is hashed (SHA-256); identical receipts map to the same
+  file and are rendered only once, even when requested concurrently
+- Rendering runs on a shared worker pool so the UI thread never blocks
+- Batch mode renders every transaction of a period into one multi-page PDF,
+  reusing the cached receipt files and appending PDF_CHUNK_PAGES pages at
+  a time so memory use does not grow with the number of receipts
+
+Receipts are written to RECEIPTS_DIR (a "receipts" folder in the project
+root by default).
+
+Dependencies:
+- PIL (Image, ImageDraw, ImageFont) for rendering
+- concurrent.futures for the worker pool
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+
+
+RECEIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "receipts")
+
+RECEIPT_SIZE = (600, 820)
+RECEIPT_MARGIN = 40
+HEADER_HEIGHT = 120
+HEADER_COLOR = "#4CAF50"
+TEXT_COLOR = "#333333"
+MUTED_COLOR = "#777777"
+
+# TrueType fonts tried in order; Pillow's bundled font is the fallback
+FONT_CANDIDATES = {
+    False: ["arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf"],
+    True: ["arialbd.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf"],
+}
+
+RENDER_WORKERS = 4
+PDF_CHUNK_PAGES = 25
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def load_font(size, bold=False):
+    """
+    Load a font once per (size, weight).
+
+    Parameters:
+        size (int): Font size in pixels.
+        bold (bool): Use the bold variant.
+
+    Returns:
+        ImageFont.FreeTypeFont: Cached font object.
+    """
+    for name in FONT_CANDIDATES[bold]:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=1)
+def _receipt_template():
+    """
+    Build the blank receipt (background, header band, title) once.
+
+    Returns:
+        Image.Image: Template image; callers must copy() it before drawing.
+    """
+    image = Image.new("RGB", RECEIPT_SIZE, "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, RECEIPT_SIZE[0], HEADER_HEIGHT], fill=HEADER_COLOR)
+    draw.text((RECEIPT_MARGIN, 30), "Campus E-Wallet", font=load_font(34, bold=True), fill="white")
+    draw.text((RECEIPT_MARGIN, 75), "Transaction Receipt", font=load_font(20), fill="white")
+    draw.text(
+        (RECEIPT_MARGIN, RECEIPT_SIZE[1] - 60),
+        "This receipt was generated electronically and needs no signature.",
+        font=load_font(14), fill=MUTED_COLOR
+    )
+    return image
+
+
+def _format_amount(amount):
+    """Format an amount the way the dashboards show it."""
+    return f"PHP {float(amount):,.2f}"
+
+
+def _format_timestamp(value):
+    """Format datetimes consistently; strings are passed through."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value) if value else ""
+
+
+def receipt_fields(result):
+    """
+    Turn a transaction result or history row into receipt lines.
+
+    Accepts the dict returned by send_money, the dict returned by
+    pay_organization_bill, or a row from StudentWallet.view_transactions.
+
+    Parameters:
+        result (dict): Transaction data.
+
+    Returns:
+        list[tuple]: Ordered (label, value) pairs shown on the receipt.
+    """
+    if result.get("transaction_type"):
+        transaction_type = result["transaction_type"]
+    elif result.get("organization"):
+        transaction_type = "Bill Payment"
+    else:
+        transaction_type = "Send Money"
+
+    receiver = (
+        result.get("organization")
+        or result.get("receiver_name")
+        or result.get("receiver_office_name")
+        or result.get("receiver_student_id")
+        or result.get("receiver_office_id")
+        or ""
+    )
+
+    fields = [
+        ("Transaction ID", result.get("transaction_id", "")),
+        ("Date", _format_timestamp(result.get("timestamp") or result.get("created_at"))),
+        ("Type", transaction_type),
+    ]
+    if result.get("sender_name"):
+        fields.append(("From", result["sender_name"]))
+    if receiver:
+        fields.append(("To", str(receiver)))
+    fields.append(("Amount", _format_amount(result.get("amount", 0))))
+    fields.append(("Status", str(result.get("status") or "completed").capitalize()))
+    if result.get("message"):
+        fields.append(("Message", str(result["message"])))
+    return fields
+
+
+def receipt_hash(fields):
+    """
+    Return the content hash identifying a receipt.
+
+    Parameters:
+        fields (list[tuple]): Output of receipt_fields.
+
+    Returns:
+        str: Hex SHA-256 digest of the receipt content.
+    """
+    payload = json.dumps(fields, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def draw_receipt(fields):
+    """
+    Draw a receipt image from its lines.
+
+    Parameters:
+        fields (list[tuple]): Output of receipt_fields.
+
+    Returns:
+        Image.Image: Rendered RGB receipt.
+    """
+    image = _receipt_template().copy()
+    draw = ImageDraw.Draw(image)
+    label_font = load_font(16)
+    value_font = load_font(20, bold=True)
+
+    y = HEADER_HEIGHT + 40
+    for label, value in fields:
+        draw.text((RECEIPT_MARGIN, y), label.upper(), font=label_font, fill=MUTED_COLOR)
+        draw.text((RECEIPT_MARGIN, y + 22), str(value)[:48], font=value_font, fill=TEXT_COLOR)
+        y += 70
+        draw.line([RECEIPT_MARGIN, y - 12, RECEIPT_SIZE[0] - RECEIPT_MARGIN, y - 12], fill="#E0E0E0")
+    return image
+
+
+def _get_executor():
+    """Create the shared render pool on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="receipt")
+        return _executor
+
+
+def _render_to_file(fields, path):
+    """Render a receipt and write it atomically to path."""
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    draw_receipt(fields).save(temp_path, format="PNG", optimize=True)
+    os.replace(temp_path, path)
+    return path
+
+
+def render_receipt_async(result, output_dir=None):
+    """
+    Render a receipt on the worker pool.
+
+    A receipt whose content was rendered before is not rendered again, and
+    concurrent requests for the same receipt share a single render.
+
+    Parameters:
+        result (dict): Transaction data accepted by receipt_fields.
+        output_dir (str, optional): Folder for receipt files.
+
+    Returns:
+        concurrent.futures.Future: Resolves to the receipt PNG path.
+    """
+    output_dir = output_dir or RECEIPTS_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    fields = receipt_fields(result)
+    path = os.path.join(output_dir, f"receipt-{receipt_hash(fields)[:24]}.png")
+
+    with _in_flight_lock:
+        future = _in_flight.get(path)
+        if future is not None:
+            return future
+
+        if os.path.exists(path):
+            future = _get_executor().submit(lambda: path)
+        else:
+            future = _get_executor().submit(_render_to_file, fields, path)
+        _in_flight[path] = future
+
+    def _forget(_):
+        with _in_flight_lock:
+            _in_flight.pop(path, None)
+
+    future.add_done_callback(_forget)
+    return future
+
+
+def render_receipt(result, output_dir=None):
+    """
+    Render a receipt and wait for it.
+
+    Parameters:
+        result (dict): Transaction data accepted by receipt_fields.
+        output_dir (str, optional): Folder for receipt files.
+
+    Returns:
+        tuple: (bool, str) True and the receipt path, or False and an error message.
+    """
+    try:
+        return True, render_receipt_async(result, output_dir).result()
+    except Exception as e:
+        print(f"Error rendering receipt: {e}")
+        return False, f"Failed to generate receipt: {e}"
+
+
+def render_receipts_pdf(results, output_path, receipts_dir=None):
+    """
+    Render many receipts into one multi-page PDF, one receipt per page.
+
+    Pages come from the receipt cache (render_receipt_async), so receipts
+    rendered before are only read back. They are written PDF_CHUNK_PAGES
+    at a time, in the original order, so only one chunk is held in memory.
+
+    Parameters:
+        results (list[dict]): Transaction data accepted by receipt_fields.
+        output_path (str): PDF file to write.
+        receipts_dir (str, optional): Folder of the receipt cache.
+
+    Returns:
+        tuple: (bool, str) True and the PDF path, or False and an error message.
+    """
+    if not results:
+        return False, "No transactions to include."
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    temp_path = f"{output_path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        for start in range(0, len(results), PDF_CHUNK_PAGES):
+            futures = [render_receipt_async(result, receipts_dir) for result in results[start:start + PDF_CHUNK_PAGES]]
+            pages = []
+            try:
+                for future in futures:
+                    with Image.open(future.result()) as image:
+                        pages.append(image.convert("RGB"))
+                pages[0].save(temp_path, format="PDF", save_all=True, append=start > 0,
+                              append_images=pages[1:], resolution=100)
+            finally:
+                for page in pages:
+                    page.close()
+
+        os.replace(temp_path, output_path)
+        return True, output_path
+
+    except Exception as e:
+        print(f"Error rendering receipts PDF: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False, f"Failed to generate receipts PDF: {e}"
@@ -0,0 +1,152 @@
+"""
+Receiver Cache Module
+
+This module resolves a transfer receiver's student or office ID to its
+wallet user, and keeps recent answers in a bounded LRU cache so repeated
+transfers to the same receiver (e.g. the canteen office) skip the lookup.
+
+How it works:
+- A miss runs one query that finds the wallet user, their display name and
+  whether a wallet exists (send_money used to need two queries)
+- Hits move the entry to the most recently used end; once
+  RECEIVER_CACHE_SIZE entries are held the least recently used is dropped
+- Entries expire after RECEIVER_CACHE_TTL_SECONDS, which bounds how stale
+  an entry can be in other processes (each desktop client has its own cache)
+- Unknown identifiers are not cached, so a newly registered student can
+  receive money immediately
+- Account creation calls invalidate_receiver_cache(); account deactivation
+  should do the same
+- get_receiver_cache_stats() reports hits, misses, evictions and hit rate
+- lookup_receiver_async() shares the cache and runs misses through async_db
+- The lookup is a registered (prepared) query, see campusEwallet_db
+
+Dependencies:
+- campusEwallet_db for the lookup query
+- async_db for lookups from coroutines (imported on first use)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from system_backend.campusEwallet_db import fetch_one, register_query
+
+
+RECEIVER_CACHE_SIZE = 2048
+RECEIVER_CACHE_TTL_SECONDS = 600
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+RECEIVER_LOOKUP = register_query("receiver.lookup", """
+    SELECT wu.user_id, wu.student_id, wu.office_id, wu.office_name, es.name AS receiver_name,
+           w.user_id IS NOT NULL AS wallet_exists
+    FROM wallet_users wu
+    LEFT JOIN enrolled_students es ON wu.student_id = es.student_id
+    LEFT JOIN wallets w ON w.user_id = wu.user_id
+    WHERE wu.student_id = %s OR wu.office_id = %s
+    LIMIT 1
+""")
+
+
+def lookup_receiver(identifier):
+    """
+    Resolve a student or office ID to its wallet user.
+
+    Parameters:
+        identifier (str): Receiver's student ID or office ID.
+
+    Returns:
+        dict or None: {"user_id", "student_id", "office_id", "office_name",
+            "receiver_name", "wallet_exists"}, or None if no wallet user has
+            this identifier. Cached entries are shared; do not modify them.
+    """
+    key = str(identifier).strip()
+    now = time.time()
+    found, receiver = _get_cached(key, now)
+    if found:
+        return receiver
+
+    return _store(key, fetch_one(RECEIVER_LOOKUP, (key, key)), now)
+
+
+async def lookup_receiver_async(identifier):
+    """
+    Coroutine version of lookup_receiver; the cache is shared with it.
+
+    Parameters:
+        identifier (str): Receiver's student ID or office ID.
+
+    Returns:
+        dict or None: Same as lookup_receiver.
+    """
+    from system_backend import async_db
+
+    key = str(identifier).strip()
+    now = time.time()
+    found, receiver = _get_cached(key, now)
+    if found:
+        return receiver
+
+    return _store(key, await async_db.fetch_one(RECEIVER_LOOKUP, (key, key)), now)
+
+
+def _get_cached(key, now):
+    """Return (True, receiver) on a fresh cache hit, else (False, None)."""
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry[1] > now:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return True, entry[0]
+        _stats["misses"] += 1
+    return False, None
+
+
+def _store(key, receiver, now):
+    """Cache a looked-up receiver; unknown identifiers return None uncached."""
+    if not receiver or not receiver.get("user_id"):
+        return None
+
+    receiver["wallet_exists"] = bool(receiver["wallet_exists"])
+    with _lock:
+        _cache[key] = (receiver, now + RECEIVER_CACHE_TTL_SECONDS)
+        _cache.move_to_end(key)
+        while len(_cache) > RECEIVER_CACHE_SIZE:
+            _cache.popitem(last=False)
+            _stats["evictions"] += 1
+    return receiver
+
+
+def invalidate_receiver_cache(identifier=None):
+    """
+    Drop cached receivers.
+
+    Parameters:
+        identifier (str, optional): Only drop this student or office ID.
+            Clears the whole cache when omitted.
+    """
+    with _lock:
+        if identifier is None:
+            _cache.clear()
+        else:
+            _cache.pop(str(identifier).strip(), None)
+
+
+def get_receiver_cache_stats():
+    """
+    Report how well the cache is doing in this process.
+
+    Returns:
+        dict: {"size", "capacity", "hits", "misses", "evictions", "hit_rate"}.
+    """
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            "size": len(_cache),
+            "capacity": RECEIVER_CACHE_SIZE,
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "evictions": _stats["evictions"],
+            "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+        }
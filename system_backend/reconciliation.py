@@ -0,0 +1,255 @@
+"""
+Reconciliation Module
+
+This module checks, as a nightly job, that every stored wallet balance
+(wallets.balance and organization_wallets.org_wallet_balance) still matches
+the balance implied by the transaction history and the approved cash-in
+and cash-out requests.
+
+How it works:
+- wallet_reconciliation keeps a running ledger balance per wallet, valid
+  up to the checkpoint in reconciliation_state
+- Each run folds only the movements recorded since that checkpoint into
+  the ledger balances with one grouped INSERT ... SELECT (see
+  statements.movements_query for what counts as a movement), so a night
+  scans one day of rows, not the full history
+- Stored balances are then compared with the ledger balances plus the
+  movements newer than the checkpoint, one set-based query per wallet kind
+- Every mismatch is written to reconciliation_discrepancies and returned
+  as the run's report (optionally also as a CSV file)
+
+Wallets start at a zero balance, so the first run replays the whole
+history. Differences that are explained (e.g. balances seeded directly in
+the database) can be accepted with accept_balance(), which records the
+difference as an adjustment instead of reporting it again every night.
+
+Usage:
+    python -m system_backend.reconciliation run [--report report.csv]
+    python -m system_backend.reconciliation accept user 42
+
+Dependencies:
+- campusEwallet_db for database queries and transactions
+- statements for the shared movement query
+"""
+
+import argparse
+import csv
+from system_backend.campusEwallet_db import fetch_all, transaction
+from system_backend.statements import SETTLE_SECONDS, movements_query
+
+
+_STORED_BALANCES = {
+    "user": ("wallets", "user_id", "balance"),
+    "org": ("organization_wallets", "org_wallet_id", "org_wallet_balance"),
+}
+
+REPORT_COLUMNS = ["wallet_kind", "wallet_ref", "expected_balance", "stored_balance", "difference"]
+
+
+def _compare_query(wallet_kind, since, wallet_ref=None):
+    """
+    Build the set-based comparison of stored and expected balances.
+
+    Parameters:
+        wallet_kind (str): 'user' or 'org'.
+        since (datetime): Checkpoint the ledger balances are valid up to.
+        wallet_ref (int, optional): Only compare this wallet.
+
+    Returns:
+        tuple: (str, list) Query returning only mismatching wallets, and its parameters.
+    """
+    table, key, balance = _STORED_BALANCES[wallet_kind]
+    tail, params = movements_query(since, None, wallet_kind, [wallet_ref] if wallet_ref is not None else None)
+
+    wallet_filter = ""
+    if wallet_ref is not None:
+        wallet_filter = f"WHERE w.{key} = %s"
+        params.append(wallet_ref)
+
+    query = f"""
+        SELECT * FROM (
+            SELECT '{wallet_kind}' AS wallet_kind, w.{key} AS wallet_ref,
+                   w.{balance} AS stored_balance,
+                   COALESCE(r.ledger_balance + r.adjustment, 0) + COALESCE(tl.net, 0) AS expected_balance
+            FROM {table} w
+            LEFT JOIN wallet_reconciliation r
+                   ON r.wallet_kind = '{wallet_kind}' AND r.wallet_ref = w.{key}
+            LEFT JOIN (
+                SELECT m.wallet_ref, SUM(m.inflow) - SUM(m.outflow) AS net
+                FROM ({tail}) AS m
+                GROUP BY m.wallet_ref
+            ) tl ON tl.wallet_ref = w.{key}
+            {wallet_filter}
+        ) AS balances
+        -- Rounded so DECIMALs stored as floats (SQLite) do not differ by fractions of a cent
+        WHERE ROUND(stored_balance - expected_balance, 2) <> 0
+        ORDER BY wallet_ref
+    """
+    return query, params
+
+
+def run_reconciliation(report_path=None):
+    """
+    Fold new movements into the ledger balances and report mismatches.
+
+    Parameters:
+        report_path (str, optional): Also write the discrepancies to this CSV file.
+
+    Returns:
+        tuple: (bool, dict or str) True and {"run_at", "reconciled_until",
+            "discrepancies"}, or False and an error message.
+    """
+    discrepancies = []
+
+    try:
+        with transaction() as cursor:
+            cursor.execute("""
+                SELECT reconciled_until, NOW() AS run_at, NOW() - INTERVAL %s SECOND AS cutoff
+                FROM reconciliation_state
+                WHERE id = 1
+                FOR UPDATE
+            """, (SETTLE_SECONDS,))
+            state = cursor.fetchone()
+            if not state:
+                return False, "Reconciliation checkpoint is missing. Run the migrations first."
+
+            start, run_at, cutoff = state["reconciled_until"], state["run_at"], state["cutoff"]
+
+            if start is None or start < cutoff:
+                movements, params = movements_query(start, cutoff)
+                cursor.execute("""
+                    INSERT INTO wallet_reconciliation (wallet_kind, wallet_ref, ledger_balance)
+                    SELECT m.wallet_kind, m.wallet_ref, SUM(m.inflow) - SUM(m.outflow)
+                    FROM (""" + movements + """) AS m
+                    GROUP BY m.wallet_kind, m.wallet_ref
+                    ON DUPLICATE KEY UPDATE
+                        ledger_balance = wallet_reconciliation.ledger_balance + VALUES(ledger_balance)
+                """, tuple(params))
+            else:
+                cutoff = start
+
+            for wallet_kind in _STORED_BALANCES:
+                query, params = _compare_query(wallet_kind, cutoff)
+                cursor.execute(query, tuple(params))
+                for row in cursor.fetchall():
+                    row["difference"] = row["stored_balance"] - row["expected_balance"]
+                    discrepancies.append(row)
+
+            if discrepancies:
+                cursor.executemany("""
+                    INSERT INTO reconciliation_discrepancies
+                        (run_at, wallet_kind, wallet_ref, expected_balance, stored_balance, difference)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, [
+                    (run_at, row["wallet_kind"], row["wallet_ref"], row["expected_balance"],
+                     row["stored_balance"], row["difference"])
+                    for row in discrepancies
+                ])
+
+            cursor.execute(
+                "UPDATE reconciliation_state SET reconciled_until = %s, last_run_at = %s WHERE id = 1",
+                (cutoff, run_at)
+            )
+
+    except Exception as e:
+        print(f"Database Error in run_reconciliation: {e}")
+        return False, f"Reconciliation failed: {e}"
+
+    if report_path:
+        with open(report_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(discrepancies)
+
+    return True, {"run_at": run_at, "reconciled_until": cutoff, "discrepancies": discrepancies}
+
+
+def get_discrepancies(run_at=None):
+    """
+    Return the discrepancy report of a reconciliation run.
+
+    Parameters:
+        run_at (datetime, optional): Run to report on. Defaults to the latest run.
+
+    Returns:
+        list: Discrepancy rows, largest absolute difference first.
+    """
+    if run_at is None:
+        return fetch_all("""
+            SELECT * FROM reconciliation_discrepancies
+            WHERE run_at = (SELECT MAX(run_at) FROM reconciliation_discrepancies)
+            ORDER BY ABS(difference) DESC
+        """) or []
+
+    return fetch_all("""
+        SELECT * FROM reconciliation_discrepancies
+        WHERE run_at = %s
+        ORDER BY ABS(difference) DESC
+    """, (run_at,)) or []
+
+
+def accept_balance(wallet_kind, wallet_ref):
+    """
+    Accept a wallet's stored balance as correct from now on.
+
+    The current difference is added to the wallet's adjustment, so the
+    wallet is only reported again if it drifts further.
+
+    Parameters:
+        wallet_kind (str): 'user' or 'org'.
+        wallet_ref (int): wallets.user_id or organization_wallets.org_wallet_id.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    if wallet_kind not in _STORED_BALANCES:
+        return False, f"Unknown wallet kind '{wallet_kind}'."
+
+    try:
+        with transaction() as cursor:
+            cursor.execute("SELECT reconciled_until FROM reconciliation_state WHERE id = 1 FOR UPDATE")
+            state = cursor.fetchone()
+            since = state["reconciled_until"] if state else None
+            if since is None:
+                return False, "Run a reconciliation before accepting balances."
+
+            query, params = _compare_query(wallet_kind, since, wallet_ref)
+            cursor.execute(query, tuple(params))
+            row = cursor.fetchone()
+            if not row:
+                return True, "Wallet balance already matches its history."
+
+            difference = row["stored_balance"] - row["expected_balance"]
+            cursor.execute("""
+                INSERT INTO wallet_reconciliation (wallet_kind, wallet_ref, adjustment)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE adjustment = adjustment + VALUES(adjustment)
+            """, (wallet_kind, wallet_ref, difference))
+
+    except Exception as e:
+        print(f"Database Error in accept_balance: {e}")
+        return False, f"Failed to accept balance: {e}"
+
+    return True, f"Accepted a difference of {difference:,.2f} for {wallet_kind} wallet {wallet_ref}."
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile wallet balances with the transaction history.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--report", default=None, help="Write discrepancies to this CSV file.")
+    accept_parser = subparsers.add_parser("accept")
+    accept_parser.add_argument("wallet_kind", choices=list(_STORED_BALANCES))
+    accept_parser.add_argument("wallet_ref", type=int)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        ok, result = run_reconciliation(args.report)
+        if ok:
+            for item in result["discrepancies"]:
+                print(f"{item['wallet_kind']} {item['wallet_ref']}: stored {item['stored_balance']}, "
+                      f"expected {item['expected_balance']} ({item['difference']:+})")
+            result = f"{len(result['discrepancies'])} discrepancies, checked up to {result['reconciled_until']}."
+    else:
+        ok, result = accept_balance(args.wallet_kind, args.wallet_ref)
+    print(result)
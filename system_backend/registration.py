@@ -37,6 +37,8 @@ responsible for student onboarding and account creation.
 from mysql.connector import Error
 from system_backend.campusEwallet_db import fetch_one, execute_query
 from system_backend.signup_email_sender import send_verification_email
+from system_backend.migrations import normalize_organization_key
+from system_backend.receiver_cache import invalidate_receiver_cache
 import random
 import time
 import bcrypt
@@ -264,11 +266,12 @@ def create_account(student_id, password, confirm_password):
 
         # Create user wallet
         execute_query("INSERT INTO wallets (user_id, balance) VALUES (%s, %s)", (user_id, 0.00))
+        invalidate_receiver_cache(student_id)
 
         # If treasurer, create organization wallet if not exists
         if student["student_role"].lower() == "treasurer" and student["organization"]:
-            if not fetch_one("SELECT org_wallet_id FROM organization_wallets WHERE organization_name = %s",
-                             (student["organization"],)):
+            if not fetch_one("SELECT org_wallet_id FROM organization_wallets WHERE organization_key = %s",
+                             (normalize_organization_key(student["organization"]),)):
                 execute_query(
                     "INSERT INTO organization_wallets (treasurer_id, organization_name, role, org_wallet_balance) "
                     "VALUES (%s, %s, %s, %s)",
@@ -0,0 +1,355 @@
+"""
+Scheduled Transfers Module
+
+This module stores recurring transfer definitions (allowances sent from an
+office wallet, monthly organization dues paid against a bill) and executes
+them when they fall due.
+
+How it works:
+- recurring_transfers holds one row per schedule; next_run_at is indexed
+  together with active, so each tick reads only the due schedules
+- run_due_transfers() works in batches: it locks up to batch_size due
+  schedules with FOR UPDATE SKIP LOCKED (several scheduler processes can
+  run side by side), records one row per occurrence in
+  recurring_transfer_runs and advances next_run_at, then commits
+- The occurrence row's primary key (schedule_id, occurrence_at) makes each
+  occurrence idempotent: an occurrence that already has a row is never
+  executed again, even if a tick is retried after a crash. An occurrence
+  interrupted mid-run stays 'pending' for review rather than being paid twice
+- Claimed occurrences are executed through StudentWallet.send_money and
+  StudentWallet.pay_organization_bill on a thread pool, so balance checks,
+  fraud scoring and cache invalidation behave exactly as for manual transfers;
+  occurrences of the same owner run one after another
+- Schedules failing MAX_FAILURES times in a row are paused (active = 0)
+- A schedule that missed several runs (e.g. the scheduler was down) catches
+  up one occurrence per batch until next_run_at is in the future
+
+Usage:
+    python -m system_backend.scheduled_transfers tick [--batch-size N]
+
+Dependencies:
+- campusEwallet_db for database queries and transactions
+- students_wallet for executing the transfers (imported on first use)
+"""
+
+import argparse
+import calendar
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from system_backend.campusEwallet_db import fetch_all, execute_query, transaction
+
+
+SCHEDULE_KINDS = ("send_money", "bill_payment")
+INTERVAL_UNITS = ("day", "week", "month")
+
+DEFAULT_BATCH_SIZE = 500
+SCHEDULER_WORKERS = 8
+MAX_FAILURES = 3
+
+
+def next_occurrence(run_at, interval_unit, interval_count=1, anchor_day=None):
+    """
+    Return the occurrence following run_at.
+
+    Monthly schedules keep their day of month where possible and fall back
+    to the last day of shorter months. The day is taken from anchor_day, not
+    from run_at, so a schedule on the 31st returns to the 31st after
+    February instead of staying on the 28th.
+
+    Parameters:
+        run_at (datetime): Current occurrence.
+        interval_unit (str): 'day', 'week' or 'month'.
+        interval_count (int): Number of units between occurrences.
+        anchor_day (int, optional): Day of month the schedule was set up
+            on; defaults to run_at's day.
+
+    Returns:
+        datetime: The next occurrence.
+    """
+    if interval_unit == "day":
+        return run_at + timedelta(days=interval_count)
+    if interval_unit == "week":
+        return run_at + timedelta(weeks=interval_count)
+
+    month_index = run_at.month - 1 + interval_count
+    year = run_at.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(anchor_day or run_at.day, calendar.monthrange(year, month)[1])
+    return run_at.replace(year=year, month=month, day=day)
+
+
+def create_recurring_transfer(owner_user_id, kind, amount, interval_unit, interval_count=1,
+                              start_at=None, receiver_identifier=None, bill_id=None,
+                              message=None, end_at=None):
+    """
+    Store a new recurring transfer.
+
+    Parameters:
+        owner_user_id (int): Wallet user whose wallet is debited.
+        kind (str): 'send_money' (needs receiver_identifier and amount) or
+            'bill_payment' (needs bill_id; the bill's amount is paid).
+        amount (float): Amount per occurrence for 'send_money'.
+        interval_unit (str): 'day', 'week' or 'month'.
+        interval_count (int): Number of units between occurrences.
+        start_at (datetime, optional): First occurrence; defaults to now.
+        receiver_identifier (str, optional): Receiver's student or office ID.
+        bill_id (int, optional): Bill to pay for 'bill_payment'.
+        message (str, optional): Message attached to each transfer.
+        end_at (datetime, optional): No occurrences after this time.
+
+    Returns:
+        tuple: (bool, int or str) True and the schedule ID, or False and
+            an error message.
+    """
+    if kind not in SCHEDULE_KINDS:
+        return False, "Invalid schedule type."
+    if interval_unit not in INTERVAL_UNITS:
+        return False, "Invalid interval. Use day, week or month."
+    try:
+        interval_count = int(interval_count)
+    except (TypeError, ValueError):
+        return False, "Invalid interval count."
+    if interval_count <= 0:
+        return False, "Interval count must be greater than zero."
+
+    if kind == "send_money":
+        if not receiver_identifier:
+            return False, "A receiver is required."
+        try:
+            amount = float(amount)
+        except (TypeError, ValueError):
+            return False, "Invalid amount format."
+        if amount <= 0:
+            return False, "Amount must be greater than zero."
+        bill_id = None
+    else:
+        if not bill_id:
+            return False, "A bill is required."
+        amount = None
+        receiver_identifier = None
+
+    start_at = start_at or datetime.now()
+    if end_at and end_at < start_at:
+        return False, "End date must not be before the first run."
+    anchor_day = start_at.day if interval_unit == "month" else None
+
+    try:
+        with transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO recurring_transfers
+                    (owner_user_id, kind, receiver_identifier, bill_id, amount, message,
+                     interval_unit, interval_count, anchor_day, next_run_at, end_at, active, failure_count, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 1, 0, NOW())
+            """, (owner_user_id, kind, receiver_identifier, bill_id, amount, message,
+                  interval_unit, interval_count, anchor_day, start_at, end_at))
+            schedule_id = cursor.lastrowid
+
+    except Exception as e:
+        print(f"Database Error in create_recurring_transfer: {e}")
+        return False, "Failed to save the recurring transfer."
+
+    return True, schedule_id
+
+
+def get_recurring_transfers(owner_user_id):
+    """
+    List a user's recurring transfers, active ones first.
+
+    Parameters:
+        owner_user_id (int): Wallet user ID.
+
+    Returns:
+        list: Schedule dictionaries (empty on error).
+    """
+    return fetch_all("""
+        SELECT schedule_id, kind, receiver_identifier, bill_id, amount, message,
+               interval_unit, interval_count, next_run_at, end_at, active, last_error
+        FROM recurring_transfers
+        WHERE owner_user_id = %s
+        ORDER BY active DESC, next_run_at
+    """, (owner_user_id,)) or []
+
+
+def cancel_recurring_transfer(owner_user_id, schedule_id):
+    """
+    Stop a recurring transfer. Past occurrences are kept.
+
+    Parameters:
+        owner_user_id (int): Wallet user ID; only the owner can cancel.
+        schedule_id (int): Schedule to cancel.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    cursor = execute_query(
+        "UPDATE recurring_transfers SET active = 0 WHERE schedule_id = %s AND owner_user_id = %s AND active = 1",
+        (schedule_id, owner_user_id)
+    )
+    if cursor is None:
+        return False, "Failed to cancel the recurring transfer."
+    if cursor.rowcount == 0:
+        return False, "Recurring transfer not found or already inactive."
+    return True, "Recurring transfer cancelled."
+
+
+def _claim_due_batch(batch_size):
+    """
+    Lock a batch of due schedules, record their occurrences and advance them.
+
+    Returns:
+        list: (schedule, occurrence_at) pairs to execute in this batch.
+    """
+    claimed = []
+    with transaction() as cursor:
+        cursor.execute("""
+            SELECT schedule_id, owner_user_id, kind, receiver_identifier, bill_id, amount,
+                   message, interval_unit, interval_count, anchor_day, next_run_at, end_at
+            FROM recurring_transfers
+            WHERE active = 1 AND next_run_at <= NOW()
+            ORDER BY next_run_at
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """, (batch_size,))
+        due = cursor.fetchall()
+        if not due:
+            return claimed
+
+        # Occurrence rows are the idempotency keys; INSERT IGNORE skips ones already run
+        for schedule in due:
+            cursor.execute("""
+                INSERT IGNORE INTO recurring_transfer_runs (schedule_id, occurrence_at, status, run_at)
+                VALUES (%s, %s, 'pending', NOW())
+            """, (schedule["schedule_id"], schedule["next_run_at"]))
+            if cursor.rowcount:
+                claimed.append((schedule, schedule["next_run_at"]))
+
+        advanced = []
+        for schedule in due:
+            following = next_occurrence(schedule["next_run_at"], schedule["interval_unit"],
+                                        schedule["interval_count"], schedule["anchor_day"])
+            still_active = not schedule["end_at"] or following <= schedule["end_at"]
+            advanced.append((following, 1 if still_active else 0, schedule["schedule_id"]))
+        cursor.executemany(
+            "UPDATE recurring_transfers SET next_run_at = %s, active = %s WHERE schedule_id = %s",
+            advanced
+        )
+
+    return claimed
+
+
+def _execute_occurrence(schedule, wallets):
+    """
+    Run one occurrence through the regular wallet logic.
+
+    Returns:
+        tuple: (bool, str or None, str) Success, transaction ID and detail.
+    """
+    from system_backend.students_wallet import StudentWallet
+
+    owner_id = schedule["owner_user_id"]
+    wallet = wallets.get(owner_id)
+    if wallet is None:
+        wallet = wallets[owner_id] = StudentWallet(owner_id)
+
+    try:
+        if schedule["kind"] == "send_money":
+            ok, result = wallet.send_money(schedule["receiver_identifier"], schedule["amount"], schedule["message"])
+        else:
+            ok, result = wallet.pay_organization_bill(schedule["bill_id"], schedule["message"])
+    except Exception as e:
+        return False, None, f"Unexpected error: {e}"
+
+    if ok:
+        return True, result["transaction_id"], "completed"
+    return False, None, str(result)
+
+
+def run_due_transfers(batch_size=DEFAULT_BATCH_SIZE, workers=SCHEDULER_WORKERS, max_batches=None):
+    """
+    Execute every recurring transfer that is due.
+
+    Parameters:
+        batch_size (int): Schedules claimed per database transaction.
+        workers (int): Occurrences executed in parallel.
+        max_batches (int, optional): Stop after this many batches.
+
+    Returns:
+        tuple: (bool, dict or str) True and {"completed", "failed"}, or
+            False and an error message.
+    """
+    completed = 0
+    failed = 0
+    batches = 0
+    wallets = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while max_batches is None or batches < max_batches:
+            try:
+                claimed = _claim_due_batch(batch_size)
+            except Exception as e:
+                print(f"Database Error in run_due_transfers: {e}")
+                return False, f"Scheduler stopped after {completed + failed} occurrences: {e}"
+            if not claimed:
+                break
+            batches += 1
+
+            # One owner's occurrences run in order so they never race on the same balance
+            by_owner = {}
+            for index, (schedule, _) in enumerate(claimed):
+                by_owner.setdefault(schedule["owner_user_id"], []).append(index)
+            results = [None] * len(claimed)
+
+            def run_owner(indexes):
+                for i in indexes:
+                    results[i] = _execute_occurrence(claimed[i][0], wallets)
+
+            list(pool.map(run_owner, by_owner.values()))
+
+            run_updates = []
+            failures = []
+            successes = []
+            for (schedule, occurrence_at), (ok, transaction_id, detail) in zip(claimed, results):
+                run_updates.append(("completed" if ok else "failed", transaction_id, detail[:255],
+                                    schedule["schedule_id"], occurrence_at))
+                if ok:
+                    completed += 1
+                    successes.append((schedule["schedule_id"],))
+                else:
+                    failed += 1
+                    failures.append((detail[:255], MAX_FAILURES, schedule["schedule_id"]))
+
+            try:
+                with transaction() as cursor:
+                    cursor.executemany("""
+                        UPDATE recurring_transfer_runs
+                        SET status = %s, transaction_id = %s, detail = %s
+                        WHERE schedule_id = %s AND occurrence_at = %s
+                    """, run_updates)
+                    if successes:
+                        cursor.executemany(
+                            "UPDATE recurring_transfers SET failure_count = 0, last_error = NULL WHERE schedule_id = %s",
+                            successes
+                        )
+                    # Schedules that keep failing (e.g. a closed wallet) are paused
+                    if failures:
+                        cursor.executemany("""
+                            UPDATE recurring_transfers
+                            SET last_error = %s,
+                                active = IF(failure_count + 1 >= %s, 0, active),
+                                failure_count = failure_count + 1
+                            WHERE schedule_id = %s
+                        """, failures)
+            except Exception as e:
+                print(f"Database Error in run_due_transfers: {e}")
+
+    return True, {"completed": completed, "failed": failed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run recurring transfers that are due.")
+    parser.add_argument("command", choices=["tick"])
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    ok, result = run_due_transfers(batch_size=args.batch_size)
+    print(f"Completed {result['completed']}, failed {result['failed']}." if ok else result)
@@ -0,0 +1,216 @@
+"""
+Spending Analytics Module
+
+This module computes the spending insights shown on the student dashboard:
+totals per transaction type, weekly totals, the running balance curve and
+the top counterparties a student pays.
+
+How it works:
+- A user's completed transfers, bill payments and approved cash-ins and
+  cash-outs are loaded in one query and turned into NumPy column arrays
+  (signed amount, timestamp, type code, counterparty code)
+- Every insight is computed with vectorized NumPy operations
+  (np.unique/np.bincount grouping, cumsum) instead of Python loops
+- Results are cached per user until that user's next transaction (the
+  write paths call invalidate_spending_analytics) or for at most
+  ANALYTICS_CACHE_TTL_SECONDS, which covers writes made by other processes
+
+Amounts are signed from the user's point of view: money received is
+positive, money spent is negative.
+
+Dependencies:
+- numpy for the columnar computations
+- campusEwallet_db for the columnar fetch
+- transaction_archive so archived months are included
+"""
+
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from system_backend.campusEwallet_db import fetch_one, fetch_columns
+from system_backend.transaction_archive import transactions_source
+
+
+ANALYTICS_CACHE_TTL_SECONDS = 300
+TOP_COUNTERPARTIES = 5
+
+# 1970-01-01 was a Thursday; shifting by 3 days makes weeks start on Monday
+_WEEK_OFFSET_DAYS = 3
+
+_analytics_cache = {}
+_analytics_cache_lock = threading.Lock()
+
+
+def invalidate_spending_analytics(user_id=None):
+    """
+    Drop cached analytics after a transaction.
+
+    Parameters:
+        user_id (int, optional): Only drop this user's entry. Clears the
+            whole cache when omitted.
+    """
+    with _analytics_cache_lock:
+        if user_id is None:
+            _analytics_cache.clear()
+        else:
+            _analytics_cache.pop(user_id, None)
+
+
+def load_transaction_columns(user_id):
+    """
+    Load a user's balance movements as NumPy arrays, oldest first.
+
+    Parameters:
+        user_id (int): Wallet user ID.
+
+    Returns:
+        dict | None: {"amount": float64[], "timestamp": datetime64[s][],
+            "type_code": int[], "types": str[], "counterparty_code": int[],
+            "counterparties": str[]}, or None on a database error.
+    """
+    columns = fetch_columns("""
+        SELECT t.created_at AS moved_at,
+               CASE WHEN t.sender_id = %s THEN -t.amount ELSE t.amount END AS amount,
+               COALESCE(t.transaction_type, 'Other') AS transaction_type,
+               CASE
+                   WHEN t.transaction_type = 'Bill Payment' THEN COALESCE(ow.organization_name, 'Organization')
+                   WHEN t.sender_id = %s THEN COALESCE(res.name, rwu.office_name, 'System')
+                   ELSE COALESCE(ses.name, swu.office_name, 'System')
+               END AS counterparty
+        FROM """ + transactions_source(datetime.min, alias="t") + """
+        LEFT JOIN wallet_users rwu ON rwu.user_id = t.receiver_id
+        LEFT JOIN enrolled_students res ON res.student_id = rwu.student_id
+        LEFT JOIN wallet_users swu ON swu.user_id = t.sender_id
+        LEFT JOIN enrolled_students ses ON ses.student_id = swu.student_id
+        LEFT JOIN organization_bills ob ON ob.bill_id = t.bill_id
+        LEFT JOIN organization_wallets ow ON ow.org_wallet_id = ob.org_wallet_id
+        WHERE t.status = 'completed' AND (t.sender_id = %s OR t.receiver_id = %s)
+
+        UNION ALL
+
+        SELECT COALESCE(ci.date_processed, ci.date_requested), ci.amount, 'Cash In', 'Cash In'
+        FROM cashin_requests ci
+        WHERE ci.user_id = %s AND ci.status = 'approved'
+
+        UNION ALL
+
+        SELECT COALESCE(co.date_processed, co.date_requested), -co.amount, 'Cash Out', 'Cash Out'
+        FROM cashout_requests co
+        JOIN wallets w ON w.wallet_id = co.wallet_id
+        WHERE w.user_id = %s AND co.status = 'approved' AND co.org_wallet_id IS NULL
+
+        ORDER BY moved_at
+    """, (user_id,) * 6)
+
+    if columns is None:
+        return None
+
+    types, type_code = np.unique(np.array(columns["transaction_type"], dtype=str), return_inverse=True)
+    counterparties, counterparty_code = np.unique(np.array(columns["counterparty"], dtype=str), return_inverse=True)
+
+    return {
+        "amount": np.array(columns["amount"], dtype=np.float64),
+        "timestamp": np.array(columns["moved_at"], dtype="datetime64[s]"),
+        "type_code": type_code,
+        "types": types,
+        "counterparty_code": counterparty_code,
+        "counterparties": counterparties,
+    }
+
+
+def compute_insights(data, current_balance, top=TOP_COUNTERPARTIES):
+    """
+    Compute the dashboard insights from loaded columns.
+
+    Parameters:
+        data (dict): Output of load_transaction_columns.
+        current_balance (float): Balance the curve ends at.
+        top (int): Number of top counterparties to return.
+
+    Returns:
+        dict: {"transaction_count", "total_spent", "total_received",
+            "by_category", "by_week", "balance_curve", "top_counterparties"}
+    """
+    amount = data["amount"]
+    spent = np.where(amount < 0, -amount, 0.0)
+    received = np.where(amount > 0, amount, 0.0)
+
+    # Totals per transaction type
+    n_types = len(data["types"])
+    type_spent = np.bincount(data["type_code"], weights=spent, minlength=n_types)
+    type_received = np.bincount(data["type_code"], weights=received, minlength=n_types)
+    type_count = np.bincount(data["type_code"], minlength=n_types)
+    by_category = [
+        {"transaction_type": str(name), "spent": float(s), "received": float(r), "count": int(c)}
+        for name, s, r, c in zip(data["types"], type_spent, type_received, type_count)
+    ]
+
+    # Totals per Monday-based week
+    days = data["timestamp"].astype("datetime64[D]").astype(np.int64)
+    week = (days + _WEEK_OFFSET_DAYS) // 7
+    weeks, week_code = np.unique(week, return_inverse=True)
+    week_spent = np.bincount(week_code, weights=spent, minlength=len(weeks))
+    week_received = np.bincount(week_code, weights=received, minlength=len(weeks))
+    week_starts = (weeks * 7 - _WEEK_OFFSET_DAYS).astype("datetime64[D]")
+    by_week = [
+        {"week_start": start.item(), "spent": float(s), "received": float(r)}
+        for start, s, r in zip(week_starts, week_spent, week_received)
+    ]
+
+    # Balance after each movement, anchored so the curve ends at the current balance
+    running = np.cumsum(amount)
+    total = running[-1] if len(running) else 0.0
+    balances = current_balance - total + running
+
+    # Counterparties the user spends the most with
+    n_parties = len(data["counterparties"])
+    party_spent = np.bincount(data["counterparty_code"], weights=spent, minlength=n_parties)
+    party_count = np.bincount(data["counterparty_code"], weights=(amount < 0), minlength=n_parties)
+    order = np.argsort(-party_spent, kind="stable")[:top]
+    top_counterparties = [
+        {"counterparty": str(data["counterparties"][i]), "spent": float(party_spent[i]), "count": int(party_count[i])}
+        for i in order if party_spent[i] > 0
+    ]
+
+    return {
+        "transaction_count": int(len(amount)),
+        "total_spent": float(spent.sum()),
+        "total_received": float(received.sum()),
+        "by_category": by_category,
+        "by_week": by_week,
+        "balance_curve": {"timestamps": data["timestamp"], "balances": balances},
+        "top_counterparties": top_counterparties,
+    }
+
+
+def get_spending_insights(user_id, refresh=False):
+    """
+    Return a user's spending insights, cached until their next transaction.
+
+    Parameters:
+        user_id (int): Wallet user ID.
+        refresh (bool): Ignore the cached result.
+
+    Returns:
+        dict | None: Insights (see compute_insights), or None if they could
+            not be loaded.
+    """
+    now = time.monotonic()
+    if not refresh:
+        with _analytics_cache_lock:
+            cached = _analytics_cache.get(user_id)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    data = load_transaction_columns(user_id)
+    if data is None:
+        return None
+
+    row = fetch_one("SELECT balance FROM wallets WHERE user_id = %s", (user_id,))
+    balance = float(row["balance"]) if row and row["balance"] is not None else 0.0
+
+    insights = compute_insights(data, balance)
+    with _analytics_cache_lock:
+        _analytics_cache[user_id] = (now + ANALYTICS_CACHE_TTL_SECONDS, insights)
+    return insights
@@ -0,0 +1,269 @@
+"""
+Split Payments Module
+
+This module lets a student split a bill with peers: the initiator creates a
+split request naming each peer's share, every peer pays their share, and
+the initiator is credited as each share arrives.
+
+How it works:
+- split_requests holds one row per split with running totals (paid_count,
+  collected_amount); split_shares holds one row per peer, keyed by
+  (split_id, payer_user_id) and indexed by (payer_user_id, status), so a
+  student's open obligations are an index range read, never a scan of
+  transactions
+- Paying a share is one database transaction: the share is moved from
+  'pending' to 'paid' with a compare-and-set update (a share can only be
+  paid once), the money moves through transfers.transfer_funds, the same
+  atomic path as send_money, and the split's totals are bumped
+- The split is marked 'completed' when its last share is paid; the
+  initiator can cancel a split, which cancels the shares still pending
+
+Dependencies:
+- campusEwallet_db for database queries and transactions
+- transfers for the atomic wallet-to-wallet transfer
+"""
+
+from decimal import Decimal, ROUND_DOWN
+from system_backend.campusEwallet_db import fetch_all, transaction
+from system_backend.transfers import transfer_funds, InsufficientBalance
+from system_backend.fraud_detection import check_transfer
+from system_backend.spending_analytics import invalidate_spending_analytics
+
+
+MAX_SPLIT_PEERS = 50
+
+
+def equal_shares(total_amount, peer_identifiers):
+    """
+    Divide a total evenly between peers, to the centavo.
+
+    Leftover centavos go to the first peers so the shares add up exactly.
+
+    Parameters:
+        total_amount (float or str): Amount to divide.
+        peer_identifiers (list[str]): Peers' student IDs.
+
+    Returns:
+        list: (student_id, amount) pairs.
+    """
+    total = Decimal(str(total_amount))
+    count = len(peer_identifiers)
+    if count == 0:
+        return []
+    base = (total / count).quantize(Decimal("0.01"), rounding=ROUND_DOWN)
+    leftover_cents = int((total - base * count) * 100)
+    return [
+        (peer, base + (Decimal("0.01") if i < leftover_cents else 0))
+        for i, peer in enumerate(peer_identifiers)
+    ]
+
+
+def create_split(initiator_user_id, title, shares):
+    """
+    Create a split request.
+
+    Parameters:
+        initiator_user_id (int): Wallet user to be paid.
+        title (str): What the split is for.
+        shares (list): (student_id, amount) pairs, one per peer
+            (see equal_shares).
+
+    Returns:
+        tuple: (bool, int or str) True and the split ID, or False and an
+            error message.
+    """
+    title = (title or "").strip()
+    if not title:
+        return False, "Title is required."
+    if not shares:
+        return False, "Add at least one peer."
+    if len(shares) > MAX_SPLIT_PEERS:
+        return False, f"A split is limited to {MAX_SPLIT_PEERS} peers."
+
+    amounts = {}
+    for student_id, amount in shares:
+        student_id = str(student_id).strip()
+        try:
+            amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+        except Exception:
+            return False, f"Invalid amount for {student_id}."
+        if amount <= 0:
+            return False, f"Share for {student_id} must be greater than zero."
+        if student_id in amounts:
+            return False, f"{student_id} is listed more than once."
+        amounts[student_id] = amount
+
+    placeholders = ", ".join(["%s"] * len(amounts))
+    peers = fetch_all(f"""
+        SELECT wu.student_id, wu.user_id
+        FROM wallet_users wu
+        JOIN wallets w ON w.user_id = wu.user_id
+        WHERE wu.student_id IN ({placeholders})
+    """, tuple(amounts))
+    if peers is None:
+        return False, "Unable to look up peers right now."
+
+    user_ids = {row["student_id"]: row["user_id"] for row in peers}
+    missing = [student_id for student_id in amounts if student_id not in user_ids]
+    if missing:
+        return False, f"No wallet found for: {', '.join(missing)}"
+    if initiator_user_id in user_ids.values():
+        return False, "You cannot include yourself in a split."
+
+    try:
+        with transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO split_requests
+                    (initiator_user_id, title, total_amount, share_count, paid_count,
+                     collected_amount, status, created_at)
+                VALUES (%s, %s, %s, %s, 0, 0, 'open', NOW())
+            """, (initiator_user_id, title, sum(amounts.values()), len(amounts)))
+            split_id = cursor.lastrowid
+
+            cursor.executemany("""
+                INSERT INTO split_shares (split_id, payer_user_id, amount, status)
+                VALUES (%s, %s, %s, 'pending')
+            """, [(split_id, user_ids[student_id], amount) for student_id, amount in amounts.items()])
+
+    except Exception as e:
+        print(f"Database Error in create_split: {e}")
+        return False, "Failed to create the split request."
+
+    return True, split_id
+
+
+def pay_share(payer_user_id, split_id, message=None):
+    """
+    Pay the caller's share of a split to the initiator.
+
+    Parameters:
+        payer_user_id (int): Wallet user paying the share.
+        split_id (int): Split to pay into.
+        message (str, optional): Message for the transfer; defaults to the
+            split's title.
+
+    Returns:
+        tuple: (bool, dict or str) True and {"transaction_id", "amount",
+            "split_completed"}, or False and an error message.
+    """
+    try:
+        with transaction() as cursor:
+            cursor.execute("""
+                SELECT ss.amount, sr.initiator_user_id, sr.title
+                FROM split_shares ss
+                JOIN split_requests sr ON sr.split_id = ss.split_id
+                WHERE ss.split_id = %s AND ss.payer_user_id = %s
+                  AND ss.status = 'pending' AND sr.status = 'open'
+            """, (split_id, payer_user_id))
+            share = cursor.fetchone()
+            if not share:
+                return False, "No unpaid share found for this split."
+
+            # Compare-and-set so a share is paid at most once
+            cursor.execute("""
+                UPDATE split_shares SET status = 'paid', paid_at = NOW()
+                WHERE split_id = %s AND payer_user_id = %s AND status = 'pending'
+            """, (split_id, payer_user_id))
+            if cursor.rowcount == 0:
+                return False, "No unpaid share found for this split."
+
+            trx_id = transfer_funds(cursor, payer_user_id, share["initiator_user_id"], share["amount"],
+                                    message or f"Split: {share['title']}")
+
+            cursor.execute(
+                "UPDATE split_shares SET transaction_id = %s WHERE split_id = %s AND payer_user_id = %s",
+                (trx_id, split_id, payer_user_id)
+            )
+            cursor.execute("""
+                UPDATE split_requests
+                SET status = IF(paid_count + 1 >= share_count, 'completed', status),
+                    paid_count = paid_count + 1,
+                    collected_amount = collected_amount + %s
+                WHERE split_id = %s
+            """, (share["amount"], split_id))
+            cursor.execute("SELECT status FROM split_requests WHERE split_id = %s", (split_id,))
+            completed = cursor.fetchone()["status"] == "completed"
+
+    except InsufficientBalance as e:
+        return False, str(e)
+    except Exception as e:
+        print(f"Database Error in pay_share: {e}")
+        return False, "A system error occurred while paying the share."
+
+    invalidate_spending_analytics(payer_user_id)
+    invalidate_spending_analytics(share["initiator_user_id"])
+    check_transfer(trx_id, payer_user_id, share["initiator_user_id"], share["amount"])
+    return True, {"transaction_id": trx_id, "amount": share["amount"], "split_completed": completed}
+
+
+def cancel_split(initiator_user_id, split_id):
+    """
+    Cancel an open split. Shares already paid stay paid.
+
+    Parameters:
+        initiator_user_id (int): Only the initiator can cancel.
+        split_id (int): Split to cancel.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    try:
+        with transaction() as cursor:
+            cursor.execute("""
+                UPDATE split_requests SET status = 'cancelled'
+                WHERE split_id = %s AND initiator_user_id = %s AND status = 'open'
+            """, (split_id, initiator_user_id))
+            if cursor.rowcount == 0:
+                return False, "Split not found or no longer open."
+            cursor.execute(
+                "UPDATE split_shares SET status = 'cancelled' WHERE split_id = %s AND status = 'pending'",
+                (split_id,)
+            )
+
+    except Exception as e:
+        print(f"Database Error in cancel_split: {e}")
+        return False, "Failed to cancel the split."
+
+    return True, "Split cancelled."
+
+
+def get_open_obligations(payer_user_id):
+    """
+    List the shares a student still has to pay.
+
+    Parameters:
+        payer_user_id (int): Wallet user ID.
+
+    Returns:
+        list: {"split_id", "title", "amount", "initiator_name", "created_at"}
+            dictionaries, oldest first (empty on error).
+    """
+    return fetch_all("""
+        SELECT ss.split_id, sr.title, ss.amount, sr.created_at,
+               COALESCE(es.name, wu.office_name) AS initiator_name
+        FROM split_shares ss
+        JOIN split_requests sr ON sr.split_id = ss.split_id
+        JOIN wallet_users wu ON wu.user_id = sr.initiator_user_id
+        LEFT JOIN enrolled_students es ON es.student_id = wu.student_id
+        WHERE ss.payer_user_id = %s AND ss.status = 'pending' AND sr.status = 'open'
+        ORDER BY sr.created_at
+    """, (payer_user_id,)) or []
+
+
+def get_created_splits(initiator_user_id):
+    """
+    List the splits a student created, with collection progress.
+
+    Parameters:
+        initiator_user_id (int): Wallet user ID.
+
+    Returns:
+        list: Split dictionaries, newest first (empty on error).
+    """
+    return fetch_all("""
+        SELECT split_id, title, total_amount, share_count, paid_count,
+               collected_amount, status, created_at
+        FROM split_requests
+        WHERE initiator_user_id = %s
+        ORDER BY created_at DESC
+    """, (initiator_user_id,)) or []
@@ -0,0 +1,768 @@
+"""
+SQLite Backend Module
+
+This module lets campusEwallet_db run on an in-process SQLite database
+instead of a MySQL server, so the whole backend (wallets, transfers, bills,
+finance admin, KPIs, ...) can be exercised end-to-end by integration tests,
+benchmarks and local runs without any database server.
+
+How it works:
+- SQLiteDatabase holds one sqlite3 connection per database file (or one
+  private in-memory database) and hands out SQLiteConnection objects with
+  the subset of the mysql.connector connection API the backend uses
+  (cursor, start_transaction, commit, rollback, in_transaction, ...)
+- Statements are translated from the MySQL dialect used in the modules
+  once per distinct SQL text (translate_query): %s placeholders, NOW() and
+  NOW() +/- INTERVAL, IF(), INSERT IGNORE, ON DUPLICATE KEY UPDATE with
+  VALUES(), FOR UPDATE [SKIP LOCKED] and FROM DUAL
+- SQLite has a single writer, so a transaction holds the database lock from
+  start_transaction until commit or rollback; statements of other threads
+  wait for it. A transaction opened inside another one on the same thread
+  becomes a savepoint of the outer transaction
+- Result rows look like MySQL rows: numbers with a fraction come back as
+  Decimal and DATETIME / DATE text as datetime / date
+- sqlite3 errors are re-raised as the matching mysql.connector errors, so
+  the modules' error handling works unchanged
+- create_schema() builds the schema of the base database with every
+  migration of migrations.MIGRATIONS applied, including the finance KPI
+  triggers, and records those migrations as applied
+
+Not supported: the MySQL partition management of transaction_archive
+(partition, extend and archive commands).
+
+Usage:
+    from system_backend.campusEwallet_db import use_sqlite
+    use_sqlite()                        # private in-memory database
+    use_sqlite("/tmp/campus.sqlite3")   # file database, kept between runs
+
+    or set CAMPUS_EWALLET_DB=sqlite:// (in-memory) or
+    CAMPUS_EWALLET_DB=sqlite:///tmp/campus.sqlite3 before starting
+
+Dependencies:
+- sqlite3 from the standard library
+- mysql.connector for the error classes
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from mysql.connector import errors
+
+
+LOCAL_NOW = "datetime('now', 'localtime')"
+
+_TRANSACTION_COLUMNS = """
+    transaction_id VARCHAR(50) PRIMARY KEY,
+    sender_id INT NULL,
+    receiver_id INT NULL,
+    org_wallet_id INT NULL,
+    bill_id INT NULL,
+    amount DECIMAL(12, 2) NOT NULL,
+    transaction_type VARCHAR(50) NULL,
+    service_paid_for VARCHAR(100) NULL,
+    created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    status VARCHAR(20) NOT NULL DEFAULT 'completed',
+    message VARCHAR(255) NULL
+"""
+
+# Base tables followed by the state of migrations 0001-0018
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS enrolled_students (
+        student_id VARCHAR(20) PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        email VARCHAR(100) NULL,
+        program VARCHAR(50) NULL,
+        section VARCHAR(20) NULL,
+        student_role VARCHAR(50) NULL,
+        organization VARCHAR(255) NULL,
+        treasurer_id VARCHAR(20) NULL,
+        organization_key VARCHAR(255) GENERATED ALWAYS AS (LOWER(TRIM(organization))) STORED,
+        student_role_key VARCHAR(50) GENERATED ALWAYS AS (LOWER(TRIM(student_role))) STORED
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS wallet_users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id VARCHAR(20) NULL UNIQUE,
+        office_id VARCHAR(20) NULL UNIQUE,
+        office_name VARCHAR(100) NULL,
+        email VARCHAR(100) NULL,
+        user_password VARCHAR(255) NOT NULL,
+        role VARCHAR(50) NOT NULL,
+        created_by_admin TINYINT(1) NOT NULL DEFAULT 0,
+        password_needs_change TINYINT(1) NOT NULL DEFAULT 0,
+        failed_attempts INT NOT NULL DEFAULT 0,
+        last_failed_time DATETIME NULL,
+        created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS wallets (
+        wallet_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INT NOT NULL UNIQUE,
+        balance DECIMAL(12, 2) NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS organization_wallets (
+        org_wallet_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        treasurer_id VARCHAR(20) NULL,
+        organization_name VARCHAR(255) NOT NULL,
+        role VARCHAR(50) NULL,
+        org_wallet_balance DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        org_wallet_held DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        organization_key VARCHAR(255) GENERATED ALWAYS AS (LOWER(TRIM(organization_name))) STORED
+    )
+    """,
+    f"CREATE TABLE IF NOT EXISTS transactions ({_TRANSACTION_COLUMNS})",
+    # Keyed like the partitioned MySQL table (migration 0014)
+    "CREATE TABLE IF NOT EXISTS transactions_archive ("
+    + _TRANSACTION_COLUMNS.replace("VARCHAR(50) PRIMARY KEY", "VARCHAR(50) NOT NULL")
+    + ", PRIMARY KEY (transaction_id, created_at))",
+    """
+    CREATE TABLE IF NOT EXISTS organization_bills (
+        bill_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        org_wallet_id INT NOT NULL,
+        title VARCHAR(100) NOT NULL,
+        description TEXT NULL,
+        amount DECIMAL(12, 2) NOT NULL,
+        is_targeted TINYINT(1) NOT NULL DEFAULT 0,
+        created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cashin_requests (
+        request_id VARCHAR(50) PRIMARY KEY,
+        user_id INT NOT NULL,
+        amount DECIMAL(12, 2) NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'pending',
+        date_requested DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+        date_processed DATETIME NULL,
+        decline_reason VARCHAR(255) NULL,
+        claimed_by INT NULL,
+        claim_expires_at DATETIME NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cashout_requests (
+        request_id VARCHAR(50) PRIMARY KEY,
+        org_wallet_id INT NULL,
+        wallet_id INT NULL,
+        amount DECIMAL(12, 2) NOT NULL,
+        message VARCHAR(255) NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'pending',
+        date_requested DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+        date_processed DATETIME NULL,
+        decline_reason VARCHAR(255) NULL,
+        claimed_by INT NULL,
+        claim_expires_at DATETIME NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS password_resets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INT NOT NULL,
+        code VARCHAR(10) NOT NULL,
+        resend_count INT NOT NULL DEFAULT 0,
+        last_sent DATETIME NULL,
+        expires_at DATETIME NOT NULL,
+        verified_at DATETIME NULL,
+        code_attempts INT NOT NULL DEFAULT 0,
+        created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_enrolled_students_org_role ON enrolled_students (organization_key, student_role_key)",
+    "CREATE INDEX IF NOT EXISTS idx_enrolled_students_program_section ON enrolled_students (program, section)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_organization_wallets_org_key ON organization_wallets (organization_key)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_sender_bill ON transactions (sender_id, bill_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_receiver ON transactions (receiver_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_type_created_at ON transactions (transaction_type, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_org_wallet_created_at ON transactions (org_wallet_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_archive_created_at ON transactions_archive (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_cashin_requests_queue ON cashin_requests (status, date_requested)",
+    "CREATE INDEX IF NOT EXISTS idx_cashout_requests_queue ON cashout_requests (status, date_requested)",
+    "CREATE INDEX IF NOT EXISTS idx_cashin_requests_status_processed ON cashin_requests (status, date_processed)",
+    "CREATE INDEX IF NOT EXISTS idx_cashout_requests_status_processed ON cashout_requests (status, date_processed)",
+    """
+    CREATE TABLE IF NOT EXISTS organization_bill_stats (
+        bill_id INT PRIMARY KEY,
+        org_wallet_id INT NOT NULL,
+        paid_count INT NOT NULL DEFAULT 0,
+        total_collected DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        last_payment_at DATETIME NULL,
+        last_transaction_id VARCHAR(50) NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_bill_stats_org_wallet ON organization_bill_stats (org_wallet_id)",
+    """
+    CREATE TABLE IF NOT EXISTS organization_bill_payers (
+        bill_id INT NOT NULL,
+        paid_at DATETIME NOT NULL,
+        transaction_id VARCHAR(50) NOT NULL,
+        user_id INT NOT NULL,
+        amount DECIMAL(12, 2) NOT NULL,
+        PRIMARY KEY (bill_id, paid_at, transaction_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_bill_payers_user_bill ON organization_bill_payers (user_id, bill_id)",
+    """
+    CREATE TABLE IF NOT EXISTS organization_bill_audience (
+        student_id VARCHAR(20) NOT NULL,
+        bill_id INT NOT NULL,
+        PRIMARY KEY (student_id, bill_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_bill_audience_bill ON organization_bill_audience (bill_id)",
+    """
+    CREATE TABLE IF NOT EXISTS transaction_archive_periods (
+        period_month DATE PRIMARY KEY,
+        row_count INT NOT NULL DEFAULT 0,
+        archived_at DATETIME NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS wallet_statement_aggregates (
+        wallet_kind VARCHAR(10) NOT NULL,
+        wallet_ref INT NOT NULL,
+        period_month DATE NOT NULL,
+        transaction_type VARCHAR(50) NOT NULL,
+        inflow DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        outflow DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        inflow_count INT NOT NULL DEFAULT 0,
+        outflow_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (wallet_kind, wallet_ref, period_month, transaction_type)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS statement_refresh_state (
+        id TINYINT PRIMARY KEY,
+        refreshed_until DATETIME NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO statement_refresh_state (id, refreshed_until) VALUES (1, NULL)",
+    """
+    CREATE TABLE IF NOT EXISTS wallet_reconciliation (
+        wallet_kind VARCHAR(10) NOT NULL,
+        wallet_ref INT NOT NULL,
+        ledger_balance DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        adjustment DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (wallet_kind, wallet_ref)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS reconciliation_state (
+        id TINYINT PRIMARY KEY,
+        reconciled_until DATETIME NULL,
+        last_run_at DATETIME NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO reconciliation_state (id, reconciled_until, last_run_at) VALUES (1, NULL, NULL)",
+    """
+    CREATE TABLE IF NOT EXISTS reconciliation_discrepancies (
+        discrepancy_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_at DATETIME NOT NULL,
+        wallet_kind VARCHAR(10) NOT NULL,
+        wallet_ref INT NOT NULL,
+        expected_balance DECIMAL(14, 2) NOT NULL,
+        stored_balance DECIMAL(14, 2) NOT NULL,
+        difference DECIMAL(14, 2) NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_reconciliation_discrepancies_run ON reconciliation_discrepancies (run_at)",
+    """
+    CREATE TABLE IF NOT EXISTS finance_kpi_counters (
+        kpi_key VARCHAR(50) NOT NULL,
+        slot TINYINT NOT NULL DEFAULT 0,
+        value_count BIGINT NOT NULL DEFAULT 0,
+        value_amount DECIMAL(16, 2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (kpi_key, slot)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS finance_daily_volume (
+        volume_date DATE NOT NULL,
+        transaction_type VARCHAR(50) NOT NULL,
+        slot TINYINT NOT NULL DEFAULT 0,
+        txn_count INT NOT NULL DEFAULT 0,
+        total_amount DECIMAL(16, 2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (volume_date, transaction_type, slot)
+    )
+    """,
+    """
+    INSERT OR IGNORE INTO finance_kpi_counters (kpi_key) VALUES
+        ('student_wallets'), ('organization_wallets'), ('pending_cashin'), ('pending_cashout')
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS flagged_transactions (
+        transaction_id VARCHAR(50) PRIMARY KEY,
+        sender_id INT NOT NULL,
+        receiver_id INT NOT NULL,
+        amount DECIMAL(12, 2) NOT NULL,
+        score DECIMAL(5, 2) NOT NULL,
+        reasons VARCHAR(255) NOT NULL,
+        flagged_at DATETIME NOT NULL,
+        status VARCHAR(10) NOT NULL DEFAULT 'pending',
+        reviewed_by INT NULL,
+        reviewed_at DATETIME NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_flagged_transactions_status ON flagged_transactions (status, flagged_at)",
+    """
+    CREATE TABLE IF NOT EXISTS recurring_transfers (
+        schedule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        owner_user_id INT NOT NULL,
+        kind VARCHAR(20) NOT NULL,
+        receiver_identifier VARCHAR(50) NULL,
+        bill_id INT NULL,
+        amount DECIMAL(12, 2) NULL,
+        message VARCHAR(255) NULL,
+        interval_unit VARCHAR(10) NOT NULL,
+        interval_count INT NOT NULL DEFAULT 1,
+        anchor_day TINYINT NULL,
+        next_run_at DATETIME NOT NULL,
+        end_at DATETIME NULL,
+        active TINYINT(1) NOT NULL DEFAULT 1,
+        failure_count INT NOT NULL DEFAULT 0,
+        last_error VARCHAR(255) NULL,
+        created_at DATETIME NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_recurring_transfers_due ON recurring_transfers (active, next_run_at)",
+    "CREATE INDEX IF NOT EXISTS idx_recurring_transfers_owner ON recurring_transfers (owner_user_id)",
+    """
+    CREATE TABLE IF NOT EXISTS recurring_transfer_runs (
+        schedule_id INT NOT NULL,
+        occurrence_at DATETIME NOT NULL,
+        status VARCHAR(10) NOT NULL,
+        transaction_id VARCHAR(50) NULL,
+        detail VARCHAR(255) NULL,
+        run_at DATETIME NOT NULL,
+        PRIMARY KEY (schedule_id, occurrence_at)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS split_requests (
+        split_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        initiator_user_id INT NOT NULL,
+        title VARCHAR(100) NOT NULL,
+        total_amount DECIMAL(12, 2) NOT NULL,
+        share_count INT NOT NULL,
+        paid_count INT NOT NULL DEFAULT 0,
+        collected_amount DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        status VARCHAR(10) NOT NULL DEFAULT 'open',
+        created_at DATETIME NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_split_requests_initiator ON split_requests (initiator_user_id, created_at)",
+    """
+    CREATE TABLE IF NOT EXISTS split_shares (
+        split_id INT NOT NULL,
+        payer_user_id INT NOT NULL,
+        amount DECIMAL(12, 2) NOT NULL,
+        status VARCHAR(10) NOT NULL DEFAULT 'pending',
+        transaction_id VARCHAR(50) NULL,
+        paid_at DATETIME NULL,
+        PRIMARY KEY (split_id, payer_user_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_split_shares_payer ON split_shares (payer_user_id, status)",
+    """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        name VARCHAR(100) PRIMARY KEY,
+        applied_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS schema_migration_steps (
+        name VARCHAR(100) NOT NULL,
+        step INT NOT NULL,
+        applied_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+        PRIMARY KEY (name, step)
+    )
+    """,
+]
+
+# Finance KPI triggers of migrations 0008 and 0018; the IF blocks of the
+# MySQL update triggers become separate triggers with a WHEN condition
+_KPI_BALANCE_TRIGGERS = [
+    ("wallets", "balance", "student_wallets"),
+    ("organization_wallets", "org_wallet_balance", "organization_wallets"),
+]
+_KPI_REQUEST_TRIGGERS = [
+    ("cashin_requests", "pending_cashin", "Cash In"),
+    ("cashout_requests", "pending_cashout", "Cash Out"),
+]
+# Random slot out of migrations.KPI_COUNTER_SLOTS
+_KPI_SLOT = "abs(random()) % 16"
+_ADD_COUNTER = (
+    "ON CONFLICT DO UPDATE SET value_count = value_count + excluded.value_count, "
+    "value_amount = value_amount + excluded.value_amount"
+)
+_ADD_VOLUME = (
+    "ON CONFLICT DO UPDATE SET txn_count = txn_count + 1, "
+    "total_amount = total_amount + excluded.total_amount"
+)
+
+
+def _kpi_triggers():
+    """Return the CREATE TRIGGER statements maintaining the finance KPIs."""
+    statements = []
+    for table, column, key in _KPI_BALANCE_TRIGGERS:
+        statements += [
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_kpi_insert AFTER INSERT ON {table} FOR EACH ROW BEGIN
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                VALUES ('{key}', {_KPI_SLOT}, 1, NEW.{column})
+                {_ADD_COUNTER};
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_kpi_update AFTER UPDATE OF {column} ON {table} FOR EACH ROW
+            WHEN NEW.{column} <> OLD.{column} BEGIN
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                VALUES ('{key}', {_KPI_SLOT}, 0, NEW.{column} - OLD.{column})
+                {_ADD_COUNTER};
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_kpi_delete AFTER DELETE ON {table} FOR EACH ROW BEGIN
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                VALUES ('{key}', {_KPI_SLOT}, -1, -OLD.{column})
+                {_ADD_COUNTER};
+            END
+            """,
+        ]
+
+    for table, key, volume_type in _KPI_REQUEST_TRIGGERS:
+        statements += [
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_kpi_insert AFTER INSERT ON {table} FOR EACH ROW
+            WHEN NEW.status = 'pending' BEGIN
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                VALUES ('{key}', {_KPI_SLOT}, 1, NEW.amount)
+                {_ADD_COUNTER};
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_kpi_update AFTER UPDATE ON {table} FOR EACH ROW
+            WHEN NEW.status = 'pending' OR OLD.status = 'pending' BEGIN
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                VALUES ('{key}', {_KPI_SLOT},
+                        (NEW.status = 'pending') - (OLD.status = 'pending'),
+                        IIF(NEW.status = 'pending', NEW.amount, 0) - IIF(OLD.status = 'pending', OLD.amount, 0))
+                {_ADD_COUNTER};
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_volume_update AFTER UPDATE ON {table} FOR EACH ROW
+            WHEN NEW.status = 'approved' AND OLD.status <> 'approved' BEGIN
+                INSERT INTO finance_daily_volume (volume_date, transaction_type, slot, txn_count, total_amount)
+                VALUES (date(COALESCE(NEW.date_processed, {LOCAL_NOW})), '{volume_type}', {_KPI_SLOT}, 1, NEW.amount)
+                {_ADD_VOLUME};
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_kpi_delete AFTER DELETE ON {table} FOR EACH ROW
+            WHEN OLD.status = 'pending' BEGIN
+                INSERT INTO finance_kpi_counters (kpi_key, slot, value_count, value_amount)
+                VALUES ('{key}', {_KPI_SLOT}, -1, -OLD.amount)
+                {_ADD_COUNTER};
+            END
+            """,
+        ]
+
+    statements.append(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_kpi_insert AFTER INSERT ON transactions FOR EACH ROW
+        WHEN NEW.status = 'completed' BEGIN
+            INSERT INTO finance_daily_volume (volume_date, transaction_type, slot, txn_count, total_amount)
+            VALUES (date(NEW.created_at), COALESCE(NEW.transaction_type, 'Other'), {_KPI_SLOT}, 1, NEW.amount)
+            {_ADD_VOLUME};
+        END
+        """
+    )
+    return statements
+
+
+_INTERVAL_UNITS = {"SECOND": "seconds", "MINUTE": "minutes", "HOUR": "hours", "DAY": "days"}
+
+# (pattern, replacement) pairs applied in order by translate_query
+_TRANSLATIONS = [
+    (re.compile(r"%s"), "?"),
+    # NOW() +/- INTERVAL n UNIT
+    (re.compile(r"\bNOW\(\)\s*([+-])\s*INTERVAL\s+(\?|\d+)\s+(SECOND|MINUTE|HOUR|DAY)\b", re.IGNORECASE),
+     lambda m: f"datetime('now', 'localtime', printf('%+d {_INTERVAL_UNITS[m.group(3).upper()]}', "
+               f"{'-' if m.group(1) == '-' else ''}({m.group(2)})))"),
+    # First day of the month: DATE(x) - INTERVAL (DAYOFMONTH(x) - 1) DAY
+    (re.compile(r"\bDATE\(([\w.]+)\)\s*-\s*INTERVAL\s*\(DAYOFMONTH\(\1\)\s*-\s*1\)\s*DAY\b", re.IGNORECASE),
+     r"date(\1, 'start of month')"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), LOCAL_NOW),
+    (re.compile(r"\bIF\(", re.IGNORECASE), "IIF("),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    (re.compile(r"\bFOR\s+UPDATE(\s+SKIP\s+LOCKED)?\b", re.IGNORECASE), ""),
+    (re.compile(r"\bFROM\s+DUAL\b", re.IGNORECASE), ""),
+]
+_ON_DUPLICATE = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE)
+_VALUES_REFERENCE = re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE)
+
+_DATETIME_TEXT = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d{1,6})?")
+_DATE_TEXT = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+@lru_cache(maxsize=1024)
+def translate_query(query):
+    """
+    Translate one MySQL statement of the backend to SQLite.
+
+    Parameters:
+        query (str): SQL text as written for MySQL.
+
+    Returns:
+        str: The equivalent SQLite statement.
+    """
+    sql = str(query)
+    for pattern, replacement in _TRANSLATIONS:
+        sql = pattern.sub(replacement, sql)
+
+    match = _ON_DUPLICATE.search(sql)
+    if match:
+        # INSERT ... ON DUPLICATE KEY UPDATE c = VALUES(c) becomes an upsert;
+        # without a conflict target it applies to any unique key, as in MySQL
+        head, tail = sql[:match.start()], sql[match.end():]
+        if re.search(r"\bSELECT\b", head, re.IGNORECASE) and not re.search(r"\b(WHERE|GROUP\s+BY)\b", head, re.IGNORECASE):
+            head += " WHERE true"
+        sql = head + "ON CONFLICT DO UPDATE SET" + _VALUES_REFERENCE.sub(r"excluded.\1", tail)
+    return sql
+
+
+def _adapt_parameters(parameters):
+    """Convert query parameters to values sqlite3 stores like MySQL does."""
+    if parameters is None:
+        return ()
+    if isinstance(parameters, dict):
+        raise errors.ProgrammingError("Named parameters are not supported by the SQLite backend.")
+    adapted = []
+    for value in parameters:
+        if isinstance(value, Decimal):
+            value = float(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat(" ")
+        elif isinstance(value, date):
+            value = value.isoformat()
+        elif isinstance(value, bool):
+            value = int(value)
+        adapted.append(value)
+    return adapted
+
+
+def _convert_value(value):
+    """Give a result value the Python type MySQL would return for it."""
+    if isinstance(value, float):
+        # Every fractional column of the schema is DECIMAL
+        return Decimal(format(value, ".12g"))
+    if isinstance(value, str):
+        if len(value) >= 19 and _DATETIME_TEXT.fullmatch(value):
+            return datetime.fromisoformat(value)
+        if len(value) == 10 and _DATE_TEXT.fullmatch(value):
+            return date.fromisoformat(value)
+    return value
+
+
+def _mysql_error(error):
+    """Return the mysql.connector error matching an sqlite3 error."""
+    if isinstance(error, sqlite3.IntegrityError):
+        return errors.IntegrityError(msg=str(error))
+    if isinstance(error, (sqlite3.OperationalError, sqlite3.ProgrammingError)):
+        return errors.ProgrammingError(msg=str(error))
+    return errors.DatabaseError(msg=str(error))
+
+
+class SQLiteCursor:
+    """
+    Cursor with the mysql.connector cursor interface used by the backend.
+
+    Result rows are read at execution time, while the database lock is held,
+    so fetching never interleaves with other threads' statements.
+    """
+
+    def __init__(self, database, dictionary=False):
+        self._database = database
+        self._dictionary = dictionary
+        self._rows = []
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    @property
+    def with_rows(self):
+        return self.description is not None
+
+    def execute(self, query, parameters=None):
+        sql = translate_query(query)
+        with self._database.lock:
+            try:
+                cursor = self._database.connection.execute(sql, _adapt_parameters(parameters))
+                rows = cursor.fetchall() if cursor.description else []
+            except sqlite3.Error as e:
+                raise _mysql_error(e) from e
+        self._set_result(cursor, rows)
+
+    def executemany(self, query, seq_params):
+        sql = translate_query(query)
+        with self._database.lock:
+            try:
+                cursor = self._database.connection.executemany(
+                    sql, [_adapt_parameters(parameters) for parameters in seq_params]
+                )
+            except sqlite3.Error as e:
+                raise _mysql_error(e) from e
+        self._set_result(cursor, [])
+
+    def _set_result(self, cursor, rows):
+        self.description = cursor.description
+        self.lastrowid = cursor.lastrowid
+        if self.description:
+            names = [column[0] for column in self.description]
+            if self._dictionary:
+                rows = [{name: _convert_value(value) for name, value in zip(names, row)} for row in rows]
+            else:
+                rows = [tuple(_convert_value(value) for value in row) for row in rows]
+            self.rowcount = len(rows)
+        else:
+            self.rowcount = cursor.rowcount
+        self._rows = rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size=1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        self._rows = []
+
+
+class SQLiteConnection:
+    """
+    Connection with the mysql.connector connection interface used by the
+    backend. All connections of a SQLiteDatabase share its sqlite3
+    connection; a transaction holds the database lock until it ends.
+    """
+
+    def __init__(self, database):
+        self._database = database
+        self._level = None
+        self.autocommit = False
+
+    @property
+    def in_transaction(self):
+        return self._level is not None
+
+    def is_connected(self):
+        return True
+
+    def cursor(self, dictionary=False, prepared=False, buffered=None):
+        # Statements are compiled and cached by sqlite3 itself, so prepared
+        # cursors need no special handling
+        return SQLiteCursor(self._database, dictionary=dictionary)
+
+    def start_transaction(self):
+        if self._level is not None:
+            raise errors.ProgrammingError(msg="Transaction already in progress")
+        self._level = self._database.begin()
+
+    def commit(self):
+        if self._level is not None:
+            level, self._level = self._level, None
+            self._database.end(level, commit=True)
+
+    def rollback(self):
+        if self._level is not None:
+            level, self._level = self._level, None
+            self._database.end(level, commit=False)
+
+    def close(self):
+        self.rollback()
+
+
+class SQLiteDatabase:
+    """
+    One SQLite database shared by every connection of the process.
+
+    Attributes:
+        path (str): Database file, or ":memory:" for a private in-memory
+            database that lives as long as this object.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.lock = threading.RLock()
+        self._depth = 0
+
+    def connect(self):
+        """
+        Return a new connection to this database.
+
+        Returns:
+            SQLiteConnection: Connection for campusEwallet_db.
+        """
+        return SQLiteConnection(self)
+
+    def begin(self):
+        """Start a transaction (or a savepoint inside the open one); returns its level."""
+        self.lock.acquire()
+        level = self._depth
+        try:
+            self.connection.execute("BEGIN IMMEDIATE" if level == 0 else f"SAVEPOINT level_{level}")
+        except sqlite3.Error as e:
+            self.lock.release()
+            raise _mysql_error(e) from e
+        self._depth += 1
+        return level
+
+    def end(self, level, commit):
+        """Commit or roll back the transaction (or savepoint) started at level."""
+        try:
+            if level == 0:
+                self.connection.execute("COMMIT" if commit else "ROLLBACK")
+            elif commit:
+                self.connection.execute(f"RELEASE SAVEPOINT level_{level}")
+            else:
+                self.connection.execute(f"ROLLBACK TO SAVEPOINT level_{level}")
+                self.connection.execute(f"RELEASE SAVEPOINT level_{level}")
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        finally:
+            self._depth = level
+            self.lock.release()
+
+    def create_schema(self):
+        """
+        Create the tables, indexes and triggers if they do not exist yet and
+        record every migration of migrations.MIGRATIONS as applied.
+        """
+        from system_backend.migrations import MIGRATIONS
+
+        with self.lock:
+            for statement in SCHEMA + _kpi_triggers():
+                self.connection.execute(statement)
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO schema_migrations (name) VALUES (?)",
+                [(name,) for name, _ in MIGRATIONS],
+            )
+
+    def close(self):
+        """Close the sqlite3 connection; an in-memory database is discarded."""
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,548 @@
+"""
+Statements Module
+
+This module produces monthly account statements for student/office wallets
+and organization wallets without replaying the full transaction history.
+
+How it works:
+- Every balance movement (completed transfers and bill payments, approved
+  cash-ins and cash-outs) is folded into wallet_statement_aggregates: one
+  row per wallet, month and transaction type with inflow/outflow totals
+  and counts
+- refresh_statement_aggregates() only folds the movements recorded since
+  the previous refresh (tracked in statement_refresh_state), so each run
+  scans a small, indexed time window. The window stops SETTLE_SECONDS
+  before now so transfers that are still committing are picked up by the
+  next run instead of being skipped
+- A statement takes its totals and opening balance from the aggregates and
+  reads only the rows of its own month for the line items; movements the
+  aggregates do not cover yet are read from the transaction tail, so
+  wallet views do not refresh. Run the refresh on a schedule instead
+  (e.g. every few minutes from cron)
+- generate_monthly_statements() writes every wallet's statement for a
+  month in parallel, one chunk of wallets per worker
+
+Opening balances are derived backwards from the current balance, which
+also covers the balance a wallet was created with:
+    opening = current balance - net movement from the period start until now
+
+Usage:
+    python -m system_backend.statements refresh
+    python -m system_backend.statements generate 2025-01 [--output-dir DIR]
+
+Dependencies:
+- campusEwallet_db for database queries and transactions
+- transaction_archive so statements of old months read archived rows
+"""
+
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from system_backend.campusEwallet_db import fetch_one, fetch_all, transaction
+from system_backend.transaction_archive import add_months, month_start, transactions_source
+
+
+WALLET_KINDS = ("user", "org")
+SETTLE_SECONDS = 60
+STATEMENT_WORKERS = 4
+STATEMENT_CHUNK_SIZE = 500
+STATEMENTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "statements")
+
+_BALANCE_QUERIES = {
+    "user": """
+        SELECT w.user_id AS wallet_ref, w.balance,
+               COALESCE(es.name, wu.office_name, wu.email) AS owner_name
+        FROM wallets w
+        JOIN wallet_users wu ON wu.user_id = w.user_id
+        LEFT JOIN enrolled_students es ON es.student_id = wu.student_id
+        WHERE w.user_id IN ({refs})
+    """,
+    "org": """
+        SELECT org_wallet_id AS wallet_ref, org_wallet_balance AS balance,
+               organization_name AS owner_name
+        FROM organization_wallets
+        WHERE org_wallet_id IN ({refs})
+    """,
+}
+
+_WALLET_LIST_QUERIES = {
+    "user": "SELECT user_id AS wallet_ref FROM wallets ORDER BY user_id",
+    "org": "SELECT org_wallet_id AS wallet_ref FROM organization_wallets ORDER BY org_wallet_id",
+}
+
+
+def _money(value):
+    """Convert a database amount to Decimal (None counts as zero)."""
+    return Decimal(str(value)) if value is not None else Decimal("0")
+
+
+def _range(column, start, end, params):
+    """Return a half-open range condition on column, appending its params."""
+    sql = ""
+    if start is not None:
+        sql += f" AND {column} >= %s"
+        params.append(start)
+    if end is not None:
+        sql += f" AND {column} < %s"
+        params.append(end)
+    return sql
+
+
+def _request_range(alias, start, end, params):
+    """
+    Range condition on when a cash-in/cash-out request was approved.
+    Requests approved before date_processed was recorded fall back to
+    date_requested.
+    """
+    processed = _range(f"{alias}.date_processed", start, end, params)
+    requested = _range(f"{alias}.date_requested", start, end, params)
+    return (f" AND (({alias}.date_processed IS NOT NULL{processed})"
+            f" OR ({alias}.date_processed IS NULL{requested}))")
+
+
+def _refs_filter(column, wallet_refs, params):
+    """Restrict column to the given wallet references, if any."""
+    if wallet_refs is None:
+        return ""
+    params.extend(wallet_refs)
+    return f" AND {column} IN ({', '.join(['%s'] * len(wallet_refs))})"
+
+
+def movements_query(start=None, end=None, wallet_kind=None, wallet_refs=None):
+    """
+    Build a query listing every balance movement in a time window.
+
+    Each row has wallet_kind, wallet_ref, moved_at, reference,
+    transaction_type, inflow, outflow and message. Wallet filters are
+    pushed into every branch so each one can use its own index.
+
+    Parameters:
+        start (datetime, optional): Inclusive start of the window.
+        end (datetime, optional): Exclusive end of the window.
+        wallet_kind (str, optional): Only 'user' or only 'org' movements.
+        wallet_refs (list, optional): Only these wallets of wallet_kind.
+
+    Returns:
+        tuple: (str, list) UNION ALL query and its parameters.
+    """
+    branches = []
+    params = []
+
+    def source():
+        return transactions_source(start or datetime.min, alias="t")
+
+    if wallet_kind in (None, "user"):
+        branches.append("""
+            SELECT 'user' AS wallet_kind, t.sender_id AS wallet_ref, t.created_at AS moved_at,
+                   t.transaction_id AS reference, t.transaction_type,
+                   0 AS inflow, t.amount AS outflow, t.message
+            FROM """ + source() + """
+            WHERE t.status = 'completed' AND t.sender_id IS NOT NULL"""
+            + _refs_filter("t.sender_id", wallet_refs, params)
+            + _range("t.created_at", start, end, params))
+
+        branches.append("""
+            SELECT 'user', t.receiver_id, t.created_at, t.transaction_id, t.transaction_type,
+                   t.amount, 0, t.message
+            FROM """ + source() + """
+            WHERE t.status = 'completed' AND t.receiver_id IS NOT NULL"""
+            + _refs_filter("t.receiver_id", wallet_refs, params)
+            + _range("t.created_at", start, end, params))
+
+        branches.append("""
+            SELECT 'user', ci.user_id, COALESCE(ci.date_processed, ci.date_requested),
+                   ci.request_id, 'Cash In', ci.amount, 0, NULL
+            FROM cashin_requests ci
+            WHERE ci.status = 'approved'"""
+            + _refs_filter("ci.user_id", wallet_refs, params)
+            + _request_range("ci", start, end, params))
+
+        branches.append("""
+            SELECT 'user', w.user_id, COALESCE(co.date_processed, co.date_requested),
+                   co.request_id, 'Cash Out', 0, co.amount, co.message
+            FROM cashout_requests co
+            JOIN wallets w ON w.wallet_id = co.wallet_id
+            WHERE co.status = 'approved' AND co.org_wallet_id IS NULL"""
+            + _refs_filter("w.user_id", wallet_refs, params)
+            + _request_range("co", start, end, params))
+
+    if wallet_kind in (None, "org"):
+        # Named like the user branch: this one comes first for wallet_kind 'org'
+        branches.append("""
+            SELECT 'org' AS wallet_kind, ob.org_wallet_id AS wallet_ref, t.created_at AS moved_at,
+                   t.transaction_id AS reference, t.transaction_type,
+                   t.amount AS inflow, 0 AS outflow, t.message
+            FROM """ + source() + """
+            JOIN organization_bills ob ON ob.bill_id = t.bill_id
+            WHERE t.status = 'completed'"""
+            + _refs_filter("ob.org_wallet_id", wallet_refs, params)
+            + _range("t.created_at", start, end, params))
+
+        branches.append("""
+            SELECT 'org', co.org_wallet_id, COALESCE(co.date_processed, co.date_requested),
+                   co.request_id, 'Cash Out', 0, co.amount, co.message
+            FROM cashout_requests co
+            WHERE co.status = 'approved' AND co.org_wallet_id IS NOT NULL"""
+            + _refs_filter("co.org_wallet_id", wallet_refs, params)
+            + _request_range("co", start, end, params))
+
+    if not branches:
+        raise ValueError(f"Unknown wallet kind '{wallet_kind}'.")
+
+    return "\nUNION ALL\n".join(branches), params
+
+
+def get_refreshed_until():
+    """
+    Return the instant up to which movements are folded into the aggregates.
+
+    Returns:
+        datetime | None: End of the last refresh window, or None if the
+            aggregates were never refreshed.
+    """
+    row = fetch_one("SELECT refreshed_until FROM statement_refresh_state WHERE id = 1")
+    return row["refreshed_until"] if row else None
+
+
+def refresh_statement_aggregates():
+    """
+    Fold the movements recorded since the last refresh into the aggregates.
+
+    The checkpoint row is locked for the duration of the refresh, so two
+    refreshes never fold the same window twice, and the checkpoint moves
+    in the same transaction as the aggregates it covers.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    try:
+        with transaction() as cursor:
+            cursor.execute("""
+                SELECT refreshed_until, NOW() - INTERVAL %s SECOND AS cutoff
+                FROM statement_refresh_state
+                WHERE id = 1
+                FOR UPDATE
+            """, (SETTLE_SECONDS,))
+            state = cursor.fetchone()
+            if not state:
+                return False, "Statement checkpoint is missing. Run the migrations first."
+
+            start, cutoff = state["refreshed_until"], state["cutoff"]
+            if start is not None and start >= cutoff:
+                return True, "Statement aggregates are already up to date."
+
+            movements, params = movements_query(start, cutoff)
+            cursor.execute("""
+                INSERT INTO wallet_statement_aggregates
+                    (wallet_kind, wallet_ref, period_month, transaction_type,
+                     inflow, outflow, inflow_count, outflow_count)
+                SELECT m.wallet_kind, m.wallet_ref,
+                       DATE(m.moved_at) - INTERVAL (DAYOFMONTH(m.moved_at) - 1) DAY,
+                       COALESCE(m.transaction_type, 'Other'),
+                       SUM(m.inflow), SUM(m.outflow), SUM(m.inflow > 0), SUM(m.outflow > 0)
+                FROM (""" + movements + """) AS m
+                GROUP BY 1, 2, 3, 4
+                ON DUPLICATE KEY UPDATE
+                    inflow = wallet_statement_aggregates.inflow + VALUES(inflow),
+                    outflow = wallet_statement_aggregates.outflow + VALUES(outflow),
+                    inflow_count = wallet_statement_aggregates.inflow_count + VALUES(inflow_count),
+                    outflow_count = wallet_statement_aggregates.outflow_count + VALUES(outflow_count)
+            """, tuple(params))
+
+            cursor.execute(
+                "UPDATE statement_refresh_state SET refreshed_until = %s WHERE id = 1",
+                (cutoff,)
+            )
+
+    except Exception as e:
+        print(f"Database Error in refresh_statement_aggregates: {e}")
+        return False, f"Failed to refresh statement aggregates: {e}"
+
+    return True, f"Statement aggregates refreshed up to {cutoff.strftime('%Y-%m-%d %H:%M:%S')}."
+
+
+def parse_period(value):
+    """
+    Parse a statement period.
+
+    Parameters:
+        value (str | date | datetime): 'YYYY-MM' or any day of the month.
+
+    Returns:
+        date: First day of the month.
+
+    Raises:
+        ValueError: If the value is not a valid period.
+    """
+    if isinstance(value, (date, datetime)):
+        return month_start(value)
+    return datetime.strptime(str(value).strip(), "%Y-%m").date()
+
+
+def build_statements(wallet_kind, wallet_refs, period, refreshed_until=None):
+    """
+    Build the statements of several wallets of one kind for one month.
+
+    Parameters:
+        wallet_kind (str): 'user' or 'org'.
+        wallet_refs (list): wallets.user_id or organization_wallets.org_wallet_id values.
+        period (date): First day of the month.
+        refreshed_until (datetime, optional): Current aggregate checkpoint.
+
+    Returns:
+        dict: Statement dicts keyed by wallet reference. Wallets that do not
+            exist are left out.
+    """
+    if wallet_kind not in WALLET_KINDS:
+        raise ValueError(f"Unknown wallet kind '{wallet_kind}'.")
+    if not wallet_refs:
+        return {}
+
+    start = datetime.combine(period, datetime.min.time())
+    end = datetime.combine(add_months(period, 1), datetime.min.time())
+    refs_sql = ", ".join(["%s"] * len(wallet_refs))
+
+    wallets = fetch_all(_BALANCE_QUERIES[wallet_kind].format(refs=refs_sql), tuple(wallet_refs)) or []
+    statements = {}
+    for wallet in wallets:
+        statements[wallet["wallet_ref"]] = {
+            "wallet_kind": wallet_kind,
+            "wallet_ref": wallet["wallet_ref"],
+            "owner_name": wallet.get("owner_name"),
+            "period": period.strftime("%Y-%m"),
+            "current_balance": _money(wallet["balance"]),
+            "later_net": Decimal("0"),
+            "by_type": {},
+            "entries": [],
+        }
+    if not statements:
+        return {}
+
+    # Net movement from the period start until the checkpoint, per wallet
+    aggregates = fetch_all("""
+        SELECT wallet_ref, period_month, transaction_type,
+               inflow, outflow, inflow_count, outflow_count
+        FROM wallet_statement_aggregates
+        WHERE wallet_kind = %s AND period_month >= %s AND wallet_ref IN (""" + refs_sql + ")",
+        (wallet_kind, period) + tuple(wallet_refs)) or []
+
+    for row in aggregates:
+        statement = statements.get(row["wallet_ref"])
+        if statement is None:
+            continue
+        statement["later_net"] += _money(row["inflow"]) - _money(row["outflow"])
+        if row["period_month"] == period:
+            statement["by_type"][row["transaction_type"]] = {
+                "inflow": _money(row["inflow"]),
+                "outflow": _money(row["outflow"]),
+                "inflow_count": int(row["inflow_count"]),
+                "outflow_count": int(row["outflow_count"]),
+            }
+
+    # Movements after the checkpoint are not aggregated yet
+    tail_start = max(refreshed_until, start) if refreshed_until else start
+    tail, params = movements_query(tail_start, None, wallet_kind, list(wallet_refs))
+    for row in fetch_all(
+        "SELECT m.wallet_ref, SUM(m.inflow) - SUM(m.outflow) AS net FROM (" + tail + ") AS m GROUP BY m.wallet_ref",
+        tuple(params)
+    ) or []:
+        if row["wallet_ref"] in statements:
+            statements[row["wallet_ref"]]["later_net"] += _money(row["net"])
+
+    period_rows, params = movements_query(start, end, wallet_kind, list(wallet_refs))
+    for row in fetch_all(
+        "SELECT m.* FROM (" + period_rows + ") AS m ORDER BY m.wallet_ref, m.moved_at, m.reference",
+        tuple(params)
+    ) or []:
+        if row["wallet_ref"] in statements:
+            statements[row["wallet_ref"]]["entries"].append(row)
+
+    period_covered = refreshed_until is not None and refreshed_until >= end
+    for statement in statements.values():
+        if not period_covered:
+            # The month is still open; total its rows directly
+            statement["by_type"] = {}
+            for entry in statement["entries"]:
+                totals = statement["by_type"].setdefault(entry["transaction_type"] or "Other", {
+                    "inflow": Decimal("0"), "outflow": Decimal("0"),
+                    "inflow_count": 0, "outflow_count": 0,
+                })
+                if _money(entry["inflow"]) > 0:
+                    totals["inflow"] += _money(entry["inflow"])
+                    totals["inflow_count"] += 1
+                if _money(entry["outflow"]) > 0:
+                    totals["outflow"] += _money(entry["outflow"])
+                    totals["outflow_count"] += 1
+
+        total_in = sum((t["inflow"] for t in statement["by_type"].values()), Decimal("0"))
+        total_out = sum((t["outflow"] for t in statement["by_type"].values()), Decimal("0"))
+        opening = statement.pop("current_balance") - statement.pop("later_net")
+
+        statement["opening_balance"] = opening
+        statement["total_inflow"] = total_in
+        statement["total_outflow"] = total_out
+        statement["closing_balance"] = opening + total_in - total_out
+
+    return statements
+
+
+def get_statement(wallet_kind, wallet_ref, period, refresh=True):
+    """
+    Return one wallet's statement for a month.
+
+    Parameters:
+        wallet_kind (str): 'user' or 'org'.
+        wallet_ref (int): wallets.user_id or organization_wallets.org_wallet_id.
+        period (str | date): 'YYYY-MM' or any day of the month.
+        refresh (bool): Fold new movements into the aggregates first. The
+            refresh locks the global refresh state, so interactive views
+            pass False and leave it to the scheduled job.
+
+    Returns:
+        tuple: (bool, dict or str) True and the statement, or False and an error message.
+    """
+    try:
+        period = parse_period(period)
+    except ValueError:
+        return False, "Invalid statement period. Use YYYY-MM."
+
+    if refresh:
+        refresh_statement_aggregates()
+
+    try:
+        statement = build_statements(wallet_kind, [wallet_ref], period, get_refreshed_until()).get(wallet_ref)
+    except Exception as e:
+        print(f"Database Error in get_statement: {e}")
+        return False, f"Failed to build statement: {e}"
+
+    if not statement:
+        return False, "Wallet not found."
+    return True, statement
+
+
+def render_statement(statement):
+    """
+    Render a statement as plain text.
+
+    Parameters:
+        statement (dict): Statement from build_statements/get_statement.
+
+    Returns:
+        str: Printable statement.
+    """
+    def amount(value):
+        return f"PHP {value:,.2f}"
+
+    lines = [
+        "Campus E-Wallet Statement",
+        f"Period:  {statement['period']}",
+        f"Account: {statement.get('owner_name') or ''} ({statement['wallet_kind']} {statement['wallet_ref']})",
+        "",
+        f"Opening balance: {amount(statement['opening_balance']):>20}",
+        f"Total in:        {amount(statement['total_inflow']):>20}",
+        f"Total out:       {amount(statement['total_outflow']):>20}",
+        f"Closing balance: {amount(statement['closing_balance']):>20}",
+        "",
+        "Summary by type:",
+    ]
+    for transaction_type, totals in sorted(statement["by_type"].items()):
+        lines.append(
+            f"  {transaction_type:<16} in {totals['inflow_count']:>4} {amount(totals['inflow']):>16}"
+            f"   out {totals['outflow_count']:>4} {amount(totals['outflow']):>16}"
+        )
+
+    lines += ["", "Transactions:"]
+    if not statement["entries"]:
+        lines.append("  No transactions this period.")
+    for entry in statement["entries"]:
+        moved_at = entry["moved_at"]
+        if isinstance(moved_at, datetime):
+            moved_at = moved_at.strftime("%Y-%m-%d %H:%M")
+        inflow, outflow = _money(entry["inflow"]), _money(entry["outflow"])
+        signed = f"+{inflow:,.2f}" if inflow > 0 else f"-{outflow:,.2f}"
+        lines.append(f"  {moved_at}  {entry['reference']:<24} {entry['transaction_type'] or 'Other':<14} {signed:>14}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _write_statement_chunk(wallet_kind, wallet_refs, period, refreshed_until, output_dir):
+    """Build and write the statements of one chunk of wallets."""
+    statements = build_statements(wallet_kind, wallet_refs, period, refreshed_until)
+    for statement in statements.values():
+        path = os.path.join(output_dir, f"{wallet_kind}-{statement['wallet_ref']}-{statement['period']}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_statement(statement))
+    return len(statements)
+
+
+def generate_monthly_statements(period, output_dir=None, workers=STATEMENT_WORKERS):
+    """
+    Write every wallet's statement for a month, e.g. as a month-end job.
+
+    Parameters:
+        period (str | date): 'YYYY-MM' or any day of the month.
+        output_dir (str, optional): Folder to write into. Defaults to
+            STATEMENTS_DIR/<YYYY-MM>.
+        workers (int): Chunks of wallets processed in parallel.
+
+    Returns:
+        tuple: (bool, dict or str) True and {"period", "statements", "output_dir"},
+            or False and an error message.
+    """
+    try:
+        period = parse_period(period)
+    except ValueError:
+        return False, "Invalid statement period. Use YYYY-MM."
+
+    ok, message = refresh_statement_aggregates()
+    if not ok:
+        return False, message
+
+    output_dir = output_dir or os.path.join(STATEMENTS_DIR, period.strftime("%Y-%m"))
+    os.makedirs(output_dir, exist_ok=True)
+    refreshed_until = get_refreshed_until()
+
+    chunks = []
+    for wallet_kind in WALLET_KINDS:
+        refs = [row["wallet_ref"] for row in fetch_all(_WALLET_LIST_QUERIES[wallet_kind]) or []]
+        for i in range(0, len(refs), STATEMENT_CHUNK_SIZE):
+            chunks.append((wallet_kind, refs[i:i + STATEMENT_CHUNK_SIZE]))
+
+    written = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(_write_statement_chunk, wallet_kind, refs, period, refreshed_until, output_dir)
+            for wallet_kind, refs in chunks
+        ]
+        for future in futures:
+            try:
+                written += future.result()
+            except Exception as e:
+                print(f"Error in generate_monthly_statements: {e}")
+                failed += 1
+
+    if failed:
+        return False, f"{failed} of {len(chunks)} statement batches failed; {written} statements written."
+    return True, {"period": period.strftime("%Y-%m"), "statements": written, "output_dir": output_dir}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain statement aggregates and generate statements.")
+    parser.add_argument("command", choices=["refresh", "generate"])
+    parser.add_argument("period", nargs="?", help="Statement month (YYYY-MM), for generate.")
+    parser.add_argument("--output-dir", default=None)
+    parser.add_argument("--workers", type=int, default=STATEMENT_WORKERS)
+    args = parser.parse_args()
+
+    if args.command == "refresh":
+        ok, result = refresh_statement_aggregates()
+    else:
+        if not args.period:
+            parser.error("generate needs a period (YYYY-MM)")
+        ok, result = generate_monthly_statements(args.period, args.output_dir, args.workers)
+        if ok:
+            result = f"Wrote {result['statements']} statements to {result['output_dir']}"
+    print(result)
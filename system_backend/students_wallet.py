@@ -9,15 +9,20 @@ Main Responsibilities:
 - Fetch student information linked to a wallet user
 - Display wallet balance and welcome information
 - Send money between users (students or offices)
+- Send batch payouts from an office wallet to many students in one transaction
+- Split bills with peers and pay split shares (see split_payments)
 - Request funds (cash-in requests)
 - View and filter cash-in requests
-- Load and pay organization bills
-- View unpaid posted bills
-- View complete transaction history
+- Load and pay organization bills (atomically, updating bill collection stats)
+- View unpaid posted bills, including bills targeted at the student
+- View transaction history, optionally by date range (including archived months)
+- Generate receipt images and a period's receipts as one PDF
+- Produce monthly wallet statements (see statements)
+- Provide cached spending insights for the dashboard (see spending_analytics)
 
 Dependencies:
 - datetime, random: for ID generation and timestamps
-- PIL (Image, ImageDraw, ImageFont): reserved for future receipt/image features
+- system_backend.receipts: receipt rendering (PIL)
 - system_backend.campusEwallet_db: database access layer
 
 All database operations are handled through the campusEwallet_db module.
@@ -25,23 +30,49 @@ All database operations are handled through the campusEwallet_db module.
 
 from datetime import datetime
 import random
-from PIL import Image, ImageDraw, ImageFont
 import os
+from mysql.connector import IntegrityError
 import system_backend.campusEwallet_db
-
-
-def generate_transaction_id():
-    """
-    Generate a unique transaction ID.
-
-    Format: TRNX-YYYYMMDD-RANDOM
-
-    Returns:
-        str: Unique transaction ID.
-    """
-    date_part = datetime.now().strftime("%Y%m%d")
-    random_part = random.randint(10000, 99999)
-    return f"TRNX-{date_part}-{random_part}"
+from system_backend.transfers import generate_transaction_id, transfer_funds, InsufficientBalance, DEBIT_SENDER
+from system_backend.bill_collection import record_bill_payment
+from system_backend.date_ranges import day_range, add_range_filter
+from system_backend.transaction_archive import transactions_source
+from system_backend.receipts import render_receipt, render_receipts_pdf
+from system_backend.statements import get_statement
+from system_backend.spending_analytics import get_spending_insights, invalidate_spending_analytics
+from system_backend.fraud_detection import check_transfer
+from system_backend.receiver_cache import lookup_receiver
+from system_backend.scheduled_transfers import (
+    create_recurring_transfer, get_recurring_transfers, cancel_recurring_transfer
+)
+from system_backend.split_payments import (
+    equal_shares, create_split, pay_share, cancel_split, get_open_obligations, get_created_splits
+)
+
+
+# Hot statements run prepared through the query registry (see campusEwallet_db)
+WALLET_BALANCE = system_backend.campusEwallet_db.register_query(
+    "wallet.balance", "SELECT balance FROM wallets WHERE user_id = %s"
+)
+INSERT_CASHIN_REQUEST = system_backend.campusEwallet_db.register_query("wallet.insert_cashin_request", """
+    INSERT INTO cashin_requests
+    (request_id, user_id, amount, status, date_requested)
+    VALUES (%s, %s, %s, 'pending', NOW())
+""")
+
+# Upper bound for one batch payout; keeps the multi-row statements a sane size
+MAX_PAYOUT_LINES = 1000
+# Fresh transaction IDs are drawn again if an insert hits an existing one
+PAYOUT_ID_ATTEMPTS = 3
+
+# Bills are visible to everyone unless targeted; targeted bills are matched
+# against organization_bill_audience through its (student_id, bill_id) key.
+BILL_AUDIENCE_CONDITION = """(ob.is_targeted = 0 OR EXISTS (
+                SELECT 1
+                FROM organization_bill_audience aud
+                WHERE aud.student_id = %s
+                  AND aud.bill_id = ob.bill_id
+            ))"""
 
 
 def generate_request_id():
@@ -63,6 +94,7 @@ class StudentWallet:
     Attributes:
         user_id (int): Wallet user ID.
         student_id (str): Linked student ID (if available).
+        office_id (int): Linked office ID for office wallets, else None.
         student_name (str): Name of the student (fetched from database).
     """
     def __init__(self, user_id):
@@ -74,6 +106,7 @@ class StudentWallet:
         """
         self.user_id = user_id
         self.student_id = None
+        self.office_id = None
         self.student_name = self._fetch_student_name()
 
         if not self.student_name:
@@ -88,8 +121,9 @@ class StudentWallet:
             str or None: Student name if found, else None.
         """
         try:
-            user_info = system_backend.campusEwallet_db.fetch_one("SELECT student_id FROM wallet_users WHERE user_id = %s", (self.user_id,))
+            user_info = system_backend.campusEwallet_db.fetch_one("SELECT student_id, office_id FROM wallet_users WHERE user_id = %s", (self.user_id,))
             self.student_id = user_info["student_id"] if user_info else None
+            self.office_id = user_info.get("office_id") if user_info else None
             student_id = self.student_id
 
             if student_id:
@@ -128,7 +162,7 @@ class StudentWallet:
             float: Wallet balance, 0.0 if not found or on error.
         """
         try:
-            row = system_backend.campusEwallet_db.fetch_one("SELECT balance FROM wallets WHERE user_id = %s", (self.user_id,))
+            row = system_backend.campusEwallet_db.fetch_one(WALLET_BALANCE, (self.user_id,))
             print("DEBUG: row from wallets:", row)
             return float(row["balance"]) if row and row["balance"] is not None else 0.0
         except Exception as e:
@@ -168,63 +202,196 @@ class StudentWallet:
             return False, "Amount must be greater than zero."
 
         try:
-            sender_wallet = system_backend.campusEwallet_db.fetch_one("SELECT balance FROM wallets WHERE user_id = %s", (self.user_id,))
+            sender_wallet = system_backend.campusEwallet_db.fetch_one(WALLET_BALANCE, (self.user_id,))
             if not sender_wallet:
                 return False, "Sender wallet not found in the system."
             if sender_wallet["balance"] < amount:
                 return False, "Insufficient balance."
 
-            receiver = system_backend.campusEwallet_db.fetch_one("""
-                SELECT wu.user_id, wu.student_id, wu.office_id, wu.office_name, es.name AS receiver_name
-                FROM wallet_users wu
-                LEFT JOIN enrolled_students es ON wu.student_id = es.student_id
-                WHERE wu.student_id = %s OR wu.office_id = %s
-            """, (receiver_identifier, receiver_identifier))
+            # Cached: frequent receivers (e.g. the canteen) skip the lookup query
+            receiver = lookup_receiver(receiver_identifier)
 
-            if not receiver or not receiver.get("user_id"):
+            if not receiver:
                 return False, "Receiver not found with the provided identifier."
                 
             receiver_user_id = receiver["user_id"]
             if receiver_user_id == self.user_id:
                 return False, "Cannot send money to yourself."
             
-            receiver_wallet = system_backend.campusEwallet_db.fetch_one("SELECT user_id FROM wallets WHERE user_id = %s", (receiver_user_id,))
-            if not receiver_wallet:
+            if not receiver["wallet_exists"]:
                  return False, "Receiver wallet does not exist."
 
-            system_backend.campusEwallet_db.execute_query("UPDATE wallets SET balance = balance - %s WHERE user_id = %s", (amount, self.user_id))
-            system_backend.campusEwallet_db.execute_query("UPDATE wallets SET balance = balance + %s WHERE user_id = %s", (amount, receiver_user_id))
+            # Debit, credit and ledger row commit together (see transfers)
+            try:
+                with system_backend.campusEwallet_db.transaction() as cursor:
+                    trx_id = transfer_funds(cursor, self.user_id, receiver_user_id, amount, message)
+            except InsufficientBalance as e:
+                return False, str(e)
 
-            trx_id = generate_transaction_id()
-
-            system_backend.campusEwallet_db.execute_query("""
-                INSERT INTO transactions
-                (transaction_id, sender_id, receiver_id, amount, transaction_type, service_paid_for, created_at, status, message)
-                VALUES (%s, %s, %s, %s, %s, %s, NOW(), %s, %s)
-            """, (trx_id, self.user_id, receiver_user_id, amount, "Send Money", None, "completed", message))
-            
-            result = {
-                "transaction_id": trx_id,
-                "sender_user_id": self.user_id,
-                "receiver_user_id": receiver_user_id,
-                "amount": amount,
-                "status": "completed",
-                "message": message
-            }
-            if receiver.get("student_id"):
-                result["receiver_student_id"] = receiver["student_id"]
-                result["receiver_name"] = receiver.get("receiver_name")
-            if receiver.get("office_id"):
-                result["receiver_office_id"] = receiver["office_id"]
-                result["receiver_office_name"] = receiver.get("office_name")
-
-            result["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            return True, result
+            invalidate_spending_analytics(self.user_id)
+            invalidate_spending_analytics(receiver_user_id)
+            check_transfer(trx_id, self.user_id, receiver_user_id, amount)
+            return True, self._transfer_result(trx_id, receiver, amount, message)
 
         except Exception as e:
             print(f"FATAL ERROR in send_money: {e}")
             return False, f"A system error occurred during the transfer: {str(e)}"
 
+    def _transfer_result(self, trx_id, receiver, amount, message):
+        """Build the send_money result for a committed transfer to a looked-up receiver."""
+        result = {
+            "transaction_id": trx_id,
+            "sender_user_id": self.user_id,
+            "receiver_user_id": receiver["user_id"],
+            "amount": amount,
+            "status": "completed",
+            "message": message
+        }
+        if receiver.get("student_id"):
+            result["receiver_student_id"] = receiver["student_id"]
+            result["receiver_name"] = receiver.get("receiver_name")
+        if receiver.get("office_id"):
+            result["receiver_office_id"] = receiver["office_id"]
+            result["receiver_office_name"] = receiver.get("office_name")
+
+        result["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return result
+
+
+    def send_batch_payout(self, lines):
+        """
+        Pay many students from an office wallet in one atomic batch.
+
+        Recipients are resolved with one query; the office wallet is
+        debited once, all recipients are credited with one UPDATE and all
+        transactions are inserted with one multi-row INSERT, in a single
+        database transaction. Lines that cannot be paid (bad amount,
+        unknown student) are reported and skipped; if the office cannot
+        cover the remaining total, nothing is paid. Payouts are not fraud
+        scored, since only office wallets can send them.
+
+        Parameters:
+            lines (list): (student_id, amount) or (student_id, amount, message) items.
+
+        Returns:
+            tuple: (bool, dict/str)
+                True and {"total", "paid_count", "failed_count", "lines"}, where
+                each line is {"line", "student_id", "amount", "status",
+                "transaction_id" or "error"}; False and an error message otherwise.
+        """
+        # Gate on the office link itself; a failed profile lookup leaves both IDs unset
+        if not self.office_id:
+            return False, "Batch payouts are only available to office wallets."
+        if not lines:
+            return False, "No payout lines given."
+        if len(lines) > MAX_PAYOUT_LINES:
+            return False, f"A batch payout is limited to {MAX_PAYOUT_LINES} lines."
+
+        report = []
+        for number, line in enumerate(lines, start=1):
+            student_id = str(line[0]).strip() if line and line[0] is not None else ""
+            entry = {"line": number, "student_id": student_id, "amount": None,
+                     "message": line[2] if len(line) > 2 else None}
+            try:
+                entry["amount"] = round(float(line[1]), 2)
+            except (TypeError, ValueError, IndexError):
+                entry.update(status="failed", error="Invalid amount format.")
+            else:
+                if entry["amount"] <= 0:
+                    entry.update(status="failed", error="Amount must be greater than zero.")
+                elif not student_id:
+                    entry.update(status="failed", error="Missing student ID.")
+                else:
+                    entry["status"] = "pending"
+            report.append(entry)
+
+        pending = [entry for entry in report if entry["status"] == "pending"]
+        if pending:
+            student_ids = sorted({entry["student_id"] for entry in pending})
+            placeholders = ", ".join(["%s"] * len(student_ids))
+            recipients = system_backend.campusEwallet_db.fetch_all(f"""
+                SELECT wu.student_id, wu.user_id
+                FROM wallet_users wu
+                JOIN wallets w ON w.user_id = wu.user_id
+                WHERE wu.student_id IN ({placeholders})
+            """, tuple(student_ids))
+            if recipients is None:
+                return False, "A system error occurred while resolving recipients."
+            user_ids = {row["student_id"]: row["user_id"] for row in recipients}
+
+            for entry in pending:
+                entry["user_id"] = user_ids.get(entry["student_id"])
+                if entry["user_id"] is None:
+                    entry.update(status="failed", error="Student wallet not found.")
+            pending = [entry for entry in pending if entry["status"] == "pending"]
+
+        total = round(sum(entry["amount"] for entry in pending), 2)
+        if pending:
+            credits = {}
+            for entry in pending:
+                credits[entry["user_id"]] = credits.get(entry["user_id"], 0) + entry["amount"]
+            for attempt in range(PAYOUT_ID_ATTEMPTS):
+                trx_ids = set()
+                while len(trx_ids) < len(pending):
+                    trx_ids.add(generate_transaction_id())
+                for entry, trx_id in zip(pending, trx_ids):
+                    entry["transaction_id"] = trx_id
+
+                try:
+                    with system_backend.campusEwallet_db.transaction() as cursor:
+                        # Single debit; the condition is the balance check
+                        cursor.execute(
+                            "UPDATE wallets SET balance = balance - %s WHERE user_id = %s AND balance >= %s",
+                            (total, self.user_id, total)
+                        )
+                        if cursor.rowcount == 0:
+                            raise ValueError("Insufficient balance for this payout.")
+
+                        cases = " ".join(["WHEN %s THEN %s"] * len(credits))
+                        in_list = ", ".join(["%s"] * len(credits))
+                        params = [value for item in credits.items() for value in item] + list(credits)
+                        cursor.execute(
+                            f"UPDATE wallets SET balance = balance + CASE user_id {cases} END WHERE user_id IN ({in_list})",
+                            tuple(params)
+                        )
+
+                        rows = ", ".join(["(%s, %s, %s, %s, 'Send Money', NULL, NOW(), 'completed', %s)"] * len(pending))
+                        params = [value for entry in pending for value in
+                                  (entry["transaction_id"], self.user_id, entry["user_id"], entry["amount"], entry["message"])]
+                        cursor.execute(f"""
+                            INSERT INTO transactions
+                            (transaction_id, sender_id, receiver_id, amount, transaction_type, service_paid_for, created_at, status, message)
+                            VALUES {rows}
+                        """, tuple(params))
+
+                except ValueError as e:
+                    return False, str(e)
+                except IntegrityError as e:
+                    # An ID clashed with an existing row; the batch was rolled back
+                    if attempt < PAYOUT_ID_ATTEMPTS - 1:
+                        continue
+                    print(f"Database Error in send_batch_payout: {e}")
+                    return False, "A system error occurred during the payout. No payments were made."
+                except Exception as e:
+                    print(f"Database Error in send_batch_payout: {e}")
+                    return False, "A system error occurred during the payout. No payments were made."
+                break
+
+            invalidate_spending_analytics(self.user_id)
+            for user_id in credits:
+                invalidate_spending_analytics(user_id)
+            for entry in pending:
+                entry["status"] = "paid"
+
+        for entry in report:
+            entry.pop("user_id", None)
+        return True, {
+            "total": total,
+            "paid_count": len(pending),
+            "failed_count": len(report) - len(pending),
+            "lines": report
+        }
+
 
     def request_funds(self, amount):
         """
@@ -249,11 +416,9 @@ class StudentWallet:
         try:
             request_id = generate_request_id()
 
-            ok = system_backend.campusEwallet_db.execute_query("""
-                INSERT INTO cashin_requests
-                (request_id, user_id, amount, status, date_requested)
-                VALUES (%s, %s, %s, 'pending', NOW())
-            """, (request_id, self.user_id, amount))
+            ok = system_backend.campusEwallet_db.execute_query(
+                INSERT_CASHIN_REQUEST, (request_id, self.user_id, amount)
+            )
 
             if not ok:
                 return False, "Database error while submitting cash-in request."
@@ -283,6 +448,11 @@ class StudentWallet:
         Returns:
             list: List of cash-in requests.
         """
+        query, params = self._cashin_requests_query(search_id, status_filter)
+        return system_backend.campusEwallet_db.fetch_all(query, params)
+
+    def _cashin_requests_query(self, search_id=None, status_filter=None):
+        """Build the view_cashin_requests query; returns (query, params)."""
         query = """
             SELECT request_id, amount, status, date_requested
             FROM cashin_requests
@@ -300,18 +470,23 @@ class StudentWallet:
             params.append(status_filter.lower())
 
         query += " ORDER BY date_requested DESC"
-        return system_backend.campusEwallet_db.fetch_all(query, tuple(params))
+        return query, tuple(params)
 
 
     def load_organization_posts(self):
+        """
+        Load the organization bills visible to the user, newest first.
+        Targeted bills are only listed for students in their audience.
+        """
         query = """
             SELECT ob.bill_id, ob.title, ob.description, ob.amount,
                    ow.organization_name
             FROM organization_bills ob
             JOIN organization_wallets ow ON ob.org_wallet_id = ow.org_wallet_id
+            WHERE """ + BILL_AUDIENCE_CONDITION + """
             ORDER BY ob.bill_id DESC
         """
-        return system_backend.campusEwallet_db.fetch_all(query)
+        return system_backend.campusEwallet_db.fetch_all(query, (self.student_id,))
 
     def pay_organization_bill(self, bill_id, message=None):
         bill = system_backend.campusEwallet_db.fetch_one("""
@@ -319,7 +494,7 @@ class StudentWallet:
             FROM organization_bills ob
             JOIN organization_wallets ow ON ob.org_wallet_id = ow.org_wallet_id
             WHERE ob.bill_id = %s
-        """, (bill_id,))
+              AND """ + BILL_AUDIENCE_CONDITION, (bill_id, self.student_id))
 
         if not bill:
             return False, "Bill not found."
@@ -331,24 +506,36 @@ class StudentWallet:
 
         trx_id = generate_transaction_id()
 
-        system_backend.campusEwallet_db.execute_query(
-            "UPDATE wallets SET balance = balance - %s WHERE user_id = %s",
-            (amount, self.user_id)
-        )
-
-        system_backend.campusEwallet_db.execute_query(
-            "UPDATE organization_wallets SET org_wallet_balance = org_wallet_balance + %s WHERE org_wallet_id = %s",
-            (amount, bill["org_wallet_id"])
-        )
-
-       
-        system_backend.campusEwallet_db.execute_query("""
-            INSERT INTO transactions
-                (transaction_id, sender_id, amount,
-                 transaction_type, bill_id, status, message)
-            VALUES (%s, %s, %s, 'Bill Payment', %s, 'completed', %s)
-        """, (trx_id, self.user_id, amount, bill_id, message))
+        # Debit, credit, ledger row and collection read model commit together.
+        # The debit is conditional, so a concurrent payment cannot overdraw
+        # the wallet between the balance check above and this transaction.
+        try:
+            with system_backend.campusEwallet_db.transaction() as cursor:
+                cursor.execute(DEBIT_SENDER, (amount, self.user_id, amount))
+                if cursor.rowcount == 0:
+                    raise InsufficientBalance("Insufficient balance.")
+
+                cursor.execute(
+                    "UPDATE organization_wallets SET org_wallet_balance = org_wallet_balance + %s WHERE org_wallet_id = %s",
+                    (amount, bill["org_wallet_id"])
+                )
+
+                cursor.execute("""
+                    INSERT INTO transactions
+                        (transaction_id, sender_id, amount,
+                         transaction_type, bill_id, status, message)
+                    VALUES (%s, %s, %s, 'Bill Payment', %s, 'completed', %s)
+                """, (trx_id, self.user_id, amount, bill_id, message))
+
+                record_bill_payment(cursor, trx_id, bill["org_wallet_id"])
+
+        except InsufficientBalance as e:
+            return False, str(e)
+        except Exception as e:
+            print(f"Database Error in pay_organization_bill: {e}")
+            return False, "A system error occurred during the bill payment."
 
+        invalidate_spending_analytics(self.user_id)
         return True, {
             "transaction_id": trx_id,
             "amount": amount,
@@ -359,7 +546,14 @@ class StudentWallet:
     def view_posted_bills(self, bill_id_search=None):
         """
         Returns a list of posted bills from 'organization_bills' that the current user has not yet paid.
+        Targeted bills are only included when the student is in the bill's audience.
+        Payments are looked up in organization_bill_payers, which is never archived.
         """
+        query, params = self._posted_bills_query(bill_id_search)
+        return system_backend.campusEwallet_db.fetch_all(query, params)
+
+    def _posted_bills_query(self, bill_id_search=None):
+        """Build the view_posted_bills query; returns (query, params)."""
         query = """
             SELECT ob.bill_id, ob.org_wallet_id, ob.title, ob.description, ob.amount,
                    ow.organization_name
@@ -367,29 +561,40 @@ class StudentWallet:
             JOIN organization_wallets ow ON ob.org_wallet_id = ow.org_wallet_id
             WHERE NOT EXISTS (
                 SELECT 1
-                FROM transactions t
-                WHERE t.bill_id = ob.bill_id
-                  AND t.sender_id = %s
-                  AND t.transaction_type = 'Bill Payment'
-                  AND t.status = 'completed'
+                FROM organization_bill_payers p
+                WHERE p.user_id = %s
+                  AND p.bill_id = ob.bill_id
             )
-        """
-        params = [self.user_id]
+            AND """ + BILL_AUDIENCE_CONDITION
+        params = [self.user_id, self.student_id]
 
         if bill_id_search:
             query += " AND ob.bill_id LIKE %s"
             params.append(f"%{bill_id_search}%")
 
         query += " ORDER BY ob.bill_id DESC"
-        return system_backend.campusEwallet_db.fetch_all(query, tuple(params))
+        return query, tuple(params)
 
     def get_posted_bills_summary(self, bill_id_search=None):
         return self.view_posted_bills(bill_id_search)
 
-    def view_transactions(self):
+    def view_transactions(self, start_date=None, end_date=None):
         """
         View all transactions for the user (sent and received).
+
+        Without dates this lists the transactions still in the hot table.
+        A date range (YYYY-MM-DD, both inclusive) limits the history and,
+        when it reaches before the archive horizon, also reads archived months.
         """
+        query, params = self._transactions_query(start_date, end_date)
+        return system_backend.campusEwallet_db.fetch_all(query, params)
+
+    def _transactions_query(self, start_date=None, end_date=None):
+        """Build the view_transactions query; returns (query, params)."""
+        start, end = day_range(start_date, end_date)
+        params = [self.user_id, self.user_id, self.user_id]
+        source = transactions_source(start, alias="t")
+
         query = """
             SELECT
                 t.transaction_id,
@@ -410,7 +615,7 @@ class StudentWallet:
                     WHEN t.transaction_type = 'Bill Payment' THEN org.organization_name
                     ELSE COALESCE(receiver_student.name, receiver_office.office_name, 'System')
                 END AS receiver_name
-            FROM transactions t
+            FROM """ + source + """
             -- Join for Sender Info
             LEFT JOIN wallet_users sender_wu ON t.sender_id = sender_wu.user_id
             LEFT JOIN enrolled_students sender_student ON sender_wu.student_id = sender_student.student_id
@@ -422,9 +627,207 @@ class StudentWallet:
             -- Join for Bill Payment Info
             LEFT JOIN organization_bills ob ON t.bill_id = ob.bill_id
             LEFT JOIN organization_wallets org ON ob.org_wallet_id = org.org_wallet_id
-            WHERE t.sender_id = %s OR t.receiver_id = %s
-            ORDER BY t.created_at DESC;
+            WHERE (t.sender_id = %s OR t.receiver_id = %s)
+        """
+        query = add_range_filter(query, params, "t.created_at", start, end)
+        query += " ORDER BY t.created_at DESC"
+        if "transactions_archive" not in source:
+            # Hot-table history has one shape per combination of bounds; run it prepared
+            name = "wallet.history" + (".from" if start else "") + (".to" if end else "")
+            query = system_backend.campusEwallet_db.register_query(name, query)
+        return query, tuple(params)
+
+    
+
+    def generate_receipt(self, transaction_result):
+        """
+        Render a receipt image for a completed transfer or bill payment.
+
+        Parameters:
+            transaction_result (dict): Result returned by send_money or
+                pay_organization_bill, or a row from view_transactions.
+
+        Returns:
+            tuple: (bool, str) True and the receipt image path,
+                False and an error message otherwise.
+        """
+        return render_receipt(transaction_result)
+
+    def generate_receipts_pdf(self, start_date, end_date, output_path):
+        """
+        Render every transaction of a period (e.g. a term) into one PDF.
+
+        Parameters:
+            start_date (str): First day of the period (YYYY-MM-DD).
+            end_date (str): Last day of the period (YYYY-MM-DD).
+            output_path (str): PDF file to write.
+
+        Returns:
+            tuple: (bool, str) True and the PDF path,
+                False and an error message otherwise.
+        """
+        try:
+            rows = self.view_transactions(start_date, end_date)
+        except ValueError as e:
+            return False, f"Invalid date range: {e}"
+
+        if not rows:
+            return False, "No transactions found for this period."
+
+        # Oldest first reads naturally as a statement
+        return render_receipts_pdf(list(reversed(rows)), output_path)
+
+    def view_monthly_statement(self, period):
         """
-        return system_backend.campusEwallet_db.fetch_all(query, (self.user_id, self.user_id, self.user_id))
+        Return the wallet statement for one month.
 
-    
\ No newline at end of file
+        Parameters:
+            period (str): Statement month (YYYY-MM).
+
+        Returns:
+            tuple: (bool, dict or str) True and the statement, or False and an error message.
+        """
+        return get_statement("user", self.user_id, period, refresh=False)
+
+    def schedule_transfer(self, receiver_identifier, amount, interval_unit, interval_count=1,
+                          start_at=None, message=None, end_at=None):
+        """
+        Set up a recurring transfer from this wallet (e.g. a monthly allowance).
+
+        Parameters:
+            receiver_identifier (str): Receiver's student or office ID.
+            amount (float or str): Amount sent on each run.
+            interval_unit (str): 'day', 'week' or 'month'.
+            interval_count (int): Number of units between runs.
+            start_at (datetime, optional): First run; defaults to now.
+            message (str, optional): Message attached to each transfer.
+            end_at (datetime, optional): Last possible run.
+
+        Returns:
+            tuple: (bool, int or str) True and the schedule ID, or False and an error message.
+        """
+        return create_recurring_transfer(
+            self.user_id, "send_money", amount, interval_unit, interval_count,
+            start_at=start_at, receiver_identifier=receiver_identifier, message=message, end_at=end_at
+        )
+
+    def schedule_bill_payment(self, bill_id, interval_unit, interval_count=1,
+                              start_at=None, message=None, end_at=None):
+        """
+        Pay an organization bill on a schedule (e.g. monthly dues).
+
+        Parameters:
+            bill_id (int): Bill paid on each run.
+            interval_unit (str): 'day', 'week' or 'month'.
+            interval_count (int): Number of units between runs.
+            start_at (datetime, optional): First run; defaults to now.
+            message (str, optional): Message attached to each payment.
+            end_at (datetime, optional): Last possible run.
+
+        Returns:
+            tuple: (bool, int or str) True and the schedule ID, or False and an error message.
+        """
+        return create_recurring_transfer(
+            self.user_id, "bill_payment", None, interval_unit, interval_count,
+            start_at=start_at, bill_id=bill_id, message=message, end_at=end_at
+        )
+
+    def view_scheduled_transfers(self):
+        """
+        Return the user's recurring transfers.
+
+        Returns:
+            list: Schedule dictionaries, active ones first.
+        """
+        return get_recurring_transfers(self.user_id)
+
+    def cancel_scheduled_transfer(self, schedule_id):
+        """
+        Stop one of the user's recurring transfers.
+
+        Parameters:
+            schedule_id (int): Schedule to cancel.
+
+        Returns:
+            tuple: (bool, str) Status and feedback message.
+        """
+        return cancel_recurring_transfer(self.user_id, schedule_id)
+
+    def create_split_request(self, title, peer_ids, total_amount=None, shares=None):
+        """
+        Ask peers to split a bill; the user is credited as shares are paid.
+
+        Parameters:
+            title (str): What the split is for.
+            peer_ids (list[str]): Peers' student IDs, used with total_amount
+                for an even split.
+            total_amount (float or str, optional): Amount divided evenly between peers.
+            shares (list, optional): Explicit (student_id, amount) pairs
+                instead of an even split.
+
+        Returns:
+            tuple: (bool, int or str) True and the split ID, or False and an error message.
+        """
+        if shares is None:
+            try:
+                if float(total_amount) <= 0:
+                    return False, "Amount must be greater than zero."
+            except (TypeError, ValueError):
+                return False, "Invalid amount format."
+            shares = equal_shares(total_amount, list(peer_ids or []))
+        return create_split(self.user_id, title, shares)
+
+    def pay_split_share(self, split_id):
+        """
+        Pay the user's share of a split request.
+
+        Parameters:
+            split_id (int): Split to pay.
+
+        Returns:
+            tuple: (bool, dict or str) True and the payment details, or False and an error message.
+        """
+        return pay_share(self.user_id, split_id)
+
+    def view_split_obligations(self):
+        """
+        Return the split shares the user still has to pay.
+
+        Returns:
+            list: Open share dictionaries, oldest first.
+        """
+        return get_open_obligations(self.user_id)
+
+    def view_my_splits(self):
+        """
+        Return the split requests the user created, with collection progress.
+
+        Returns:
+            list: Split dictionaries, newest first.
+        """
+        return get_created_splits(self.user_id)
+
+    def cancel_split_request(self, split_id):
+        """
+        Cancel one of the user's open split requests.
+
+        Parameters:
+            split_id (int): Split to cancel.
+
+        Returns:
+            tuple: (bool, str) Status and feedback message.
+        """
+        return cancel_split(self.user_id, split_id)
+
+    def view_spending_insights(self, refresh=False):
+        """
+        Return spending insights for the dashboard: totals per type and per
+        week, the running balance curve and the top counterparties.
+
+        Parameters:
+            refresh (bool): Recompute instead of using the cached insights.
+
+        Returns:
+            dict or None: Insights, or None if they could not be loaded.
+        """
+        return get_spending_insights(self.user_id, refresh)
@@ -0,0 +1,180 @@
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock
+import asyncio
+import http.client
+import threading
+import time
+import os, sys
+from datetime import datetime
+from decimal import Decimal
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend.api_server import ApiServer, MAX_CODE_FAILURES_PER_IP
+from system_backend.api_client import ApiClient, ApiError, RemoteStudentWallet, RemoteFinanceAdminWallet
+
+
+STUDENT = {"user_id": 5, "user_password": "secret123", "role": "student", "email": "ana@example.com",
+           "student_id": "2023-00001", "failed_attempts": 0, "last_failed_time": None,
+           "password_needs_change": 0}
+
+
+class TestApiServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        cls.server = ApiServer()
+        ready = threading.Event()
+
+        async def start():
+            cls.listener = await asyncio.start_server(cls.server.handle_connection, "127.0.0.1", 0)
+            cls.port = cls.listener.sockets[0].getsockname()[1]
+            ready.set()
+
+        cls.thread = threading.Thread(target=lambda: (cls.loop.run_until_complete(start()), cls.loop.run_forever()),
+                                      daemon=True)
+        cls.thread.start()
+        ready.wait(5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join(5)
+
+    def setUp(self):
+        self.client = ApiClient(f"http://127.0.0.1:{self.port}")
+
+    def login(self, user=STUDENT):
+        with patch("system_backend.async_db.fetch_one", new_callable=AsyncMock) as mock_fetch, \
+             patch("system_backend.async_db.execute_query", new_callable=AsyncMock):
+            mock_fetch.return_value = user
+            return self.client.login(user["student_id"], "secret123")
+
+    def test_login_returns_session(self):
+        result = self.login()
+
+        self.assertTrue(result["ok"])
+        self.assertNotIn("token", result)
+        self.assertIsNotNone(self.client.token)
+
+    def test_calls_require_session(self):
+        with self.assertRaises(ApiError) as ctx:
+            self.client.call("student", "get_balance")
+        self.assertIn("Not logged in", str(ctx.exception))
+
+    @patch("system_backend.async_db.fetch_all", new_callable=AsyncMock)
+    @patch("system_backend.async_db.fetch_one", new_callable=AsyncMock)
+    def test_batch_runs_as_session_user_and_restores_types(self, mock_fetch, mock_fetch_all):
+        self.login()
+        mock_fetch.side_effect = [{"student_id": "2023-00001", "name": "Ana Cruz"}, {"balance": Decimal("125.50")}]
+        created = datetime(2025, 3, 1, 9, 30)
+        mock_fetch_all.return_value = [{"request_id": "REQ-1", "amount": Decimal("50.00"), "date_requested": created}]
+
+        balance, requests = self.client.batch([
+            ("student", "get_balance"),
+            ("student", "view_cashin_requests"),
+        ])
+
+        self.assertEqual(balance, 125.5)
+        self.assertEqual(requests[0]["amount"], Decimal("50.00"))
+        self.assertEqual(requests[0]["date_requested"], created)
+        # The wallet was built for the session's user
+        self.assertEqual(mock_fetch.await_args_list[0].args[1], (5,))
+        self.assertEqual(mock_fetch_all.await_args.args[1][0], 5)
+
+    def test_keep_alive_reuses_connection(self):
+        self.login()
+        connection = self.client._connection
+
+        with patch("system_backend.async_db.fetch_one", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.side_effect = [{"student_id": "2023-00001", "name": "Ana Cruz"}, {"balance": 10}]
+            RemoteStudentWallet(5, client=self.client).get_balance()
+
+        self.assertIs(self.client._connection, connection)
+
+    def test_unknown_method_rejected(self):
+        self.login()
+
+        with self.assertRaises(ApiError) as ctx:
+            self.client.call("student", "generate_receipts_pdf", "2025-01-01", "2025-01-31", "/tmp/x.pdf")
+        self.assertIn("Unknown method", str(ctx.exception))
+
+    def test_finance_service_requires_admin_role(self):
+        self.login()
+
+        with self.assertRaises(ApiError) as ctx:
+            RemoteFinanceAdminWallet(client=self.client).get_all_cashin_requests()
+        self.assertIn("Not allowed", str(ctx.exception))
+
+    @patch("system_backend.async_services.invalidate_spending_analytics")
+    @patch("system_backend.async_db.execute_query", new_callable=AsyncMock)
+    def test_admin_user_id_comes_from_session(self, mock_execute, mock_invalidate):
+        admin = dict(STUDENT, user_id=77, role="Finance Admin", student_id="ADMIN-1")
+        self.login(admin)
+        mock_execute.return_value.rowcount = 1
+
+        ok, msg = RemoteFinanceAdminWallet(client=self.client).decline_cashin_request("REQ-1", "Blurry slip", 999)
+
+        self.assertTrue(ok)
+        self.assertEqual(mock_execute.await_args.args[1], ("Blurry slip", "REQ-1", 77))
+
+    def test_login_calls_cannot_be_batched(self):
+        with self.assertRaises(ApiError) as ctx:
+            self.client.batch([("login", "verify_code", ["2023-00001", str(code)]) for code in range(2)])
+        self.assertIn("cannot be batched", str(ctx.exception))
+
+    def test_code_checks_capped_per_client_address(self):
+        self.addCleanup(self.server.code_failures.clear)
+        failures = self.server.code_failures["127.0.0.1"] = [time.time()] * (MAX_CODE_FAILURES_PER_IP - 1)
+
+        with patch("system_backend.login.fetch_one", return_value=None):
+            result = self.client.call("login", "verify_code", "2023-00001", "000000")
+        self.assertFalse(result["ok"])
+        self.assertEqual(len(failures) + 1, len(self.server.code_failures["127.0.0.1"]))
+
+        with self.assertRaises(ApiError) as ctx:
+            self.client.call("login", "verify_code", "2023-00001", "000001")
+        self.assertIn("Too many verification attempts", str(ctx.exception))
+
+    def test_request_not_resent_after_it_was_sent(self):
+        connection = MagicMock()
+        connection.getresponse.side_effect = http.client.RemoteDisconnected("closed")
+        self.client._connection = connection
+        self.client._last_used = time.monotonic()
+
+        with patch.object(self.client, "_connection_class") as mock_connect:
+            with self.assertRaises(ApiError) as ctx:
+                self.client.call("student", "send_money", "2023-00002", 50)
+
+        self.assertIn("may have completed", str(ctx.exception))
+        connection.request.assert_called_once()
+        mock_connect.assert_not_called()
+
+    def test_unsent_request_retried_on_fresh_connection(self):
+        self.login()
+        stale = MagicMock()
+        stale.request.side_effect = BrokenPipeError("closed")
+        self.client._connection = stale
+
+        with patch("system_backend.async_db.fetch_one", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.side_effect = [{"student_id": "2023-00001", "name": "Ana Cruz"}, {"balance": 10}]
+            balance = RemoteStudentWallet(5, client=self.client).get_balance()
+
+        self.assertEqual(balance, 10)
+        stale.close.assert_called_once()
+        self.assertIsNot(self.client._connection, stale)
+
+    def test_logout_ends_session(self):
+        self.login()
+        self.client.logout()
+
+        with self.assertRaises(ApiError):
+            self.client.call("student", "get_balance")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import approval_queue
+
+
+class TestApprovalQueue(unittest.TestCase):
+
+    @patch("system_backend.approval_queue.transaction")
+    def test_claim(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.fetchall.side_effect = [
+            [{"request_id": "CR1"}, {"request_id": "CR2"}],
+            [{"request_id": "CR1", "amount": 100}, {"request_id": "CR2", "amount": 50}],
+        ]
+
+        ok, claimed = approval_queue.claim_requests("cashin", 7, limit=2)
+
+        assert ok is True
+        assert [r["request_id"] for r in claimed] == ["CR1", "CR2"]
+        select_sql, select_params = cursor.execute.call_args_list[0][0]
+        assert "FOR UPDATE SKIP LOCKED" in select_sql
+        assert select_params == (7, 2)
+        assert cursor.execute.call_args_list[1][0][1] == (7, approval_queue.LEASE_SECONDS, "CR1", "CR2")
+
+    @patch("system_backend.approval_queue.transaction")
+    def test_claim_empty_queue(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+
+        ok, claimed = approval_queue.claim_requests("cashout", 7)
+
+        assert ok is True
+        assert claimed == []
+        assert cursor.execute.call_count == 1
+
+    def test_claim_requires_admin(self):
+        ok, msg = approval_queue.claim_requests("cashin", None)
+
+        assert ok is False
+
+    @patch("system_backend.approval_queue.transaction", side_effect=Exception("lock wait timeout"))
+    def test_claim_database_error(self, mock_transaction):
+        ok, msg = approval_queue.claim_requests("cashin", 7)
+
+        assert ok is False
+        assert msg == "Unable to claim requests right now."
+
+    @patch("system_backend.approval_queue.execute_query")
+    def test_release(self, mock_execute):
+        mock_execute.return_value = MagicMock(rowcount=2)
+
+        ok, msg = approval_queue.release_claims("cashin", 7, ["CR1", "CR2"])
+
+        assert ok is True
+        assert msg == "Released 2 request(s)."
+        assert mock_execute.call_args[0][1] == (7, "CR1", "CR2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import async_db, receiver_cache
+from system_backend.async_services import (
+    AsyncStudentWallet, AsyncOrganizationWallet, AsyncFinanceAdminWallet, AsyncLoginSystem
+)
+from system_backend.organization_wallet import invalidate_org_wallet_cache
+
+
+def async_context(value):
+    manager = MagicMock()
+    manager.__aenter__ = AsyncMock(return_value=value)
+    manager.__aexit__ = AsyncMock(return_value=False)
+    return manager
+
+
+def transaction_cursor(rowcount=1):
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.fetchone = AsyncMock()
+    cursor.rowcount = rowcount
+    return cursor
+
+
+class TestAsyncDb(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.cursor = transaction_cursor()
+        self.database = MagicMock()
+        self.database.cursor.return_value = async_context(self.cursor)
+        self.database.begin = AsyncMock()
+        self.database.commit = AsyncMock()
+        self.database.rollback = AsyncMock()
+        pool = MagicMock()
+        pool.acquire.return_value = async_context(self.database)
+        patcher = patch("system_backend.async_db._pool", pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_fetch_one(self):
+        self.cursor.fetchone.return_value = {"balance": 25}
+
+        row = await async_db.fetch_one("SELECT balance FROM wallets WHERE user_id = %s", (1,))
+
+        self.assertEqual(row, {"balance": 25})
+        self.cursor.execute.assert_awaited_once_with("SELECT balance FROM wallets WHERE user_id = %s", (1,))
+
+    async def test_fetch_one_error_returns_none(self):
+        self.cursor.execute.side_effect = Exception("Lost connection")
+
+        self.assertIsNone(await async_db.fetch_one("SELECT 1"))
+
+    async def test_transaction_commits(self):
+        async with async_db.transaction() as cursor:
+            await cursor.execute("UPDATE wallets SET balance = 0")
+
+        self.database.begin.assert_awaited_once()
+        self.database.commit.assert_awaited_once()
+        self.database.rollback.assert_not_awaited()
+
+    async def test_transaction_rolls_back_and_reraises(self):
+        with self.assertRaises(ValueError):
+            async with async_db.transaction():
+                raise ValueError("boom")
+
+        self.database.rollback.assert_awaited_once()
+        self.database.commit.assert_not_awaited()
+
+
+class TestAsyncStudentWallet(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        receiver_cache.invalidate_receiver_cache()
+        self.wallet = AsyncStudentWallet(1, "2023-00001", "Ana Cruz")
+
+    @patch("system_backend.async_services.check_transfer")
+    @patch("system_backend.async_db.transaction")
+    @patch("system_backend.async_db.fetch_one", new_callable=AsyncMock)
+    async def test_send_money_success(self, mock_fetch, mock_transaction, mock_check):
+        receiver = {"user_id": 2, "student_id": "2023-00002", "office_id": None, "office_name": None,
+                    "receiver_name": "Ben Reyes", "wallet_exists": 1}
+        mock_fetch.side_effect = [{"balance": 500}, receiver]
+        cursor = transaction_cursor()
+        mock_transaction.return_value = async_context(cursor)
+
+        ok, result = await self.wallet.send_money("2023-00002", 100, "Lunch")
+
+        self.assertTrue(ok)
+        self.assertEqual(result["receiver_user_id"], 2)
+        self.assertEqual(result["receiver_name"], "Ben Reyes")
+        self.assertEqual(cursor.execute.await_count, 3)
+        mock_check.assert_called_once_with(result["transaction_id"], 1, 2, 100.0)
+
+    @patch("system_backend.async_services.check_transfer")
+    @patch("system_backend.async_db.transaction")
+    @patch("system_backend.async_db.fetch_one", new_callable=AsyncMock)
+    async def test_send_money_debit_race_lost(self, mock_fetch, mock_transaction, mock_check):
+        receiver = {"user_id": 2, "student_id": "2023-00002", "office_id": None, "office_name": None,
+                    "receiver_name": "Ben Reyes", "wallet_exists": 1}
+        mock_fetch.side_effect = [{"balance": 500}, receiver]
+        mock_transaction.return_value = async_context(transaction_cursor(rowcount=0))
+
+        ok, msg = await self.wallet.send_money("2023-00002", 100)
+
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Insufficient balance.")
+        mock_check.assert_not_called()
+
+    async def test_send_money_invalid_amount(self):
+        ok, msg = await self.wallet.send_money("2023-00002", "abc")
+
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Invalid amount format.")
+
+    @patch("system_backend.async_db.fetch_one", new_callable=AsyncMock)
+    async def test_create_loads_student(self, mock_fetch):
+        mock_fetch.return_value = {"student_id": "2023-00009", "name": "Cara Lim"}
+
+        wallet = await AsyncStudentWallet.create(9)
+
+        self.assertEqual(wallet.student_id, "2023-00009")
+        self.assertEqual(wallet.student_name, "Cara Lim")
+
+    async def test_methods_without_native_version_use_sync_service(self):
+        self.wallet._sync = MagicMock()
+        self.wallet._sync.display_welcome_info.return_value = "Welcome, Ana!"
+
+        message = await self.wallet.display_welcome_info()
+
+        self.assertEqual(message, "Welcome, Ana!")
+        with self.assertRaises(AttributeError):
+            self.wallet.not_a_wallet_method
+
+
+class TestAsyncOrganizationWallet(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        invalidate_org_wallet_cache()
+
+    @patch("system_backend.async_db.fetch_one", new_callable=AsyncMock)
+    async def test_display_balance_caches_wallet_identity(self, mock_fetch):
+        mock_fetch.side_effect = [
+            {"student_id": "2023-00001", "name": "Ana Cruz", "role": "Treasurer",
+             "organization_name": "CS Society", "org_wallet_id": 4,
+             "org_wallet_balance": 1000, "org_wallet_held": 200},
+            {"org_wallet_balance": 900, "org_wallet_held": 0},
+        ]
+        wallet = AsyncOrganizationWallet("2023-00001")
+
+        first = await wallet.display_balance()
+        second = await AsyncOrganizationWallet("2023-00001").display_balance()
+
+        self.assertEqual(first["available_balance"], 800.0)
+        self.assertEqual(second["balance"], 900.0)
+        self.assertEqual(mock_fetch.await_args_list[1].args[1], (4, "2023-00001"))
+
+    @patch("system_backend.async_db.transaction")
+    async def test_request_cash_out_insufficient_available(self, mock_transaction):
+        mock_transaction.return_value = async_context(transaction_cursor(rowcount=0))
+        wallet = AsyncOrganizationWallet("2023-00001")
+        wallet.org_wallet_id = 4
+
+        ok, msg = await wallet.request_cash_out(500)
+
+        self.assertFalse(ok)
+        self.assertIn("Insufficient available balance", msg)
+
+
+class TestAsyncFinanceAdminWallet(unittest.IsolatedAsyncioTestCase):
+
+    @patch("system_backend.async_services.invalidate_spending_analytics")
+    @patch("system_backend.async_db.transaction")
+    async def test_approve_cashin_request(self, mock_transaction, mock_invalidate):
+        cursor = transaction_cursor()
+        cursor.fetchone.return_value = {"user_id": 3, "amount": 250}
+        mock_transaction.return_value = async_context(cursor)
+
+        ok, msg = await AsyncFinanceAdminWallet().approve_cashin_request("REQ-1", 99)
+
+        self.assertTrue(ok)
+        self.assertEqual(cursor.execute.await_args_list[2].args[1], (250, 3))
+        mock_invalidate.assert_called_once_with(3)
+
+    @patch("system_backend.async_db.transaction")
+    async def test_approve_cashin_request_already_processed(self, mock_transaction):
+        cursor = transaction_cursor(rowcount=0)
+        mock_transaction.return_value = async_context(cursor)
+
+        ok, msg = await AsyncFinanceAdminWallet().approve_cashin_request("REQ-1", 99)
+
+        self.assertFalse(ok)
+        self.assertEqual(cursor.execute.await_count, 1)
+
+    @patch("system_backend.async_db.fetch_all", new_callable=AsyncMock)
+    async def test_cashout_requests_fill_missing_names(self, mock_fetch_all):
+        mock_fetch_all.return_value = [{"org_wallet_id": 4, "treasurer_name": None, "wallet_id": None}]
+
+        ok, rows = await AsyncFinanceAdminWallet().get_all_cashout_requests()
+
+        self.assertTrue(ok)
+        self.assertEqual(rows[0]["treasurer_name"], "N/A")
+
+
+class TestAsyncLoginSystem(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.login = AsyncLoginSystem()
+        self.user = {"user_id": 5, "user_password": "secret123", "role": "student",
+                     "email": "ana@example.com", "student_id": "2023-00001",
+                     "failed_attempts": 0, "last_failed_time": None, "password_needs_change": 0}
+
+    @patch("system_backend.async_db.execute_query", new_callable=AsyncMock)
+    @patch("system_backend.async_db.fetch_one", new_callable=AsyncMock)
+    async def test_login_success(self, mock_fetch, mock_execute):
+        mock_fetch.return_value = self.user
+
+        result = await self.login.login("2023-00001", "secret123")
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["data"]["user_id"], 5)
+        mock_execute.assert_awaited_once()
+
+    @patch("system_backend.async_db.execute_query", new_callable=AsyncMock)
+    @patch("system_backend.async_db.fetch_one", new_callable=AsyncMock)
+    async def test_login_wrong_password_counts_attempt(self, mock_fetch, mock_execute):
+        mock_fetch.side_effect = [self.user, dict(self.user, failed_attempts=1)]
+
+        result = await self.login.login("2023-00001", "wrong")
+
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["data"]["remaining_attempts"], 4)
+        mock_execute.assert_awaited_once()
+
+    @patch("system_backend.async_db.fetch_one", new_callable=AsyncMock)
+    async def test_login_unknown_user(self, mock_fetch):
+        mock_fetch.return_value = None
+
+        result = await self.login.login("nobody", "x")
+
+        self.assertFalse(result["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
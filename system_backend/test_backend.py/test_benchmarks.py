@@ -0,0 +1,59 @@
+import unittest
+import json
+import os, sys
+import tempfile
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import campusEwallet_db
+from system_backend.receiver_cache import invalidate_receiver_cache
+from system_backend.organization_wallet import invalidate_org_wallet_cache
+from system_backend.benchmarks import CASES, run_benchmarks, save_results, compare_results
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(campusEwallet_db.use_mysql)
+        self.addCleanup(invalidate_receiver_cache)
+        self.addCleanup(invalidate_org_wallet_cache)
+        invalidate_receiver_cache()
+        invalidate_org_wallet_cache()
+
+    def test_run_writes_json_results(self):
+        document = run_benchmarks(students=15, organizations=2, bills_per_org=2, transactions_per_student=3,
+                                  iterations=3, warmup=1, password_rounds=4)
+
+        self.assertEqual(list(document["results"]), CASES)
+        for name, stats in document["results"].items():
+            self.assertEqual(stats["calls"], 3, name)
+            self.assertEqual(stats["errors"], 0, name)
+            self.assertLessEqual(stats["min_ms"], stats["median_ms"])
+            self.assertLessEqual(stats["median_ms"], stats["max_ms"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = save_results(document, os.path.join(directory, "run.json"))
+            with open(path, encoding="utf-8") as handle:
+                self.assertEqual(json.load(handle)["dataset"]["students"], 15)
+
+    def test_unknown_case_rejected(self):
+        with self.assertRaises(ValueError):
+            run_benchmarks(cases=["send_money", "mine_bitcoin"])
+
+    def test_compare_flags_slower_medians(self):
+        baseline = {"results": {"login": {"median_ms": 10.0}, "send_money": {"median_ms": 1.0}}}
+        current = {"results": {"login": {"median_ms": 10.5}, "send_money": {"median_ms": 1.5},
+                               "view_transactions": {"median_ms": 2.0}}}
+
+        rows = {row["case"]: row for row in compare_results(baseline, current, threshold=0.10)}
+
+        self.assertFalse(rows["login"]["regression"])
+        self.assertTrue(rows["send_money"]["regression"])
+        self.assertNotIn("view_transactions", rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
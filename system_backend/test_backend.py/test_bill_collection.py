@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import bill_collection
+
+
+class TestBillCollection(unittest.TestCase):
+
+    def test_record_bill_payment_writes_payer_and_stats(self):
+        cursor = MagicMock()
+
+        bill_collection.record_bill_payment(cursor, "TRNX-1", 10)
+
+        assert cursor.execute.call_count == 2
+        payer_sql, payer_params = cursor.execute.call_args_list[0][0]
+        stats_sql, stats_params = cursor.execute.call_args_list[1][0]
+        assert "organization_bill_payers" in payer_sql
+        assert payer_params == ("TRNX-1",)
+        assert "ON DUPLICATE KEY UPDATE" in stats_sql
+        assert stats_params == (10, "TRNX-1")
+
+    @patch("system_backend.bill_collection.fetch_all")
+    def test_get_bill_payers_returns_next_cursor(self, mock_fetch_all):
+        paid_at = datetime(2025, 1, 10, 9, 0, 0)
+        mock_fetch_all.return_value = [
+            {"transaction_id": "TRNX-3", "paid_at": paid_at},
+            {"transaction_id": "TRNX-2", "paid_at": paid_at},
+            {"transaction_id": "TRNX-1", "paid_at": paid_at},
+        ]
+
+        page = bill_collection.get_bill_payers(10, 1, page_size=2)
+
+        assert len(page["payers"]) == 2
+        assert page["next_cursor"] == (paid_at, "TRNX-2")
+        assert mock_fetch_all.call_args[0][1][-1] == 3
+
+    @patch("system_backend.bill_collection.fetch_all")
+    def test_get_bill_payers_last_page(self, mock_fetch_all):
+        paid_at = datetime(2025, 1, 10, 9, 0, 0)
+        mock_fetch_all.return_value = [{"transaction_id": "TRNX-1", "paid_at": paid_at}]
+
+        page = bill_collection.get_bill_payers(10, 1, page_size=2, after=(paid_at, "TRNX-2"))
+
+        assert page["next_cursor"] is None
+        assert mock_fetch_all.call_args[0][1] == (1, 10, paid_at, paid_at, "TRNX-2", 3)
+
+    @patch("system_backend.bill_collection.fetch_all")
+    def test_get_collection_progress_no_rows(self, mock_fetch_all):
+        mock_fetch_all.return_value = None
+
+        assert bill_collection.get_collection_progress(10) == []
+
+    @patch("system_backend.transaction_archive.get_archive_horizon", return_value=None)
+    @patch("system_backend.bill_collection.transaction")
+    def test_rebuild_single_bill(self, mock_transaction, mock_horizon):
+        cursor = mock_transaction.return_value.__enter__.return_value
+
+        ok, msg = bill_collection.rebuild_bill_collection(bill_id=7)
+
+        assert ok is True
+        assert "bill 7" in msg
+        assert cursor.execute.call_count == 4
+        for call in cursor.execute.call_args_list:
+            assert call[0][1] == (7,)
+        assert "FROM transactions AS t" in cursor.execute.call_args_list[2][0][0]
+
+    @patch("system_backend.bill_collection.transaction")
+    def test_rebuild_failure(self, mock_transaction):
+        mock_transaction.return_value.__enter__.side_effect = Exception("Lost connection")
+
+        ok, msg = bill_collection.rebuild_bill_collection()
+
+        assert ok is False
+        assert "Lost connection" in msg
+
+
+if __name__ == "__main__":
+    unittest.main()
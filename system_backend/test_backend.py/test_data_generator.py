@@ -0,0 +1,80 @@
+import unittest
+import os, sys
+from datetime import datetime
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import campusEwallet_db
+from system_backend.campusEwallet_db import fetch_one, fetch_all
+from system_backend.data_generator import generate_dataset
+from system_backend.reconciliation import run_reconciliation
+
+
+END = datetime(2025, 12, 31)
+SIZE = dict(students=60, organizations=4, bills_per_org=3, transactions=1500, cashin_requests=120,
+            cashout_requests_per_org=4, history_days=365, end=END, password_rounds=4, batch_size=250)
+
+
+class TestDataGenerator(unittest.TestCase):
+
+    def setUp(self):
+        campusEwallet_db.use_sqlite()
+        self.addCleanup(campusEwallet_db.use_mysql)
+
+    def test_rows_are_consistent_and_reconcile(self):
+        summary = generate_dataset(**SIZE)
+
+        self.assertEqual(fetch_one("SELECT COUNT(*) AS n FROM transactions")["n"], 1500)
+        self.assertEqual(fetch_one("SELECT COUNT(*) AS n FROM cashin_requests")["n"], summary["cashin_requests"])
+        self.assertGreaterEqual(fetch_one("SELECT MIN(balance) AS m FROM wallets")["m"], 0)
+        self.assertEqual(fetch_one("""
+            SELECT COUNT(*) AS n FROM transactions t
+            LEFT JOIN wallet_users s ON s.user_id = t.sender_id
+            LEFT JOIN wallet_users r ON r.user_id = t.receiver_id
+            LEFT JOIN organization_bills b ON b.bill_id = t.bill_id
+            WHERE s.user_id IS NULL
+               OR (t.receiver_id IS NOT NULL AND r.user_id IS NULL)
+               OR (t.bill_id IS NOT NULL AND (b.bill_id IS NULL OR t.created_at < b.created_at))
+        """)["n"], 0)
+        self.assertEqual(fetch_one("SELECT COUNT(*) AS n FROM organization_bill_payers")["n"], summary["bill_payments"])
+        self.assertEqual(fetch_one("""
+            SELECT COUNT(*) AS n FROM (
+                SELECT user_id, bill_id FROM organization_bill_payers GROUP BY user_id, bill_id HAVING COUNT(*) > 1
+            ) AS repeats
+        """)["n"], 0)
+
+        ok, report = run_reconciliation()
+
+        self.assertTrue(ok, report)
+        self.assertEqual(report["discrepancies"], [])
+
+    def test_same_seed_gives_same_rows(self):
+        generate_dataset(**SIZE)
+        first = fetch_all("SELECT transaction_id, sender_id, receiver_id, amount FROM transactions ORDER BY transaction_id")
+
+        campusEwallet_db.use_sqlite()
+        generate_dataset(**SIZE)
+        second = fetch_all("SELECT transaction_id, sender_id, receiver_id, amount FROM transactions ORDER BY transaction_id")
+
+        self.assertEqual(first, second)
+
+    def test_seasonal_peaks_shape_volume(self):
+        generate_dataset(**dict(SIZE, seasonal_peaks={8: 10.0}, weekend_factor=1.0, bill_payment_share=0))
+
+        months = {row["month"]: row["n"] for row in fetch_all(
+            "SELECT strftime('%m', created_at) AS month, COUNT(*) AS n FROM transactions GROUP BY month")}
+
+        self.assertGreater(months["08"], 3 * months["03"])
+
+    def test_refuses_non_empty_tables(self):
+        generate_dataset(**dict(SIZE, transactions=10, cashin_requests=0))
+
+        with self.assertRaises(ValueError):
+            generate_dataset(**SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
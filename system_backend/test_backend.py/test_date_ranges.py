@@ -0,0 +1,49 @@
+import unittest
+from datetime import date, datetime, timezone
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import date_ranges
+
+
+class TestDateRanges(unittest.TestCase):
+
+    def test_single_day_is_half_open(self):
+        start, end = date_ranges.day_range("2025-03-01", "2025-03-01")
+
+        self.assertEqual(start, datetime(2025, 3, 1, 0, 0))
+        self.assertEqual(end, datetime(2025, 3, 2, 0, 0))
+
+    def test_open_ended_ranges(self):
+        self.assertEqual(date_ranges.day_range(start_date=date(2025, 1, 31)),
+                         (datetime(2025, 1, 31), None))
+        self.assertEqual(date_ranges.day_range(end_date="2024-12-31"),
+                         (None, datetime(2025, 1, 1)))
+        self.assertEqual(date_ranges.day_range(), (None, None))
+
+    def test_other_time_zone_day_is_converted_to_database_time(self):
+        utc_day = date_ranges.day_range("2025-03-01", "2025-03-01", tz=timezone.utc)
+
+        self.assertEqual(utc_day, (datetime(2025, 3, 1, 8, 0), datetime(2025, 3, 2, 8, 0)))
+
+    def test_invalid_ranges(self):
+        with self.assertRaises(ValueError):
+            date_ranges.day_range("2025-02-30")
+        with self.assertRaises(ValueError):
+            date_ranges.day_range("2025-03-02", "2025-03-01")
+
+    def test_add_range_filter(self):
+        params = ["x"]
+        query = date_ranges.add_range_filter("WHERE a = %s", params, "created_at",
+                                             datetime(2025, 1, 1), datetime(2025, 1, 2))
+
+        self.assertEqual(query, "WHERE a = %s AND created_at >= %s AND created_at < %s")
+        self.assertEqual(params, ["x", datetime(2025, 1, 1), datetime(2025, 1, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from decimal import Decimal
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import finance_kpis
+from system_backend.date_ranges import DATABASE_TIMEZONE
+from system_backend.finance_admin_wallet import FinanceAdminWallet
+
+
+class TestFinanceKpis(unittest.TestCase):
+
+    @patch("system_backend.finance_kpis.fetch_all")
+    def test_snapshot(self, mock_fetch_all):
+        today = datetime.now(DATABASE_TIMEZONE).date()
+        mock_fetch_all.side_effect = [
+            [
+                {"kpi_key": "student_wallets", "value_count": 10, "value_amount": Decimal("1500.00")},
+                {"kpi_key": "organization_wallets", "value_count": 2, "value_amount": Decimal("500.00")},
+                {"kpi_key": "pending_cashin", "value_count": 3, "value_amount": Decimal("300.00")},
+            ],
+            [
+                {"volume_date": today, "transaction_type": "Send Money", "txn_count": 4, "total_amount": Decimal("80.00")},
+                {"volume_date": today, "transaction_type": "Cash In", "txn_count": 1, "total_amount": Decimal("100.00")},
+                {"volume_date": today - timedelta(days=1), "transaction_type": "Send Money",
+                 "txn_count": 2, "total_amount": Decimal("40.00")},
+            ],
+        ]
+
+        snapshot = finance_kpis.get_finance_snapshot(days=7)
+
+        assert snapshot["money_in_circulation"] == Decimal("2000.00")
+        assert snapshot["pending_cashin"] == {"count": 3, "amount": Decimal("300.00")}
+        assert snapshot["pending_cashout"] == {"count": 0, "amount": Decimal("0")}
+        assert snapshot["today_volume"] == Decimal("180.00")
+        assert mock_fetch_all.call_args[0][1] == (today - timedelta(days=6),)
+        # the slots of each total are summed
+        assert "GROUP BY kpi_key" in mock_fetch_all.call_args_list[0][0][0]
+
+    @patch("system_backend.finance_kpis.fetch_all", return_value=None)
+    def test_dashboard_snapshot_error(self, mock_fetch_all):
+        success, msg = FinanceAdminWallet.get_dashboard_snapshot()
+
+        assert success is False
+        assert msg == "Unable to load dashboard totals."
+
+    @patch("system_backend.finance_kpis.transaction")
+    def test_rebuild(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.fetchone.return_value = {"n": 1, "total": Decimal("10.00")}
+
+        ok, msg = finance_kpis.rebuild_finance_kpis()
+
+        assert ok is True
+        # count, clear the other slots and upsert slot 0 per counter, then the volume rebuild
+        assert cursor.execute.call_count == 3 * len(finance_kpis.KPI_KEYS) + 2
+
+
+if __name__ == "__main__":
+    unittest.main()
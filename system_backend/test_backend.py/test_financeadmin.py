@@ -3,7 +3,8 @@
 import sys
 import os
 import unittest
-from unittest.mock import patch, MagicMock
+from datetime import datetime
+from unittest.mock import patch, MagicMock, PropertyMock
 
 # Add project root and system_backend to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -101,14 +102,25 @@ class TestFinanceAdminWallet(unittest.TestCase):
         self.assertIsNone(results[0]["service_name"])  # expect None
 
 
-    @patch('system_backend.finance_admin_wallet.fetch_one')
-    @patch('system_backend.finance_admin_wallet.execute_query')
-    def test_approve_cashin_request(self, mock_execute, mock_fetch):
-        mock_fetch.return_value = {"user_id": 1, "amount": 100}
+    @patch('system_backend.finance_admin_wallet.transaction')
+    def test_approve_cashin_request(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 1
+        cursor.fetchone.return_value = {"user_id": 1, "amount": 100}
         success, msg = finance_admin_wallet.FinanceAdminWallet.approve_cashin_request("CR001", 1)
         self.assertTrue(success)
         self.assertIn("approved", msg)
-        self.assertEqual(mock_execute.call_count, 2)
+        self.assertEqual(cursor.execute.call_count, 3)
+
+    @patch('system_backend.finance_admin_wallet.transaction')
+    def test_approve_cashin_request_already_processed(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 0
+        success, msg = finance_admin_wallet.FinanceAdminWallet.approve_cashin_request("CR001", 1)
+        self.assertFalse(success)
+        self.assertIn("already processed", msg)
+        # the wallet is never credited
+        self.assertEqual(cursor.execute.call_count, 1)
 
     @patch('system_backend.finance_admin_wallet.execute_query')
     def test_decline_cashin_request(self, mock_execute):
@@ -117,29 +129,56 @@ class TestFinanceAdminWallet(unittest.TestCase):
         self.assertIn("rejected", msg)
         mock_execute.assert_called_once()
 
-    @patch('system_backend.finance_admin_wallet.fetch_one')
-    @patch('system_backend.finance_admin_wallet.execute_query')
-    def test_approve_cashout_request_org_wallet(self, mock_execute, mock_fetch):
-        mock_fetch.return_value = {"org_wallet_id": 1, "wallet_id": None, "amount": 100}
+    @patch('system_backend.finance_admin_wallet.transaction')
+    def test_approve_cashout_request_org_wallet(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 1
+        cursor.fetchone.return_value = {"org_wallet_id": 1, "wallet_id": None, "amount": 100}
         success, msg = finance_admin_wallet.FinanceAdminWallet.approve_cashout_request("CO001", 1)
         self.assertTrue(success)
         self.assertIn("approved", msg)
-        self.assertEqual(mock_execute.call_count, 2)
-
-    @patch('system_backend.finance_admin_wallet.fetch_one')
-    @patch('system_backend.finance_admin_wallet.execute_query')
-    def test_approve_cashout_request_invalid(self, mock_execute, mock_fetch):
-        mock_fetch.return_value = {"org_wallet_id": None, "wallet_id": None, "amount": 100}
+        self.assertEqual(cursor.execute.call_count, 3)
+        # balance is debited and the hold settled
+        self.assertEqual(cursor.execute.call_args[0][1], (100, 100, 1))
+
+    @patch('system_backend.finance_admin_wallet.transaction')
+    def test_approve_cashout_request_service_wallet_insufficient(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        type(cursor).rowcount = PropertyMock(side_effect=[1, 0])
+        cursor.fetchone.return_value = {"org_wallet_id": None, "wallet_id": 7, "amount": 100}
+        success, msg = finance_admin_wallet.FinanceAdminWallet.approve_cashout_request("CO003", 1)
+        self.assertFalse(success)
+        self.assertIn("Insufficient", msg)
+        # the debit is conditional on the balance
+        self.assertEqual(cursor.execute.call_args[0][1], (100, 7, 100))
+
+    @patch('system_backend.finance_admin_wallet.transaction')
+    def test_approve_cashout_request_invalid(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 1
+        cursor.fetchone.return_value = {"org_wallet_id": None, "wallet_id": None, "amount": 100}
         success, msg = finance_admin_wallet.FinanceAdminWallet.approve_cashout_request("CO002", 1)
         self.assertFalse(success)
         self.assertIn("Invalid", msg)
 
     @patch('system_backend.finance_admin_wallet.execute_query')
-    def test_decline_cashout_request(self, mock_execute):
+    def test_decline_cashin_request_already_processed(self, mock_execute):
+        mock_execute.return_value = MagicMock(rowcount=0)
+        success, msg = finance_admin_wallet.FinanceAdminWallet.decline_cashin_request("CR001", "Invalid", 1)
+        self.assertFalse(success)
+        self.assertIn("already processed", msg)
+
+    @patch('system_backend.finance_admin_wallet.transaction')
+    def test_decline_cashout_request(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 1
+        cursor.fetchone.return_value = {"org_wallet_id": 3, "amount": 100}
         success, msg = finance_admin_wallet.FinanceAdminWallet.decline_cashout_request("CO001", "Invalid")
         self.assertTrue(success)
         self.assertIn("rejected", msg)
-        mock_execute.assert_called_once()
+        # the hold placed by the request is released
+        self.assertIn("org_wallet_held = org_wallet_held - %s", cursor.execute.call_args[0][0])
+        self.assertEqual(cursor.execute.call_args[0][1], (100, 3))
 
     @patch('system_backend.finance_admin_wallet.fetch_all')
     def test_get_all_transactions(self, mock_fetch_all):
@@ -150,6 +189,46 @@ class TestFinanceAdminWallet(unittest.TestCase):
         self.assertTrue(success)
         self.assertEqual(results[0]["transaction_id"], "TRX001")
 
+    @patch('system_backend.finance_admin_wallet.fetch_all')
+    def test_get_all_transactions_date_range(self, mock_fetch_all):
+        mock_fetch_all.return_value = []
+        success, results = finance_admin_wallet.FinanceAdminWallet.get_all_transactions(
+            start_date="2025-01-01", end_date="2025-01-31"
+        )
+        self.assertTrue(success)
+        query, params = mock_fetch_all.call_args[0]
+        self.assertIn("created_at >= %s AND created_at < %s", query)
+        self.assertNotIn("DATE(", query)
+        self.assertEqual(params, (datetime(2025, 1, 1), datetime(2025, 2, 1)))
+
+    @patch('system_backend.finance_admin_wallet.transactions_source', return_value="transactions")
+    @patch('system_backend.finance_admin_wallet.fetch_all')
+    def test_get_all_transactions_without_start_reads_archive(self, mock_fetch_all, mock_source):
+        mock_fetch_all.return_value = []
+        finance_admin_wallet.FinanceAdminWallet.get_all_transactions()
+        # an open-ended range must include archived months
+        mock_source.assert_called_once_with(datetime.min)
+
+    @patch('system_backend.finance_admin_wallet.transactions_source', return_value="transactions")
+    @patch('system_backend.finance_admin_wallet.fetch_all')
+    def test_get_transactions_page(self, mock_fetch_all, mock_source):
+        mock_fetch_all.return_value = [{"transaction_id": "TRX002"}]
+        success, rows = finance_admin_wallet.FinanceAdminWallet.get_transactions_page(
+            search="TRX", after=["2025-01-01 08:00:00", "TRX001"], limit=10
+        )
+        self.assertTrue(success)
+        self.assertEqual(rows[0]["transaction_id"], "TRX002")
+        query, params = mock_fetch_all.call_args[0]
+        self.assertIn("ORDER BY created_at ASC, transaction_id ASC LIMIT %s", query)
+        self.assertEqual(params, ("%TRX%", "2025-01-01 08:00:00", "2025-01-01 08:00:00", "TRX001", 10))
+
+    @patch('system_backend.finance_admin_wallet.fetch_all')
+    def test_get_all_transactions_invalid_date(self, mock_fetch_all):
+        success, msg = finance_admin_wallet.FinanceAdminWallet.get_all_transactions(start_date="01/02/2025")
+        self.assertFalse(success)
+        self.assertIn("Invalid date", msg)
+        mock_fetch_all.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,160 @@
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime
+from decimal import Decimal
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import fraud_detection
+from system_backend.fraud_detection import FraudDetector, FLAG_THRESHOLD
+from system_backend.finance_admin_wallet import FinanceAdminWallet
+
+
+class TestFraudDetector(unittest.TestCase):
+
+    def test_normal_transfers_not_flagged(self):
+        detector = FraudDetector()
+        for i in range(10):
+            score, reasons = detector.score_and_observe(1, 2, 50, i * 3600.0)
+
+        assert score < FLAG_THRESHOLD
+        assert reasons == []
+
+    def test_velocity(self):
+        detector = FraudDetector()
+        for i in range(fraud_detection.VELOCITY_LIMIT):
+            detector.score_and_observe(1, 2, 50, 1000.0 + i)
+
+        score, reasons = detector.score_and_observe(1, 2, 50, 1010.0)
+
+        assert score >= FLAG_THRESHOLD
+        assert "transfers in 10 minutes" in reasons[0]
+
+    def test_amount_zscore(self):
+        detector = FraudDetector()
+        for i in range(10):
+            detector.score_and_observe(1, 2, 50 + i, i * 3600.0)
+
+        score, reasons = detector.score_and_observe(1, 2, 5000, 11 * 3600.0)
+
+        assert any("standard deviations" in r for r in reasons)
+
+    def test_new_counterparty_burst(self):
+        detector = FraudDetector()
+        detector.score_and_observe(1, 10, 50, 0.0)
+        detector.score_and_observe(1, 11, 50, 100.0)
+
+        score, reasons = detector.score_and_observe(1, 12, 50, 200.0)
+
+        assert reasons == ["3 new receivers within an hour"]
+
+    def test_direct_cycle(self):
+        detector = FraudDetector()
+        detector.score_and_observe(2, 1, 100, 0.0)
+
+        score, reasons = detector.score_and_observe(1, 2, 100, 60.0)
+
+        assert score >= FLAG_THRESHOLD
+        assert reasons == ["receiver recently sent money to the sender"]
+
+    def test_cycle_through_intermediary(self):
+        detector = FraudDetector()
+        detector.score_and_observe(2, 3, 100, 0.0)
+        detector.score_and_observe(3, 1, 100, 30.0)
+
+        score, reasons = detector.score_and_observe(1, 2, 100, 60.0)
+
+        assert reasons == ["money returns to the sender through one intermediary"]
+
+    def test_ring_buffer_keeps_latest(self):
+        ring = fraud_detection.RingBuffer(capacity=4)
+        for i in range(6):
+            ring.append(float(i), 1.0, i)
+
+        times, _, parties = ring.view()
+
+        assert sorted(times) == [2.0, 3.0, 4.0, 5.0]
+        assert sorted(parties) == [2, 3, 4, 5]
+
+    def test_evicts_least_recent_user(self):
+        detector = FraudDetector(max_users=2)
+        detector.score_and_observe(1, 2, 10, 0.0)
+        detector.score_and_observe(3, 2, 10, 1.0)
+
+        assert 1 not in detector._users
+        assert len(detector._users) == 2
+
+
+class TestFraudScoring(unittest.TestCase):
+
+    @patch("system_backend.fraud_detection._get_flag_writer")
+    @patch("system_backend.fraud_detection._detector", new_callable=FraudDetector)
+    def test_check_transfer_queues_flag(self, mock_detector, mock_writer):
+        mock_detector.score_and_observe(2, 1, 100, time.time())
+
+        flagged, score, reasons = fraud_detection.check_transfer("T1", 1, 2, 100)
+
+        assert flagged is True
+        args = mock_writer.return_value.submit.call_args[0]
+        assert args[0] is fraud_detection.record_flag
+        assert args[1:4] == ("T1", 1, 2)
+
+    @patch("system_backend.transaction_archive.get_archive_horizon", return_value=None)
+    @patch("system_backend.fraud_detection.transaction")
+    @patch("system_backend.fraud_detection.stream_rows")
+    def test_score_history(self, mock_stream, mock_transaction, mock_horizon):
+        mock_stream.return_value = iter([
+            {"transaction_id": "T1", "sender_id": 2, "receiver_id": 1,
+             "amount": Decimal("100.00"), "created_at": datetime(2025, 1, 6, 9, 0)},
+            {"transaction_id": "T2", "sender_id": 1, "receiver_id": 2,
+             "amount": Decimal("100.00"), "created_at": datetime(2025, 1, 6, 9, 5)},
+        ])
+        cursor = mock_transaction.return_value.__enter__.return_value
+        inserted = []
+        cursor.executemany.side_effect = lambda query, rows: inserted.extend(rows)
+
+        ok, result = fraud_detection.score_history("2025-01-01", "2025-01-31")
+
+        assert ok is True
+        assert result == {"scored": 2, "flagged": 1}
+        assert [row[0] for row in inserted] == ["T2"]
+
+    def test_score_history_bad_dates(self):
+        ok, msg = fraud_detection.score_history("2025-02-01", "2025-01-01")
+
+        assert ok is False
+
+
+class TestFlaggedReview(unittest.TestCase):
+
+    @patch("system_backend.finance_admin_wallet.execute_query")
+    def test_review(self, mock_execute):
+        mock_execute.return_value = MagicMock(rowcount=1)
+
+        success, msg = FinanceAdminWallet.review_flagged_transaction("T1", "cleared", 9)
+
+        assert success is True
+        assert mock_execute.call_args[0][1] == ("cleared", 9, "T1")
+
+    @patch("system_backend.finance_admin_wallet.execute_query")
+    def test_review_already_done(self, mock_execute):
+        mock_execute.return_value = MagicMock(rowcount=0)
+
+        success, msg = FinanceAdminWallet.review_flagged_transaction("T1", "confirmed", 9)
+
+        assert success is False
+        assert msg == "Flagged transaction not found or already reviewed."
+
+    def test_review_invalid_decision(self):
+        success, msg = FinanceAdminWallet.review_flagged_transaction("T1", "approved", 9)
+
+        assert success is False
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import campusEwallet_db
+from system_backend.campusEwallet_db import execute_query
+from system_backend.receiver_cache import invalidate_receiver_cache
+from system_backend.organization_wallet import invalidate_org_wallet_cache
+from system_backend.data_generator import generate_dataset
+from system_backend.load_test import run_load_test, format_report, find_negative_balances
+
+
+class TestLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        campusEwallet_db.use_sqlite()
+        self.addCleanup(campusEwallet_db.use_mysql)
+        self.addCleanup(invalidate_receiver_cache)
+        self.addCleanup(invalidate_org_wallet_cache)
+        invalidate_receiver_cache()
+        invalidate_org_wallet_cache()
+        generate_dataset(students=40, organizations=3, bills_per_org=2, transactions=400, cashin_requests=40,
+                         password_rounds=4)
+
+    def run_short(self, **options):
+        return run_load_test(**dict(dict(users=4, duration=30, think_time=0, check_interval=0.05,
+                                         max_scenarios=5), **options))
+
+    def test_mixed_load_reports_latencies_and_stays_consistent(self):
+        report = self.run_short()
+
+        self.assertGreater(report["steps"]["login"]["calls"], 0)
+        self.assertEqual(sum(stats["runs"] for stats in report["scenarios"].values()), 20)
+        for stats in report["steps"].values():
+            self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+        self.assertEqual(report["violations"]["negative_balances"], [])
+        self.assertEqual(report["violations"]["duplicate_ids"], [])
+        self.assertEqual(report["violations"]["reconciliation_discrepancies"], 0)
+        self.assertIn("scenarios/s", format_report(report))
+
+    def test_duplicate_generated_ids_are_reported(self):
+        with patch("system_backend.transfers.generate_transaction_id", return_value="TRNX-20250101-00001"):
+            report = self.run_short(mix={"send_money": 1}, max_scenarios=3)
+
+        self.assertEqual(report["steps"]["send_money"]["ok"], 1)
+        self.assertGreater(report["violations"]["id_collisions"], 0)
+
+    def test_negative_balances_are_found(self):
+        execute_query("UPDATE wallets SET balance = -5 WHERE user_id = %s", (7,))
+
+        self.assertEqual(find_negative_balances(), [("user", 7, -5.0)])
+
+    def test_unknown_scenario_rejected(self):
+        with self.assertRaises(ValueError):
+            run_load_test(mix={"enroll": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -135,8 +135,9 @@ class TestLoginSystem(unittest.TestCase):
 
         self.assertTrue(res["ok"])
 
+    @patch("login.execute_query")
     @patch("login.fetch_one")
-    def test_verify_code_invalid(self, mock_fetch):
+    def test_verify_code_invalid(self, mock_fetch, mock_execute):
         mock_fetch.side_effect = [
             self.student_user,
             {
@@ -149,6 +150,27 @@ class TestLoginSystem(unittest.TestCase):
         res = self.login.verify_code("20210001", "123456")
 
         self.assertFalse(res["ok"])
+        self.assertEqual(res["msg"], "Invalid code.")
+
+    @patch("login.execute_query")
+    @patch("login.fetch_one")
+    def test_verify_code_attempts_capped(self, mock_fetch, mock_execute):
+        mock_fetch.side_effect = [
+            self.student_user,
+            {
+                "id": 1,
+                "code": "123456",
+                "expires_at": datetime.now() + timedelta(minutes=5)
+            }
+        ]
+        # the conditional attempt counter is already at MAX_CODE_ATTEMPTS
+        mock_execute.return_value.rowcount = 0
+
+        res = self.login.verify_code("20210001", "123456")
+
+        self.assertFalse(res["ok"])
+        self.assertIn("Too many", res["msg"])
+        self.assertEqual(mock_execute.call_args[0][1], (1, self.login.MAX_CODE_ATTEMPTS))
 
     # -------------------------
     # RESET PASSWORD
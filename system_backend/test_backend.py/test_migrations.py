@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import migrations
+
+
+MIGRATIONS = [
+    ("0001_first", ["ALTER TABLE a ADD COLUMN x INT", "CREATE UNIQUE INDEX ux ON a (x)"]),
+    ("0002_second", ["CREATE TABLE b (id INT)"]),
+]
+
+
+class TestApplyMigrations(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.multiple(migrations, MIGRATIONS=MIGRATIONS, MIGRATION_CHECKS={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("system_backend.migrations.fetch_all")
+    @patch("system_backend.migrations.execute_query")
+    def test_rerun_resumes_after_completed_statements(self, mock_execute, mock_fetch_all):
+        # First statement of 0001 succeeded on an earlier run
+        mock_fetch_all.side_effect = [[], [{"step": 0}], []]
+        mock_execute.return_value = True
+
+        ok, applied = migrations.apply_migrations()
+
+        self.assertTrue(ok)
+        self.assertEqual(applied, ["0001_first", "0002_second"])
+        executed = [call.args[0] for call in mock_execute.call_args_list]
+        self.assertNotIn("ALTER TABLE a ADD COLUMN x INT", executed)
+        self.assertIn("CREATE UNIQUE INDEX ux ON a (x)", executed)
+
+    @patch("system_backend.migrations.fetch_all")
+    @patch("system_backend.migrations.execute_query")
+    def test_failed_statement_is_not_recorded(self, mock_execute, mock_fetch_all):
+        mock_fetch_all.side_effect = [[], []]
+        mock_execute.side_effect = lambda query, params=None: "UNIQUE" not in query
+
+        ok, applied = migrations.apply_migrations()
+
+        self.assertFalse(ok)
+        self.assertEqual(applied, [])
+        recorded = [call.args[1] for call in mock_execute.call_args_list
+                    if "schema_migration_steps (name, step)" in call.args[0]]
+        self.assertEqual(recorded, [("0001_first", 0)])
+
+    @patch("system_backend.migrations.fetch_all")
+    @patch("system_backend.migrations.execute_query")
+    def test_check_rows_block_migration(self, mock_execute, mock_fetch_all):
+        migrations.MIGRATION_CHECKS["0001_first"] = ("SELECT dupes", "Duplicate names")
+        mock_fetch_all.side_effect = [[], [{"organization_key": "cs society", "wallets": 2}]]
+        mock_execute.return_value = True
+
+        ok, applied = migrations.apply_migrations()
+
+        self.assertFalse(ok)
+        executed = [call.args[0] for call in mock_execute.call_args_list]
+        self.assertNotIn("ALTER TABLE a ADD COLUMN x INT", executed)
+
+
+if __name__ == "__main__":
+    unittest.main()
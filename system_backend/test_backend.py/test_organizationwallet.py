@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import patch
+from datetime import datetime
 import os, sys
 
 # ---- FIX PATH ----
@@ -7,12 +8,13 @@ CURRENT_DIR = os.path.dirname(__file__)
 PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
 sys.path.insert(0, PROJECT_ROOT)
 
-from system_backend.organization_wallet import OrganizationWallet
+from system_backend.organization_wallet import OrganizationWallet, invalidate_org_wallet_cache
 
 
 class TestOrganizationWallet(unittest.TestCase):
 
     def setUp(self):
+        invalidate_org_wallet_cache()
         self.wallet = OrganizationWallet("24-74745")
 
         self.org_wallet_row = {
@@ -41,6 +43,30 @@ class TestOrganizationWallet(unittest.TestCase):
 
         assert balance is None
 
+    @patch("system_backend.organization_wallet.fetch_one")
+    def test_load_org_wallet_uses_cache(self, mock_fetch):
+        mock_fetch.side_effect = [
+            {"student_id": "24-74745", "name": "Treasurer", "role": "treasurer",
+             "organization_name": "CS Society", "org_wallet_id": 10, "org_wallet_balance": 100.0},
+            {"org_wallet_balance": 250.0}
+        ]
+
+        self.wallet.get_balance()
+        balance = OrganizationWallet("24-74745").get_balance()
+
+        assert balance == 250.0
+        assert "org_wallet_id = %s" in mock_fetch.call_args_list[1][0][0]
+
+    @patch("system_backend.organization_wallet.fetch_one")
+    def test_load_org_wallet_cache_entry_dropped_when_wallet_missing(self, mock_fetch):
+        mock_fetch.side_effect = [self.org_wallet_row, None, None]
+
+        self.wallet.get_balance()
+        balance = self.wallet.get_balance()
+
+        assert balance is None
+        assert mock_fetch.call_count == 3
+
     # -------------------------
     # POST BILL
     # -------------------------
@@ -75,6 +101,61 @@ class TestOrganizationWallet(unittest.TestCase):
         assert ok is False
         assert msg == "Invalid amount."
 
+    # -------------------------
+    # BULK / TARGETED BILLS
+    # -------------------------
+
+    @patch("system_backend.organization_wallet.transaction")
+    @patch("system_backend.organization_wallet.fetch_one")
+    def test_post_bills_with_audience(self, mock_fetch, mock_transaction):
+        mock_fetch.return_value = self.org_wallet_row
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.lastrowid = 55
+        cursor.fetchone.return_value = {"audience_size": 120}
+
+        ok, results = self.wallet.post_bills([
+            {"title": "Org Fee", "description": "1st sem", "amount": 150,
+             "audience": [{"organization": " CS Society ", "section": "2A"},
+                          {"student_ids": ["24-1", "24-2", "24-1"]}]},
+            {"title": "Shirt", "description": None, "amount": "300"},
+        ])
+
+        assert ok is True
+        assert results[0] == {"bill_id": 55, "title": "Org Fee", "audience_size": 120}
+        assert results[1]["audience_size"] is None
+
+        statements = [call[0] for call in cursor.execute.call_args_list]
+        selector_sql, selector_params = statements[1]
+        assert "organization_key = %s AND section = %s" in selector_sql
+        assert selector_params == (55, "cs society", "2A")
+        assert statements[2][1] == (55, "24-1", "24-2")
+        assert statements[-1][1] == (10, "Shirt", None, 300.0, 0)
+
+    @patch("system_backend.organization_wallet.transaction")
+    @patch("system_backend.organization_wallet.fetch_one")
+    def test_post_bills_validation_happens_before_insert(self, mock_fetch, mock_transaction):
+        mock_fetch.return_value = self.org_wallet_row
+
+        ok, msg = self.wallet.post_bills([
+            {"title": "Org Fee", "amount": 150},
+            {"title": "Shirt", "amount": -5},
+        ])
+
+        assert ok is False
+        assert msg == "Bill #2: Amount must be greater than zero."
+        mock_transaction.assert_not_called()
+
+    @patch("system_backend.organization_wallet.fetch_one")
+    def test_post_bills_empty_audience_selector(self, mock_fetch):
+        mock_fetch.return_value = self.org_wallet_row
+
+        ok, msg = self.wallet.post_bills([
+            {"title": "Org Fee", "amount": 150, "audience": [{"program": "  "}]}
+        ])
+
+        assert ok is False
+        assert "Audience selectors" in msg
+
     # -------------------------
     # VIEW TRANSACTIONS
     # -------------------------
@@ -100,21 +181,58 @@ class TestOrganizationWallet(unittest.TestCase):
 
         assert results == []
 
+    @patch("system_backend.organization_wallet.fetch_all")
+    @patch("system_backend.organization_wallet.fetch_one")
+    def test_org_transaction_date_filter_uses_range(self, mock_fetch, mock_fetch_all):
+        mock_fetch.return_value = self.org_wallet_row
+        mock_fetch_all.return_value = []
+
+        self.wallet.org_transaction(date_filter="2025-02-14")
+
+        query, params = mock_fetch_all.call_args[0]
+        assert "DATE(created_at)" not in query
+        assert params == (10, datetime(2025, 2, 14), datetime(2025, 2, 15))
+
     # -------------------------
     # CASH OUT REQUEST
     # -------------------------
 
-    @patch("system_backend.organization_wallet.execute_query")
+    @patch("system_backend.organization_wallet.transaction")
     @patch("system_backend.organization_wallet.fetch_one")
-    def test_request_cash_out_success(self, mock_fetch, mock_execute):
+    def test_request_cash_out_success(self, mock_fetch, mock_transaction):
         mock_fetch.return_value = self.org_wallet_row
-        mock_execute.return_value = True
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 1
 
         ok, msg = self.wallet.request_cash_out(300, "For event")
 
         assert ok is True
         assert "cash-out request submitted" in msg.lower()
         assert "REQ-" in msg
+        # funds are held before the request is inserted
+        assert cursor.execute.call_args_list[0][0][1] == (300.0, 10, 300.0)
+
+    @patch("system_backend.organization_wallet.transaction")
+    @patch("system_backend.organization_wallet.fetch_one")
+    def test_request_cash_out_exceeds_available(self, mock_fetch, mock_transaction):
+        mock_fetch.return_value = self.org_wallet_row
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 0
+
+        ok, msg = self.wallet.request_cash_out(2000, "Too much")
+
+        assert ok is False
+        assert msg.startswith("Insufficient available balance")
+        assert cursor.execute.call_count == 1
+
+    @patch("system_backend.organization_wallet.fetch_one")
+    def test_display_balance_available(self, mock_fetch):
+        mock_fetch.return_value = dict(self.org_wallet_row, org_wallet_held=500.50)
+
+        info = self.wallet.display_balance()
+
+        assert info["held"] == 500.50
+        assert info["available_balance"] == 1000.0
 
     @patch("system_backend.organization_wallet.fetch_one")
     def test_request_cash_out_invalid_amount(self, mock_fetch):
@@ -0,0 +1,157 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from mysql.connector import OperationalError
+from system_backend import campusEwallet_db
+from system_backend.campusEwallet_db import register_query, NamedQuery
+
+BALANCE = register_query("test.balance", "SELECT balance FROM wallets WHERE user_id = %s")
+DEBIT = register_query("test.debit", "UPDATE wallets SET balance = balance - %s WHERE user_id = %s")
+
+
+def fake_connection():
+    database = MagicMock()
+    database.in_transaction = False
+    prepared_cursors = []
+
+    def cursor(prepared=False, dictionary=False, **kwargs):
+        new_cursor = MagicMock()
+        new_cursor.prepared = prepared
+        if prepared:
+            prepared_cursors.append(new_cursor)
+        return new_cursor
+
+    database.cursor.side_effect = cursor
+    database.prepared_cursors = prepared_cursors
+    return database
+
+
+class TestQueryRegistry(unittest.TestCase):
+
+    def setUp(self):
+        campusEwallet_db._drop_thread_connection()
+        campusEwallet_db.reset_query_timings()
+
+    def tearDown(self):
+        campusEwallet_db._drop_thread_connection()
+
+    def test_register_is_idempotent(self):
+        again = register_query("test.balance", "SELECT balance FROM wallets WHERE user_id = %s")
+
+        self.assertIs(again, BALANCE)
+        self.assertIsInstance(BALANCE, NamedQuery)
+        self.assertEqual(BALANCE.name, "test.balance")
+
+    def test_register_rejects_different_sql(self):
+        with self.assertRaises(ValueError):
+            register_query("test.balance", "SELECT * FROM wallets")
+
+    @patch("system_backend.campusEwallet_db.connect_to_db")
+    def test_named_query_reuses_connection_and_prepared_cursor(self, mock_connect):
+        database = fake_connection()
+        mock_connect.return_value = database
+
+        for user_id in (1, 2, 3):
+            campusEwallet_db.fetch_one(BALANCE, (user_id,))
+
+        mock_connect.assert_called_once()
+        self.assertTrue(database.autocommit)
+        self.assertEqual(len(database.prepared_cursors), 1)
+        cursor = database.prepared_cursors[0]
+        self.assertEqual(cursor.execute.call_count, 3)
+        # The same registered object is passed every time, so it is prepared only once
+        for call in cursor.execute.call_args_list:
+            self.assertIs(call.args[0], BALANCE)
+
+    @patch("system_backend.campusEwallet_db.connect_to_db")
+    def test_fetch_one_returns_first_row_and_records_timing(self, mock_connect):
+        database = fake_connection()
+        mock_connect.return_value = database
+        campusEwallet_db.fetch_all(BALANCE, (1,))
+        database.prepared_cursors[0].fetchall.return_value = [{"balance": 50}]
+
+        row = campusEwallet_db.fetch_one(BALANCE, (1,))
+
+        self.assertEqual(row, {"balance": 50})
+        timings = campusEwallet_db.get_query_timings()["test.balance"]
+        self.assertEqual(timings["calls"], 2)
+        self.assertEqual(timings["errors"], 0)
+        self.assertGreaterEqual(timings["max_ms"], timings["avg_ms"])
+
+    @patch("system_backend.campusEwallet_db.connect_to_db")
+    def test_read_is_retried_on_a_new_connection(self, mock_connect):
+        dropped = fake_connection()
+        healthy = fake_connection()
+        mock_connect.side_effect = [dropped, healthy]
+        campusEwallet_db.fetch_one(BALANCE, (1,))
+        dropped.prepared_cursors[0].execute.side_effect = OperationalError("Lost connection")
+        # Force the dropped connection to be used again
+        campusEwallet_db._local.database = dropped
+        campusEwallet_db._local.prepared = {"test.balance": dropped.prepared_cursors[0]}
+
+        campusEwallet_db.fetch_one(BALANCE, (1,))
+
+        dropped.close.assert_called_once()
+        healthy.prepared_cursors[0].execute.assert_called_once_with(BALANCE, (1,))
+        self.assertEqual(campusEwallet_db.get_query_timings()["test.balance"]["errors"], 1)
+
+    @patch("system_backend.campusEwallet_db.connect_to_db")
+    def test_write_is_not_retried(self, mock_connect):
+        database = fake_connection()
+        mock_connect.return_value = database
+        campusEwallet_db.execute_query(DEBIT, (10, 1))
+        database.prepared_cursors[0].execute.side_effect = OperationalError("Lost connection")
+        campusEwallet_db._local.database = database
+        campusEwallet_db._local.prepared = {"test.debit": database.prepared_cursors[0]}
+
+        result = campusEwallet_db.execute_query(DEBIT, (10, 1))
+
+        self.assertIsNone(result)
+        self.assertEqual(mock_connect.call_count, 1)
+
+    @patch("system_backend.campusEwallet_db.connect_to_db")
+    def test_transaction_prepares_named_queries_only(self, mock_connect):
+        database = fake_connection()
+        mock_connect.return_value = database
+
+        with campusEwallet_db.transaction() as cursor:
+            cursor.execute(DEBIT, (10, 1))
+            prepared = database.prepared_cursors[0]
+            prepared.rowcount = 1
+            self.assertEqual(cursor.rowcount, 1)
+            cursor.execute("SELECT status FROM split_requests WHERE split_id = %s", (4,))
+
+        prepared.execute.assert_called_once_with(DEBIT, (10, 1))
+        database.start_transaction.assert_called_once()
+        database.commit.assert_called_once()
+        # The thread's connection is kept for the next transaction
+        database.close.assert_not_called()
+
+        with campusEwallet_db.transaction() as cursor:
+            cursor.execute(DEBIT, (5, 2))
+        self.assertEqual(len(database.prepared_cursors), 1)
+
+    @patch("system_backend.campusEwallet_db.connect_to_db")
+    def test_nested_transaction_gets_own_connection(self, mock_connect):
+        outer = fake_connection()
+        inner = fake_connection()
+        mock_connect.side_effect = [outer, inner]
+
+        with campusEwallet_db.transaction():
+            outer.in_transaction = True
+            with campusEwallet_db.transaction() as cursor:
+                cursor.execute(DEBIT, (1, 1))
+
+        inner.commit.assert_called_once()
+        inner.close.assert_called_once()
+        outer.close.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from unittest.mock import patch
+from datetime import datetime
+import os, sys, tempfile
+from PIL import PdfParser
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import receipts
+from system_backend.students_wallet import StudentWallet
+
+
+SEND_RESULT = {
+    "transaction_id": "TRNX-20250110-000001",
+    "sender_name": "Juan Dela Cruz",
+    "receiver_name": "Maria Santos",
+    "receiver_student_id": "2023-00002",
+    "amount": 150.0,
+    "message": "Lunch",
+    "timestamp": "2025-01-10 09:00:00",
+}
+
+BILL_RESULT = {
+    "transaction_id": "TRNX-20250110-000002",
+    "organization": "Computer Society",
+    "amount": 50.0,
+    "bill_title": "Membership Fee",
+    "timestamp": "2025-01-10 10:00:00",
+}
+
+
+class TestReceipts(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_receipt_fields_send_money(self):
+        fields = dict(receipts.receipt_fields(SEND_RESULT))
+
+        assert fields["Type"] == "Send Money"
+        assert fields["To"] == "Maria Santos"
+        assert fields["Amount"] == "PHP 150.00"
+        assert fields["Message"] == "Lunch"
+
+    def test_receipt_fields_bill_payment_and_history_row(self):
+        bill = dict(receipts.receipt_fields(BILL_RESULT))
+        row = dict(receipts.receipt_fields({
+            "transaction_id": "TRNX-3",
+            "transaction_type": "Cash In",
+            "amount": 1000,
+            "status": "completed",
+            "created_at": datetime(2025, 1, 10, 11, 30, 0),
+        }))
+
+        assert bill["Type"] == "Bill Payment"
+        assert bill["To"] == "Computer Society"
+        assert row["Type"] == "Cash In"
+        assert row["Date"] == "2025-01-10 11:30:00"
+
+    def test_same_content_renders_once(self):
+        with patch("system_backend.receipts.draw_receipt", wraps=receipts.draw_receipt) as mock_draw:
+            ok1, path1 = receipts.render_receipt(SEND_RESULT, self.temp_dir.name)
+            ok2, path2 = receipts.render_receipt(dict(SEND_RESULT), self.temp_dir.name)
+
+        assert ok1 and ok2
+        assert path1 == path2
+        assert os.path.exists(path1)
+        assert mock_draw.call_count == 1
+
+    def test_different_content_different_file(self):
+        _, path1 = receipts.render_receipt(SEND_RESULT, self.temp_dir.name)
+        _, path2 = receipts.render_receipt(BILL_RESULT, self.temp_dir.name)
+
+        assert path1 != path2
+
+    def test_render_receipts_pdf(self):
+        output = os.path.join(self.temp_dir.name, "term.pdf")
+
+        ok, path = receipts.render_receipts_pdf([SEND_RESULT, BILL_RESULT], output, self.temp_dir.name)
+
+        assert ok is True
+        with open(path, "rb") as f:
+            assert f.read(4) == b"%PDF"
+
+    @patch("system_backend.receipts.PDF_CHUNK_PAGES", 2)
+    def test_render_receipts_pdf_chunks_and_reuses_cache(self):
+        output = os.path.join(self.temp_dir.name, "term.pdf")
+        results = [SEND_RESULT, BILL_RESULT, dict(SEND_RESULT), dict(BILL_RESULT, amount=75.0), SEND_RESULT]
+
+        with patch("system_backend.receipts.draw_receipt", wraps=receipts.draw_receipt) as mock_draw:
+            ok, path = receipts.render_receipts_pdf(results, output, self.temp_dir.name)
+
+        assert ok is True
+        # three distinct receipts, drawn once each
+        assert mock_draw.call_count == 3
+        parser = PdfParser.PdfParser(path)
+        try:
+            assert len(parser.pages) == 5
+        finally:
+            parser.close()
+
+    def test_render_receipts_pdf_empty(self):
+        ok, msg = receipts.render_receipts_pdf([], os.path.join(self.temp_dir.name, "x.pdf"))
+
+        assert ok is False
+
+    @patch.object(StudentWallet, "view_transactions")
+    def test_student_receipts_pdf_no_transactions(self, mock_view):
+        mock_view.return_value = []
+        wallet = StudentWallet.__new__(StudentWallet)
+
+        ok, msg = wallet.generate_receipts_pdf("2025-01-01", "2025-05-31", "term.pdf")
+
+        assert ok is False
+        assert msg == "No transactions found for this period."
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import patch
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import receiver_cache
+
+
+def receiver_row(identifier):
+    return {"user_id": 7, "student_id": None, "office_id": identifier, "office_name": "Canteen",
+            "receiver_name": None, "wallet_exists": 1}
+
+
+class TestReceiverCache(unittest.TestCase):
+
+    def setUp(self):
+        receiver_cache.invalidate_receiver_cache()
+        receiver_cache._stats.update(hits=0, misses=0, evictions=0)
+
+    @patch("system_backend.receiver_cache.fetch_one")
+    def test_hit_after_first_lookup(self, mock_fetch):
+        mock_fetch.side_effect = lambda query, params: receiver_row(params[0])
+
+        first = receiver_cache.lookup_receiver("CANTEEN")
+        second = receiver_cache.lookup_receiver(" CANTEEN ")
+
+        assert first is second
+        assert first["wallet_exists"] is True
+        assert mock_fetch.call_count == 1
+        stats = receiver_cache.get_receiver_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    @patch("system_backend.receiver_cache.fetch_one", return_value=None)
+    def test_unknown_receiver_not_cached(self, mock_fetch):
+        assert receiver_cache.lookup_receiver("24-99999") is None
+        assert receiver_cache.lookup_receiver("24-99999") is None
+
+        assert mock_fetch.call_count == 2
+
+    @patch("system_backend.receiver_cache.RECEIVER_CACHE_SIZE", 2)
+    @patch("system_backend.receiver_cache.fetch_one")
+    def test_evicts_least_recently_used(self, mock_fetch):
+        mock_fetch.side_effect = lambda query, params: receiver_row(params[0])
+
+        receiver_cache.lookup_receiver("A")
+        receiver_cache.lookup_receiver("B")
+        receiver_cache.lookup_receiver("A")
+        receiver_cache.lookup_receiver("C")
+
+        assert list(receiver_cache._cache) == ["A", "C"]
+        assert receiver_cache.get_receiver_cache_stats()["evictions"] == 1
+
+    @patch("system_backend.receiver_cache.fetch_one")
+    def test_invalidate(self, mock_fetch):
+        mock_fetch.side_effect = lambda query, params: receiver_row(params[0])
+
+        receiver_cache.lookup_receiver("CANTEEN")
+        receiver_cache.invalidate_receiver_cache("CANTEEN")
+        receiver_cache.lookup_receiver("CANTEEN")
+
+        assert mock_fetch.call_count == 2
+
+
+if __name__ == "__main__":
+    unittest.main()
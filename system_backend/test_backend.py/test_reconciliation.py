@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+from datetime import datetime
+from decimal import Decimal
+import os, sys, tempfile
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import reconciliation
+
+
+@patch("system_backend.transaction_archive.get_archive_horizon", return_value=None)
+class TestReconciliation(unittest.TestCase):
+
+    def test_compare_query_single_wallet(self, mock_horizon):
+        since = datetime(2025, 1, 10)
+
+        query, params = reconciliation._compare_query("org", since, 7)
+
+        assert "FROM organization_wallets w" in query
+        assert "WHERE w.org_wallet_id = %s" in query
+        assert params[-1] == 7
+        assert query.count("%s") == len(params)
+
+    @patch("system_backend.reconciliation.transaction")
+    def test_run_folds_new_window_and_reports(self, mock_transaction, mock_horizon):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        last = datetime(2025, 1, 9, 2, 0, 0)
+        run_at = datetime(2025, 1, 10, 2, 0, 0)
+        cutoff = datetime(2025, 1, 10, 1, 59, 0)
+        cursor.fetchone.return_value = {"reconciled_until": last, "run_at": run_at, "cutoff": cutoff}
+        cursor.fetchall.side_effect = [
+            [{"wallet_kind": "user", "wallet_ref": 5,
+              "stored_balance": Decimal("120.00"), "expected_balance": Decimal("100.00")}],
+            [],
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report = os.path.join(temp_dir, "report.csv")
+            ok, result = reconciliation.run_reconciliation(report)
+
+            assert ok is True
+            assert len(result["discrepancies"]) == 1
+            assert result["discrepancies"][0]["difference"] == Decimal("20.00")
+            with open(report, encoding="utf-8") as f:
+                assert f.read().splitlines()[1] == "user,5,100.00,120.00,20.00"
+
+        fold_sql, fold_params = cursor.execute.call_args_list[1][0]
+        assert "INSERT INTO wallet_reconciliation" in fold_sql
+        assert fold_params[:2] == (last, cutoff)
+        assert cursor.executemany.call_count == 1
+        assert cursor.execute.call_args_list[-1][0][1] == (cutoff, run_at)
+
+    @patch("system_backend.reconciliation.transaction")
+    def test_run_without_changes_skips_insert(self, mock_transaction, mock_horizon):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        now = datetime(2025, 1, 10, 2, 0, 0)
+        cursor.fetchone.return_value = {"reconciled_until": now, "run_at": now, "cutoff": now}
+        cursor.fetchall.return_value = []
+
+        ok, result = reconciliation.run_reconciliation()
+
+        assert ok is True
+        assert result["discrepancies"] == []
+        assert cursor.executemany.call_count == 0
+        # state lock, two comparisons, checkpoint update
+        assert cursor.execute.call_count == 4
+
+    @patch("system_backend.reconciliation.transaction")
+    def test_accept_balance_records_adjustment(self, mock_transaction, mock_horizon):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.fetchone.side_effect = [
+            {"reconciled_until": datetime(2025, 1, 10)},
+            {"wallet_kind": "user", "wallet_ref": 5,
+             "stored_balance": Decimal("500.00"), "expected_balance": Decimal("0.00")},
+        ]
+
+        ok, msg = reconciliation.accept_balance("user", 5)
+
+        assert ok is True
+        assert "500.00" in msg
+        assert cursor.execute.call_args_list[-1][0][1] == ("user", 5, Decimal("500.00"))
+
+    def test_accept_balance_unknown_kind(self, mock_horizon):
+        ok, msg = reconciliation.accept_balance("office", 5)
+
+        assert ok is False
+
+
+if __name__ == "__main__":
+    unittest.main()
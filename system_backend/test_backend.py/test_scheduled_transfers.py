@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime
+from decimal import Decimal
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import scheduled_transfers
+
+
+def schedule(schedule_id, owner, kind="send_money", next_run_at=datetime(2025, 1, 31, 8, 0), end_at=None,
+             anchor_day=31):
+    return {
+        "schedule_id": schedule_id, "owner_user_id": owner, "kind": kind,
+        "receiver_identifier": "24-00001", "bill_id": 4, "amount": Decimal("100.00"),
+        "message": "Allowance", "interval_unit": "month", "interval_count": 1,
+        "anchor_day": anchor_day, "next_run_at": next_run_at, "end_at": end_at,
+    }
+
+
+class TestNextOccurrence(unittest.TestCase):
+
+    def test_month_end_clamped(self):
+        assert scheduled_transfers.next_occurrence(datetime(2025, 1, 31, 8), "month") == datetime(2025, 2, 28, 8)
+        assert scheduled_transfers.next_occurrence(datetime(2025, 11, 15), "month", 3) == datetime(2026, 2, 15)
+
+    def test_month_end_returns_to_anchor_day(self):
+        run_at = datetime(2025, 1, 31, 8)
+        runs = []
+        for _ in range(3):
+            run_at = scheduled_transfers.next_occurrence(run_at, "month", anchor_day=31)
+            runs.append(run_at)
+        assert runs == [datetime(2025, 2, 28, 8), datetime(2025, 3, 31, 8), datetime(2025, 4, 30, 8)]
+
+    def test_days_and_weeks(self):
+        assert scheduled_transfers.next_occurrence(datetime(2025, 1, 1), "day", 10) == datetime(2025, 1, 11)
+        assert scheduled_transfers.next_occurrence(datetime(2025, 1, 1), "week", 2) == datetime(2025, 1, 15)
+
+
+class TestScheduledTransfers(unittest.TestCase):
+
+    def test_create_validation(self):
+        assert scheduled_transfers.create_recurring_transfer(1, "send_money", 50, "year")[0] is False
+        assert scheduled_transfers.create_recurring_transfer(1, "send_money", -5, "month", receiver_identifier="X")[0] is False
+        assert scheduled_transfers.create_recurring_transfer(1, "bill_payment", None, "month")[0] is False
+
+    @patch("system_backend.scheduled_transfers.transaction")
+    def test_create(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.lastrowid = 12
+
+        ok, schedule_id = scheduled_transfers.create_recurring_transfer(
+            1, "send_money", "250", "month", receiver_identifier="24-00001"
+        )
+
+        assert ok is True
+        assert schedule_id == 12
+        assert cursor.execute.call_args[0][1][4] == 250.0
+        # monthly schedules remember the day they start on
+        params = cursor.execute.call_args[0][1]
+        assert params[8] == params[9].day
+
+    @patch("system_backend.scheduled_transfers.transaction")
+    def test_claim_skips_existing_occurrence(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [schedule(1, 5), schedule(2, 6, end_at=datetime(2025, 2, 1)),
+                                        schedule(3, 7, next_run_at=datetime(2025, 2, 28, 8))]
+        # schedule 2's occurrence was already recorded by an earlier tick
+        type(cursor).rowcount = property(lambda self: 1 if cursor.execute.call_count in (2, 4) else 0)
+
+        claimed = scheduled_transfers._claim_due_batch(100)
+
+        assert [item[0]["schedule_id"] for item in claimed] == [1, 3]
+        advanced = cursor.executemany.call_args[0][1]
+        # schedule 3 was clamped to Feb 28 and goes back to its anchor day
+        assert advanced == [(datetime(2025, 2, 28, 8), 1, 1), (datetime(2025, 2, 28, 8), 0, 2),
+                            (datetime(2025, 3, 31, 8), 1, 3)]
+
+    @patch("system_backend.scheduled_transfers.transaction")
+    @patch("system_backend.scheduled_transfers._claim_due_batch")
+    @patch("system_backend.students_wallet.StudentWallet")
+    def test_run_due_transfers(self, mock_wallet_cls, mock_claim, mock_transaction):
+        wallet = mock_wallet_cls.return_value
+        wallet.send_money.side_effect = [(True, {"transaction_id": "TRX1"}), (False, "Insufficient balance.")]
+        wallet.pay_organization_bill.return_value = (True, {"transaction_id": "TRX2"})
+        run_at = datetime(2025, 1, 31, 8, 0)
+        mock_claim.side_effect = [
+            [(schedule(1, 5), run_at), (schedule(2, 5), run_at), (schedule(3, 7, kind="bill_payment"), run_at)],
+            [],
+        ]
+        cursor = mock_transaction.return_value.__enter__.return_value
+
+        ok, result = scheduled_transfers.run_due_transfers(workers=2)
+
+        assert ok is True
+        assert result == {"completed": 2, "failed": 1}
+        wallet.pay_organization_bill.assert_called_once_with(4, "Allowance")
+        run_updates = cursor.executemany.call_args_list[0][0][1]
+        assert [u[0] for u in run_updates] == ["completed", "failed", "completed"]
+        assert run_updates[1][2] == "Insufficient balance."
+
+    @patch("system_backend.scheduled_transfers.execute_query")
+    def test_cancel_not_found(self, mock_execute):
+        mock_execute.return_value = MagicMock(rowcount=0)
+
+        ok, msg = scheduled_transfers.cancel_recurring_transfer(1, 99)
+
+        assert ok is False
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+from datetime import date, datetime
+from decimal import Decimal
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import spending_analytics
+
+
+COLUMNS = {
+    "moved_at": (
+        datetime(2025, 1, 6, 9, 0),    # Monday
+        datetime(2025, 1, 8, 12, 0),
+        datetime(2025, 1, 12, 18, 0),  # Sunday, same week
+        datetime(2025, 1, 13, 8, 0),   # next Monday
+    ),
+    "amount": (Decimal("500.00"), Decimal("-120.00"), Decimal("-30.00"), Decimal("-50.00")),
+    "transaction_type": ("Cash In", "Send Money", "Send Money", "Bill Payment"),
+    "counterparty": ("Cash In", "Maria Santos", "Maria Santos", "Computer Society"),
+}
+
+
+@patch("system_backend.transaction_archive.get_archive_horizon", return_value=None)
+class TestSpendingAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        spending_analytics.invalidate_spending_analytics()
+
+    @patch("system_backend.spending_analytics.fetch_columns", return_value=COLUMNS)
+    def test_insights(self, mock_columns, mock_horizon):
+        data = spending_analytics.load_transaction_columns(5)
+
+        insights = spending_analytics.compute_insights(data, 300.0)
+
+        assert insights["transaction_count"] == 4
+        assert insights["total_spent"] == 200.0
+        assert insights["total_received"] == 500.0
+        send = next(c for c in insights["by_category"] if c["transaction_type"] == "Send Money")
+        assert send == {"transaction_type": "Send Money", "spent": 150.0, "received": 0.0, "count": 2}
+        assert [w["week_start"] for w in insights["by_week"]] == [date(2025, 1, 6), date(2025, 1, 13)]
+        assert insights["by_week"][0]["spent"] == 150.0
+        assert list(insights["balance_curve"]["balances"]) == [500.0, 380.0, 350.0, 300.0]
+        assert insights["top_counterparties"][0] == {"counterparty": "Maria Santos", "spent": 150.0, "count": 2}
+        assert len(insights["top_counterparties"]) == 2
+
+    @patch("system_backend.spending_analytics.fetch_columns")
+    def test_no_transactions(self, mock_columns, mock_horizon):
+        mock_columns.return_value = {name: () for name in COLUMNS}
+
+        insights = spending_analytics.compute_insights(spending_analytics.load_transaction_columns(5), 0.0)
+
+        assert insights["transaction_count"] == 0
+        assert insights["by_week"] == []
+        assert insights["top_counterparties"] == []
+
+    @patch("system_backend.spending_analytics.fetch_one", return_value={"balance": Decimal("300.00")})
+    @patch("system_backend.spending_analytics.fetch_columns", return_value=COLUMNS)
+    def test_cached_until_invalidated(self, mock_columns, mock_fetch_one, mock_horizon):
+        first = spending_analytics.get_spending_insights(5)
+        second = spending_analytics.get_spending_insights(5)
+
+        assert first is second
+        assert mock_columns.call_count == 1
+
+        spending_analytics.invalidate_spending_analytics(5)
+        spending_analytics.get_spending_insights(5)
+
+        assert mock_columns.call_count == 2
+
+    @patch("system_backend.spending_analytics.fetch_columns", return_value=None)
+    def test_database_error(self, mock_columns, mock_horizon):
+        assert spending_analytics.get_spending_insights(5) is None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+from decimal import Decimal
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import split_payments
+
+
+class TestSplitPayments(unittest.TestCase):
+
+    def test_equal_shares(self):
+        shares = split_payments.equal_shares("100", ["A", "B", "C"])
+
+        assert shares == [("A", Decimal("33.34")), ("B", Decimal("33.33")), ("C", Decimal("33.33"))]
+        assert sum(amount for _, amount in shares) == Decimal("100")
+
+    @patch("system_backend.split_payments.transaction")
+    @patch("system_backend.split_payments.fetch_all")
+    def test_create_split(self, mock_fetch_all, mock_transaction):
+        mock_fetch_all.return_value = [{"student_id": "A", "user_id": 2}, {"student_id": "B", "user_id": 3}]
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.lastrowid = 40
+
+        ok, split_id = split_payments.create_split(1, "Pizza", [("A", "150"), ("B", 150)])
+
+        assert ok is True
+        assert split_id == 40
+        assert cursor.execute.call_args[0][1] == (1, "Pizza", Decimal("300.00"), 2)
+        assert cursor.executemany.call_args[0][1] == [(40, 2, Decimal("150.00")), (40, 3, Decimal("150.00"))]
+
+    @patch("system_backend.split_payments.fetch_all")
+    def test_create_split_unknown_peer(self, mock_fetch_all):
+        mock_fetch_all.return_value = [{"student_id": "A", "user_id": 2}]
+
+        ok, msg = split_payments.create_split(1, "Pizza", [("A", 10), ("Z", 10)])
+
+        assert ok is False
+        assert msg == "No wallet found for: Z"
+
+    def test_create_split_rejects_duplicates(self):
+        ok, msg = split_payments.create_split(1, "Pizza", [("A", 10), ("A", 5)])
+
+        assert ok is False
+
+    @patch("system_backend.split_payments.check_transfer")
+    @patch("system_backend.split_payments.transaction")
+    def test_pay_share(self, mock_transaction, mock_check):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.fetchone.side_effect = [
+            {"amount": Decimal("150.00"), "initiator_user_id": 1, "title": "Pizza"},
+            {"status": "completed"},
+        ]
+        cursor.rowcount = 1
+
+        ok, result = split_payments.pay_share(2, 40)
+
+        assert ok is True
+        assert result["split_completed"] is True
+        statements = [c[0][0] for c in cursor.execute.call_args_list]
+        # share CAS, then the shared transfer path: conditional debit, credit, ledger row
+        assert "status = 'paid'" in statements[1]
+        assert "balance >= %s" in statements[2]
+        assert "INSERT INTO transactions" in statements[4]
+        mock_check.assert_called_once()
+
+    @patch("system_backend.split_payments.transaction")
+    def test_pay_share_insufficient_balance(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.fetchone.return_value = {"amount": Decimal("150.00"), "initiator_user_id": 1, "title": "Pizza"}
+        type(cursor).rowcount = property(lambda self: 1 if cursor.execute.call_count < 3 else 0)
+
+        ok, msg = split_payments.pay_share(2, 40)
+
+        assert ok is False
+        assert msg == "Insufficient balance."
+
+    @patch("system_backend.split_payments.transaction")
+    def test_pay_share_already_paid(self, mock_transaction):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.fetchone.return_value = None
+
+        ok, msg = split_payments.pay_share(2, 40)
+
+        assert ok is False
+        assert msg == "No unpaid share found for this split."
+
+    @patch("system_backend.split_payments.fetch_all", return_value=[])
+    def test_open_obligations_use_payer_index(self, mock_fetch_all):
+        split_payments.get_open_obligations(2)
+
+        query = mock_fetch_all.call_args[0][0]
+        assert "ss.payer_user_id = %s AND ss.status = 'pending'" in query
+        assert "transactions" not in query
+
+
+if __name__ == "__main__":
+    unittest.main()
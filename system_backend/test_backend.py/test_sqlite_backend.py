@@ -0,0 +1,178 @@
+import unittest
+import asyncio
+import os, sys
+from decimal import Decimal
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import campusEwallet_db
+from system_backend.campusEwallet_db import execute_query, fetch_one, fetch_all, transaction
+from system_backend.sqlite_backend import translate_query
+from system_backend.receiver_cache import invalidate_receiver_cache
+from system_backend.organization_wallet import OrganizationWallet, invalidate_org_wallet_cache
+from system_backend.students_wallet import StudentWallet
+from system_backend.finance_admin_wallet import FinanceAdminWallet
+from system_backend.async_services import AsyncStudentWallet
+from system_backend.reconciliation import run_reconciliation
+from system_backend.finance_kpis import get_finance_snapshot
+
+
+STUDENTS = [
+    ("2023-00001", "Ana Cruz", "Student", None),
+    ("2023-00002", "Ben Reyes", "Treasurer", "CS Society"),
+    ("2023-00003", "Cara Lim", "Student", None),
+]
+ADMIN_USER_ID = 99
+
+
+class TestTranslateQuery(unittest.TestCase):
+
+    def test_placeholders_and_functions(self):
+        sql = translate_query("UPDATE t SET done_at = NOW(), s = IF(n >= %s, 'x', s) WHERE id = %s")
+
+        self.assertEqual(sql, "UPDATE t SET done_at = datetime('now', 'localtime'), s = IIF(n >= ?, 'x', s) WHERE id = ?")
+
+    def test_interval_arithmetic(self):
+        sql = translate_query("SELECT NOW() - INTERVAL %s SECOND AS cutoff")
+
+        self.assertIn("datetime('now', 'localtime', printf('%+d seconds', -(?)))", sql)
+
+    def test_on_duplicate_key_update_becomes_upsert(self):
+        sql = translate_query(
+            "INSERT INTO c (k, n) VALUES (%s, %s) ON DUPLICATE KEY UPDATE n = n + VALUES(n)"
+        )
+
+        self.assertEqual(sql, "INSERT INTO c (k, n) VALUES (?, ?) ON CONFLICT DO UPDATE SET n = n + excluded.n")
+
+    def test_locking_clauses_removed(self):
+        sql = translate_query("SELECT id FROM q WHERE s = 'p' LIMIT 5 FOR UPDATE SKIP LOCKED")
+
+        self.assertNotIn("FOR UPDATE", sql)
+        self.assertEqual(translate_query("INSERT IGNORE INTO a VALUES (%s)"), "INSERT OR IGNORE INTO a VALUES (?)")
+
+
+class TestSQLiteBackend(unittest.TestCase):
+
+    def setUp(self):
+        campusEwallet_db.use_sqlite()
+        self.addCleanup(campusEwallet_db.use_mysql)
+        invalidate_receiver_cache()
+        invalidate_org_wallet_cache()
+
+        for student_id, name, role, organization in STUDENTS:
+            execute_query(
+                "INSERT INTO enrolled_students (student_id, name, email, student_role, organization, treasurer_id) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                (student_id, name, f"{student_id}@example.com", role, organization,
+                 student_id if organization else None)
+            )
+            cursor = execute_query(
+                "INSERT INTO wallet_users (student_id, email, user_password, role) VALUES (%s, %s, %s, %s)",
+                (student_id, f"{student_id}@example.com", "secret123", role)
+            )
+            execute_query("INSERT INTO wallets (user_id, balance) VALUES (%s, %s)", (cursor.lastrowid, 0.00))
+        execute_query(
+            "INSERT INTO organization_wallets (treasurer_id, organization_name, role, org_wallet_balance) "
+            "VALUES (%s, %s, %s, %s)",
+            ("2023-00002", "CS Society", "Treasurer", 0.00)
+        )
+
+    def fund(self, user_id, amount):
+        ok, request = StudentWallet(user_id).request_funds(amount)
+        self.assertTrue(ok)
+        ok, msg = FinanceAdminWallet.approve_cashin_request(request["request_id"], ADMIN_USER_ID)
+        self.assertTrue(ok, msg)
+
+    def test_cash_in_and_send_money_end_to_end(self):
+        self.fund(1, 500)
+        ana = StudentWallet(1)
+
+        ok, result = ana.send_money("2023-00003", 120.25, "Lunch")
+
+        self.assertTrue(ok, result)
+        self.assertEqual(ana.get_balance(), 379.75)
+        self.assertEqual(StudentWallet(3).get_balance(), 120.25)
+        history = ana.view_transactions()
+        self.assertEqual(history[0]["amount"], Decimal("120.25"))
+        self.assertEqual(history[0]["receiver_name"], "Cara Lim")
+
+    def test_kpi_triggers_follow_writes(self):
+        self.fund(1, 500)
+        StudentWallet(1).send_money("2023-00003", 20)
+
+        snapshot = get_finance_snapshot()
+        volume = {row["transaction_type"]: row for row in snapshot["daily_volume"]}
+
+        self.assertEqual(snapshot["student_wallets"], {"count": 3, "amount": 500})
+        self.assertEqual(snapshot["pending_cashin"]["count"], 0)
+        self.assertEqual(volume["Cash In"]["total_amount"], 500)
+        self.assertEqual(volume["Send Money"]["txn_count"], 1)
+
+    def test_cash_out_hold_leaves_kpi_counters_alone(self):
+        self.fund(1, 100)
+        org = OrganizationWallet("2023-00002")
+        org.post_bill("Membership", "Yearly fee", 50)
+        StudentWallet(1).pay_organization_bill(StudentWallet(1).view_posted_bills()[0]["bill_id"])
+        before = fetch_all("SELECT * FROM finance_kpi_counters WHERE kpi_key = 'organization_wallets'")
+
+        ok, msg = org.request_cash_out(30, "Supplies")
+
+        self.assertTrue(ok, msg)
+        self.assertEqual(fetch_all("SELECT * FROM finance_kpi_counters WHERE kpi_key = 'organization_wallets'"),
+                         before)
+        self.assertEqual(get_finance_snapshot()["pending_cashout"], {"count": 1, "amount": 30})
+
+    def test_bill_payment_and_reconciliation(self):
+        self.fund(1, 100)
+        org = OrganizationWallet("2023-00002")
+        org.post_bill("Membership", "Yearly fee", 50)
+        bill = StudentWallet(1).view_posted_bills()[0]
+
+        ok, result = StudentWallet(1).pay_organization_bill(bill["bill_id"])
+
+        self.assertTrue(ok, result)
+        self.assertEqual(org.get_balance(), 50.0)
+        stats = fetch_one("SELECT paid_count, total_collected FROM organization_bill_stats WHERE bill_id = %s",
+                          (bill["bill_id"],))
+        self.assertEqual(stats["paid_count"], 1)
+        ok, report = run_reconciliation()
+        self.assertTrue(ok, report)
+        self.assertEqual(report["discrepancies"], [])
+
+    def test_demoted_treasurer_loses_cached_wallet(self):
+        org = OrganizationWallet("2023-00002")
+        self.assertEqual(org.get_balance(), 0.0)
+
+        execute_query("UPDATE enrolled_students SET student_role = 'Student' WHERE student_id = %s", ("2023-00002",))
+
+        self.assertIsNone(OrganizationWallet("2023-00002").get_balance())
+        ok, msg = OrganizationWallet("2023-00002").post_bill("Membership", "Yearly fee", 50)
+        self.assertFalse(ok)
+
+    def test_transaction_rolls_back(self):
+        with self.assertRaises(RuntimeError):
+            with transaction() as cursor:
+                cursor.execute("UPDATE wallets SET balance = 1000 WHERE user_id = %s", (1,))
+                raise RuntimeError("boom")
+
+        self.assertEqual(fetch_one("SELECT balance FROM wallets WHERE user_id = %s", (1,))["balance"], 0)
+
+    def test_async_services_run_on_sqlite(self):
+        self.fund(1, 50)
+
+        async def send():
+            wallet = await AsyncStudentWallet.create(1)
+            ok, result = await wallet.send_money("2023-00003", 15)
+            return ok, result, await wallet.get_balance()
+
+        ok, result, balance = asyncio.run(send())
+
+        self.assertTrue(ok, result)
+        self.assertEqual(balance, 35.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
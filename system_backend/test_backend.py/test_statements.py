@@ -0,0 +1,135 @@
+import unittest
+from unittest.mock import patch
+from datetime import date, datetime
+from decimal import Decimal
+import os, sys, tempfile
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import statements
+
+
+@patch("system_backend.transaction_archive.get_archive_horizon", return_value=None)
+class TestStatements(unittest.TestCase):
+
+    def test_movements_query_user_branches_only(self, mock_horizon):
+        query, params = statements.movements_query(
+            datetime(2025, 1, 1), datetime(2025, 2, 1), "user", [5]
+        )
+
+        assert query.count("UNION ALL") == 3
+        assert "organization_bills" not in query
+        assert "t.sender_id IN (%s)" in query
+        assert params.count(5) == 4
+
+    def test_movements_query_unknown_kind(self, mock_horizon):
+        with self.assertRaises(ValueError):
+            statements.movements_query(wallet_kind="office")
+
+    @patch("system_backend.statements.transaction")
+    def test_refresh_up_to_date(self, mock_transaction, mock_horizon):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        now = datetime(2025, 1, 10, 9, 0, 0)
+        cursor.fetchone.return_value = {"refreshed_until": now, "cutoff": now}
+
+        ok, msg = statements.refresh_statement_aggregates()
+
+        assert ok is True
+        assert "up to date" in msg
+        assert cursor.execute.call_count == 1
+
+    @patch("system_backend.statements.transaction")
+    def test_refresh_folds_window_and_moves_checkpoint(self, mock_transaction, mock_horizon):
+        cursor = mock_transaction.return_value.__enter__.return_value
+        last = datetime(2025, 1, 10, 8, 0, 0)
+        cutoff = datetime(2025, 1, 10, 9, 0, 0)
+        cursor.fetchone.return_value = {"refreshed_until": last, "cutoff": cutoff}
+
+        ok, msg = statements.refresh_statement_aggregates()
+
+        assert ok is True
+        assert cursor.execute.call_count == 3
+        fold_sql, fold_params = cursor.execute.call_args_list[1][0]
+        assert "ON DUPLICATE KEY UPDATE" in fold_sql
+        assert fold_params[:2] == (last, cutoff)
+        assert cursor.execute.call_args_list[2][0][1] == (cutoff,)
+
+    @patch("system_backend.statements.fetch_all")
+    def test_build_statement_balances(self, mock_fetch_all, mock_horizon):
+        period = date(2025, 1, 1)
+        mock_fetch_all.side_effect = [
+            [{"wallet_ref": 5, "balance": Decimal("700.00"), "owner_name": "Juan"}],
+            [
+                {"wallet_ref": 5, "period_month": period, "transaction_type": "Cash In",
+                 "inflow": Decimal("1000.00"), "outflow": Decimal("0"), "inflow_count": 1, "outflow_count": 0},
+                {"wallet_ref": 5, "period_month": period, "transaction_type": "Send Money",
+                 "inflow": Decimal("0"), "outflow": Decimal("200.00"), "inflow_count": 0, "outflow_count": 2},
+                {"wallet_ref": 5, "period_month": date(2025, 2, 1), "transaction_type": "Send Money",
+                 "inflow": Decimal("0"), "outflow": Decimal("100.00"), "inflow_count": 0, "outflow_count": 1},
+            ],
+            [],
+            [],
+        ]
+
+        result = statements.build_statements("user", [5], period, datetime(2025, 2, 10))[5]
+
+        # 700 now, minus the January (+800) and February (-100) net movement
+        assert result["opening_balance"] == Decimal("0.00")
+        assert result["total_inflow"] == Decimal("1000.00")
+        assert result["total_outflow"] == Decimal("200.00")
+        assert result["closing_balance"] == Decimal("800.00")
+        assert "Closing balance" in statements.render_statement(result)
+
+    @patch("system_backend.statements.fetch_all")
+    def test_open_month_totals_from_rows(self, mock_fetch_all, mock_horizon):
+        period = date(2025, 1, 1)
+        entry = {"wallet_ref": 5, "moved_at": datetime(2025, 1, 5, 10, 0), "reference": "TRNX-1",
+                 "transaction_type": "Send Money", "inflow": 0, "outflow": Decimal("50.00"), "message": None}
+        mock_fetch_all.side_effect = [
+            [{"wallet_ref": 5, "balance": Decimal("450.00"), "owner_name": "Juan"}],
+            [],
+            [{"wallet_ref": 5, "net": Decimal("-50.00")}],
+            [entry],
+        ]
+
+        result = statements.build_statements("user", [5], period, None)[5]
+
+        assert result["opening_balance"] == Decimal("500.00")
+        assert result["by_type"]["Send Money"]["outflow_count"] == 1
+        assert result["closing_balance"] == Decimal("450.00")
+
+    def test_get_statement_invalid_period(self, mock_horizon):
+        ok, msg = statements.get_statement("user", 5, "January")
+
+        assert ok is False
+        assert "YYYY-MM" in msg
+
+    @patch("system_backend.statements.get_refreshed_until", return_value=datetime(2025, 2, 1))
+    @patch("system_backend.statements.refresh_statement_aggregates", return_value=(True, "ok"))
+    @patch("system_backend.statements.build_statements")
+    @patch("system_backend.statements.fetch_all")
+    def test_generate_monthly_statements(self, mock_fetch_all, mock_build, mock_refresh, mock_until, mock_horizon):
+        mock_fetch_all.side_effect = [[{"wallet_ref": 1}, {"wallet_ref": 2}], [{"wallet_ref": 9}]]
+        mock_build.side_effect = lambda kind, refs, period, until: {
+            ref: {"wallet_kind": kind, "wallet_ref": ref, "owner_name": None, "period": "2025-01",
+                  "opening_balance": Decimal("0"), "closing_balance": Decimal("0"),
+                  "total_inflow": Decimal("0"), "total_outflow": Decimal("0"),
+                  "by_type": {}, "entries": []}
+            for ref in refs
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ok, result = statements.generate_monthly_statements("2025-01", temp_dir, workers=2)
+
+            assert ok is True
+            assert result["statements"] == 3
+            assert sorted(os.listdir(temp_dir)) == [
+                "org-9-2025-01.txt", "user-1-2025-01.txt", "user-2-2025-01.txt"
+            ]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import patch
+from mysql.connector import IntegrityError
 import sys
 import os
 #This is the error occurs in unittest, change the changes directly into my files.
@@ -10,10 +11,14 @@ sys.path.insert(0, PROJECT_ROOT)
 
 import system_backend.campusEwallet_db as campusEwallet_db
 from system_backend.students_wallet import StudentWallet
+from system_backend.receiver_cache import invalidate_receiver_cache
 
 
 class TestStudentWallet(unittest.TestCase):
 
+    def setUp(self):
+        invalidate_receiver_cache()
+
     # -------------------------
     # STUDENT NAME
     # -------------------------
@@ -63,25 +68,53 @@ class TestStudentWallet(unittest.TestCase):
     # -------------------------
     # SEND MONEY
     # -------------------------
-    @patch("system_backend.campusEwallet_db.execute_query")
+    @patch("system_backend.campusEwallet_db.transaction")
+    @patch("system_backend.receiver_cache.fetch_one")
     @patch("system_backend.campusEwallet_db.fetch_one")
-    def test_send_money_success(self, mock_fetch, mock_execute):
-        # Mocks for __init__, sender balance, receiver info, receiver wallet existence
+    def test_send_money_success(self, mock_fetch, mock_receiver_fetch, mock_transaction):
+        # Mocks for __init__ and sender balance
         mock_fetch.side_effect = [
             {"student_id": "SENDER-ID"}, # __init__
             {"name": "Sender Name"},     # __init__
             {"balance": 1000},  # sender wallet
-            {"user_id": 2, "student_id": "20210002", "office_id": None,
-             "office_name": None, "receiver_name": "Maria Cruz"},  # receiver
-            {"user_id": 2}  # receiver wallet exists
         ]
-        mock_execute.return_value = True
+        # receiver info and wallet existence in one lookup
+        mock_receiver_fetch.return_value = {"user_id": 2, "student_id": "20210002", "office_id": None,
+                                            "office_name": None, "receiver_name": "Maria Cruz",
+                                            "wallet_exists": 1}
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 1
 
         wallet = StudentWallet(1)
         ok, result = wallet.send_money("20210002", 200, "Allowance")
         self.assertTrue(ok)
         self.assertEqual(result["amount"], 200)
         self.assertEqual(result["receiver_user_id"], 2)
+        # conditional debit, credit and ledger row in one transaction
+        self.assertEqual(cursor.execute.call_args_list[0][0][1], (200.0, 1, 200.0))
+        self.assertEqual(cursor.execute.call_count, 3)
+
+    @patch("system_backend.campusEwallet_db.transaction")
+    @patch("system_backend.receiver_cache.fetch_one")
+    @patch("system_backend.campusEwallet_db.fetch_one")
+    def test_send_money_balance_spent_concurrently(self, mock_fetch, mock_receiver_fetch, mock_transaction):
+        mock_fetch.side_effect = [
+            {"student_id": "SENDER-ID"},
+            {"name": "Sender Name"},
+            {"balance": 1000},
+        ]
+        mock_receiver_fetch.return_value = {"user_id": 2, "student_id": "20210002", "office_id": None,
+                                            "office_name": None, "receiver_name": "Maria Cruz",
+                                            "wallet_exists": 1}
+        # the balance was spent between the read and the debit
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 0
+
+        wallet = StudentWallet(1)
+        ok, msg = wallet.send_money("20210002", 200)
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Insufficient balance.")
+        self.assertEqual(cursor.execute.call_count, 1)
 
     @patch("system_backend.campusEwallet_db.fetch_one")
     def test_send_money_insufficient_balance(self, mock_fetch):
@@ -110,6 +143,98 @@ class TestStudentWallet(unittest.TestCase):
         self.assertFalse(ok)
         self.assertEqual(msg, "Invalid amount format.")
 
+    # -------------------------
+    # BATCH PAYOUT
+    # -------------------------
+    @patch("system_backend.campusEwallet_db.transaction")
+    @patch("system_backend.campusEwallet_db.fetch_all")
+    @patch("system_backend.campusEwallet_db.fetch_one")
+    def test_send_batch_payout(self, mock_fetch, mock_fetch_all, mock_transaction):
+        mock_fetch.return_value = {"student_id": None, "office_id": 4}  # office account
+        mock_fetch_all.return_value = [
+            {"student_id": "20210002", "user_id": 2},
+            {"student_id": "20210003", "user_id": 3},
+        ]
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 1
+
+        wallet = StudentWallet(9)
+        ok, report = wallet.send_batch_payout([
+            ("20210002", 100, "Stipend"),
+            ("20210003", "50.5"),
+            ("20210002", 25),
+            ("20219999", 10),
+            ("20210003", "abc"),
+        ])
+
+        self.assertTrue(ok)
+        self.assertEqual(report["total"], 175.5)
+        self.assertEqual(report["paid_count"], 3)
+        self.assertEqual([line["status"] for line in report["lines"]],
+                         ["paid", "paid", "paid", "failed", "failed"])
+        self.assertEqual(report["lines"][3]["error"], "Student wallet not found.")
+        # one debit, one bulk credit, one multi-row insert
+        self.assertEqual(cursor.execute.call_count, 3)
+        self.assertEqual(cursor.execute.call_args_list[0][0][1], (175.5, 9, 175.5))
+        self.assertEqual(cursor.execute.call_args_list[1][0][1], (2, 125.0, 3, 50.5, 2, 3))
+        self.assertEqual(len(cursor.execute.call_args_list[2][0][1]), 15)
+
+    @patch("system_backend.campusEwallet_db.transaction")
+    @patch("system_backend.campusEwallet_db.fetch_all")
+    @patch("system_backend.campusEwallet_db.fetch_one")
+    def test_send_batch_payout_insufficient_balance(self, mock_fetch, mock_fetch_all, mock_transaction):
+        mock_fetch.return_value = {"student_id": None, "office_id": 4}
+        mock_fetch_all.return_value = [{"student_id": "20210002", "user_id": 2}]
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 0
+
+        wallet = StudentWallet(9)
+        ok, msg = wallet.send_batch_payout([("20210002", 100)])
+
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Insufficient balance for this payout.")
+        self.assertEqual(cursor.execute.call_count, 1)
+
+    @patch("system_backend.students_wallet.generate_transaction_id")
+    @patch("system_backend.campusEwallet_db.transaction")
+    @patch("system_backend.campusEwallet_db.fetch_all")
+    @patch("system_backend.campusEwallet_db.fetch_one")
+    def test_send_batch_payout_retries_duplicate_ids(self, mock_fetch, mock_fetch_all, mock_transaction, mock_id):
+        mock_fetch.return_value = {"student_id": None, "office_id": 4}
+        mock_fetch_all.return_value = [{"student_id": "20210002", "user_id": 2}]
+        mock_id.side_effect = ["TRNX-20250101-TAKEN", "TRNX-20250101-FRESH"]
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 1
+        cursor.execute.side_effect = [None, None, IntegrityError(msg="Duplicate entry"), None, None, None]
+
+        wallet = StudentWallet(9)
+        ok, report = wallet.send_batch_payout([("20210002", 100)])
+
+        self.assertTrue(ok)
+        self.assertEqual(report["lines"][0]["transaction_id"], "TRNX-20250101-FRESH")
+        self.assertEqual(cursor.execute.call_count, 6)
+
+    @patch("system_backend.campusEwallet_db.fetch_one")
+    def test_send_batch_payout_requires_office_link(self, mock_fetch):
+        # profile lookup failed: neither a student nor an office is known
+        mock_fetch.side_effect = Exception("connection lost")
+
+        wallet = StudentWallet(1)
+        ok, msg = wallet.send_batch_payout([("20210002", 100)])
+
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Batch payouts are only available to office wallets.")
+
+    @patch("system_backend.campusEwallet_db.fetch_one")
+    def test_send_batch_payout_students_not_allowed(self, mock_fetch):
+        mock_fetch.side_effect = [{"student_id": "20210001"}, {"name": "Juan Dela Cruz"}]
+
+        wallet = StudentWallet(1)
+        ok, msg = wallet.send_batch_payout([("20210002", 100)])
+
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Batch payouts are only available to office wallets.")
+
     # -------------------------
     # REQUEST FUNDS
     # -------------------------
@@ -164,9 +289,9 @@ class TestStudentWallet(unittest.TestCase):
     # -------------------------
     # PAY ORGANIZATION BILL
     # -------------------------
-    @patch("system_backend.campusEwallet_db.execute_query")
+    @patch("system_backend.campusEwallet_db.transaction")
     @patch("system_backend.campusEwallet_db.fetch_one")
-    def test_pay_organization_bill_success(self, mock_fetch, mock_execute):
+    def test_pay_organization_bill_success(self, mock_fetch, mock_transaction):
         mock_fetch.side_effect = [
             # For __init__
             {"student_id": "SENDER-ID"},
@@ -176,7 +301,6 @@ class TestStudentWallet(unittest.TestCase):
             # For get_balance inside pay_organization_bill
             {"balance": 500.0}
         ]
-        mock_execute.return_value = True
         wallet = StudentWallet(user_id=1)
         ok, result = wallet.pay_organization_bill(1, "Payment for fees")
         self.assertTrue(ok)
@@ -200,6 +324,21 @@ class TestStudentWallet(unittest.TestCase):
             results = wallet.view_transactions()
             self.assertEqual(len(results), 1)
 
+    # -------------------------
+    # MONTHLY STATEMENT
+    # -------------------------
+    @patch("system_backend.students_wallet.get_statement")
+    @patch("system_backend.campusEwallet_db.fetch_one")
+    def test_view_monthly_statement_skips_refresh(self, mock_fetch, mock_statement):
+        mock_fetch.side_effect = [{"student_id": "SENDER-ID"}, {"name": "Sender Name"}]
+        mock_statement.return_value = (True, {"period": "2025-01"})
+
+        wallet = StudentWallet(1)
+        ok, statement = wallet.view_monthly_statement("2025-01")
+
+        self.assertTrue(ok)
+        mock_statement.assert_called_once_with("user", 1, "2025-01", refresh=False)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -12,9 +12,9 @@ from system_backend.students_wallet import StudentWallet
 
 class TestStudentWallet(unittest.TestCase):
 
-    @patch("system_backend.students_wallet.system_backend.campusEwallet_db.execute_query")
+    @patch("system_backend.students_wallet.system_backend.campusEwallet_db.transaction")
     @patch("system_backend.students_wallet.system_backend.campusEwallet_db.fetch_one")
-    def test_pay_organization_bill_success(self, mock_fetch, mock_execute):
+    def test_pay_organization_bill_success(self, mock_fetch, mock_transaction):
         """
         Tests the success path for paying an organization bill.
         """
@@ -28,7 +28,7 @@ class TestStudentWallet(unittest.TestCase):
             {"amount": 200, "org_wallet_id": 1, "organization_name": "Org A"}, # Mock for bill details
             {"balance": 500.0},            # Mock for get_balance()
         ]
-        mock_execute.return_value = True
+        cursor = mock_transaction.return_value.__enter__.return_value
 
         # This call will consume the first mock value
         wallet = StudentWallet(user_id=1)
@@ -40,7 +40,55 @@ class TestStudentWallet(unittest.TestCase):
         self.assertTrue(ok, "The payment process should return True for success.")
         self.assertIn("transaction_id", result)
         self.assertEqual(result["amount"], 200)
-        self.assertEqual(mock_execute.call_count, 3, "Should execute 3 queries: update sender, update org, insert transaction.")
+        self.assertEqual(
+            cursor.execute.call_count, 5,
+            "Should execute 5 queries in one transaction: update sender, update org, "
+            "insert transaction, insert payer, upsert bill stats."
+        )
+
+    @patch("system_backend.students_wallet.system_backend.campusEwallet_db.transaction")
+    @patch("system_backend.students_wallet.system_backend.campusEwallet_db.fetch_one")
+    def test_pay_organization_bill_rolls_back_on_error(self, mock_fetch, mock_transaction):
+        """
+        Tests that a failing statement inside the payment transaction is reported as a failure.
+        """
+        mock_fetch.side_effect = [
+            {"student_id": "2024-123"},
+            {"name": "John Doe"},
+            {"amount": 200, "org_wallet_id": 1, "organization_name": "Org A"},
+            {"balance": 500.0},
+        ]
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.execute.side_effect = [None, None, Exception("Deadlock found")]
+
+        wallet = StudentWallet(user_id=1)
+        ok, msg = wallet.pay_organization_bill(bill_id=1)
+
+        self.assertFalse(ok)
+        self.assertIn("system error", msg)
+
+    @patch("system_backend.students_wallet.system_backend.campusEwallet_db.transaction")
+    @patch("system_backend.students_wallet.system_backend.campusEwallet_db.fetch_one")
+    def test_pay_organization_bill_conditional_debit(self, mock_fetch, mock_transaction):
+        """
+        Tests that a payment losing the race for the balance is rejected inside the transaction.
+        """
+        mock_fetch.side_effect = [
+            {"student_id": "2024-123"},
+            {"name": "John Doe"},
+            {"amount": 200, "org_wallet_id": 1, "organization_name": "Org A"},
+            {"balance": 500.0},
+        ]
+        cursor = mock_transaction.return_value.__enter__.return_value
+        cursor.rowcount = 0
+
+        wallet = StudentWallet(user_id=1)
+        ok, msg = wallet.pay_organization_bill(bill_id=1)
+
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Insufficient balance.")
+        self.assertIn("balance >= %s", str(cursor.execute.call_args_list[0][0][0]))
+        self.assertEqual(cursor.execute.call_count, 1)
 
 
 if __name__ == "__main__":
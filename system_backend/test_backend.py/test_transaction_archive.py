@@ -0,0 +1,150 @@
+import unittest
+from unittest.mock import patch
+from datetime import date, datetime
+import os, sys
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import transaction_archive
+
+
+class TestTransactionArchive(unittest.TestCase):
+
+    def setUp(self):
+        transaction_archive._horizon_cache["expires_at"] = 0.0
+
+    def test_month_helpers(self):
+        self.assertEqual(transaction_archive.month_start(datetime(2025, 3, 17, 10, 5)), date(2025, 3, 1))
+        self.assertEqual(transaction_archive.add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(transaction_archive.add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+        self.assertEqual(transaction_archive.partition_name(date(2025, 3, 1)), "p202503")
+
+    @patch("system_backend.transaction_archive.get_archive_horizon")
+    def test_transactions_source_hot_only(self, mock_horizon):
+        mock_horizon.return_value = datetime(2025, 1, 1)
+
+        self.assertEqual(transaction_archive.transactions_source(), "transactions")
+        self.assertEqual(transaction_archive.transactions_source(datetime(2025, 2, 1)), "transactions")
+        self.assertEqual(transaction_archive.transactions_source(datetime(2025, 2, 1), alias="t"),
+                         "transactions AS t")
+        self.assertEqual(mock_horizon.call_count, 2)
+
+    @patch("system_backend.transaction_archive.get_archive_horizon")
+    def test_transactions_source_old_range_reads_archive(self, mock_horizon):
+        mock_horizon.return_value = datetime(2025, 1, 1)
+
+        source = transaction_archive.transactions_source(datetime(2024, 6, 1), alias="t")
+
+        self.assertIn("FROM transactions WHERE created_at >= '2025-01-01 00:00:00'", source)
+        self.assertIn("FROM transactions_archive WHERE created_at < '2025-01-01 00:00:00'", source)
+        self.assertTrue(source.endswith("AS t"))
+
+    @patch("system_backend.transaction_archive.fetch_one")
+    def test_archive_horizon_is_cached(self, mock_fetch):
+        mock_fetch.return_value = {"last_period": date(2024, 12, 1)}
+
+        self.assertEqual(transaction_archive.get_archive_horizon(), datetime(2025, 1, 1))
+        self.assertEqual(transaction_archive.get_archive_horizon(), datetime(2025, 1, 1))
+        mock_fetch.assert_called_once()
+
+    @patch("system_backend.transaction_archive.date")
+    @patch("system_backend.transaction_archive.execute_query")
+    @patch("system_backend.transaction_archive.get_partition_names")
+    def test_ensure_future_partitions(self, mock_names, mock_execute, mock_date):
+        mock_date.today.return_value = date(2025, 3, 10)
+        mock_date.side_effect = lambda *args: date(*args)
+        mock_names.return_value = ["p202502", "p202503", "p_future"]
+        mock_execute.return_value = True
+
+        ok, msg = transaction_archive.ensure_future_partitions(months_ahead=2)
+
+        self.assertTrue(ok)
+        sql = mock_execute.call_args[0][0]
+        self.assertIn("REORGANIZE PARTITION p_future", sql)
+        self.assertIn("PARTITION p202504 VALUES LESS THAN (TO_DAYS('2025-05-01'))", sql)
+        self.assertIn("PARTITION p202505 VALUES LESS THAN (TO_DAYS('2025-06-01'))", sql)
+        self.assertNotIn("p202506", sql)
+
+    @patch("system_backend.transaction_archive.date")
+    @patch("system_backend.transaction_archive.execute_query")
+    @patch("system_backend.transaction_archive.transaction")
+    @patch("system_backend.transaction_archive.get_partition_names")
+    @patch("system_backend.transaction_archive.fetch_one")
+    @patch("system_backend.transaction_archive.time.sleep")
+    def test_archive_closed_periods_drops_partitions(self, mock_sleep, mock_fetch, mock_names, mock_transaction,
+                                                     mock_execute, mock_date):
+        mock_date.today.return_value = date(2025, 3, 10)
+        mock_date.side_effect = lambda *args: date(*args)
+        mock_fetch.side_effect = [{"oldest": datetime(2024, 12, 5, 8, 0)},
+                                  {"hot_rows": 4, "archived_rows": 4},
+                                  {"hot_rows": 2, "archived_rows": 2}]
+        mock_names.return_value = ["p202412", "p202501", "p202502", "p202503", "p_future"]
+        mock_execute.return_value = True
+        cursor = mock_transaction.return_value.__enter__.return_value
+        recorded_before_wait = []
+        mock_sleep.side_effect = lambda seconds: recorded_before_wait.extend(
+            call for call in cursor.execute.call_args_list if "transaction_archive_periods" in call[0][0]
+        )
+
+        ok, msg = transaction_archive.archive_closed_periods(keep_months=1)
+
+        self.assertTrue(ok)
+        self.assertEqual(msg, "Archived 2 month(s): 2024-12, 2025-01.")
+        # both months are recorded (horizon moved) and cached horizons expire before anything is dropped
+        self.assertEqual(len(recorded_before_wait), 2)
+        mock_sleep.assert_called_once_with(transaction_archive.HORIZON_CACHE_SECONDS)
+        dropped = [call[0][0] for call in mock_execute.call_args_list]
+        self.assertEqual(dropped, ["ALTER TABLE transactions DROP PARTITION p202412",
+                                   "ALTER TABLE transactions DROP PARTITION p202501"])
+
+    @patch("system_backend.transaction_archive.date")
+    @patch("system_backend.transaction_archive.execute_query")
+    @patch("system_backend.transaction_archive.transaction")
+    @patch("system_backend.transaction_archive.get_partition_names")
+    @patch("system_backend.transaction_archive.fetch_one")
+    @patch("system_backend.transaction_archive.time.sleep")
+    def test_archive_keeps_month_when_copy_incomplete(self, mock_sleep, mock_fetch, mock_names, mock_transaction,
+                                                      mock_execute, mock_date):
+        mock_date.today.return_value = date(2025, 3, 10)
+        mock_date.side_effect = lambda *args: date(*args)
+        mock_fetch.side_effect = [{"oldest": datetime(2024, 12, 5, 8, 0)},
+                                  {"hot_rows": 4, "archived_rows": 3}]
+        mock_names.return_value = ["p202412", "p202501", "p_future"]
+
+        ok, msg = transaction_archive.archive_closed_periods(keep_months=1)
+
+        self.assertFalse(ok)
+        self.assertIn("2024-12", msg)
+        mock_execute.assert_not_called()
+        executed = [call[0][0] for call in mock_transaction.return_value.__enter__.return_value.execute.call_args_list]
+        self.assertFalse(any("transaction_archive_periods" in sql for sql in executed))
+
+    @patch("system_backend.transaction_archive.date")
+    @patch("system_backend.transaction_archive.execute_query")
+    @patch("system_backend.transaction_archive.transaction")
+    @patch("system_backend.transaction_archive.get_partition_names")
+    @patch("system_backend.transaction_archive.fetch_one")
+    @patch("system_backend.transaction_archive.time.sleep")
+    def test_archive_stops_when_drop_fails(self, mock_sleep, mock_fetch, mock_names, mock_transaction,
+                                           mock_execute, mock_date):
+        mock_date.today.return_value = date(2025, 3, 10)
+        mock_date.side_effect = lambda *args: date(*args)
+        mock_fetch.side_effect = [{"oldest": datetime(2024, 12, 5, 8, 0)},
+                                  {"hot_rows": 4, "archived_rows": 4},
+                                  {"hot_rows": 2, "archived_rows": 2}]
+        mock_names.return_value = ["p202412", "p202501", "p_future"]
+        mock_execute.return_value = False
+
+        ok, msg = transaction_archive.archive_closed_periods(keep_months=1)
+
+        self.assertFalse(ok)
+        self.assertIn("Could not drop partition p202412", msg)
+        # the next run finds the month still in the hot table and drops it then
+        self.assertEqual(mock_execute.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime
+from decimal import Decimal
+import csv
+import gzip
+import json
+import os, sys
+import tempfile
+
+# ---- FIX PATH ----
+CURRENT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from system_backend import transaction_export
+
+
+def make_rows(count):
+    return [
+        {"transaction_id": f"TRNX-{i:03d}", "created_at": datetime(2025, 1, 1, 8, 0, i),
+         "transaction_type": "Send Money", "status": "completed", "amount": Decimal("10.50"),
+         "sender_id": 1, "receiver_id": 2, "org_wallet_id": None, "service_id": None,
+         "service_paid_for": None, "bill_id": None, "message": "hi"}
+        for i in range(count)
+    ]
+
+
+@patch("system_backend.transaction_export.FinanceAdminWallet.build_transaction_filters",
+       return_value=("FROM transactions WHERE 1=1", []))
+class TestTransactionExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch("system_backend.transaction_export.stream_rows")
+    def test_export_csv(self, mock_stream, mock_filters):
+        mock_stream.return_value = iter(make_rows(3))
+        path = os.path.join(self.tmp.name, "out.csv")
+
+        ok, result = transaction_export.export_transactions(path)
+
+        self.assertTrue(ok)
+        self.assertEqual(result["rows"], 3)
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["amount"], "10.50")
+        self.assertEqual(rows[2]["created_at"], "2025-01-01 08:00:02")
+        self.assertIn("ORDER BY created_at ASC, transaction_id ASC", mock_stream.call_args[0][0])
+
+    @patch("system_backend.transaction_export.CHECKPOINT_EVERY_ROWS", 2)
+    @patch("system_backend.transaction_export.stream_rows")
+    def test_export_gzip_jsonl_resumes_after_interruption(self, mock_stream, mock_filters):
+        rows = make_rows(5)
+
+        def interrupted(query, params, batch_size):
+            yield from rows[:3]
+            raise ConnectionError("Lost connection to MySQL server")
+
+        mock_stream.side_effect = interrupted
+        path = os.path.join(self.tmp.name, "out.jsonl.gz")
+
+        ok, msg = transaction_export.export_transactions(path)
+        self.assertFalse(ok)
+        self.assertIn("after 3 rows", msg)
+        self.assertTrue(os.path.exists(path + ".checkpoint.json"))
+
+        mock_stream.side_effect = None
+        mock_stream.return_value = iter(rows[2:])
+        progress = []
+        with patch("system_backend.transaction_export.fetch_one", return_value={"total": 5}):
+            ok, result = transaction_export.export_transactions(
+                path, progress_callback=lambda done, total: progress.append((done, total))
+            )
+
+        self.assertTrue(ok)
+        self.assertTrue(result["resumed"])
+        self.assertEqual(result["rows"], 5)
+        self.assertEqual(progress[-1], (5, 5))
+        self.assertEqual(mock_stream.call_args[0][1][-1], "TRNX-001")
+        self.assertFalse(os.path.exists(path + ".checkpoint.json"))
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            exported = [json.loads(line)["transaction_id"] for line in f]
+        self.assertEqual(exported, [row["transaction_id"] for row in rows])
+
+    @patch("system_backend.transaction_export.stream_rows")
+    def test_changed_filters_start_fresh(self, mock_stream, mock_filters):
+        path = os.path.join(self.tmp.name, "out.csv")
+        with open(path, "w") as f:
+            f.write("stale")
+        with open(path + ".checkpoint.json", "w") as f:
+            json.dump({"settings": {"format": "csv"}, "offset": 5, "rows": 9, "last_key": None}, f)
+        mock_stream.return_value = iter(make_rows(1))
+
+        ok, result = transaction_export.export_transactions(path, search="TRNX")
+
+        self.assertTrue(ok)
+        self.assertFalse(result["resumed"])
+        self.assertEqual(result["rows"], 1)
+
+    def test_export_through_backend_pages(self, mock_filters):
+        rows = make_rows(3)
+        backend = MagicMock()
+        backend.count_transactions.return_value = (True, 3)
+        backend.get_transactions_page.side_effect = [(True, rows[:2]), (True, rows[2:]), (True, [])]
+        path = os.path.join(self.tmp.name, "out.csv")
+        progress = []
+
+        ok, result = transaction_export.export_transactions(
+            path, start_date="2025-01-01", backend=backend,
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+
+        self.assertTrue(ok)
+        self.assertEqual(result["rows"], 3)
+        self.assertEqual(progress[-1], (3, 3))
+        mock_filters.assert_not_called()
+        calls = backend.get_transactions_page.call_args_list
+        self.assertIsNone(calls[0][1]["after"])
+        self.assertEqual(calls[1][1]["after"], ["2025-01-01 08:00:01", "TRNX-001"])
+        self.assertEqual(calls[1][1]["start_date"], "2025-01-01")
+
+    def test_unsupported_format(self, mock_filters):
+        ok, msg = transaction_export.export_transactions("out.xml", file_format="xml")
+
+        self.assertFalse(ok)
+        self.assertIn("Unsupported", msg)
+
+
+if __name__ == "__main__":
+    unittest.main()
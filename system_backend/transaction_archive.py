@@ -0,0 +1,379 @@
+"""
+Transaction Archive Module
+
+This module keeps the transactions table small enough for the everyday
+history, bill and admin queries by splitting it by month and moving
+closed months into a compressed archive table.
+
+Main Responsibilities:
+- Convert transactions into a table partitioned by created_at month
+  (one-time, explicit operation)
+- Keep future monthly partitions ahead of the calendar (monthly job)
+- Move closed months into transactions_archive and record them in
+  transaction_archive_periods before removing them from the hot table
+  (nightly or monthly job)
+- Tell read APIs which table expression covers a requested date range, so
+  old ranges read the archive transparently while recent ranges only touch
+  the hot table
+
+Archived months are always contiguous from the oldest month, so everything
+before the archive horizon (the first month that was not archived) lives in
+transactions_archive and everything from the horizon on lives in
+transactions.
+
+Usage:
+    python -m system_backend.transaction_archive partition
+    python -m system_backend.transaction_archive extend [--months-ahead 3]
+    python -m system_backend.transaction_archive archive [--keep-months 12]
+
+Dependencies:
+- campusEwallet_db for database queries and transactions
+"""
+
+import argparse
+import time
+from datetime import date, datetime
+from system_backend.campusEwallet_db import fetch_one, fetch_all, execute_query, transaction
+
+
+DEFAULT_KEEP_MONTHS = 12
+DEFAULT_MONTHS_AHEAD = 3
+ARCHIVE_DELETE_BATCH_SIZE = 10000
+HORIZON_CACHE_SECONDS = 60
+
+_horizon_cache = {"value": None, "expires_at": 0.0}
+
+
+def month_start(value):
+    """
+    Return the first day of the month containing a date or datetime.
+
+    Parameters:
+        value (date | datetime): Any day of the month.
+
+    Returns:
+        date: First day of that month.
+    """
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    """
+    Shift a first-of-month date by a number of months.
+
+    Parameters:
+        month (date): First day of a month.
+        count (int): Months to add (may be negative).
+
+    Returns:
+        date: First day of the resulting month.
+    """
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """
+    Return the partition name used for a month, e.g. p202501.
+
+    Parameters:
+        month (date): First day of the month.
+
+    Returns:
+        str: Partition name.
+    """
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+def _partition_clause(month):
+    """Build the PARTITION definition for one month."""
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{add_months(month, 1).isoformat()}'))"
+
+
+def get_partition_names():
+    """
+    Return the monthly partitions of the transactions table.
+
+    Returns:
+        list[str]: Partition names in order, empty if the table is not partitioned.
+    """
+    rows = fetch_all("""
+        SELECT PARTITION_NAME AS name
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'transactions'
+          AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """)
+    return [row["name"] for row in rows] if rows else []
+
+
+def partition_transactions_table(months_ahead=DEFAULT_MONTHS_AHEAD):
+    """
+    Convert the transactions table into monthly RANGE partitions.
+
+    MySQL requires the partitioning column in every unique key, so the
+    primary key becomes (transaction_id, created_at), the key
+    transactions_archive has since migration 0014. Uniqueness of new IDs
+    then rests on transfers.generate_transaction_id. Run this once during
+    a maintenance window; it rebuilds the table.
+
+    Parameters:
+        months_ahead (int): Future months to create partitions for.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    if get_partition_names():
+        return False, "The transactions table is already partitioned."
+
+    oldest = fetch_one("SELECT MIN(created_at) AS oldest FROM transactions")
+    first_month = month_start(oldest["oldest"]) if oldest and oldest["oldest"] else month_start(date.today())
+    last_month = add_months(month_start(date.today()), months_ahead)
+
+    clauses = []
+    month = first_month
+    while month <= last_month:
+        clauses.append(_partition_clause(month))
+        month = add_months(month, 1)
+    clauses.append("PARTITION p_future VALUES LESS THAN MAXVALUE")
+
+    ok = execute_query(f"""
+        ALTER TABLE transactions
+            MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (transaction_id, created_at)
+        PARTITION BY RANGE (TO_DAYS(created_at)) (
+            {", ".join(clauses)}
+        )
+    """)
+    if not ok:
+        return False, "Failed to partition the transactions table."
+    return True, f"Transactions partitioned into {len(clauses) - 1} monthly partitions."
+
+
+def ensure_future_partitions(months_ahead=DEFAULT_MONTHS_AHEAD):
+    """
+    Split new monthly partitions off p_future so inserts never land in it.
+
+    Parameters:
+        months_ahead (int): Months after the current one that must exist.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    names = [name for name in get_partition_names() if name != "p_future"]
+    if not names:
+        return False, "The transactions table is not partitioned."
+
+    last = names[-1]
+    next_month = add_months(date(int(last[1:5]), int(last[5:7]), 1), 1)
+    target = add_months(month_start(date.today()), months_ahead)
+
+    clauses = []
+    while next_month <= target:
+        clauses.append(_partition_clause(next_month))
+        next_month = add_months(next_month, 1)
+
+    if not clauses:
+        return True, "Future partitions are already in place."
+
+    clauses.append("PARTITION p_future VALUES LESS THAN MAXVALUE")
+    ok = execute_query(f"ALTER TABLE transactions REORGANIZE PARTITION p_future INTO ({', '.join(clauses)})")
+    if not ok:
+        return False, "Failed to add future partitions."
+    return True, f"Added {len(clauses) - 1} monthly partitions."
+
+
+def get_archive_horizon(refresh=False):
+    """
+    Return the first instant that is still stored in the hot transactions table.
+
+    Parameters:
+        refresh (bool): Bypass the short-lived in-process cache.
+
+    Returns:
+        datetime | None: Start of the first month not archived, or None if
+            nothing has been archived yet.
+    """
+    now = time.time()
+    if not refresh and _horizon_cache["expires_at"] > now:
+        return _horizon_cache["value"]
+
+    row = fetch_one("SELECT MAX(period_month) AS last_period FROM transaction_archive_periods")
+    horizon = None
+    if row and row["last_period"]:
+        horizon = datetime.combine(add_months(month_start(row["last_period"]), 1), datetime.min.time())
+
+    _horizon_cache.update(value=horizon, expires_at=now + HORIZON_CACHE_SECONDS)
+    return horizon
+
+
+def transactions_source(start=None, alias="transactions"):
+    """
+    Return the table expression read APIs should select transactions from.
+
+    Ranges that start at or after the archive horizon (the common case)
+    read only the hot, partition-pruned transactions table. Ranges that
+    reach back before the horizon get both tables, each restricted to its
+    own side of the horizon so no row is ever counted twice.
+
+    Parameters:
+        start (datetime | None): Inclusive start of the requested range.
+            None means the caller did not ask for an old range.
+        alias (str): Name the rows are addressed by in the query.
+
+    Returns:
+        str: The transactions table or a derived table, under the alias.
+    """
+    horizon = get_archive_horizon() if start is not None else None
+    if horizon is None or start >= horizon:
+        return "transactions" if alias == "transactions" else f"transactions AS {alias}"
+
+    boundary = horizon.strftime("%Y-%m-%d %H:%M:%S")
+    return f"""(
+            SELECT * FROM transactions WHERE created_at >= '{boundary}'
+            UNION ALL
+            SELECT * FROM transactions_archive WHERE created_at < '{boundary}'
+        ) AS {alias}"""
+
+
+def _verify_archived_copy(bounds):
+    """
+    Check that every hot row of a month is present in transactions_archive.
+
+    Parameters:
+        bounds (tuple): (first day of the month, first day of the next month).
+
+    Raises:
+        RuntimeError: If the counts differ; nothing may be removed then.
+    """
+    row = fetch_one("""
+        SELECT
+            (SELECT COUNT(*) FROM transactions
+             WHERE created_at >= %s AND created_at < %s) AS hot_rows,
+            (SELECT COUNT(*) FROM transactions t
+             JOIN transactions_archive a
+               ON a.transaction_id = t.transaction_id AND a.created_at = t.created_at
+             WHERE t.created_at >= %s AND t.created_at < %s) AS archived_rows
+    """, bounds + bounds)
+    if not row:
+        raise RuntimeError("Could not verify the archived copy.")
+    if row["hot_rows"] != row["archived_rows"]:
+        raise RuntimeError(
+            f"Archive holds {row['archived_rows']} of {row['hot_rows']} rows; the month was not removed."
+        )
+
+
+def archive_closed_periods(keep_months=DEFAULT_KEEP_MONTHS):
+    """
+    Move every month older than keep_months into transactions_archive.
+
+    Months are archived oldest first, in two phases:
+    1. Each month is copied with INSERT IGNORE (so a rerun after an
+       interruption is harmless; the archive has the same
+       (transaction_id, created_at) key as the hot table, so no distinct
+       row is ever ignored), checked to have all its hot rows in the
+       archive, and recorded in transaction_archive_periods. Recording it
+       moves the archive horizon, so from then on reads of the month go to
+       the archive.
+    2. After HORIZON_CACHE_SECONDS, when no process still holds the old
+       horizon, the copied months are removed from the hot table by
+       dropping their partitions or, on an unpartitioned table, by batched
+       deletes.
+
+    A month is never missing from both tables: until it is removed it is
+    readable from the hot table (old horizon) or the archive (new horizon).
+    A run interrupted in phase 2 leaves recorded months in the hot table;
+    the next run copies nothing new for them and removes them.
+
+    Parameters:
+        keep_months (int): Number of recent months, besides the current
+            one, that stay in the hot table.
+
+    Returns:
+        tuple: (bool, str) Status and feedback message.
+    """
+    cutoff = add_months(month_start(date.today()), -keep_months)
+
+    oldest = fetch_one("SELECT MIN(created_at) AS oldest FROM transactions")
+    if not oldest or not oldest["oldest"]:
+        return True, "No transactions to archive."
+
+    month = month_start(oldest["oldest"])
+    partitions = set(get_partition_names())
+    archived = []
+
+    try:
+        while month < cutoff:
+            next_month = add_months(month, 1)
+            bounds = (month, next_month)
+
+            with transaction() as cursor:
+                cursor.execute("""
+                    INSERT IGNORE INTO transactions_archive
+                    SELECT * FROM transactions
+                    WHERE created_at >= %s AND created_at < %s
+                """, bounds)
+
+            _verify_archived_copy(bounds)
+
+            with transaction() as cursor:
+                cursor.execute("""
+                    INSERT INTO transaction_archive_periods (period_month, row_count, archived_at)
+                    SELECT %s, COUNT(*), NOW()
+                    FROM transactions_archive
+                    WHERE created_at >= %s AND created_at < %s
+                    ON DUPLICATE KEY UPDATE row_count = VALUES(row_count), archived_at = VALUES(archived_at)
+                """, (month,) + bounds)
+
+            archived.append(month)
+            month = next_month
+
+        if archived:
+            # Other processes cache the horizon; wait until they read the archive
+            time.sleep(HORIZON_CACHE_SECONDS)
+
+        for month in archived:
+            bounds = (month, add_months(month, 1))
+            name = partition_name(month)
+            if name in partitions:
+                if not execute_query(f"ALTER TABLE transactions DROP PARTITION {name}"):
+                    raise RuntimeError(f"Could not drop partition {name}.")
+            else:
+                while True:
+                    with transaction() as cursor:
+                        cursor.execute(
+                            "DELETE FROM transactions WHERE created_at >= %s AND created_at < %s LIMIT %s",
+                            bounds + (ARCHIVE_DELETE_BATCH_SIZE,)
+                        )
+                        deleted = cursor.rowcount
+                    if deleted < ARCHIVE_DELETE_BATCH_SIZE:
+                        break
+
+    except Exception as e:
+        print(f"Database Error in archive_closed_periods: {e}")
+        return False, f"Archiving stopped at {month.strftime('%Y-%m')}: {e}"
+
+    finally:
+        _horizon_cache["expires_at"] = 0.0
+
+    if not archived:
+        return True, "No closed periods to archive."
+    return True, f"Archived {len(archived)} month(s): {', '.join(m.strftime('%Y-%m') for m in archived)}."
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partition and archive the transactions table.")
+    parser.add_argument("command", choices=["partition", "extend", "archive"])
+    parser.add_argument("--months-ahead", type=int, default=DEFAULT_MONTHS_AHEAD)
+    parser.add_argument("--keep-months", type=int, default=DEFAULT_KEEP_MONTHS)
+    args = parser.parse_args()
+
+    if args.command == "partition":
+        ok, message = partition_transactions_table(args.months_ahead)
+    elif args.command == "extend":
+        ok, message = ensure_future_partitions(args.months_ahead)
+    else:
+        ok, message = archive_closed_periods(args.keep_months)
+    print(message)
@@ -0,0 +1,346 @@
+"""
+Transaction Export Module
+
+This module exports the transactions selected by the finance admin filters
+(see FinanceAdminWallet.build_transaction_filters) to CSV or JSON Lines
+files, optionally gzip-compressed, for auditors.
+
+How it works:
+- Rows are streamed from a server-side cursor through a generator and
+  written one by one, so memory use does not grow with the export size
+- Rows are written in (created_at, transaction_id) order, which doubles
+  as a keyset cursor
+- Every CHECKPOINT_EVERY_ROWS rows the output is flushed to disk and a
+  small <output>.checkpoint.json file records the byte offset and the last
+  key written. An interrupted export with the same filters resumes from
+  there instead of starting over
+- Gzip output starts a new gzip member at every checkpoint, so the file
+  can be truncated back to a checkpoint and appended to; multi-member gzip
+  files read back as one stream
+- With a backend (e.g. the API client's FinanceAdminWallet) the rows are
+  fetched a page at a time through get_transactions_page instead, so the
+  file is written on the desktop client
+
+Usage:
+    python -m system_backend.transaction_export out.csv.gz --start-date 2025-01-01
+
+Dependencies:
+- campusEwallet_db for streaming and counting rows
+- finance_admin_wallet for the shared transaction filters
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+from datetime import datetime
+from decimal import Decimal
+from system_backend.campusEwallet_db import fetch_one, stream_rows
+from system_backend.finance_admin_wallet import FinanceAdminWallet
+
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+EXPORT_COLUMNS = [
+    "transaction_id", "created_at", "transaction_type", "status", "amount",
+    "sender_id", "receiver_id", "org_wallet_id", "service_id",
+    "service_paid_for", "bill_id", "message",
+]
+
+CHECKPOINT_EVERY_ROWS = 5000
+STREAM_BATCH_SIZE = 1000
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _checkpoint_path(path):
+    """Return the sidecar checkpoint file used for an export path."""
+    return f"{path}.checkpoint.json"
+
+
+def _format_value(value):
+    """Convert database values into plain text/JSON friendly values."""
+    if isinstance(value, datetime):
+        return value.strftime(TIMESTAMP_FORMAT)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+def iter_transactions(filters, params, after=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    Stream filtered transactions in keyset order.
+
+    Parameters:
+        filters (str): FROM/WHERE SQL from build_transaction_filters.
+        params (list): Parameters of the filters.
+        after (tuple, optional): (created_at, transaction_id) of the last row
+            already exported; only later rows are returned.
+        batch_size (int): Rows fetched per round trip.
+
+    Yields:
+        dict: One transaction row, limited to EXPORT_COLUMNS.
+    """
+    query = f"SELECT {', '.join(EXPORT_COLUMNS)} {filters}"
+    params = list(params)
+
+    if after:
+        created_at, transaction_id = after
+        query += " AND (created_at > %s OR (created_at = %s AND transaction_id > %s))"
+        params.extend([created_at, created_at, transaction_id])
+
+    query += " ORDER BY created_at ASC, transaction_id ASC"
+    yield from stream_rows(query, tuple(params) if params else None, batch_size)
+
+
+def iter_transaction_pages(backend, filter_args, after=None):
+    """
+    Fetch filtered transactions page by page through a backend.
+
+    Parameters:
+        backend: FinanceAdminWallet or its API client counterpart.
+        filter_args (dict): filter_type, search, start_date and end_date.
+        after (tuple, optional): (created_at, transaction_id) of the last row
+            already exported; only later rows are returned.
+
+    Yields:
+        dict: One transaction row.
+
+    Raises:
+        RuntimeError: If a page cannot be loaded.
+    """
+    while True:
+        key = [_format_value(after[0]), after[1]] if after else None
+        ok, rows = backend.get_transactions_page(after=key, **filter_args)
+        if not ok:
+            raise RuntimeError(rows)
+        yield from rows
+        if not rows:
+            return
+        after = (rows[-1]["created_at"], rows[-1]["transaction_id"])
+
+
+class _ExportFile:
+    """
+    Output file that can be flushed to a resumable byte offset.
+
+    Parameters:
+        path (str): Output file path.
+        compress (bool): Write gzip members instead of plain text.
+        offset (int): Byte offset to truncate to and append from (0 = new file).
+    """
+
+    def __init__(self, path, compress, offset=0):
+        self.compress = compress
+        self.raw = open(path, "r+b" if offset else "wb")
+        if offset:
+            self.raw.truncate(offset)
+            self.raw.seek(offset)
+        self._open_text()
+
+    def _open_text(self):
+        stream = gzip.GzipFile(fileobj=self.raw, mode="wb") if self.compress else self.raw
+        self.text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+    def _close_text(self):
+        self.text.flush()
+        stream = self.text.detach()
+        if self.compress:
+            # Ends the current gzip member without closing the raw file
+            stream.close()
+
+    def checkpoint(self):
+        """
+        Flush everything written so far to disk.
+
+        Returns:
+            int: Byte offset the file can later be truncated back to.
+        """
+        self._close_text()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        offset = self.raw.tell()
+        self._open_text()
+        return offset
+
+    def close(self):
+        self._close_text()
+        self.raw.close()
+
+
+def _load_checkpoint(path, settings):
+    """
+    Return the saved checkpoint for an export, if it matches the settings.
+
+    Parameters:
+        path (str): Output file path.
+        settings (dict): Filters and format of the current export.
+
+    Returns:
+        dict | None: Checkpoint data, or None to start a fresh export.
+    """
+    checkpoint_file = _checkpoint_path(path)
+    if not os.path.exists(checkpoint_file) or not os.path.exists(path):
+        return None
+    try:
+        with open(checkpoint_file, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if checkpoint.get("settings") != settings or checkpoint.get("offset", 0) <= 0:
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(path, settings, offset, rows, last_key):
+    """Atomically write the checkpoint sidecar file."""
+    checkpoint_file = _checkpoint_path(path)
+    temp_file = checkpoint_file + ".tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump({
+            "settings": settings,
+            "offset": offset,
+            "rows": rows,
+            "last_key": [last_key[0].strftime(TIMESTAMP_FORMAT), last_key[1]] if last_key else None,
+        }, f)
+    os.replace(temp_file, checkpoint_file)
+
+
+def export_transactions(path, file_format=None, compress=None, filter_type=None, search=None,
+                        start_date=None, end_date=None, progress_callback=None, resume=True, backend=None):
+    """
+    Export filtered transactions to a CSV or JSON Lines file.
+
+    Parameters:
+        path (str): Output file path. The format and compression are taken
+            from the extension (.csv, .jsonl, optionally followed by .gz)
+            unless given explicitly.
+        file_format (str, optional): "csv" or "jsonl".
+        compress (bool, optional): Gzip the output.
+        filter_type (str, optional): Transaction type filter.
+        search (str, optional): Transaction ID search.
+        start_date (str, optional): First day to export (YYYY-MM-DD).
+        end_date (str, optional): Last day to export (YYYY-MM-DD).
+        progress_callback (callable, optional): Called as
+            progress_callback(rows_written, total_rows) after each checkpoint
+            and at the end.
+        resume (bool): Continue an interrupted export of the same file and
+            filters instead of starting over.
+        backend (optional): Read the rows through this FinanceAdminWallet
+            (e.g. the API client's) instead of the local database.
+
+    Returns:
+        tuple: (bool, dict or str) True and {"path", "rows", "resumed"},
+            or False and an error message.
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    if compress is None:
+        compress = path.endswith(".gz")
+    if file_format is None:
+        file_format = "jsonl" if name.endswith(".jsonl") else "csv"
+    if file_format not in EXPORT_FORMATS:
+        return False, f"Unsupported export format '{file_format}'."
+
+    filter_args = {"filter_type": filter_type, "search": search, "start_date": start_date, "end_date": end_date}
+    if backend is None:
+        try:
+            filters, params = FinanceAdminWallet.build_transaction_filters(**filter_args)
+        except ValueError as e:
+            return False, f"Invalid date filter: {e}"
+
+    settings = {
+        "format": file_format,
+        "compress": compress,
+        "filters": [filter_type, search, start_date, end_date],
+    }
+    checkpoint = _load_checkpoint(path, settings) if resume else None
+
+    rows = checkpoint["rows"] if checkpoint else 0
+    after = None
+    if checkpoint and checkpoint["last_key"]:
+        after = (datetime.strptime(checkpoint["last_key"][0], TIMESTAMP_FORMAT), checkpoint["last_key"][1])
+
+    total = None
+    if progress_callback and backend is None:
+        count_row = fetch_one(f"SELECT COUNT(*) AS total {filters}", tuple(params) if params else None)
+        total = count_row["total"] if count_row else None
+    elif progress_callback:
+        ok, count = backend.count_transactions(**filter_args)
+        total = count if ok else None
+
+    output = None
+    try:
+        output = _ExportFile(path, compress, checkpoint["offset"] if checkpoint else 0)
+
+        if file_format == "csv":
+            writer = csv.DictWriter(output.text, fieldnames=EXPORT_COLUMNS)
+            if not checkpoint:
+                writer.writeheader()
+
+        last_key = after
+        if backend is None:
+            source = iter_transactions(filters, params, after)
+        else:
+            source = iter_transaction_pages(backend, filter_args, after)
+
+        for row in source:
+            record = {column: _format_value(row.get(column)) for column in EXPORT_COLUMNS}
+            if file_format == "csv":
+                writer.writerow(record)
+            else:
+                output.text.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            rows += 1
+            last_key = (row["created_at"], row["transaction_id"])
+
+            if rows % CHECKPOINT_EVERY_ROWS == 0:
+                offset = output.checkpoint()
+                if file_format == "csv":
+                    writer = csv.DictWriter(output.text, fieldnames=EXPORT_COLUMNS)
+                _save_checkpoint(path, settings, offset, rows, last_key)
+                if progress_callback:
+                    progress_callback(rows, total)
+
+        output.close()
+        output = None
+
+    except Exception as e:
+        print(f"Error in export_transactions: {e}")
+        return False, f"Export interrupted after {rows} rows: {e}"
+
+    finally:
+        if output:
+            output.close()
+
+    if os.path.exists(_checkpoint_path(path)):
+        os.remove(_checkpoint_path(path))
+    if progress_callback:
+        progress_callback(rows, total)
+
+    return True, {"path": path, "rows": rows, "resumed": bool(checkpoint)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export transactions to CSV or JSON Lines.")
+    parser.add_argument("path", help="Output file (.csv, .jsonl, optionally .gz)")
+    parser.add_argument("--type", dest="filter_type", default=None)
+    parser.add_argument("--search", default=None)
+    parser.add_argument("--start-date", default=None)
+    parser.add_argument("--end-date", default=None)
+    parser.add_argument("--no-resume", action="store_true")
+    args = parser.parse_args()
+
+    ok, result = export_transactions(
+        args.path,
+        filter_type=args.filter_type,
+        search=args.search,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        progress_callback=lambda done, total: print(f"{done}/{total if total is not None else '?'} rows"),
+        resume=not args.no_resume
+    )
+    print(f"Exported {result['rows']} rows to {result['path']}" if ok else result)
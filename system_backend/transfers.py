@@ -0,0 +1,122 @@
+"""
+Transfers Module
+
+This module holds the single atomic path used to move money from one
+wallet user to another. StudentWallet.send_money and split payments
+(see split_payments) both go through transfer_funds.
+
+How it works:
+- transfer_funds runs inside the caller's transaction: the sender is
+  debited with a conditional UPDATE (balance >= amount), so the balance
+  check and the debit cannot be separated by a concurrent transfer
+- The receiver is credited and the 'Send Money' ledger row inserted on the
+  same cursor, so all three commit or roll back together
+- Follow-up work that must not run for a rolled-back transfer (fraud
+  scoring, spending cache invalidation) is left to the caller, after commit
+- The three statements are registered queries, so they run prepared on the
+  transaction's connection (see campusEwallet_db.register_query)
+- transfer_funds_async runs the same statements on an async_db transaction
+
+Dependencies:
+- datetime, uuid: for transaction ID generation
+- campusEwallet_db for the query registry
+"""
+
+from datetime import datetime
+import uuid
+from system_backend.campusEwallet_db import register_query
+
+
+DEBIT_SENDER = register_query(
+    "transfer.debit_sender",
+    "UPDATE wallets SET balance = balance - %s WHERE user_id = %s AND balance >= %s"
+)
+CREDIT_RECEIVER = register_query(
+    "transfer.credit_receiver",
+    "UPDATE wallets SET balance = balance + %s WHERE user_id = %s"
+)
+INSERT_TRANSFER = register_query("transfer.insert_ledger_row", """
+    INSERT INTO transactions
+    (transaction_id, sender_id, receiver_id, amount, transaction_type, service_paid_for, created_at, status, message)
+    VALUES (%s, %s, %s, %s, %s, %s, NOW(), %s, %s)
+""")
+
+
+class InsufficientBalance(Exception):
+    """Raised inside a transaction when the sender cannot cover a transfer."""
+
+
+def generate_transaction_id():
+    """
+    Generate a unique transaction ID.
+
+    Format: TRNX-YYYYMMDD-<32 hex digits>
+
+    The random part is a UUID4 so IDs do not collide: the partitioned
+    transactions table only enforces (transaction_id, created_at).
+
+    Returns:
+        str: Unique transaction ID.
+    """
+    date_part = datetime.now().strftime("%Y%m%d")
+    return f"TRNX-{date_part}-{uuid.uuid4().hex.upper()}"
+
+
+def transfer_funds(cursor, sender_id, receiver_id, amount, message=None):
+    """
+    Debit the sender, credit the receiver and record the transfer.
+
+    Must be called with the cursor of an open transaction (see
+    campusEwallet_db.transaction); nothing is committed here.
+
+    Parameters:
+        cursor: Cursor bound to the open transaction.
+        sender_id (int): Wallet user ID to debit.
+        receiver_id (int): Wallet user ID to credit.
+        amount (float): Amount to move; must be positive.
+        message (str, optional): Message stored with the transaction.
+
+    Returns:
+        str: The new transaction ID.
+
+    Raises:
+        InsufficientBalance: If the sender's balance is below amount. The
+            caller's transaction should be rolled back.
+    """
+    cursor.execute(DEBIT_SENDER, (amount, sender_id, amount))
+    if cursor.rowcount == 0:
+        raise InsufficientBalance("Insufficient balance.")
+
+    cursor.execute(CREDIT_RECEIVER, (amount, receiver_id))
+
+    trx_id = generate_transaction_id()
+    cursor.execute(INSERT_TRANSFER, (trx_id, sender_id, receiver_id, amount, "Send Money", None, "completed", message))
+    return trx_id
+
+
+async def transfer_funds_async(cursor, sender_id, receiver_id, amount, message=None):
+    """
+    Coroutine version of transfer_funds for an async_db transaction.
+
+    Parameters:
+        cursor: Cursor bound to the open async_db transaction.
+        sender_id (int): Wallet user ID to debit.
+        receiver_id (int): Wallet user ID to credit.
+        amount (float): Amount to move; must be positive.
+        message (str, optional): Message stored with the transaction.
+
+    Returns:
+        str: The new transaction ID.
+
+    Raises:
+        InsufficientBalance: If the sender's balance is below amount.
+    """
+    await cursor.execute(DEBIT_SENDER, (amount, sender_id, amount))
+    if cursor.rowcount == 0:
+        raise InsufficientBalance("Insufficient balance.")
+
+    await cursor.execute(CREDIT_RECEIVER, (amount, receiver_id))
+
+    trx_id = generate_transaction_id()
+    await cursor.execute(INSERT_TRANSFER, (trx_id, sender_id, receiver_id, amount, "Send Money", None, "completed", message))
+    return trx_id